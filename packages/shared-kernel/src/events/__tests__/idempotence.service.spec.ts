@@ -0,0 +1,70 @@
+import { describe, expect, it } from 'bun:test';
+import { IdempotenceService, type IdempotenceStore } from '../idempotence.service';
+
+function createStore(processed: string[] = []) {
+  const ids = new Set(processed);
+  const calls = { lookups: 0, bulkLookups: 0 };
+  const store: IdempotenceStore = {
+    isEventProcessed: async (eventId) => {
+      calls.lookups += 1;
+      return ids.has(eventId);
+    },
+    markEventProcessed: async (eventId) => {
+      ids.add(eventId);
+    },
+  };
+  return { store, calls };
+}
+
+describe('IdempotenceService cache', () => {
+  it('answers known processed ids from memory', async () => {
+    const { store, calls } = createStore(['evt-1']);
+    const service = new IdempotenceService(store);
+
+    expect(await service.isProcessed('evt-1')).toBe(true);
+    expect(await service.isProcessed('evt-1')).toBe(true);
+    expect(calls.lookups).toBe(1);
+
+    await service.markProcessed('evt-2', 'test.event');
+    expect(await service.isProcessed('evt-2')).toBe(true);
+    expect(calls.lookups).toBe(1);
+
+    // Unprocessed ids are never cached
+    expect(await service.isProcessed('evt-3')).toBe(false);
+    expect(await service.isProcessed('evt-3')).toBe(false);
+    expect(calls.lookups).toBe(3);
+  });
+
+  it('only looks up unknown ids in bulk checks', async () => {
+    const { store, calls } = createStore(['evt-1', 'evt-2']);
+    store.findProcessedEventIds = async (eventIds) => {
+      calls.bulkLookups += 1;
+      return eventIds.filter((id) => id === 'evt-1' || id === 'evt-2');
+    };
+    const service = new IdempotenceService(store);
+
+    await service.isProcessed('evt-1');
+    const processed = await service.filterProcessed(['evt-1', 'evt-2', 'evt-3']);
+    const again = await service.filterProcessed(['evt-1', 'evt-2']);
+
+    expect([...processed].sort()).toEqual(['evt-1', 'evt-2']);
+    expect([...again].sort()).toEqual(['evt-1', 'evt-2']);
+    expect(calls.bulkLookups).toBe(1);
+  });
+
+  it('evicts the least recently used ids beyond cacheSize', async () => {
+    const { store, calls } = createStore(['a', 'b', 'c']);
+    const service = new IdempotenceService(store, { cacheSize: 2 });
+
+    await service.isProcessed('a');
+    await service.isProcessed('b');
+    await service.isProcessed('a');
+    await service.isProcessed('c');
+    expect(calls.lookups).toBe(3);
+
+    // 'b' was the least recently used
+    await service.isProcessed('a');
+    await service.isProcessed('b');
+    expect(calls.lookups).toBe(4);
+  });
+});
@@ -1,24 +1,48 @@
-import { Inject, Injectable, Logger } from '@nestjs/common';
+import { Inject, Injectable, Logger, Optional } from '@nestjs/common';
+import { mapWithConcurrency } from '../helpers/concurrency.helper.js';
 
 export interface IdempotenceStore {
   isEventProcessed(eventId: string): Promise<boolean>;
   markEventProcessed(eventId: string, eventType: string): Promise<void>;
+  /** Optional bulk lookup: the subset of `eventIds` already processed */
+  findProcessedEventIds?(eventIds: string[]): Promise<string[]>;
 }
 
 export const IDEMPOTENCE_STORE = 'IDEMPOTENCE_STORE';
+export const IDEMPOTENCE_OPTIONS = 'IDEMPOTENCE_OPTIONS';
+
+export interface IdempotenceServiceOptions {
+  /** Processed event ids remembered in memory, 0 disables the cache (default: 10000) */
+  cacheSize?: number;
+}
+
+/** Parallel single lookups when the store has no bulk lookup */
+const FALLBACK_LOOKUP_CONCURRENCY = 16;
+const DEFAULT_CACHE_SIZE = 10_000;
 
 /**
  * IdempotenceService
- * Ensures NATS events are processed exactly once using eventId tracking
+ * Ensures NATS events are processed exactly once using eventId tracking.
+ *
+ * Ids known to be processed are kept in an in-memory LRU in front of the store,
+ * so redeliveries and duplicates are answered without a round trip.
+ * Only positive answers are cached: an id marked processed never goes back.
  */
 @Injectable()
 export class IdempotenceService {
   private readonly logger = new Logger(IdempotenceService.name);
+  private readonly processedIds = new Map<string, true>();
+  private readonly cacheSize: number;
 
   constructor(
     @Inject(IDEMPOTENCE_STORE)
     private readonly store: IdempotenceStore,
-  ) {}
+    @Optional()
+    @Inject(IDEMPOTENCE_OPTIONS)
+    options: IdempotenceServiceOptions = {},
+  ) {
+    this.cacheSize = Math.max(0, Math.floor(options.cacheSize ?? DEFAULT_CACHE_SIZE));
+  }
 
   async isProcessed(eventId: string | undefined): Promise<boolean> {
     if (!eventId) {
@@ -26,15 +50,45 @@ export class IdempotenceService {
       return false;
     }
 
-    const processed = await this.store.isEventProcessed(eventId);
+    const processed = this.isCached(eventId) || (await this.store.isEventProcessed(eventId));
 
     if (processed) {
+      this.remember(eventId);
       this.logger.log(`Event ${eventId} already processed, skipping`);
     }
 
     return processed;
   }
 
+  /**
+   * Check a whole batch of event ids at once.
+   * Returns the ids already processed.
+   */
+  async filterProcessed(eventIds: readonly string[]): Promise<Set<string>> {
+    const ids = [...new Set(eventIds.filter(Boolean))];
+    const processed = new Set(ids.filter((id) => this.isCached(id)));
+    const unknown = ids.filter((id) => !processed.has(id));
+    if (unknown.length === 0) {
+      return processed;
+    }
+
+    let found: string[];
+    if (this.store.findProcessedEventIds) {
+      found = await this.store.findProcessedEventIds(unknown);
+    } else {
+      const flags = await mapWithConcurrency(unknown, FALLBACK_LOOKUP_CONCURRENCY, (id) =>
+        this.store.isEventProcessed(id),
+      );
+      found = unknown.filter((_, index) => flags[index]);
+    }
+
+    for (const id of found) {
+      this.remember(id);
+      processed.add(id);
+    }
+    return processed;
+  }
+
   async markProcessed(eventId: string | undefined, eventType: string): Promise<void> {
     if (!eventId) {
       this.logger.warn(`Event ${eventType} processed without eventId - cannot mark as processed`);
@@ -43,6 +97,7 @@ export class IdempotenceService {
 
     try {
       await this.store.markEventProcessed(eventId, eventType);
+      this.remember(eventId);
       this.logger.debug(`Event ${eventId} (${eventType}) marked as processed`);
     } catch (error) {
       this.logger.error(
@@ -50,4 +105,26 @@ export class IdempotenceService {
       );
     }
   }
+
+  private isCached(eventId: string): boolean {
+    if (!this.processedIds.has(eventId)) {
+      return false;
+    }
+    // Refresh recency: Map iteration order is insertion order
+    this.processedIds.delete(eventId);
+    this.processedIds.set(eventId, true);
+    return true;
+  }
+
+  private remember(eventId: string): void {
+    if (this.cacheSize === 0) {
+      return;
+    }
+    this.processedIds.delete(eventId);
+    this.processedIds.set(eventId, true);
+    if (this.processedIds.size > this.cacheSize) {
+      const oldest = this.processedIds.keys().next().value as string;
+      this.processedIds.delete(oldest);
+    }
+  }
 }
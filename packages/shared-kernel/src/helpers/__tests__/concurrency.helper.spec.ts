@@ -0,0 +1,108 @@
+import { describe, expect, it } from 'bun:test';
+import {
+  chunkArray,
+  createConcurrencyLimiter,
+  KeyedSerialQueue,
+  mapWithConcurrency,
+  TokenBucket,
+} from '../concurrency.helper';
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+describe('createConcurrencyLimiter', () => {
+  it('never runs more than the limit at once', async () => {
+    const limit = createConcurrencyLimiter(2);
+    let active = 0;
+    let peak = 0;
+
+    await Promise.all(
+      Array.from({ length: 6 }, () =>
+        limit(async () => {
+          active += 1;
+          peak = Math.max(peak, active);
+          await sleep(5);
+          active -= 1;
+        }),
+      ),
+    );
+
+    expect(peak).toBe(2);
+  });
+
+  it('forwards task rejections and keeps draining the queue', async () => {
+    const limit = createConcurrencyLimiter(1);
+    const failing = limit(async () => {
+      throw new Error('boom');
+    });
+    const next = limit(async () => 'ok');
+
+    await expect(failing).rejects.toThrow('boom');
+    expect(await next).toBe('ok');
+  });
+});
+
+describe('mapWithConcurrency', () => {
+  it('keeps input order in the results', async () => {
+    const results = await mapWithConcurrency([30, 10, 20], 3, async (delay, index) => {
+      await sleep(delay);
+      return index;
+    });
+
+    expect(results).toEqual([0, 1, 2]);
+  });
+
+  it('returns an empty array for empty input', async () => {
+    expect(await mapWithConcurrency([], 4, async () => 1)).toEqual([]);
+  });
+});
+
+describe('KeyedSerialQueue', () => {
+  it('serializes tasks with the same key', async () => {
+    const queue = new KeyedSerialQueue();
+    const order: string[] = [];
+
+    await Promise.all([
+      queue.run('a', async () => {
+        await sleep(10);
+        order.push('a1');
+      }),
+      queue.run('a', async () => {
+        order.push('a2');
+      }),
+      queue.run('b', async () => {
+        order.push('b1');
+      }),
+    ]);
+
+    expect(order).toEqual(['b1', 'a1', 'a2']);
+  });
+
+  it('continues the chain after a failure', async () => {
+    const queue = new KeyedSerialQueue();
+    const first = queue.run('a', async () => {
+      throw new Error('fail');
+    });
+    const second = queue.run('a', async () => 'done');
+
+    await expect(first).rejects.toThrow('fail');
+    expect(await second).toBe('done');
+  });
+});
+
+describe('TokenBucket', () => {
+  it('lets the burst through then paces at the refill rate', async () => {
+    const bucket = new TokenBucket(100, 2);
+    const startedAt = Date.now();
+
+    await Promise.all(Array.from({ length: 5 }, () => bucket.take()));
+
+    // 2 immediate tokens, then 3 more at one per 10 ms
+    expect(Date.now() - startedAt).toBeGreaterThanOrEqual(25);
+  });
+});
+
+describe('chunkArray', () => {
+  it('splits into chunks of the given size', () => {
+    expect(chunkArray([1, 2, 3, 4, 5], 2)).toEqual([[1, 2], [3, 4], [5]]);
+  });
+});
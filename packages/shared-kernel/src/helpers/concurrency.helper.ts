@@ -0,0 +1,150 @@
+/**
+ * Concurrency Helper
+ *
+ * Bounded-parallelism primitives shared by batch jobs (imports, relays, charging runs).
+ *
+ * @module @crm/shared-kernel/helpers
+ */
+
+/**
+ * Runs async tasks with at most `limit` of them in flight at any time.
+ */
+export type ConcurrencyLimiter = <T>(task: () => Promise<T>) => Promise<T>;
+
+/**
+ * Create a limiter that queues tasks once `limit` of them are running.
+ * Task results and errors are forwarded untouched to the caller.
+ */
+export function createConcurrencyLimiter(limit: number): ConcurrencyLimiter {
+  const max = Math.max(1, Math.floor(limit) || 1);
+  const waiting: Array<() => void> = [];
+  let active = 0;
+
+  const release = (): void => {
+    active -= 1;
+    const next = waiting.shift();
+    if (next) {
+      next();
+    }
+  };
+
+  return <T>(task: () => Promise<T>): Promise<T> =>
+    new Promise<T>((resolve, reject) => {
+      const start = (): void => {
+        active += 1;
+        Promise.resolve()
+          .then(task)
+          .then(resolve, reject)
+          .finally(release);
+      };
+
+      if (active < max) {
+        start();
+      } else {
+        waiting.push(start);
+      }
+    });
+}
+
+/**
+ * Map `items` through `mapper` with at most `limit` calls in flight.
+ * Results keep the input order. The first rejection rejects the whole call,
+ * like `Promise.all`; use `Promise.allSettled` semantics inside `mapper` to isolate errors.
+ */
+export async function mapWithConcurrency<T, R>(
+  items: readonly T[],
+  limit: number,
+  mapper: (item: T, index: number) => Promise<R>,
+): Promise<R[]> {
+  const results = new Array<R>(items.length);
+  const workers = Math.max(1, Math.min(Math.floor(limit) || 1, items.length));
+  let cursor = 0;
+
+  const worker = async (): Promise<void> => {
+    while (cursor < items.length) {
+      const index = cursor;
+      cursor += 1;
+      results[index] = await mapper(items[index] as T, index);
+    }
+  };
+
+  await Promise.all(Array.from({ length: workers }, () => worker()));
+  return results;
+}
+
+/**
+ * Serializes tasks sharing the same key while letting different keys run in parallel.
+ * Used where concurrent work must keep per-entity ordering (same client, same SKU, ...).
+ */
+export class KeyedSerialQueue {
+  private readonly tails = new Map<string, Promise<unknown>>();
+
+  run<T>(key: string, task: () => Promise<T>): Promise<T> {
+    const previous = this.tails.get(key) ?? Promise.resolve();
+    const current = previous.then(task, task);
+    const tail = current.catch(() => undefined);
+    this.tails.set(key, tail);
+    void tail.then(() => {
+      if (this.tails.get(key) === tail) {
+        this.tails.delete(key);
+      }
+    });
+    return current;
+  }
+
+  get size(): number {
+    return this.tails.size;
+  }
+}
+
+/**
+ * Token bucket rate limiter: `ratePerSecond` tokens refill continuously up to `burst`.
+ * `take()` resolves once a token is available; waiters are served in arrival order.
+ * Used to stay under third-party rate limits (PSPs, partner APIs).
+ */
+export class TokenBucket {
+  private readonly capacity: number;
+  private readonly refillPerMs: number;
+  private tokens: number;
+  private lastRefill = Date.now();
+  private queue: Promise<void> = Promise.resolve();
+
+  constructor(ratePerSecond: number, burst: number = ratePerSecond) {
+    this.refillPerMs = Math.max(ratePerSecond, Number.EPSILON) / 1000;
+    this.capacity = Math.max(1, Math.floor(burst) || 1);
+    this.tokens = this.capacity;
+  }
+
+  take(): Promise<void> {
+    const turn = this.queue.then(() => this.acquire());
+    this.queue = turn;
+    return turn;
+  }
+
+  private async acquire(): Promise<void> {
+    this.refill();
+    while (this.tokens < 1) {
+      await new Promise((resolve) => setTimeout(resolve, Math.ceil((1 - this.tokens) / this.refillPerMs)));
+      this.refill();
+    }
+    this.tokens -= 1;
+  }
+
+  private refill(): void {
+    const now = Date.now();
+    this.tokens = Math.min(this.capacity, this.tokens + (now - this.lastRefill) * this.refillPerMs);
+    this.lastRefill = now;
+  }
+}
+
+/**
+ * Split `items` into consecutive chunks of at most `size` elements.
+ */
+export function chunkArray<T>(items: readonly T[], size: number): T[][] {
+  const step = Math.max(1, Math.floor(size) || 1);
+  const chunks: T[][] = [];
+  for (let i = 0; i < items.length; i += step) {
+    chunks.push(items.slice(i, i + step));
+  }
+  return chunks;
+}
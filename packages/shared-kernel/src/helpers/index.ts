@@ -4,6 +4,7 @@
  * @module @crm/shared-kernel/helpers
  */
 
+export * from './concurrency.helper.js';
 export * from './env.helper.js';
 export * from './pagination.helper.js';
 export * from './timestamp.helper.js';
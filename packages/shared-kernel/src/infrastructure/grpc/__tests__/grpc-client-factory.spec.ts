@@ -0,0 +1,162 @@
+import { describe, expect, it } from 'bun:test';
+import { status } from '@grpc/grpc-js';
+import {
+  getGrpcClientMetrics,
+  GRPC_READ_POLICY,
+  httpStatusFromGrpcCode,
+  PooledGrpcClient,
+  resetGrpcClientMetrics,
+} from '../grpc-client-factory';
+
+// ---------------------------------------------------------------------------
+// Fake raw client: records calls and answers after `delayMs`
+// ---------------------------------------------------------------------------
+
+type Answer = { error?: { code: number; message: string }; response?: unknown };
+
+function createRawClient(answers: Answer[] = [], delayMs = 5) {
+  const calls: Array<{ request: unknown; deadline: Date }> = [];
+  const handler = (
+    request: unknown,
+    _metadata: unknown,
+    options: { deadline: Date },
+    callback: (error: unknown, response?: unknown) => void,
+  ) => {
+    calls.push({ request, deadline: options.deadline });
+    const answer = answers.shift() ?? { response: { id: (request as { id?: string }).id ?? 'ok' } };
+    setTimeout(() => callback(answer.error ?? null, answer.response), delayMs);
+  };
+  return { calls, raw: { GetById: handler, Create: handler } };
+}
+
+const unavailable: Answer = { error: { code: status.UNAVAILABLE, message: '14 UNAVAILABLE' } };
+
+describe('PooledGrpcClient', () => {
+  it('coalesces identical in-flight reads into one upstream call', async () => {
+    const { calls, raw } = createRawClient();
+    const client = new PooledGrpcClient(raw, 'clients:50051', { methods: { GetById: GRPC_READ_POLICY } });
+
+    const results = await Promise.all([
+      client.call('GetById', { id: 'c-1', organisation_id: 'o-1' }),
+      client.call('GetById', { organisation_id: 'o-1', id: 'c-1' }),
+      client.call('GetById', { id: 'c-1', organisation_id: 'o-1' }),
+      client.call('GetById', { id: 'c-2', organisation_id: 'o-1' }),
+    ]);
+
+    expect(calls).toHaveLength(2);
+    expect(results.map((r: any) => r.id)).toEqual(['c-1', 'c-1', 'c-1', 'c-2']);
+
+    // Writes are never shared
+    await Promise.all([client.call('Create', { id: 'x' }), client.call('Create', { id: 'x' })]);
+    expect(calls).toHaveLength(4);
+  });
+
+  it('retries retryable failures with backoff and records them', async () => {
+    resetGrpcClientMetrics();
+    const { calls, raw } = createRawClient([unavailable, unavailable]);
+    const client = new PooledGrpcClient(raw, 'payments:50051', {
+      defaults: { retries: 2, backoffMs: 10 },
+    });
+
+    const startedAt = Date.now();
+    const response = await client.call<{ id: string }>('GetById', { id: 'p-1' });
+
+    expect(response.id).toBe('p-1');
+    expect(calls).toHaveLength(3);
+    // Jittered backoff: at least half of 10 + 20 ms
+    expect(Date.now() - startedAt).toBeGreaterThanOrEqual(15);
+
+    const metrics = getGrpcClientMetrics().find((m) => m.target === 'payments:50051');
+    expect(metrics?.count).toBe(3);
+    expect(metrics?.retries).toBe(2);
+    expect(metrics?.errors).toEqual({ UNAVAILABLE: 2 });
+  });
+
+  it('does not retry by default nor on non-retryable codes', async () => {
+    const { calls, raw } = createRawClient([
+      unavailable,
+      { error: { code: status.INVALID_ARGUMENT, message: '3 INVALID_ARGUMENT' } },
+    ]);
+    const noRetry = new PooledGrpcClient(raw, 'factures:50051');
+    const withRetry = new PooledGrpcClient(raw, 'factures:50051', { defaults: { retries: 3 } });
+
+    await expect(noRetry.call('Create', { id: 'f-1' })).rejects.toMatchObject({ code: status.UNAVAILABLE });
+    await expect(withRetry.call('Create', { id: 'f-2' })).rejects.toMatchObject({
+      code: status.INVALID_ARGUMENT,
+    });
+    expect(calls).toHaveLength(2);
+  });
+
+  it('counts queueing time against the deadline', async () => {
+    const { calls, raw } = createRawClient([], 40);
+    const client = new PooledGrpcClient(raw, 'users:50051', {
+      defaults: { deadlineMs: 20 },
+      maxInFlight: 1,
+    });
+
+    const before = Date.now();
+    const first = client.call('GetById', { id: 'u-1' }, { deadlineMs: 1_000 });
+    const second = client.call('GetById', { id: 'u-2' });
+
+    await expect(second).rejects.toMatchObject({ code: status.DEADLINE_EXCEEDED });
+    await first;
+    expect(calls).toHaveLength(1);
+    expect(calls[0].deadline.getTime()).toBeGreaterThanOrEqual(before + 1_000);
+  });
+
+  it('serves reference data from the read-through cache until invalidated', async () => {
+    const { calls, raw } = createRawClient();
+    const client = new PooledGrpcClient(raw, 'catalog:50051', {
+      methods: { GetById: { cacheTtlMs: 60_000 } },
+    });
+
+    await client.call('GetById', { id: 'prod-1' });
+    await client.call('GetById', { id: 'prod-1' });
+    expect(calls).toHaveLength(1);
+
+    client.invalidate('GetById');
+    await client.call('GetById', { id: 'prod-1' });
+    expect(calls).toHaveLength(2);
+  });
+
+  it('fails fast on methods the service does not expose', async () => {
+    const client = new PooledGrpcClient({}, 'users:50051');
+
+    expect(client.hasMethod('GetById')).toBe(false);
+    await expect(client.call('GetById', { id: 'u-1' })).rejects.toMatchObject({
+      code: status.UNIMPLEMENTED,
+    });
+  });
+});
+
+describe('getGrpcClientMetrics', () => {
+  it('exposes cumulative latency buckets per method', async () => {
+    resetGrpcClientMetrics();
+    const { raw } = createRawClient([], 30);
+    const client = new PooledGrpcClient(raw, 'metrics:50051');
+
+    await client.call('GetById', { id: 'a' });
+    await client.call('GetById', { id: 'b' });
+
+    const [metrics] = getGrpcClientMetrics();
+    expect(metrics.method).toBe('GetById');
+    expect(metrics.count).toBe(2);
+    expect(metrics.buckets['10']).toBe(0);
+    expect(metrics.buckets['+Inf']).toBe(2);
+    expect(metrics.sumMs).toBeGreaterThanOrEqual(60);
+  });
+});
+
+describe('httpStatusFromGrpcCode', () => {
+  it('maps gRPC codes like grpc-gateway', () => {
+    expect(httpStatusFromGrpcCode(status.NOT_FOUND)).toBe(404);
+    expect(httpStatusFromGrpcCode(status.INVALID_ARGUMENT)).toBe(400);
+    expect(httpStatusFromGrpcCode(status.ALREADY_EXISTS)).toBe(409);
+    expect(httpStatusFromGrpcCode(status.UNAUTHENTICATED)).toBe(401);
+    expect(httpStatusFromGrpcCode(status.RESOURCE_EXHAUSTED)).toBe(429);
+    expect(httpStatusFromGrpcCode(status.DEADLINE_EXCEEDED)).toBe(504);
+    expect(httpStatusFromGrpcCode(status.UNAVAILABLE)).toBe(503);
+    expect(httpStatusFromGrpcCode(status.INTERNAL)).toBe(500);
+    expect(httpStatusFromGrpcCode(undefined)).toBe(500);
+  });
+});
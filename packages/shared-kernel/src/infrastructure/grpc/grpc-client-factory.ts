@@ -0,0 +1,417 @@
+/**
+ * Pooled gRPC client factory
+ *
+ * Shared entry point for service-to-service unary calls:
+ * - one channel per target, shared by every client of that target (keepalive enabled);
+ * - per-method deadlines and retries with exponential backoff;
+ * - coalescing of identical in-flight read calls;
+ * - optional short-TTL read-through cache for reference data;
+ * - per-method latency histograms.
+ */
+
+import { Channel, type ChannelOptions, credentials, Metadata, type ServiceError, status } from '@grpc/grpc-js';
+import { type ConcurrencyLimiter, createConcurrencyLimiter } from '../../helpers/concurrency.helper.js';
+
+export interface GrpcCallPolicy {
+  /** Deadline of one call, queueing and retries included (default 5000 ms) */
+  deadlineMs?: number;
+  /** Extra attempts after a retryable failure (default 0 — only retry idempotent calls) */
+  retries?: number;
+  /** Base delay before the first retry, doubled on each attempt with jitter (default 100 ms) */
+  backoffMs?: number;
+  /** Status codes worth retrying (default UNAVAILABLE, RESOURCE_EXHAUSTED) */
+  retryOn?: readonly status[];
+  /** Share one upstream call between identical concurrent requests */
+  coalesce?: boolean;
+  /** Serve identical requests from memory for this long (reference data only) */
+  cacheTtlMs?: number;
+}
+
+/** Policy for side-effect free lookups (GetById, Search, GetByExternalId, ...) */
+export const GRPC_READ_POLICY: GrpcCallPolicy = {
+  retries: 2,
+  coalesce: true,
+  retryOn: [status.UNAVAILABLE, status.RESOURCE_EXHAUSTED, status.DEADLINE_EXCEEDED],
+};
+
+export interface PooledGrpcClientOptions {
+  /** Service constructor taken from `loadGrpcPackage(...)` */
+  service: any;
+  /** Target address, `host:port` */
+  url: string;
+  /** Policy applied to every method unless overridden in `methods` */
+  defaults?: GrpcCallPolicy;
+  /** Per-method policy overrides */
+  methods?: Record<string, GrpcCallPolicy>;
+  /** Calls in flight towards this target before new ones queue (default 64) */
+  maxInFlight?: number;
+  /** Extra channel arguments */
+  channelOptions?: ChannelOptions;
+}
+
+const DEFAULT_POLICY: Required<GrpcCallPolicy> = {
+  deadlineMs: 5_000,
+  retries: 0,
+  backoffMs: 100,
+  retryOn: [status.UNAVAILABLE, status.RESOURCE_EXHAUSTED],
+  coalesce: false,
+  cacheTtlMs: 0,
+};
+
+const DEFAULT_MAX_IN_FLIGHT = 64;
+const MAX_CACHE_ENTRIES = 1_000;
+
+const DEFAULT_CHANNEL_OPTIONS: ChannelOptions = {
+  'grpc.keepalive_time_ms': 30_000,
+  'grpc.keepalive_timeout_ms': 10_000,
+  'grpc.keepalive_permit_without_calls': 1,
+  'grpc.max_receive_message_length': 20 * 1024 * 1024,
+  'grpc.max_send_message_length': 20 * 1024 * 1024,
+};
+
+// ============================================================================
+// Channel pool
+// ============================================================================
+
+const channels = new Map<string, Channel>();
+
+function getChannel(url: string, options?: ChannelOptions): Channel {
+  const channelOptions = { ...DEFAULT_CHANNEL_OPTIONS, ...options };
+  const key = `${url}|${stableStringify(channelOptions)}`;
+  let channel = channels.get(key);
+  if (!channel) {
+    channel = new Channel(url, credentials.createInsecure(), channelOptions);
+    channels.set(key, channel);
+  }
+  return channel;
+}
+
+// ============================================================================
+// Latency histograms
+// ============================================================================
+
+const LATENCY_BUCKETS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000];
+
+export interface GrpcClientMethodMetrics {
+  target: string;
+  method: string;
+  count: number;
+  sumMs: number;
+  /** Cumulative counts per upper bound in ms, `+Inf` included */
+  buckets: Record<string, number>;
+  /** Failed calls by gRPC status name */
+  errors: Record<string, number>;
+  retries: number;
+  coalesced: number;
+  cacheHits: number;
+}
+
+interface MethodStats {
+  target: string;
+  method: string;
+  count: number;
+  sumMs: number;
+  buckets: number[];
+  errors: Map<string, number>;
+  retries: number;
+  coalesced: number;
+  cacheHits: number;
+}
+
+const methodStats = new Map<string, MethodStats>();
+
+function statsFor(target: string, method: string): MethodStats {
+  const key = `${target}/${method}`;
+  let stats = methodStats.get(key);
+  if (!stats) {
+    stats = {
+      target,
+      method,
+      count: 0,
+      sumMs: 0,
+      buckets: new Array(LATENCY_BUCKETS.length + 1).fill(0),
+      errors: new Map(),
+      retries: 0,
+      coalesced: 0,
+      cacheHits: 0,
+    };
+    methodStats.set(key, stats);
+  }
+  return stats;
+}
+
+function recordLatency(stats: MethodStats, durationMs: number, error?: ServiceError): void {
+  stats.count += 1;
+  stats.sumMs += durationMs;
+  const index = LATENCY_BUCKETS.findIndex((bound) => durationMs <= bound);
+  stats.buckets[index === -1 ? LATENCY_BUCKETS.length : index] += 1;
+  if (error) {
+    const code = status[error.code] ?? String(error.code);
+    stats.errors.set(code, (stats.errors.get(code) ?? 0) + 1);
+  }
+}
+
+/** Snapshot of the client-side latency histograms, one entry per target and method */
+export function getGrpcClientMetrics(): GrpcClientMethodMetrics[] {
+  return [...methodStats.values()].map((stats) => {
+    const buckets: Record<string, number> = {};
+    let cumulative = 0;
+    LATENCY_BUCKETS.forEach((bound, index) => {
+      cumulative += stats.buckets[index];
+      buckets[String(bound)] = cumulative;
+    });
+    buckets['+Inf'] = cumulative + stats.buckets[LATENCY_BUCKETS.length];
+
+    return {
+      target: stats.target,
+      method: stats.method,
+      count: stats.count,
+      sumMs: stats.sumMs,
+      buckets,
+      errors: Object.fromEntries(stats.errors),
+      retries: stats.retries,
+      coalesced: stats.coalesced,
+      cacheHits: stats.cacheHits,
+    };
+  });
+}
+
+export function resetGrpcClientMetrics(): void {
+  methodStats.clear();
+}
+
+// ============================================================================
+// Client
+// ============================================================================
+
+function grpcError(code: status, details: string): ServiceError {
+  return Object.assign(new Error(`${code} ${status[code]}: ${details}`), {
+    code,
+    details,
+    metadata: new Metadata(),
+  });
+}
+
+function stableStringify(value: unknown): string {
+  if (value === null || typeof value !== 'object') {
+    return JSON.stringify(value) ?? 'undefined';
+  }
+  if (Array.isArray(value)) {
+    return `[${value.map(stableStringify).join(',')}]`;
+  }
+  const entries = Object.keys(value as Record<string, unknown>)
+    .sort()
+    .map((key) => `${JSON.stringify(key)}:${stableStringify((value as Record<string, unknown>)[key])}`);
+  return `{${entries.join(',')}}`;
+}
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Unary gRPC client on a pooled channel.
+ *
+ * Every call gets a deadline; the time spent queued behind `maxInFlight`
+ * counts against it, so a saturated target fails fast instead of piling up
+ * callers in the services that depend on it.
+ */
+export class PooledGrpcClient {
+  private readonly limit: ConcurrencyLimiter;
+  private readonly inFlight = new Map<string, Promise<unknown>>();
+  private readonly cache = new Map<string, { expiresAt: number; value: unknown }>();
+
+  constructor(
+    private readonly client: any,
+    readonly target: string,
+    private readonly options: Pick<PooledGrpcClientOptions, 'defaults' | 'methods' | 'maxInFlight'> = {},
+    limiter?: ConcurrencyLimiter,
+  ) {
+    this.limit = limiter ?? createConcurrencyLimiter(options.maxInFlight ?? DEFAULT_MAX_IN_FLIGHT);
+  }
+
+  hasMethod(method: string): boolean {
+    return typeof this.client?.[method] === 'function';
+  }
+
+  async call<TResponse>(method: string, request: unknown, policy?: GrpcCallPolicy): Promise<TResponse> {
+    if (!this.hasMethod(method)) {
+      throw grpcError(status.UNIMPLEMENTED, `${method} is not available on ${this.target}`);
+    }
+
+    const effective = { ...DEFAULT_POLICY, ...this.options.defaults, ...this.options.methods?.[method], ...policy };
+    const stats = statsFor(this.target, method);
+    const shareable = effective.coalesce || effective.cacheTtlMs > 0;
+    if (!shareable) {
+      return this.execute<TResponse>(method, request, effective, stats);
+    }
+
+    const key = `${method}:${stableStringify(request)}`;
+    const cached = this.cache.get(key);
+    if (cached && cached.expiresAt > Date.now()) {
+      stats.cacheHits += 1;
+      return cached.value as TResponse;
+    }
+
+    const pending = this.inFlight.get(key);
+    if (pending) {
+      stats.coalesced += 1;
+      return pending as Promise<TResponse>;
+    }
+
+    const promise = this.execute<TResponse>(method, request, effective, stats)
+      .then((response) => {
+        if (effective.cacheTtlMs > 0) {
+          this.storeInCache(key, response, effective.cacheTtlMs);
+        }
+        return response;
+      })
+      .finally(() => this.inFlight.delete(key));
+    this.inFlight.set(key, promise);
+    return promise;
+  }
+
+  /** Drop cached responses, all of them or those of one method */
+  invalidate(method?: string): void {
+    if (!method) {
+      this.cache.clear();
+      return;
+    }
+    for (const key of this.cache.keys()) {
+      if (key.startsWith(`${method}:`)) {
+        this.cache.delete(key);
+      }
+    }
+  }
+
+  private async execute<TResponse>(
+    method: string,
+    request: unknown,
+    policy: Required<GrpcCallPolicy>,
+    stats: MethodStats,
+  ): Promise<TResponse> {
+    const deadline = Date.now() + policy.deadlineMs;
+
+    for (let attempt = 0; ; attempt += 1) {
+      const startedAt = Date.now();
+      try {
+        const response = await this.limit(() => this.invoke<TResponse>(method, request, deadline));
+        recordLatency(stats, Date.now() - startedAt);
+        return response;
+      } catch (error: any) {
+        recordLatency(stats, Date.now() - startedAt, error);
+
+        const delay = policy.backoffMs * 2 ** attempt * (0.5 + Math.random() / 2);
+        const retryable = attempt < policy.retries && policy.retryOn.includes(error?.code);
+        if (!retryable || Date.now() + delay >= deadline) {
+          throw error;
+        }
+        stats.retries += 1;
+        await sleep(delay);
+      }
+    }
+  }
+
+  private invoke<TResponse>(method: string, request: unknown, deadline: number): Promise<TResponse> {
+    if (Date.now() >= deadline) {
+      return Promise.reject(grpcError(status.DEADLINE_EXCEEDED, `${method} deadline exceeded while queued`));
+    }
+
+    return new Promise<TResponse>((resolve, reject) => {
+      this.client[method](
+        request,
+        new Metadata(),
+        { deadline: new Date(deadline) },
+        (error: ServiceError | null, response: TResponse) => {
+          if (error) {
+            reject(error);
+            return;
+          }
+          resolve(response);
+        },
+      );
+    });
+  }
+
+  private storeInCache(key: string, value: unknown, ttlMs: number): void {
+    if (this.cache.size >= MAX_CACHE_ENTRIES) {
+      const oldest = this.cache.keys().next().value;
+      if (oldest !== undefined) {
+        this.cache.delete(oldest);
+      }
+    }
+    this.cache.set(key, { expiresAt: Date.now() + ttlMs, value });
+  }
+}
+
+const clients = new Map<string, PooledGrpcClient>();
+const targetLimiters = new Map<string, ConcurrencyLimiter>();
+
+/**
+ * Get a pooled client of a service at `url`.
+ *
+ * Callers asking for the same service with the same policies share one client,
+ * hence one coalescing map and one cache. All clients of a target share its
+ * channel and its `maxInFlight` budget (set by the first caller).
+ */
+export function createGrpcClient(options: PooledGrpcClientOptions): PooledGrpcClient {
+  const serviceName = options.service?.serviceName ?? options.service?.name;
+  const key = `${options.url}|${serviceName}|${stableStringify([options.defaults, options.methods])}`;
+  let client = clients.get(key);
+  if (!client) {
+    let limiter = targetLimiters.get(options.url);
+    if (!limiter) {
+      limiter = createConcurrencyLimiter(options.maxInFlight ?? DEFAULT_MAX_IN_FLIGHT);
+      targetLimiters.set(options.url, limiter);
+    }
+
+    const channel = getChannel(options.url, options.channelOptions);
+    const raw = new options.service(options.url, credentials.createInsecure(), { channelOverride: channel });
+    client = new PooledGrpcClient(raw, options.url, options, limiter);
+    clients.set(key, client);
+  }
+  return client;
+}
+
+/** Close every pooled channel (application shutdown) */
+export function closeGrpcChannels(): void {
+  for (const channel of channels.values()) {
+    channel.close();
+  }
+  channels.clear();
+  clients.clear();
+  targetLimiters.clear();
+}
+
+/**
+ * HTTP status for a gRPC status code, following the grpc-gateway mapping.
+ */
+export function httpStatusFromGrpcCode(code: number | undefined): number {
+  switch (code) {
+    case status.OK:
+      return 200;
+    case status.CANCELLED:
+      return 499;
+    case status.INVALID_ARGUMENT:
+    case status.FAILED_PRECONDITION:
+    case status.OUT_OF_RANGE:
+      return 400;
+    case status.DEADLINE_EXCEEDED:
+      return 504;
+    case status.NOT_FOUND:
+      return 404;
+    case status.ALREADY_EXISTS:
+    case status.ABORTED:
+      return 409;
+    case status.PERMISSION_DENIED:
+      return 403;
+    case status.UNAUTHENTICATED:
+      return 401;
+    case status.RESOURCE_EXHAUSTED:
+      return 429;
+    case status.UNIMPLEMENTED:
+      return 501;
+    case status.UNAVAILABLE:
+      return 503;
+    default:
+      return 500;
+  }
+}
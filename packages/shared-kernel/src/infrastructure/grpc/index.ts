@@ -8,6 +8,20 @@ export {
   loadGrpcPackage,
 } from './grpc-client.js';
 
+// Pooled clients: shared channels, deadlines, retries, coalescing, latency histograms
+export {
+  closeGrpcChannels,
+  createGrpcClient,
+  getGrpcClientMetrics,
+  GRPC_READ_POLICY,
+  type GrpcCallPolicy,
+  type GrpcClientMethodMetrics,
+  httpStatusFromGrpcCode,
+  PooledGrpcClient,
+  type PooledGrpcClientOptions,
+  resetGrpcClientMetrics,
+} from './grpc-client-factory.js';
+
 // Proto loading utilities
 export {
   getGrpcOptions,
@@ -0,0 +1,286 @@
+import { describe, expect, it } from 'bun:test';
+import type { Logger } from '@nestjs/common';
+import { dispatchJetStreamMessages, type JetStreamDispatchMessage } from '../jetstream-consumer';
+
+// ---------------------------------------------------------------------------
+// Fake durable consumer: nak'ed messages come back after their delay with a
+// higher delivery count, a message without ack nor progress for `ackWaitMs`
+// is redelivered, iteration ends once every message is acked or terminated
+// ---------------------------------------------------------------------------
+
+interface TestEvent {
+  id: number;
+  key: string;
+  publishedAt: number;
+}
+
+type Outcome = {
+  subject: string;
+  outcome: 'ack' | 'nak' | 'term' | 'redelivered';
+  delivery: number;
+  delayMs?: number;
+};
+
+function createFakeConsumer(payloads: Array<TestEvent | string>, ackWaitMs = 60_000) {
+  const encoder = new TextEncoder();
+  const outcomes: Outcome[] = [];
+  const ready: JetStreamDispatchMessage[] = [];
+  const settled = new Set<number>();
+  const timers = new Set<ReturnType<typeof setTimeout>>();
+  let pending = payloads.length;
+  let wake: (() => void) | null = null;
+
+  const notify = () => {
+    const resolve = wake;
+    wake = null;
+    resolve?.();
+  };
+
+  const deliver = (index: number, delivery: number) => {
+    const subject = `crm.test.${index}`;
+    const payload = payloads[index];
+    let ackTimer: ReturnType<typeof setTimeout> | undefined;
+    const armAckWait = () => {
+      if (ackTimer) {
+        clearTimeout(ackTimer);
+        timers.delete(ackTimer);
+      }
+      ackTimer = setTimeout(() => {
+        timers.delete(ackTimer as ReturnType<typeof setTimeout>);
+        if (!settled.has(index)) {
+          outcomes.push({ subject, outcome: 'redelivered', delivery });
+          deliver(index, delivery + 1);
+          notify();
+        }
+      }, ackWaitMs);
+      timers.add(ackTimer);
+    };
+    const disarm = () => {
+      if (ackTimer) {
+        clearTimeout(ackTimer);
+        timers.delete(ackTimer);
+      }
+    };
+    const settle = (outcome: Outcome['outcome']) => {
+      disarm();
+      outcomes.push({ subject, outcome, delivery });
+      if (settled.has(index)) {
+        return;
+      }
+      settled.add(index);
+      pending -= 1;
+      notify();
+    };
+
+    ready.push({
+      subject,
+      data: encoder.encode(typeof payload === 'string' ? payload : JSON.stringify(payload)),
+      info: { redeliveryCount: delivery, timestampNanos: Date.now() * 1_000_000 },
+      ack: () => settle('ack'),
+      term: () => settle('term'),
+      working: armAckWait,
+      nak: (delayMs?: number) => {
+        disarm();
+        outcomes.push({ subject, outcome: 'nak', delivery, delayMs });
+        setTimeout(() => {
+          deliver(index, delivery + 1);
+          notify();
+        }, delayMs ?? 0);
+      },
+    });
+    armAckWait();
+  };
+
+  payloads.forEach((_, index) => deliver(index, 1));
+
+  const messages: AsyncIterable<JetStreamDispatchMessage> = {
+    async *[Symbol.asyncIterator]() {
+      while (pending > 0) {
+        const next = ready.shift();
+        if (next) {
+          yield next;
+        } else if (pending > 0) {
+          await new Promise<void>((resolve) => {
+            wake = resolve;
+          });
+        }
+      }
+      timers.forEach((timer) => clearTimeout(timer));
+    },
+  };
+
+  return { messages, outcomes };
+}
+
+const quietLogger = { error: () => undefined, warn: () => undefined } as unknown as Logger;
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+const decode = (data: Uint8Array) => JSON.parse(new TextDecoder().decode(data)) as TestEvent;
+
+function buildEvents(count: number, keys: number): TestEvent[] {
+  return Array.from({ length: count }, (_, id) => ({ id, key: `client-${id % keys}`, publishedAt: Date.now() }));
+}
+
+// ---------------------------------------------------------------------------
+// Tests
+// ---------------------------------------------------------------------------
+
+describe('dispatchJetStreamMessages', () => {
+  it('bounds in-flight handlers and keeps per-key ordering', async () => {
+    const { messages, outcomes } = createFakeConsumer(buildEvents(60, 6));
+    const seenByKey = new Map<string, number[]>();
+    let inFlight = 0;
+    let maxInFlight = 0;
+
+    await dispatchJetStreamMessages<TestEvent>(
+      messages,
+      async (event) => {
+        inFlight += 1;
+        maxInFlight = Math.max(maxInFlight, inFlight);
+        await sleep(1 + (event.id % 3));
+        seenByKey.set(event.key, [...(seenByKey.get(event.key) ?? []), event.id]);
+        inFlight -= 1;
+      },
+      { concurrency: 4, orderingKey: (event) => event.key },
+      decode,
+      quietLogger,
+    );
+
+    expect(maxInFlight).toBe(4);
+    expect(outcomes.filter((o) => o.outcome === 'ack')).toHaveLength(60);
+    for (const ids of seenByKey.values()) {
+      expect(ids).toEqual([...ids].sort((a, b) => a - b));
+    }
+  });
+
+  it('signals progress while a message waits behind its key so ack_wait never redelivers it', async () => {
+    // Each handler takes longer than ack_wait / 2: the third event of the key waits
+    // well past ack_wait before its handler starts
+    const { messages, outcomes } = createFakeConsumer(buildEvents(4, 1), 30);
+    const handled: number[] = [];
+
+    await dispatchJetStreamMessages<TestEvent>(
+      messages,
+      async (event) => {
+        handled.push(event.id);
+        await sleep(20);
+      },
+      { concurrency: 4, orderingKey: (event) => event.key, ackWaitMs: 30 },
+      decode,
+      quietLogger,
+    );
+
+    expect(outcomes.filter((o) => o.outcome === 'redelivered')).toHaveLength(0);
+    expect(handled).toEqual([0, 1, 2, 3]);
+  });
+
+  it('naks failures with exponential backoff, then terminates after maxDeliver', async () => {
+    const { messages, outcomes } = createFakeConsumer(buildEvents(2, 2));
+    const attempts = new Map<number, number>();
+
+    await dispatchJetStreamMessages<TestEvent>(
+      messages,
+      async (event) => {
+        attempts.set(event.id, (attempts.get(event.id) ?? 0) + 1);
+        // Event 0 recovers on its second delivery, event 1 never does
+        if (event.id === 1 || attempts.get(event.id) === 1) {
+          throw new Error('downstream unavailable');
+        }
+      },
+      { concurrency: 2, maxDeliver: 3, retryDelayMs: 2 },
+      decode,
+      quietLogger,
+    );
+
+    expect(outcomes.filter((o) => o.subject === 'crm.test.0').map((o) => o.outcome)).toEqual(['nak', 'ack']);
+    expect(outcomes.filter((o) => o.subject === 'crm.test.1')).toEqual([
+      { subject: 'crm.test.1', outcome: 'nak', delivery: 1, delayMs: 2 },
+      { subject: 'crm.test.1', outcome: 'nak', delivery: 2, delayMs: 4 },
+      { subject: 'crm.test.1', outcome: 'term', delivery: 3 },
+    ]);
+  });
+
+  it('terminates undecodable payloads without calling the handler', async () => {
+    const { messages, outcomes } = createFakeConsumer(['{not json']);
+    let calls = 0;
+
+    await dispatchJetStreamMessages<TestEvent>(
+      messages,
+      async () => {
+        calls += 1;
+      },
+      {},
+      decode,
+      quietLogger,
+    );
+
+    expect(calls).toBe(0);
+    expect(outcomes.map((o) => o.outcome)).toEqual(['term']);
+  });
+});
+
+// ---------------------------------------------------------------------------
+// Load benchmark: the previous `subscribe` loop awaited each handler before
+// reading the next message, which is the concurrency 1 case below
+// ---------------------------------------------------------------------------
+
+const BENCH_EVENTS = 400;
+const BENCH_KEYS = 50;
+const HANDLER_IO_MS = 3;
+
+async function runLoad(concurrency: number) {
+  const events = buildEvents(BENCH_EVENTS, BENCH_KEYS);
+  const { messages } = createFakeConsumer(events);
+  const lags: number[] = [];
+  const handledByKey = new Map<string, number[]>();
+  let inFlight = 0;
+  let maxInFlight = 0;
+
+  const startedAt = Date.now();
+  await dispatchJetStreamMessages<TestEvent>(
+    messages,
+    async (event) => {
+      lags.push(Date.now() - event.publishedAt);
+      inFlight += 1;
+      maxInFlight = Math.max(maxInFlight, inFlight);
+      // Several gRPC / DB round trips per event
+      await sleep(HANDLER_IO_MS);
+      handledByKey.set(event.key, [...(handledByKey.get(event.key) ?? []), event.id]);
+      inFlight -= 1;
+    },
+    { concurrency, orderingKey: concurrency > 1 ? (event) => event.key : undefined },
+    decode,
+    quietLogger,
+  );
+  const elapsedMs = Math.max(1, Date.now() - startedAt);
+
+  lags.sort((a, b) => a - b);
+  return {
+    perSecond: Math.round((BENCH_EVENTS / elapsedMs) * 1000),
+    p95LagMs: lags[Math.floor(lags.length * 0.95)],
+    maxLagMs: lags[lags.length - 1],
+    maxInFlight,
+    handledByKey,
+  };
+}
+
+describe('JetStream consumer load benchmark', () => {
+  it('measures messages per second and handler lag, sequential vs concurrent', async () => {
+    const before = await runLoad(1);
+    const after = await runLoad(16);
+
+    // eslint-disable-next-line no-console
+    console.log(
+      `[nats-consumer benchmark] ${BENCH_EVENTS} events, ${BENCH_KEYS} keys, ${HANDLER_IO_MS}ms handler: ` +
+        `sequential ${before.perSecond} msg/s (p95 lag ${before.p95LagMs}ms, max ${before.maxLagMs}ms), ` +
+        `concurrency 16 ${after.perSecond} msg/s (p95 lag ${after.p95LagMs}ms, max ${after.maxLagMs}ms)`,
+    );
+
+    // Timings are only reported: wall-clock ratios are not reliable on shared runners
+    expect(before.maxInFlight).toBe(1);
+    expect(after.maxInFlight).toBe(16);
+    expect(after.handledByKey.size).toBe(BENCH_KEYS);
+    for (const ids of after.handledByKey.values()) {
+      expect(ids).toEqual([...ids].sort((a, b) => a - b));
+    }
+  });
+});
@@ -1,6 +1,12 @@
+export {
+  dispatchJetStreamMessages,
+  type JetStreamConsumeOptions,
+  type JetStreamDispatchMessage,
+} from './jetstream-consumer.js';
 export { NATS_OPTIONS } from './nats.constants.js';
 export { NatsModule, type NatsModuleOptions } from './nats.module.js';
 export {
+  type JetStreamConsumerHandle,
   type MessageHandler,
   type NatsConfig,
   NatsRemoteError,
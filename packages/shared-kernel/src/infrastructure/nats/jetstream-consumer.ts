@@ -0,0 +1,134 @@
+import { Logger } from '@nestjs/common';
+import type { RetentionPolicy } from 'nats';
+import { KeyedSerialQueue } from '../../helpers/concurrency.helper.js';
+import type { MessageHandler } from './nats.service.js';
+
+/**
+ * Options of a durable JetStream consumer (see `NatsService.consume`).
+ */
+export interface JetStreamConsumeOptions<T = unknown> {
+  /** Stream capturing the subject, created when missing or extended to cover the subject */
+  stream: string;
+  /** Retention of a stream created by `consume` (default: work queue, messages are removed once acked) */
+  streamRetention?: RetentionPolicy;
+  /** Age after which messages of a stream created by `consume` are discarded (default: 7 days) */
+  streamMaxAgeMs?: number;
+  /** Durable consumer name, shared by every replica of the service */
+  durable: string;
+  /** Handlers running at once (default: 1) */
+  concurrency?: number;
+  /**
+   * Messages sharing a key are handled one after the other, in delivery order.
+   * Ordering holds within one replica and for messages handled on first delivery.
+   */
+  orderingKey?: (data: T, subject: string) => string | undefined;
+  /** Deliveries before a failing message is terminated (default: 5) */
+  maxDeliver?: number;
+  /**
+   * Time without progress before the server redelivers the message (default: 30000).
+   * Progress is signalled while the message waits behind its key and while its handler runs.
+   */
+  ackWaitMs?: number;
+  /** Redelivery delay after a failure, doubled on each delivery (default: 1000) */
+  retryDelayMs?: number;
+}
+
+/**
+ * Subset of a JetStream message the dispatcher relies on (`JsMsg` from `nats`).
+ */
+export interface JetStreamDispatchMessage {
+  subject: string;
+  data: Uint8Array;
+  info: { redeliveryCount: number; timestampNanos: number };
+  ack(): void;
+  nak(millis?: number): void;
+  term(reason?: string): void;
+  /** Resets the server-side ack_wait timer */
+  working(): void;
+}
+
+export const DEFAULT_CONSUMER_CONCURRENCY = 1;
+export const DEFAULT_CONSUMER_MAX_DELIVER = 5;
+export const DEFAULT_CONSUMER_ACK_WAIT_MS = 30_000;
+export const DEFAULT_CONSUMER_RETRY_DELAY_MS = 1_000;
+export const DEFAULT_STREAM_MAX_AGE_MS = 7 * 24 * 60 * 60 * 1000;
+
+/**
+ * Pull messages from `messages` and run `handler` on them with bounded concurrency.
+ *
+ * - at most `concurrency` messages are in flight: the next message is only read
+ *   once a slot is free, so the client never buffers more than the server allows;
+ * - messages with the same ordering key are serialized, other keys run in parallel;
+ * - a message signals progress every third of `ackWaitMs` until it is settled, so one
+ *   waiting behind its key is not redelivered elsewhere and handled out of order;
+ * - a handled message is acked, a failed one is nak'ed with exponential backoff
+ *   and terminated after `maxDeliver` deliveries; undecodable payloads are terminated.
+ *
+ * Resolves once `messages` ends and every in-flight handler has settled.
+ */
+export async function dispatchJetStreamMessages<T>(
+  messages: AsyncIterable<JetStreamDispatchMessage>,
+  handler: MessageHandler<T>,
+  options: Omit<JetStreamConsumeOptions<T>, 'stream' | 'durable'> = {},
+  decode: (data: Uint8Array) => T = (data) => JSON.parse(new TextDecoder().decode(data)) as T,
+  logger: Logger = new Logger('JetStreamConsumer'),
+): Promise<void> {
+  const concurrency = Math.max(1, Math.floor(options.concurrency ?? DEFAULT_CONSUMER_CONCURRENCY) || 1);
+  const maxDeliver = options.maxDeliver ?? DEFAULT_CONSUMER_MAX_DELIVER;
+  const retryDelayMs = options.retryDelayMs ?? DEFAULT_CONSUMER_RETRY_DELAY_MS;
+  const progressIntervalMs = Math.max(
+    1,
+    Math.floor((options.ackWaitMs ?? DEFAULT_CONSUMER_ACK_WAIT_MS) / 3),
+  );
+  const keyedQueue = new KeyedSerialQueue();
+  const inFlight = new Set<Promise<void>>();
+
+  const handle = async (msg: JetStreamDispatchMessage): Promise<void> => {
+    let data: T;
+    try {
+      data = decode(msg.data);
+    } catch (error) {
+      logger.error(`Dropping undecodable message from ${msg.subject}: ${error}`);
+      msg.term('undecodable payload');
+      return;
+    }
+
+    const run = async (): Promise<void> => {
+      try {
+        await handler(data, msg.subject);
+        msg.ack();
+      } catch (error) {
+        const deliveries = msg.info.redeliveryCount;
+        if (deliveries >= maxDeliver) {
+          logger.error(
+            `Giving up on message from ${msg.subject} after ${deliveries} deliveries: ${error}`,
+          );
+          msg.term(`failed after ${deliveries} deliveries`);
+          return;
+        }
+
+        logger.warn(`Error processing message from ${msg.subject} (delivery ${deliveries}): ${error}`);
+        msg.nak(retryDelayMs * 2 ** (deliveries - 1));
+      }
+    };
+
+    const key = options.orderingKey?.(data, msg.subject);
+    const progress = setInterval(() => msg.working(), progressIntervalMs);
+    try {
+      await (key ? keyedQueue.run(key, run) : run());
+    } finally {
+      clearInterval(progress);
+    }
+  };
+
+  for await (const msg of messages) {
+    while (inFlight.size >= concurrency) {
+      await Promise.race(inFlight);
+    }
+
+    const task: Promise<void> = handle(msg).finally(() => inFlight.delete(task));
+    inFlight.add(task);
+  }
+
+  await Promise.all(inFlight);
+}
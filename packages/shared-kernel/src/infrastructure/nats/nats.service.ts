@@ -1,5 +1,26 @@
 import { Inject, Injectable, Logger, OnModuleDestroy, OnModuleInit } from '@nestjs/common';
-import { connect, JetStreamClient, JetStreamManager, JSONCodec, NatsConnection, StringCodec, Subscription } from 'nats';
+import {
+  AckPolicy,
+  connect,
+  ConsumerMessages,
+  JetStreamClient,
+  JetStreamManager,
+  JSONCodec,
+  nanos,
+  NatsConnection,
+  RetentionPolicy,
+  StreamInfo,
+  StringCodec,
+  Subscription,
+} from 'nats';
+import {
+  DEFAULT_CONSUMER_ACK_WAIT_MS,
+  DEFAULT_CONSUMER_CONCURRENCY,
+  DEFAULT_CONSUMER_MAX_DELIVER,
+  DEFAULT_STREAM_MAX_AGE_MS,
+  dispatchJetStreamMessages,
+  type JetStreamConsumeOptions,
+} from './jetstream-consumer.js';
 import { NATS_OPTIONS } from './nats.constants.js';
 
 export interface NatsConfig {
@@ -26,6 +47,14 @@ export interface RequestOptions {
   retryDelay?: number;
 }
 
+/**
+ * Running durable JetStream consumer, returned by `NatsService.consume`.
+ */
+export interface JetStreamConsumerHandle {
+  /** Stop pulling and wait for in-flight handlers to settle */
+  stop(): Promise<void>;
+}
+
 /**
  * Error thrown when a remote service responds with a business error via subscribeAndReply.
  * These errors are NOT retried by request() - only network/timeout errors are retried.
@@ -44,6 +73,7 @@ export class NatsService implements OnModuleInit, OnModuleDestroy {
   private jetstream: JetStreamClient | null = null;
   private jetstreamManager: JetStreamManager | null = null;
   private subscriptions: Subscription[] = [];
+  private consumers: JetStreamConsumerHandle[] = [];
   private readonly stringCodec = StringCodec();
   private readonly jsonCodec = JSONCodec();
   private reconnectAttempts = 0;
@@ -96,6 +126,9 @@ export class NatsService implements OnModuleInit, OnModuleDestroy {
   }
 
   async disconnect(): Promise<void> {
+    await Promise.all(this.consumers.map((consumer) => consumer.stop()));
+    this.consumers = [];
+
     for (const sub of this.subscriptions) {
       sub.unsubscribe();
     }
@@ -131,6 +164,15 @@ export class NatsService implements OnModuleInit, OnModuleDestroy {
     this.logger.debug(`Published string message to ${subject}`);
   }
 
+  /**
+   * Round-trip to the server so every message published so far is known to be received.
+   * Lets batch publishers pipeline `publish()` calls and confirm them once.
+   */
+  async flush(): Promise<void> {
+    this.ensureConnection();
+    await this.connection?.flush();
+  }
+
   async subscribe<T = unknown>(subject: string, handler: MessageHandler<T>): Promise<Subscription> {
     this.ensureConnection();
     const sub = this.connection?.subscribe(subject, { queue: this.config.queue });
@@ -204,6 +246,52 @@ export class NatsService implements OnModuleInit, OnModuleDestroy {
     return sub;
   }
 
+  /**
+   * Consume a subject through a durable JetStream pull consumer.
+   *
+   * Unlike `subscribe`, messages survive restarts (the stream keeps them until acked),
+   * handlers run `concurrency` at a time, optionally serialized per `orderingKey`,
+   * and a failing handler gets its message redelivered with backoff.
+   * Plain `publish()` calls are captured as soon as the stream covers the subject.
+   * A stream created here is a work queue (acked messages are removed) with a max age.
+   */
+  async consume<T = unknown>(
+    subject: string,
+    handler: MessageHandler<T>,
+    options: JetStreamConsumeOptions<T>,
+  ): Promise<JetStreamConsumerHandle> {
+    const jetstream = this.getJetStream();
+    const concurrency = Math.max(1, options.concurrency ?? DEFAULT_CONSUMER_CONCURRENCY);
+
+    await this.ensureStream(subject, options);
+    await this.ensureDurableConsumer(subject, options, concurrency);
+
+    const consumer = await jetstream.consumers.get(options.stream, options.durable);
+    const messages: ConsumerMessages = await consumer.consume({ max_messages: concurrency * 2 });
+    this.logger.log(
+      `Consuming ${subject} from stream ${options.stream} (durable: ${options.durable}, concurrency: ${concurrency})`,
+    );
+
+    const done = dispatchJetStreamMessages<T>(
+      messages,
+      handler,
+      options,
+      (data) => this.jsonCodec.decode(data) as T,
+      this.logger,
+    ).catch((error) => {
+      this.logger.error(`JetStream consumer ${options.durable} stopped: ${error}`);
+    });
+
+    const handle: JetStreamConsumerHandle = {
+      stop: async () => {
+        messages.stop();
+        await done;
+      },
+    };
+    this.consumers.push(handle);
+    return handle;
+  }
+
   /**
    * Subscribe to a subject and respond to requests (request-reply pattern).
    * The handler must return the response data. Errors are wrapped and sent back to the caller.
@@ -320,6 +408,90 @@ export class NatsService implements OnModuleInit, OnModuleDestroy {
     return this.connection !== null && !this.connection.isClosed();
   }
 
+  private async ensureStream<T>(subject: string, options: JetStreamConsumeOptions<T>): Promise<void> {
+    const manager = this.getJetStreamManager();
+
+    let info: StreamInfo;
+    try {
+      info = await manager.streams.info(options.stream);
+    } catch (error) {
+      if (!this.isJetStreamNotFound(error)) {
+        throw error;
+      }
+      await manager.streams.add({
+        name: options.stream,
+        subjects: [subject],
+        retention: options.streamRetention ?? RetentionPolicy.Workqueue,
+        max_age: nanos(options.streamMaxAgeMs ?? DEFAULT_STREAM_MAX_AGE_MS),
+      });
+      this.logger.log(`Created JetStream stream ${options.stream} for ${subject}`);
+      return;
+    }
+
+    const subjects = info.config.subjects ?? [];
+    if (!subjects.some((pattern) => this.subjectMatches(pattern, subject))) {
+      await manager.streams.update(options.stream, { subjects: [...subjects, subject] });
+      this.logger.log(`Added ${subject} to JetStream stream ${options.stream}`);
+    }
+  }
+
+  private async ensureDurableConsumer<T>(
+    subject: string,
+    options: JetStreamConsumeOptions<T>,
+    concurrency: number,
+  ): Promise<void> {
+    const manager = this.getJetStreamManager();
+    const config = {
+      filter_subject: subject,
+      max_deliver: options.maxDeliver ?? DEFAULT_CONSUMER_MAX_DELIVER,
+      ack_wait: nanos(options.ackWaitMs ?? DEFAULT_CONSUMER_ACK_WAIT_MS),
+      max_ack_pending: concurrency * 4,
+    };
+
+    try {
+      await manager.consumers.info(options.stream, options.durable);
+    } catch (error) {
+      if (!this.isJetStreamNotFound(error)) {
+        throw error;
+      }
+      await manager.consumers.add(options.stream, {
+        ...config,
+        durable_name: options.durable,
+        ack_policy: AckPolicy.Explicit,
+      });
+      return;
+    }
+
+    try {
+      await manager.consumers.update(options.stream, options.durable, config);
+    } catch (error) {
+      // The existing durable keeps consuming with its previous settings
+      this.logger.error(
+        `Could not update JetStream consumer ${options.durable} on ${options.stream}, keeping its current config: ${error}`,
+      );
+    }
+  }
+
+  private isJetStreamNotFound(error: unknown): boolean {
+    return (error as { api_error?: { code?: number } })?.api_error?.code === 404;
+  }
+
+  /** NATS subject matching: `*` matches one token, a trailing `>` one or more */
+  private subjectMatches(pattern: string, subject: string): boolean {
+    const patternTokens = pattern.split('.');
+    const subjectTokens = subject.split('.');
+
+    for (let i = 0; i < patternTokens.length; i++) {
+      if (patternTokens[i] === '>') {
+        return subjectTokens.length > i;
+      }
+      if (i >= subjectTokens.length || (patternTokens[i] !== '*' && patternTokens[i] !== subjectTokens[i])) {
+        return false;
+      }
+    }
+    return patternTokens.length === subjectTokens.length;
+  }
+
   private ensureConnection(): void {
     if (!this.connection || this.connection.isClosed()) {
       throw new Error('Not connected to NATS server');
@@ -0,0 +1,142 @@
+import { describe, expect, it, mock } from 'bun:test';
+import { OutboxEvent, OutboxEventStatus } from '../outbox.entity';
+import { OutboxService, outboxRelayOptionsFromEnv } from '../outbox.service';
+
+// ---------------------------------------------------------------------------
+// Fixtures
+// ---------------------------------------------------------------------------
+
+function makeEvent(id: string, attempts = 0): OutboxEvent {
+  const event = new OutboxEvent();
+  event.id = id;
+  event.subject = `crm.test.${id}`;
+  event.payload = { id };
+  event.status = OutboxEventStatus.PENDING;
+  event.attempts = attempts;
+  event.maxAttempts = 5;
+  event.createdAt = new Date(Date.now() - 1000);
+  return event;
+}
+
+function createHarness(pending: OutboxEvent[], failingSubjects: string[] = []) {
+  const updates: Array<{ criteria: unknown; values: Record<string, unknown> }> = [];
+  const increments: unknown[] = [];
+  const lockModes: string[] = [];
+
+  const queryBuilder = {
+    where: () => queryBuilder,
+    orWhere: () => queryBuilder,
+    orderBy: () => queryBuilder,
+    limit: (n: number) => {
+      queryBuilder.take = n;
+      return queryBuilder;
+    },
+    setLock: (mode: string) => {
+      lockModes.push(mode);
+      return queryBuilder;
+    },
+    setOnLocked: (mode: string) => {
+      lockModes.push(mode);
+      return queryBuilder;
+    },
+    getMany: async () => pending.splice(0, queryBuilder.take),
+    take: 0,
+  };
+
+  const repository = {
+    createQueryBuilder: () => queryBuilder,
+    update: mock(async (criteria: unknown, values: Record<string, unknown>) => {
+      updates.push({ criteria, values });
+      return { affected: 1 };
+    }),
+    increment: mock(async (criteria: unknown) => {
+      increments.push(criteria);
+      return { affected: 1 };
+    }),
+    count: mock(async () => 0),
+    findOne: mock(async () => null),
+    manager: {
+      transaction: async (work: (manager: unknown) => Promise<unknown>) =>
+        work({ getRepository: () => repository }),
+    },
+  };
+
+  const nats = {
+    publish: mock(async (subject: string) => {
+      if (failingSubjects.includes(subject)) {
+        throw new Error('nats down');
+      }
+    }),
+    flush: mock(async () => undefined),
+  };
+
+  const service = new OutboxService(repository as never, nats as never);
+  return { service, repository, nats, updates, increments, lockModes };
+}
+
+describe('OutboxService relay', () => {
+  it('claims with SKIP LOCKED and marks published events in one bulk update', async () => {
+    const { service, nats, updates, increments, lockModes } = createHarness([
+      makeEvent('a'),
+      makeEvent('b'),
+      makeEvent('c'),
+    ]);
+
+    const published = await service.processOutbox(10);
+
+    expect(published).toBe(3);
+    expect(lockModes).toEqual(['pessimistic_write', 'skip_locked']);
+    expect(increments).toHaveLength(1);
+    expect(nats.publish).toHaveBeenCalledTimes(3);
+    expect(nats.flush).toHaveBeenCalledTimes(1);
+
+    const publishedUpdates = updates.filter((u) => u.values.status === OutboxEventStatus.PUBLISHED);
+    expect(publishedUpdates).toHaveLength(1);
+  });
+
+  it('schedules a backoff retry for failed publishes only', async () => {
+    const { service, updates } = createHarness([makeEvent('ok'), makeEvent('ko')], ['crm.test.ko']);
+
+    const published = await service.processOutbox(10);
+
+    expect(published).toBe(1);
+    const failedUpdate = updates.find((u) => u.values.status === OutboxEventStatus.FAILED);
+    expect(failedUpdate?.criteria).toBe('ko');
+    expect(failedUpdate?.values.nextRetryAt).toBeInstanceOf(Date);
+  });
+
+  it('reports batch and throughput metrics through getStats', async () => {
+    const { service } = createHarness([makeEvent('a'), makeEvent('b')]);
+
+    await service.processOutbox(10);
+    const stats = await service.getStats();
+
+    expect(stats.lagMs).toBe(0);
+    expect(stats.relay.batches).toBe(1);
+    expect(stats.relay.lastBatchSize).toBe(2);
+    expect(stats.relay.publishedTotal).toBe(2);
+    expect(stats.relay.publishedPerSecond).toBeGreaterThan(0);
+    expect(stats.relay.avgPublishLagMs).toBeGreaterThanOrEqual(1000);
+  });
+
+  it('returns 0 without touching NATS when nothing is claimable', async () => {
+    const { service, nats } = createHarness([]);
+
+    expect(await service.processOutbox()).toBe(0);
+    expect(nats.publish).not.toHaveBeenCalled();
+  });
+});
+
+describe('outboxRelayOptionsFromEnv', () => {
+  it('reads positive numbers and ignores invalid values', () => {
+    const options = outboxRelayOptionsFromEnv({
+      OUTBOX_RELAY_WORKERS: '4',
+      OUTBOX_BATCH_SIZE: 'abc',
+      OUTBOX_PUBLISH_CONCURRENCY: '-1',
+    });
+
+    expect(options.workers).toBe(4);
+    expect(options.batchSize).toBeUndefined();
+    expect(options.publishConcurrency).toBeUndefined();
+  });
+});
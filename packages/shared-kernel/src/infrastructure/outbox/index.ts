@@ -1,3 +1,10 @@
 export { OutboxEvent, OutboxEventStatus } from './outbox.entity.js';
-export { OutboxService, type OutboxEventData, type OutboxStats } from './outbox.service.js';
+export {
+  OutboxService,
+  outboxRelayOptionsFromEnv,
+  type OutboxEventData,
+  type OutboxRelayMetrics,
+  type OutboxRelayOptions,
+  type OutboxStats,
+} from './outbox.service.js';
 export { OutboxModule } from './outbox.module.js';
@@ -1,7 +1,7 @@
 import { Module, OnModuleInit } from '@nestjs/common';
 import { TypeOrmModule } from '@nestjs/typeorm';
 import { OutboxEvent } from './outbox.entity.js';
-import { OutboxService } from './outbox.service.js';
+import { OutboxService, outboxRelayOptionsFromEnv } from './outbox.service.js';
 
 /**
  * Outbox Module
@@ -28,8 +28,8 @@ export class OutboxModule implements OnModuleInit {
   constructor(private readonly outboxService: OutboxService) {}
 
   onModuleInit(): void {
-    // Start the outbox processor when the module initializes
-    // Process every 1 second
-    this.outboxService.startProcessor(1000);
+    // Start the outbox relay when the module initializes
+    // Idle polling starts at 1 second; workers and batch sizing come from OUTBOX_* env vars
+    this.outboxService.startProcessor(1000, outboxRelayOptionsFromEnv());
   }
 }
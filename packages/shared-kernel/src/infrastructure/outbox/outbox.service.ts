@@ -1,8 +1,69 @@
 import { Injectable, Logger, OnModuleDestroy } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { EntityManager, LessThanOrEqual, Repository } from 'typeorm';
+import { Brackets, EntityManager, In, LessThanOrEqual, Repository } from 'typeorm';
 import { OutboxEvent, OutboxEventStatus } from './outbox.entity.js';
 import { NatsService } from '../nats/nats.service';
+import { chunkArray, mapWithConcurrency } from '../../helpers/concurrency.helper.js';
+
+/**
+ * Relay tuning. Every worker claims its own batch with FOR UPDATE SKIP LOCKED,
+ * so several workers and several replicas can drain the same table safely.
+ */
+export interface OutboxRelayOptions {
+  /** Concurrent claim/publish loops in this process (default: 1) */
+  workers?: number;
+  /** Rows claimed per batch (default: 100) */
+  batchSize?: number;
+  /** Publishes in flight per batch (default: 32) */
+  publishConcurrency?: number;
+  /** Delay after a partial batch (default: 100ms) */
+  minIntervalMs?: number;
+  /** First delay once the table is empty, doubled while idle (default: 1000ms) */
+  idleIntervalMs?: number;
+  /** Upper bound of the idle backoff (default: 5000ms) */
+  maxIdleIntervalMs?: number;
+  /** PROCESSING rows older than this are reclaimed, e.g. after a crash (default: 60000ms) */
+  processingTimeoutMs?: number;
+}
+
+const DEFAULT_RELAY_OPTIONS: Required<OutboxRelayOptions> = {
+  workers: 1,
+  batchSize: 100,
+  publishConcurrency: 32,
+  minIntervalMs: 100,
+  idleIntervalMs: 1000,
+  maxIdleIntervalMs: 5000,
+  processingTimeoutMs: 60000,
+};
+
+const THROUGHPUT_WINDOW_MS = 60000;
+const STATUS_UPDATE_CHUNK_SIZE = 500;
+
+/**
+ * Build relay options from OUTBOX_* environment variables.
+ * Unset variables keep the defaults.
+ */
+export function outboxRelayOptionsFromEnv(env: NodeJS.ProcessEnv = process.env): OutboxRelayOptions {
+  const read = (name: string): number | undefined => {
+    const value = Number(env[name]);
+    return env[name] && Number.isFinite(value) && value > 0 ? value : undefined;
+  };
+
+  return {
+    workers: read('OUTBOX_RELAY_WORKERS'),
+    batchSize: read('OUTBOX_BATCH_SIZE'),
+    publishConcurrency: read('OUTBOX_PUBLISH_CONCURRENCY'),
+    minIntervalMs: read('OUTBOX_MIN_INTERVAL_MS'),
+    idleIntervalMs: read('OUTBOX_IDLE_INTERVAL_MS'),
+    maxIdleIntervalMs: read('OUTBOX_MAX_IDLE_INTERVAL_MS'),
+    processingTimeoutMs: read('OUTBOX_PROCESSING_TIMEOUT_MS'),
+  };
+}
+
+interface RelayBatchResult {
+  claimed: number;
+  published: number;
+}
 
 /**
  * Event data for outbox
@@ -37,7 +98,12 @@ export interface OutboxEventData {
  *
  * Usage:
  * 1. Call scheduleEvent() within your business transaction
- * 2. The OutboxProcessor will publish events to NATS asynchronously
+ * 2. The relay workers publish events to NATS asynchronously
+ *
+ * Relay: each worker claims a batch with FOR UPDATE SKIP LOCKED, pipelines the
+ * publishes with bounded concurrency, confirms them with a single flush and
+ * writes the PUBLISHED status in bulk. Polling is adaptive: a full batch is
+ * followed immediately by the next one, an empty table backs off.
  *
  * @example
  * ```typescript
@@ -69,8 +135,21 @@ export interface OutboxEventData {
 @Injectable()
 export class OutboxService implements OnModuleDestroy {
   private readonly logger = new Logger(OutboxService.name);
-  private processingInterval: NodeJS.Timeout | null = null;
-  private isProcessing = false;
+  private relayOptions: Required<OutboxRelayOptions> = { ...DEFAULT_RELAY_OPTIONS };
+  private running = false;
+  private readonly timers = new Set<NodeJS.Timeout>();
+  private readonly idleDelays: number[] = [];
+  private readonly metrics = {
+    batches: 0,
+    published: 0,
+    failed: 0,
+    lastBatchSize: 0,
+    maxBatchSize: 0,
+    claimedTotal: 0,
+    lastBatchDurationMs: 0,
+    avgPublishLagMs: 0,
+    window: [] as Array<{ at: number; count: number }>,
+  };
 
   constructor(
     @InjectRepository(OutboxEvent)
@@ -136,32 +215,47 @@ export class OutboxService implements OnModuleDestroy {
   }
 
   /**
-   * Start the background processor
+   * Start the relay workers
    * Call this in your module's onModuleInit
+   *
+   * @param intervalMs - First idle polling delay (kept for backward compatibility)
    */
-  startProcessor(intervalMs = 1000): void {
-    if (this.processingInterval) {
+  startProcessor(intervalMs = 1000, options: OutboxRelayOptions = {}): void {
+    if (this.running) {
       return;
     }
 
-    this.logger.log(`Starting outbox processor with ${intervalMs}ms interval`);
+    const defined = Object.fromEntries(
+      Object.entries(options).filter(([, value]) => value !== undefined),
+    ) as OutboxRelayOptions;
+    this.relayOptions = { ...DEFAULT_RELAY_OPTIONS, idleIntervalMs: intervalMs, ...defined };
+    this.running = true;
+
+    const { workers, batchSize, publishConcurrency } = this.relayOptions;
+    this.logger.log(
+      `Starting outbox relay: ${workers} worker(s), batch ${batchSize}, publish concurrency ${publishConcurrency}`,
+    );
 
-    this.processingInterval = setInterval(() => {
-      this.processOutbox().catch((err) => {
-        this.logger.error('Error processing outbox', err);
-      });
-    }, intervalMs);
+    for (let worker = 0; worker < workers; worker++) {
+      this.idleDelays[worker] = this.relayOptions.idleIntervalMs;
+      this.scheduleWorker(worker, 0);
+    }
   }
 
   /**
-   * Stop the background processor
+   * Stop the relay workers
    */
   stopProcessor(): void {
-    if (this.processingInterval) {
-      clearInterval(this.processingInterval);
-      this.processingInterval = null;
-      this.logger.log('Outbox processor stopped');
+    if (!this.running) {
+      return;
+    }
+
+    this.running = false;
+    for (const timer of this.timers) {
+      clearTimeout(timer);
     }
+    this.timers.clear();
+    this.logger.log('Outbox processor stopped');
   }
 
   onModuleDestroy(): void {
@@ -169,70 +263,159 @@ export class OutboxService implements OnModuleDestroy {
   }
 
   /**
-   * Process pending outbox events
+   * Claim and publish one batch of pending outbox events.
+   * Safe to call concurrently, from this or another replica.
    */
-  async processOutbox(batchSize = 100): Promise<number> {
-    if (this.isProcessing) {
-      return 0;
+  async processOutbox(batchSize = this.relayOptions.batchSize): Promise<number> {
+    const { published } = await this.relayBatch(batchSize);
+    return published;
+  }
+
+  private scheduleWorker(worker: number, delayMs: number): void {
+    if (!this.running) {
+      return;
     }
 
-    this.isProcessing = true;
+    const timer = setTimeout(() => {
+      this.timers.delete(timer);
+      void this.runWorker(worker);
+    }, delayMs);
+    this.timers.add(timer);
+  }
 
-    try {
-      // Find pending events that are ready for processing
-      const events = await this.outboxRepository.find({
-        where: [
-          { status: OutboxEventStatus.PENDING },
-          {
-            status: OutboxEventStatus.FAILED,
-            nextRetryAt: LessThanOrEqual(new Date()),
-          },
-        ],
-        order: { createdAt: 'ASC' },
-        take: batchSize,
-      });
+  private async runWorker(worker: number): Promise<void> {
+    const { batchSize, minIntervalMs, idleIntervalMs, maxIdleIntervalMs } = this.relayOptions;
+    let delayMs: number;
 
-      if (events.length === 0) {
-        return 0;
+    try {
+      const { claimed } = await this.relayBatch(batchSize);
+
+      if (claimed >= batchSize) {
+        // Backlog: drain immediately
+        delayMs = 0;
+        this.idleDelays[worker] = idleIntervalMs;
+      } else if (claimed > 0) {
+        delayMs = minIntervalMs;
+        this.idleDelays[worker] = idleIntervalMs;
+      } else {
+        delayMs = this.idleDelays[worker] ?? idleIntervalMs;
+        this.idleDelays[worker] = Math.min(delayMs * 2, maxIdleIntervalMs);
       }
+    } catch (error) {
+      this.logger.error('Error processing outbox', error);
+      delayMs = idleIntervalMs;
+    }
 
-      let publishedCount = 0;
+    this.scheduleWorker(worker, delayMs);
+  }
 
-      for (const event of events) {
-        try {
-          await this.publishEvent(event);
-          publishedCount++;
-        } catch (error) {
-          await this.handlePublishError(event, error as Error);
-        }
+  private async relayBatch(batchSize: number): Promise<RelayBatchResult> {
+    const startedAt = Date.now();
+    const events = await this.claimBatch(batchSize);
+
+    if (events.length === 0) {
+      return { claimed: 0, published: 0 };
+    }
+
+    let published: OutboxEvent[] = [];
+    const failed: Array<{ event: OutboxEvent; error: Error }> = [];
+
+    await mapWithConcurrency(events, this.relayOptions.publishConcurrency, async (event) => {
+      try {
+        await this.natsService.publish(event.subject, event.payload);
+        published.push(event);
+      } catch (error) {
+        failed.push({ event, error: error as Error });
       }
+    });
 
-      if (publishedCount > 0) {
-        this.logger.log(`Published ${publishedCount}/${events.length} outbox events`);
+    if (published.length > 0) {
+      try {
+        await this.natsService.flush();
+      } catch (error) {
+        failed.push(...published.map((event) => ({ event, error: error as Error })));
+        published = [];
       }
+    }
+
+    const publishedAt = new Date();
+    await this.markPublished(published, publishedAt);
+    await Promise.all(failed.map(({ event, error }) => this.handlePublishError(event, error)));
 
-      return publishedCount;
-    } finally {
-      this.isProcessing = false;
+    this.recordBatch(events.length, published, failed.length, startedAt, publishedAt);
+
+    if (published.length > 0) {
+      this.logger.log(`Published ${published.length}/${events.length} outbox events`);
     }
+
+    return { claimed: events.length, published: published.length };
   }
 
   /**
-   * Publish a single event to NATS
+   * Claim up to `batchSize` publishable rows and mark them PROCESSING in one transaction.
+   * Rows locked by another worker are skipped instead of waited on.
    */
-  private async publishEvent(event: OutboxEvent): Promise<void> {
-    // Mark as processing
-    event.status = OutboxEventStatus.PROCESSING;
-    event.attempts++;
-    await this.outboxRepository.save(event);
+  private async claimBatch(batchSize: number): Promise<OutboxEvent[]> {
+    const now = new Date();
+    const staleBefore = new Date(now.getTime() - this.relayOptions.processingTimeoutMs);
+
+    return this.outboxRepository.manager.transaction(async (manager) => {
+      const repo = manager.getRepository(OutboxEvent);
+
+      const events = await repo
+        .createQueryBuilder('outbox')
+        .where('outbox.status = :pending', { pending: OutboxEventStatus.PENDING })
+        .orWhere(
+          new Brackets((qb) => {
+            qb.where('outbox.status = :failed', { failed: OutboxEventStatus.FAILED })
+              .andWhere('outbox.nextRetryAt <= :now', { now })
+              .andWhere('outbox.attempts < outbox.maxAttempts');
+          }),
+        )
+        .orWhere(
+          new Brackets((qb) => {
+            qb.where('outbox.status = :processing', { processing: OutboxEventStatus.PROCESSING }).andWhere(
+              'outbox.updatedAt <= :staleBefore',
+              { staleBefore },
+            );
+          }),
+        )
+        .orderBy('outbox.createdAt', 'ASC')
+        .limit(batchSize)
+        .setLock('pessimistic_write')
+        .setOnLocked('skip_locked')
+        .getMany();
 
-    // Publish to NATS
-    await this.natsService.publish(event.subject, event.payload);
+      if (events.length === 0) {
+        return [];
+      }
 
-    // Mark as published
-    event.status = OutboxEventStatus.PUBLISHED;
-    event.publishedAt = new Date();
-    await this.outboxRepository.save(event);
+      const ids = events.map((event) => event.id);
+      await repo.update({ id: In(ids) }, { status: OutboxEventStatus.PROCESSING });
+      await repo.increment({ id: In(ids) }, 'attempts', 1);
+
+      for (const event of events) {
+        event.status = OutboxEventStatus.PROCESSING;
+        event.attempts++;
+      }
+
+      return events;
+    });
+  }
+
+  /**
+   * Mark published events in bulk
+   */
+  private async markPublished(events: OutboxEvent[], publishedAt: Date): Promise<void> {
+    for (const ids of chunkArray(
+      events.map((event) => event.id),
+      STATUS_UPDATE_CHUNK_SIZE,
+    )) {
+      await this.outboxRepository.update(
+        { id: In(ids) },
+        { status: OutboxEventStatus.PUBLISHED, publishedAt },
+      );
+    }
   }
 
   /**
@@ -242,33 +425,96 @@ export class OutboxService implements OnModuleDestroy {
     this.logger.warn(`Failed to publish outbox event ${event.id}: ${error.message}`);
 
     event.lastError = error.message;
+    event.status = OutboxEventStatus.FAILED;
 
     if (event.attempts >= event.maxAttempts) {
-      // Max retries exceeded
-      event.status = OutboxEventStatus.FAILED;
+      // Max retries exceeded: never claimed again (attempts < maxAttempts guard)
       this.logger.error(`Outbox event ${event.id} failed permanently after ${event.attempts} attempts`);
     } else {
       // Calculate next retry with exponential backoff
       const backoffMs = Math.min(1000 * Math.pow(2, event.attempts), 60000); // Max 1 minute
-      event.status = OutboxEventStatus.FAILED;
       event.nextRetryAt = new Date(Date.now() + backoffMs);
     }
 
-    await this.outboxRepository.save(event);
+    await this.outboxRepository.update(event.id, {
+      status: event.status,
+      lastError: event.lastError,
+      ...(event.nextRetryAt ? { nextRetryAt: event.nextRetryAt } : {}),
+    });
+  }
+
+  private recordBatch(
+    claimed: number,
+    published: OutboxEvent[],
+    failedCount: number,
+    startedAt: number,
+    publishedAt: Date,
+  ): void {
+    const metrics = this.metrics;
+    const now = publishedAt.getTime();
+
+    metrics.batches++;
+    metrics.claimedTotal += claimed;
+    metrics.published += published.length;
+    metrics.failed += failedCount;
+    metrics.lastBatchSize = claimed;
+    metrics.maxBatchSize = Math.max(metrics.maxBatchSize, claimed);
+    metrics.lastBatchDurationMs = now - startedAt;
+
+    if (published.length > 0) {
+      const totalLag = published.reduce((sum, event) => sum + (now - new Date(event.createdAt).getTime()), 0);
+      metrics.avgPublishLagMs = Math.round(totalLag / published.length);
+      metrics.window.push({ at: now, count: published.length });
+    }
+
+    while (metrics.window.length > 0 && (metrics.window[0]?.at ?? now) < now - THROUGHPUT_WINDOW_MS) {
+      metrics.window.shift();
+    }
   }
 
   /**
    * Get outbox statistics
    */
   async getStats(): Promise<OutboxStats> {
-    const [pending, processing, published, failed] = await Promise.all([
+    const [pending, processing, published, failed, oldestPending] = await Promise.all([
       this.outboxRepository.count({ where: { status: OutboxEventStatus.PENDING } }),
       this.outboxRepository.count({ where: { status: OutboxEventStatus.PROCESSING } }),
       this.outboxRepository.count({ where: { status: OutboxEventStatus.PUBLISHED } }),
       this.outboxRepository.count({ where: { status: OutboxEventStatus.FAILED } }),
+      this.outboxRepository.findOne({
+        where: { status: OutboxEventStatus.PENDING },
+        order: { createdAt: 'ASC' },
+        select: { id: true, createdAt: true },
+      }),
     ]);
 
-    return { pending, processing, published, failed };
+    const now = Date.now();
+    const metrics = this.metrics;
+    const windowStart = now - THROUGHPUT_WINDOW_MS;
+    const recentlyPublished = metrics.window
+      .filter((entry) => entry.at >= windowStart)
+      .reduce((sum, entry) => sum + entry.count, 0);
+
+    return {
+      pending,
+      processing,
+      published,
+      failed,
+      lagMs: oldestPending ? now - new Date(oldestPending.createdAt).getTime() : 0,
+      relay: {
+        running: this.running,
+        workers: this.running ? this.relayOptions.workers : 0,
+        batches: metrics.batches,
+        publishedTotal: metrics.published,
+        failedTotal: metrics.failed,
+        lastBatchSize: metrics.lastBatchSize,
+        maxBatchSize: metrics.maxBatchSize,
+        avgBatchSize: metrics.batches > 0 ? Math.round(metrics.claimedTotal / metrics.batches) : 0,
+        lastBatchDurationMs: metrics.lastBatchDurationMs,
+        avgPublishLagMs: metrics.avgPublishLagMs,
+        publishedPerSecond: Math.round((recentlyPublished / (THROUGHPUT_WINDOW_MS / 1000)) * 100) / 100,
+      },
+    };
   }
 
   /**
@@ -320,4 +566,24 @@ export interface OutboxStats {
   processing: number;
   published: number;
   failed: number;
+  /** Age of the oldest PENDING event (0 when the table is drained) */
+  lagMs: number;
+  /** Counters of the relay running in this process */
+  relay: OutboxRelayMetrics;
+}
+
+export interface OutboxRelayMetrics {
+  running: boolean;
+  workers: number;
+  batches: number;
+  publishedTotal: number;
+  failedTotal: number;
+  lastBatchSize: number;
+  maxBatchSize: number;
+  avgBatchSize: number;
+  lastBatchDurationMs: number;
+  /** Mean created -> published delay of the last batch */
+  avgPublishLagMs: number;
+  /** Rolling average over the last minute */
+  publishedPerSecond: number;
 }
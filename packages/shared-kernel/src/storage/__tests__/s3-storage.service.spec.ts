@@ -26,6 +26,18 @@ mock.module('@aws-sdk/client-s3', () => ({
   HeadObjectCommand: class MockHead {
     constructor(public input: Record<string, unknown>) {}
   },
+  CreateMultipartUploadCommand: class MockCreateMultipart {
+    constructor(public input: Record<string, unknown>) {}
+  },
+  UploadPartCommand: class MockUploadPart {
+    constructor(public input: Record<string, unknown>) {}
+  },
+  CompleteMultipartUploadCommand: class MockCompleteMultipart {
+    constructor(public input: Record<string, unknown>) {}
+  },
+  AbortMultipartUploadCommand: class MockAbortMultipart {
+    constructor(public input: Record<string, unknown>) {}
+  },
 }));
 
 mock.module('@aws-sdk/s3-request-presigner', () => ({
@@ -84,6 +96,64 @@ describe('S3StorageService', () => {
     });
   });
 
+  // -------------------------------------------------------------------------
+  // uploadStream
+  // -------------------------------------------------------------------------
+  describe('uploadStream', () => {
+    const MiB = 1024 * 1024;
+
+    async function* chunks(count: number, size: number) {
+      for (let i = 0; i < count; i++) {
+        yield Buffer.alloc(size, i);
+      }
+    }
+
+    const sentCommands = () =>
+      mockSend.mock.calls.map((call) => (call as unknown[])[0]?.constructor.name as string);
+
+    it('should fall back to a single PutObject for small streams', async () => {
+      const result = await service.uploadStream('small', chunks(3, 10), 'text/csv');
+
+      expect(result).toBe('small');
+      expect(sentCommands()).toEqual(['MockPut']);
+    });
+
+    it('should upload large streams as multipart parts and complete them', async () => {
+      mockSend.mockImplementation((command: unknown) =>
+        Promise.resolve(
+          (command as object).constructor.name === 'MockCreateMultipart' ? { UploadId: 'up-1' } : { ETag: 'etag' },
+        ),
+      );
+
+      await service.uploadStream('big', chunks(12, MiB), 'application/gzip', undefined, 5 * MiB);
+
+      expect(sentCommands()).toEqual([
+        'MockCreateMultipart',
+        'MockUploadPart',
+        'MockUploadPart',
+        'MockUploadPart',
+        'MockCompleteMultipart',
+      ]);
+    });
+
+    it('should abort the multipart upload when the source fails', async () => {
+      mockSend.mockImplementation((command: unknown) =>
+        Promise.resolve(
+          (command as object).constructor.name === 'MockCreateMultipart' ? { UploadId: 'up-1' } : { ETag: 'etag' },
+        ),
+      );
+      async function* failing() {
+        yield* chunks(6, MiB);
+        throw new Error('source broke');
+      }
+
+      await expect(
+        service.uploadStream('broken', failing(), 'application/gzip', undefined, 5 * MiB),
+      ).rejects.toThrow('source broke');
+      expect(sentCommands()).toEqual(['MockCreateMultipart', 'MockUploadPart', 'MockAbortMultipart']);
+    });
+  });
+
   // -------------------------------------------------------------------------
   // download
   // -------------------------------------------------------------------------
@@ -1,10 +1,14 @@
 import type { Readable } from 'node:stream';
 import {
+  AbortMultipartUploadCommand,
+  CompleteMultipartUploadCommand,
+  CreateMultipartUploadCommand,
   DeleteObjectCommand,
   GetObjectCommand,
   HeadObjectCommand,
   PutObjectCommand,
   S3Client,
+  UploadPartCommand,
 } from '@aws-sdk/client-s3';
 import { getSignedUrl } from '@aws-sdk/s3-request-presigner';
 
@@ -23,6 +27,10 @@ export interface S3StorageConfig {
   secretAccessKey: string;
 }
 
+/** S3 rejects multipart parts smaller than 5 MiB (except the last one). */
+const MIN_PART_SIZE = 5 * 1024 * 1024;
+const DEFAULT_PART_SIZE = 8 * 1024 * 1024;
+
 /**
  * Read S3 storage configuration from environment variables.
  * Throws if required variables are missing.
@@ -98,6 +106,99 @@ export class S3StorageService implements IStorageService {
     return key;
   }
 
+  /**
+   * Upload a stream without buffering it whole.
+   * Content is sent as multipart parts of `partSize` bytes, so memory stays bounded
+   * by one part regardless of the object size. Streams shorter than one part fall
+   * back to a single PutObject. A failed upload is aborted so no orphan parts remain.
+   */
+  async uploadStream(
+    key: string,
+    stream: AsyncIterable<Buffer | Uint8Array | string>,
+    contentType: string,
+    metadata?: Record<string, string>,
+    partSize = DEFAULT_PART_SIZE,
+  ): Promise<string> {
+    const threshold = Math.max(MIN_PART_SIZE, partSize);
+    const pending: Buffer[] = [];
+    let pendingBytes = 0;
+    let uploadId: string | undefined;
+    const parts: Array<{ ETag?: string; PartNumber: number }> = [];
+
+    const takePart = (): Buffer => {
+      const body = Buffer.concat(pending, pendingBytes);
+      pending.length = 0;
+      pendingBytes = 0;
+      return body;
+    };
+
+    const sendPart = async (body: Buffer): Promise<void> => {
+      if (!uploadId) {
+        const created = await this.client.send(
+          new CreateMultipartUploadCommand({
+            Bucket: this.bucket,
+            Key: key,
+            ContentType: contentType,
+            ...(metadata ? { Metadata: metadata } : {}),
+          }),
+        );
+        uploadId = created.UploadId;
+        if (!uploadId) {
+          throw new Error(`S3 did not return an upload id for key: ${key}`);
+        }
+      }
+
+      const partNumber = parts.length + 1;
+      const uploaded = await this.client.send(
+        new UploadPartCommand({
+          Bucket: this.bucket,
+          Key: key,
+          UploadId: uploadId,
+          PartNumber: partNumber,
+          Body: body,
+        }),
+      );
+      parts.push({ ETag: uploaded.ETag, PartNumber: partNumber });
+    };
+
+    try {
+      for await (const chunk of stream) {
+        const buffer =
+          typeof chunk === 'string' ? Buffer.from(chunk) : Buffer.from(chunk.buffer, chunk.byteOffset, chunk.byteLength);
+        pending.push(buffer);
+        pendingBytes += buffer.length;
+        if (pendingBytes >= threshold) {
+          await sendPart(takePart());
+        }
+      }
+
+      if (!uploadId) {
+        return this.upload(key, takePart(), contentType, metadata);
+      }
+
+      if (pendingBytes > 0) {
+        await sendPart(takePart());
+      }
+
+      await this.client.send(
+        new CompleteMultipartUploadCommand({
+          Bucket: this.bucket,
+          Key: key,
+          UploadId: uploadId,
+          MultipartUpload: { Parts: parts },
+        }),
+      );
+      return key;
+    } catch (error) {
+      if (uploadId) {
+        await this.client
+          .send(new AbortMultipartUploadCommand({ Bucket: this.bucket, Key: key, UploadId: uploadId }))
+          .catch(() => undefined);
+      }
+      throw error;
+    }
+  }
+
   async download(key: string): Promise<Buffer> {
     const command = new GetObjectCommand({
       Bucket: this.bucket,
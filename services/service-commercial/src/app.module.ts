@@ -1,6 +1,6 @@
-import { Module } from '@nestjs/common';
+import { Module, type OnApplicationShutdown } from '@nestjs/common';
 import { APP_INTERCEPTOR, APP_FILTER } from '@nestjs/core';
-import { AuthInterceptor, NatsModule, GrpcExceptionFilter } from '@crm/shared-kernel';
+import { AuthInterceptor, closeGrpcChannels, NatsModule, GrpcExceptionFilter } from '@crm/shared-kernel';
 import { ConfigModule, ConfigService } from '@nestjs/config';
 import { TypeOrmModule } from '@nestjs/typeorm';
 import { ScheduleModule } from '@nestjs/schedule';
@@ -23,6 +23,7 @@ import { CfastModule } from './cfast.module';
 import { QualiteModule } from './qualite.module';
 import { ReducBoxModule } from './reducbox.module';
 import { EnergieModule } from './energie.module';
+import { HealthModule } from './health.module';
 @Module({
   imports: [
     ConfigModule.forRoot({
@@ -77,6 +78,7 @@ import { EnergieModule } from './energie.module';
     QualiteModule,
     ReducBoxModule,
     EnergieModule,
+    HealthModule,
   ],
   controllers: [],
   providers: [
@@ -91,4 +93,9 @@ import { EnergieModule } from './energie.module';
     AuditSubscriber,
   ],
 })
-export class AppModule {}
+export class AppModule implements OnApplicationShutdown {
+  /** Pooled gRPC channels are shared by every client of the service: close them once, last */
+  onApplicationShutdown(): void {
+    closeGrpcChannels();
+  }
+}
@@ -19,6 +19,7 @@ import {
   PartenaireCommercialEntity,
   PartenaireCommercialSocieteEntity,
 } from './domain/commercial/entities';
+import { ContratEntity } from './domain/contrats/entities';
 
 // Infrastructure services
 import {
@@ -54,7 +55,10 @@ import { ContratsModule } from './contrats.module';
 import { ContratService } from './infrastructure/persistence/typeorm/repositories/contrats';
 import { CommissionCalculationService } from './domain/commercial/services/commission-calculation.service';
 import { RepriseCalculationService } from './domain/commercial/services/reprise-calculation.service';
-import { RecurrenceGenerationService } from './domain/commercial/services/recurrence-generation.service';
+import {
+  RecurrenceGenerationService,
+  type ContratForRecurrence,
+} from './domain/commercial/services/recurrence-generation.service';
 import { ContestationWorkflowService } from './domain/commercial/services/contestation-workflow.service';
 import { BordereauExportService } from './domain/commercial/services/bordereau-export.service';
 import { BordereauFileStorageService } from './domain/commercial/services/bordereau-file-storage.service';
@@ -111,8 +115,48 @@ import { EcheanceEncaisseeHandler } from './infrastructure/messaging/nats/handle
     ContestationCommissionService,
     PartenaireCommercialService,
     CommissionCalculationService,
-    RepriseCalculationService,
-    RecurrenceGenerationService,
+    {
+      provide: RepriseCalculationService,
+      useFactory: (commissionService: CommissionService) =>
+        new RepriseCalculationService({
+          findCommissionsVerseesDansFenetre: async (contratId, fenetreMois, periodeActuelle) =>
+            (await commissionService.findMontantsVersesDansFenetre([contratId], fenetreMois, periodeActuelle)).get(
+              contratId,
+            ) ?? [],
+          findCommissionDuePeriode: async (contratId, periodeActuelle) =>
+            (await commissionService.sumMontantsDusPeriode([contratId], periodeActuelle)).get(contratId) ?? 0,
+          findCommissionsVerseesDansFenetreForContrats: (contratIds, fenetreMois, periodeActuelle) =>
+            commissionService.findMontantsVersesDansFenetre(contratIds, fenetreMois, periodeActuelle),
+          findCommissionsDuesPeriode: (contratIds, periodeActuelle) =>
+            commissionService.sumMontantsDusPeriode(contratIds, periodeActuelle),
+        }),
+      inject: [CommissionService],
+    },
+    {
+      // Echeances and bareme-at-date lookups belong to service-finance and keep
+      // the service defaults until a port to it exists.
+      provide: RecurrenceGenerationService,
+      useFactory: (contratService: ContratService) => {
+        const toContratForRecurrence = (contrat: ContratEntity): ContratForRecurrence => ({
+          id: contrat.id,
+          organisationId: contrat.organisationId,
+          statut: contrat.statut,
+          dateFin: contrat.dateFin,
+          montantHT: Number(contrat.montant ?? 0),
+        });
+        return new RecurrenceGenerationService({
+          findContratById: async (contratId) => toContratForRecurrence(await contratService.findById(contratId)),
+          findContratsByIds: async (contratIds) =>
+            new Map(
+              (await contratService.findByIds(contratIds)).map((contrat) => [
+                contrat.id,
+                toContratForRecurrence(contrat),
+              ]),
+            ),
+        });
+      },
+      inject: [ContratService],
+    },
     {
       provide: GenererBordereauWorkflowService,
       useFactory: (
@@ -150,14 +194,40 @@ import { EcheanceEncaisseeHandler } from './infrastructure/messaging/nats/handle
             );
             return result.data as any;
           },
+          findCQStatusesForContrats: async (contratIds) => {
+            const contrats = await contratService.findByIds(contratIds);
+            return new Map(contrats.map((contrat) => [contrat.id, contrat.statutCq ?? null]));
+          },
           findBaremeForCommission: async (commission) =>
             baremeService.findApplicable(
               commission.organisationId,
               commission.contratId,
               `${commission.periode}-01`,
             ) as any,
+          findBaremesForCommissions: async (commissions) => {
+            const byCommission = new Map<string, any>();
+            const byOrganisation = new Map<string, typeof commissions>();
+            for (const commission of commissions) {
+              const group = byOrganisation.get(commission.organisationId) ?? [];
+              group.push(commission);
+              byOrganisation.set(commission.organisationId, group);
+            }
+            for (const [organisationId, group] of byOrganisation) {
+              const requests = group.map((commission) => ({
+                typeProduit: commission.contratId,
+                dateEffet: `${commission.periode}-01`,
+              }));
+              const baremes = await baremeService.findApplicableMany(organisationId, requests);
+              group.forEach((commission, index) => {
+                const { typeProduit, dateEffet } = requests[index];
+                byCommission.set(commission.id, baremes.get(BaremeService.applicableKey(typeProduit, dateEffet)));
+              });
+            }
+            return byCommission;
+          },
           calculerCommission: (contrat, bareme, montantBase) =>
             commissionCalculationService.calculer(contrat, bareme, montantBase),
+          calculerCommissions: (items) => commissionCalculationService.calculerBatch(items),
           findStatutAPayer: async () => {
             try {
               return await statutService.findByCode('a_payer');
@@ -179,6 +249,7 @@ import { EcheanceEncaisseeHandler } from './infrastructure/messaging/nats/handle
           },
           calculerReprise: (contratId, typeReprise, fenetreMois, periode) =>
             repriseCalculationService.calculerReprise(contratId, typeReprise, fenetreMois, periode),
+          calculerReprises: (requests, periode) => repriseCalculationService.calculerReprises(requests, periode),
           updateReprise: async (id, payload) => {
             await repriseService.update(id, payload as any);
           },
@@ -196,6 +267,7 @@ import { EcheanceEncaisseeHandler } from './infrastructure/messaging/nats/handle
           },
           genererRecurrence: (contratId, echeanceId, dateEncaissement) =>
             recurrenceGenerationService.genererRecurrence(contratId, echeanceId, dateEncaissement),
+          preparerRecurrences: (requests) => recurrenceGenerationService.preparerRecurrences(requests),
           findReportsNegatifs: async (input) => {
             const result = await reportNegatifService.findAll(
               {
@@ -220,6 +292,7 @@ import { EcheanceEncaisseeHandler } from './infrastructure/messaging/nats/handle
           audit: async (payload) => {
             await auditLogService.create(payload as any);
           },
+          persistBordereau: async (payload) => bordereauService.persistGeneration(payload as any),
         }),
       inject: [
         CommissionService,
@@ -4,10 +4,18 @@ import { TypeOrmModule } from '@nestjs/typeorm';
 // Domain entities (cross-context)
 import { ContratEntity } from './domain/contrats/entities/contrat.entity';
 import { LigneContratEntity } from './domain/contrats/entities/ligne-contrat.entity';
+import { ContratKpiMensuelEntity } from './domain/contrats/entities/contrat-kpi-mensuel.entity';
 import { ProduitEntity } from './domain/products/entities/produit.entity';
 
 // Infrastructure services
-import { DashboardService } from './infrastructure/persistence/typeorm/repositories/dashboard';
+import {
+  ContratKpiMaterializerService,
+  DashboardService,
+} from './infrastructure/persistence/typeorm/repositories/dashboard';
+import { DashboardKpiSchedulerService } from './infrastructure/scheduling/dashboard-kpi-scheduler.service';
+
+// NATS handlers
+import { DashboardKpiRefreshHandler } from './infrastructure/messaging/nats/handlers/dashboard-kpi-refresh.handler';
 
 // Interface controllers
 import {
@@ -26,6 +34,7 @@ import { ProductsModule } from './products.module';
       ContratEntity,
       LigneContratEntity,
       ProduitEntity,
+      ContratKpiMensuelEntity,
     ]),
     forwardRef(() => ContratsModule),
     forwardRef(() => ProductsModule),
@@ -37,9 +46,13 @@ import { ProductsModule } from './products.module';
   ],
   providers: [
     DashboardService,
+    ContratKpiMaterializerService,
+    DashboardKpiSchedulerService,
+    DashboardKpiRefreshHandler,
   ],
   exports: [
     DashboardService,
+    ContratKpiMaterializerService,
   ],
 })
 export class DashboardModule {}
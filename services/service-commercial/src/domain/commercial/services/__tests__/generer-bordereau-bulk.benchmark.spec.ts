@@ -0,0 +1,336 @@
+import { describe, expect, it } from 'bun:test';
+import { CommissionCalculationService, type BaremeForCalculation } from '../commission-calculation.service';
+import {
+  GenererBordereauWorkflowService,
+  type GenererBordereauCommission,
+  type GenererBordereauDeps,
+  type GenererBordereauPersistPayload,
+} from '../generer-bordereau-workflow.service';
+
+// ---------------------------------------------------------------------------
+// Fixture: one end-of-month bordereau for a large apporteur network
+// ---------------------------------------------------------------------------
+
+const COMMISSIONS = 6000;
+const REPRISES = 400;
+const RECURRENCES = 600;
+const REPORTS = 40;
+
+function seededRandom(seed: number) {
+  let state = seed;
+  return () => {
+    state = (state * 1664525 + 1013904223) % 4294967296;
+    return state / 4294967296;
+  };
+}
+
+const BAREMES: Array<BaremeForCalculation & { id: string }> = [
+  { id: 'brm-pct', typeCalcul: 'pourcentage', montantFixe: null, tauxPourcentage: 12.5 },
+  { id: 'brm-fixe', typeCalcul: 'fixe', montantFixe: 35, tauxPourcentage: null },
+  { id: 'brm-mixte', typeCalcul: 'mixte', montantFixe: 10, tauxPourcentage: 3.33 },
+  {
+    id: 'brm-palier',
+    typeCalcul: 'palier',
+    montantFixe: null,
+    tauxPourcentage: null,
+    paliers: [
+      { seuilMin: 0, seuilMax: 99.99, montantPrime: 5, cumulable: false, ordre: 1 },
+      { seuilMin: 100, seuilMax: 499.99, montantPrime: 20, cumulable: false, ordre: 2 },
+      { seuilMin: 500, seuilMax: null, montantPrime: 60, cumulable: false, ordre: 3 },
+    ],
+  },
+];
+
+function buildFixture() {
+  const random = seededRandom(42);
+  const contrats = Array.from({ length: 1500 }, (_, i) => `ctr-${i}`);
+  const cqByContrat = new Map(
+    contrats.map((id) => [id, random() < 0.08 ? (random() < 0.5 ? 'EN_ATTENTE' : null) : 'VALIDE']),
+  );
+
+  const commissions: GenererBordereauCommission[] = Array.from({ length: COMMISSIONS }, (_, i) => ({
+    id: `com-${i}`,
+    organisationId: 'org-1',
+    apporteurId: 'app-1',
+    contratId: contrats[Math.floor(random() * contrats.length)],
+    reference: `COM-${i}`,
+    montantBrut: Math.round(random() * 120000) / 100,
+    montantReprises: random() < 0.1 ? Math.round(random() * 3000) / 100 : 0,
+    montantAcomptes: random() < 0.05 ? Math.round(random() * 2000) / 100 : 0,
+    montantNetAPayer: 0,
+    statutId: random() < 0.9 ? 'st-a-payer' : 'st-en-attente',
+    periode: '2026-01',
+    dateCreation: new Date('2026-01-15'),
+    echeanceEncaissee: random() < 0.97,
+  }));
+
+  const reprises = Array.from({ length: REPRISES }, (_, i) => ({
+    id: `rep-${i}`,
+    commissionOriginaleId: `com-${i}`,
+    contratId: contrats[i % contrats.length],
+    apporteurId: 'app-1',
+    typeReprise: ['resiliation', 'impaye', 'annulation', 'regularisation'][i % 4],
+    periodeApplication: '2026-01',
+    montant: Math.round(random() * 8000) / 100,
+  }));
+
+  const recurrences = Array.from({ length: RECURRENCES }, (_, i) => ({
+    id: `rec-${i}`,
+    commissionInitialeId: `com-${i}`,
+    contratId: contrats[(i * 7) % contrats.length],
+    echeanceId: `ech-${i}`,
+    dateEncaissement: new Date('2026-01-20T00:00:00Z'),
+    montantCalcule: Math.round(random() * 4000) / 100,
+    creee: random() < 0.9,
+  }));
+
+  const reports = Array.from({ length: REPORTS }, (_, i) => ({
+    id: `rpt-${i}`,
+    periodeOrigine: '2025-12',
+    montantRestant: Math.round(random() * 15000) / 100,
+  }));
+
+  return { cqByContrat, commissions, reprises, recurrences, reports };
+}
+
+function baremeFor(contratId: string): BaremeForCalculation {
+  const index = Number(contratId.split('-')[1]) % BAREMES.length;
+  return BAREMES[index];
+}
+
+/**
+ * In-memory deps counting every awaited call, i.e. every database round trip
+ * the workflow would make in production.
+ */
+function createDeps(fixture: ReturnType<typeof buildFixture>, bulk: boolean) {
+  const calculation = new CommissionCalculationService();
+  const stats = {
+    roundTrips: 0,
+    bordereaux: 0,
+    recurrenceWrites: 0,
+    lignes: [] as Record<string, unknown>[],
+    audits: [] as Record<string, unknown>[],
+  };
+  const trip = () => {
+    stats.roundTrips += 1;
+  };
+  // The bordereau reference embeds Date.now() and bulk mode generates the bordereau id,
+  // so both differ between two runs
+  let bordereauId = 'brd-1';
+  const normalize = (row: Record<string, unknown>) => {
+    const normalized = { ...row };
+    if (normalized.bordereauId === bordereauId) normalized.bordereauId = '<brd>';
+    if (normalized.refId === bordereauId) normalized.refId = '<brd>';
+    const afterData = row.afterData as Record<string, unknown> | undefined;
+    if (afterData && 'reference' in afterData) normalized.afterData = { ...afterData, reference: '<ref>' };
+    return normalized;
+  };
+
+  const deps: GenererBordereauDeps = {
+    findCQStatusForContrat: async (contratId) => {
+      trip();
+      return fixture.cqByContrat.get(contratId) ?? null;
+    },
+    findCommissionsForPeriode: async () => {
+      trip();
+      return fixture.commissions;
+    },
+    findBaremeForCommission: async (commission) => {
+      trip();
+      return baremeFor(commission.contratId);
+    },
+    calculerCommission: (contrat, bareme, montantBase) => calculation.calculer(contrat, bareme, montantBase),
+    findStatutAPayer: async () => {
+      trip();
+      return { id: 'st-a-payer', code: 'a_payer' };
+    },
+    findReprisesForPeriode: async () => {
+      trip();
+      return fixture.reprises;
+    },
+    calculerReprise: async (contratId) => {
+      trip();
+      const reprise = fixture.reprises.find((r) => r.contratId === contratId);
+      return { montantReprise: reprise?.montant ?? 0, suspendRecurrence: false, creerLigneReprise: true };
+    },
+    updateReprise: async () => {
+      trip();
+    },
+    findRecurrencesForPeriode: async () => {
+      trip();
+      return fixture.recurrences;
+    },
+    genererRecurrence: async (_contratId, echeanceId) => {
+      trip();
+      const recurrence = fixture.recurrences.find((r) => r.echeanceId === echeanceId);
+      if (!recurrence?.creee) {
+        return { creee: false, recurrence: null };
+      }
+      // genererRecurrence persists what it creates
+      stats.recurrenceWrites += 1;
+      return { creee: true, recurrence: { montantCalcule: recurrence.montantCalcule } };
+    },
+    findReportsNegatifs: async () => {
+      trip();
+      return fixture.reports;
+    },
+    createBordereau: async (input) => {
+      trip();
+      stats.bordereaux += 1;
+      return { id: bordereauId, reference: input.reference };
+    },
+    createLigne: async (payload) => {
+      trip();
+      stats.lignes.push(payload);
+      return { id: `line-${stats.lignes.length}` };
+    },
+    updateBordereau: async (_id, payload) => {
+      trip();
+      return { id: '<brd>', ...payload };
+    },
+    audit: async (payload) => {
+      trip();
+      stats.audits.push(payload);
+    },
+  };
+
+  if (bulk) {
+    const memo = new Map<string, BaremeForCalculation>();
+    deps.findCQStatusesForContrats = async (contratIds) => {
+      trip();
+      return new Map(contratIds.map((id) => [id, fixture.cqByContrat.get(id) ?? null]));
+    };
+    deps.findBaremesForCommissions = async (commissions) => {
+      trip();
+      return new Map(
+        commissions.map((commission) => {
+          const key = `${commission.contratId}|${commission.periode}-01`;
+          if (!memo.has(key)) memo.set(key, baremeFor(commission.contratId));
+          return [commission.id, memo.get(key) as BaremeForCalculation];
+        }),
+      );
+    };
+    deps.calculerCommissions = (items) => calculation.calculerBatch(items);
+    deps.calculerReprises = async (requests) => {
+      // Commissions versees once per fenetre, commissions dues once
+      stats.roundTrips += new Set(requests.map((request) => request.fenetreMois)).size + 1;
+      return requests.map((request) => {
+        const reprise = fixture.reprises.find((r) => r.contratId === request.contratId);
+        return { montantReprise: reprise?.montant ?? 0, suspendRecurrence: false, creerLigneReprise: true };
+      });
+    };
+    deps.preparerRecurrences = async (requests) => {
+      // Echeances, contrats, baremes and month numbers of the period
+      stats.roundTrips += 4;
+      return requests.map((request) => {
+        const recurrence = fixture.recurrences.find((r) => r.echeanceId === request.echeanceId);
+        return recurrence?.creee
+          ? { creee: true, recurrence: { montantCalcule: recurrence.montantCalcule } }
+          : { creee: false, recurrence: null };
+      });
+    };
+    deps.persistBordereau = async (payload: GenererBordereauPersistPayload) => {
+      // One transaction: bordereau insert and commit, chunked multi-row inserts of 500 rows,
+      // one update per reprise
+      bordereauId = payload.bordereau.id;
+      stats.roundTrips += 2 + Math.ceil(payload.lignes.length / 500) + Math.ceil(payload.audits.length / 500);
+      stats.roundTrips += Math.ceil(payload.recurrences.length / 500) + payload.repriseUpdates.length;
+      stats.bordereaux += 1;
+      stats.recurrenceWrites += payload.recurrences.length;
+      stats.lignes.push(...payload.lignes);
+      stats.audits.push(...payload.audits);
+      return { id: '<brd>', ...payload.bordereauUpdate };
+    };
+  }
+
+  return {
+    deps,
+    stats,
+    normalizedLignes: () => stats.lignes.map(normalize),
+    normalizedAudits: () => stats.audits.map(normalize),
+  };
+}
+
+const INPUT = { organisationId: 'org-1', apporteurId: 'app-1', periode: '2026-01', creePar: 'ops' };
+
+describe('GenererBordereauWorkflowService bulk mode (benchmark fixture)', () => {
+  it('produces the same totals, lignes and audit trail as the sequential path with far fewer round trips', async () => {
+    const fixture = buildFixture();
+    const sequential = createDeps(fixture, false);
+    const bulk = createDeps(fixture, true);
+
+    const sequentialStart = performance.now();
+    const expected = await new GenererBordereauWorkflowService(sequential.deps).execute(INPUT);
+    const sequentialMs = performance.now() - sequentialStart;
+
+    const bulkStart = performance.now();
+    const actual = await new GenererBordereauWorkflowService(bulk.deps).execute(INPUT);
+    const bulkMs = performance.now() - bulkStart;
+
+    expect(actual.totaux).toEqual(expected.totaux);
+    expect(actual.summary).toEqual(expected.summary);
+    expect(actual.bordereau).toEqual(expected.bordereau);
+    expect(bulk.normalizedLignes()).toEqual(sequential.normalizedLignes());
+    expect(bulk.normalizedAudits()).toEqual(sequential.normalizedAudits());
+    expect(bulk.stats.recurrenceWrites).toBe(sequential.stats.recurrenceWrites);
+
+    expect(expected.summary.excludedForCQ).toBeGreaterThan(0);
+    expect(sequential.stats.lignes.length).toBeGreaterThan(COMMISSIONS / 2);
+
+    expect(bulk.stats.roundTrips).toBeLessThan(sequential.stats.roundTrips / 5);
+
+    // eslint-disable-next-line no-console
+    console.log(
+      `[bordereau benchmark] ${sequential.stats.lignes.length} lignes: ` +
+        `sequential ${sequential.stats.roundTrips} round trips (${sequentialMs.toFixed(1)}ms in-memory), ` +
+        `bulk ${bulk.stats.roundTrips} round trips (${bulkMs.toFixed(1)}ms in-memory)`,
+    );
+  });
+
+  it('defaults to bulk mode when persistBordereau is wired, and can be forced sequential', async () => {
+    const fixture = buildFixture();
+    const { deps, stats } = createDeps(fixture, true);
+    const service = new GenererBordereauWorkflowService(deps);
+
+    await service.execute(INPUT, 'sequential');
+    const sequentialTrips = stats.roundTrips;
+    stats.roundTrips = 0;
+    await service.execute(INPUT);
+
+    expect(stats.roundTrips).toBeLessThan(sequentialTrips / 5);
+  });
+
+  it('creates the bordereau and its recurrences only inside the transaction', async () => {
+    const fixture = buildFixture();
+    const { deps, stats } = createDeps(fixture, true);
+    let persisted: GenererBordereauPersistPayload | undefined;
+    deps.persistBordereau = async (payload) => {
+      persisted = payload;
+      throw new Error('deadlock detected');
+    };
+
+    await expect(new GenererBordereauWorkflowService(deps).execute(INPUT)).rejects.toThrow('deadlock detected');
+
+    // Nothing was written outside persistBordereau, so the rollback leaves nothing behind
+    expect(stats.bordereaux).toBe(0);
+    expect(stats.recurrenceWrites).toBe(0);
+    expect(stats.lignes).toHaveLength(0);
+    expect(persisted?.bordereau).toMatchObject({ ...INPUT, reference: expect.stringMatching(/^BRD-2026-01-/) });
+    expect(persisted?.lignes.every((ligne) => ligne.bordereauId === persisted?.bordereau.id)).toBe(true);
+    expect(persisted?.recurrences).toHaveLength(fixture.recurrences.filter((r) => r.creee).length);
+    expect(persisted?.recurrences[0]).toMatchObject({
+      organisationId: 'org-1',
+      apporteurId: 'app-1',
+      commissionInitialeId: expect.any(String),
+      bordereauId: persisted?.bordereau.id,
+    });
+  });
+
+  it('refuses bulk mode without a transactional persister', async () => {
+    const { deps } = createDeps(buildFixture(), false);
+
+    await expect(new GenererBordereauWorkflowService(deps).execute(INPUT, 'bulk')).rejects.toThrow(
+      'persistBordereau',
+    );
+  });
+});
@@ -80,6 +80,7 @@ function createDeps(): GenererBordereauDeps {
     findRecurrencesForPeriode: async () => [
       {
         id: 'rec-1',
+        commissionInitialeId: 'com-3',
         contratId: 'ctr-3',
         echeanceId: 'ech-1',
         dateEncaissement: new Date('2026-01-14'),
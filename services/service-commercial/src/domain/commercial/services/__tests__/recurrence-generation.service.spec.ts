@@ -122,4 +122,46 @@ describe('RecurrenceGenerationService', () => {
     const result = await service.genererRecurrence('contrat-1', 'ech-1', '2026-03-10');
     expectDecimalEqual(result.recurrence?.montantCalcule ?? 0, 30);
   });
+
+  it('preparation par lot: echeances et contrats lus en une fois, sans persistance', async () => {
+    const echeanceReads: string[][] = [];
+    const contratReads: string[][] = [];
+    let persisted = 0;
+    const service = createService({
+      isEcheanceReglee: async () => {
+        throw new Error('lecture unitaire inattendue');
+      },
+      findContratById: async () => {
+        throw new Error('lecture unitaire inattendue');
+      },
+      findEcheancesReglees: async (echeanceIds) => {
+        echeanceReads.push(echeanceIds);
+        return new Set(echeanceIds.filter((echeanceId) => echeanceId !== 'ech-impayee'));
+      },
+      findContratsByIds: async (contratIds) => {
+        contratReads.push(contratIds);
+        return new Map(
+          contratIds.map((contratId) => [
+            contratId,
+            createMockContrat({ id: contratId, statut: 'VALIDE', dateFin: null, montantHT: 1200 }),
+          ]),
+        );
+      },
+      persistRecurrence: async () => {
+        persisted += 1;
+      },
+    });
+
+    const results = await service.preparerRecurrences([
+      { contratId: 'contrat-1', echeanceId: 'ech-1', dateEncaissement: '2026-03-10' },
+      { contratId: 'contrat-2', echeanceId: 'ech-impayee', dateEncaissement: '2026-03-10' },
+      { contratId: 'contrat-3', echeanceId: 'ech-3', dateEncaissement: '2026-03-10' },
+    ]);
+
+    expect(echeanceReads).toEqual([['ech-1', 'ech-impayee', 'ech-3']]);
+    expect(contratReads).toEqual([['contrat-1', 'contrat-3']]);
+    expect(results.map((result) => result.creee)).toEqual([true, false, true]);
+    expect(results[1].raison).toBe('ECHEANCE_NON_REGLEE');
+    expect(persisted).toBe(0);
+  });
 });
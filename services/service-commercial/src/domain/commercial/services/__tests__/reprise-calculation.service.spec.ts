@@ -124,4 +124,42 @@ describe('RepriseCalculationService', () => {
     expect(regularisation.creerLignePositive).toBe(false);
     expectDecimalEqual(regularisation.montantRegularisation, 0);
   });
+
+  it('calcul par lot: une lecture groupee par fenetre, aucun appel unitaire', async () => {
+    const versees: Array<{ contratIds: string[]; fenetreMois: number }> = [];
+    const dues: string[][] = [];
+    const service = createService({
+      findCommissionsVerseesDansFenetre: async () => {
+        throw new Error('lecture unitaire inattendue');
+      },
+      findCommissionDuePeriode: async () => {
+        throw new Error('lecture unitaire inattendue');
+      },
+      findCommissionsVerseesDansFenetreForContrats: async (contratIds, fenetreMois) => {
+        versees.push({ contratIds, fenetreMois });
+        return new Map(contratIds.map((contratId) => [contratId, [100, 50]]));
+      },
+      findCommissionsDuesPeriode: async (contratIds) => {
+        dues.push(contratIds);
+        return new Map(contratIds.map((contratId) => [contratId, contratId === 'contrat-3' ? 120 : 500]));
+      },
+    });
+
+    const results = await service.calculerReprises(
+      [
+        { contratId: 'contrat-1', typeReprise: TypeReprise.RESILIATION, fenetreMois: 3 },
+        { contratId: 'contrat-2', typeReprise: TypeReprise.RESILIATION, fenetreMois: 3 },
+        { contratId: 'contrat-3', typeReprise: TypeReprise.RESILIATION, fenetreMois: 12 },
+      ],
+      '2026-02',
+    );
+
+    expect(versees).toEqual([
+      { contratIds: ['contrat-1', 'contrat-2'], fenetreMois: 3 },
+      { contratIds: ['contrat-3'], fenetreMois: 12 },
+    ]);
+    expect(dues).toEqual([['contrat-1', 'contrat-2', 'contrat-3']]);
+    expectDecimalEqual(results[0].montantReprise, 150);
+    expectDecimalEqual(results[2].montantReprise, 120);
+  });
 });
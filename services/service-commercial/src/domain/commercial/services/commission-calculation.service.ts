@@ -92,6 +92,16 @@ export class CommissionCalculationService {
     };
   }
 
+  /**
+   * Batch variant of calculer: same rules, results in input order.
+   * The first invalid item throws, as the sequential loop would.
+   */
+  calculerBatch(
+    items: Array<{ contrat: unknown; bareme: BaremeForCalculation; montantBase: number }>,
+  ): CommissionResult[] {
+    return items.map((item) => this.calculer(item.contrat, item.bareme, item.montantBase));
+  }
+
   calculerPalier(bareme: BaremeForCalculation, montantBase: number): number {
     const paliers = [...(bareme.paliers || [])].sort((a, b) => (a.ordre || 0) - (b.ordre || 0));
     if (paliers.length === 0) {
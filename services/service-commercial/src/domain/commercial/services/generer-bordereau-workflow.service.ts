@@ -1,3 +1,4 @@
+import { randomUUID } from 'node:crypto';
 import { Injectable, Logger } from '@nestjs/common';
 import { TypeCalcul, type BaremeForCalculation, type CommissionResult } from './commission-calculation.service';
 import { TypeReprise, type TypeReprise as TypeRepriseType } from '../entities/reprise-commission.entity';
@@ -38,6 +39,7 @@ export interface GenererBordereauReprise {
 
 export interface GenererBordereauRecurrence {
   id: string;
+  commissionInitialeId: string;
   contratId: string;
   echeanceId: string | null;
   dateEncaissement: Date | null;
@@ -50,12 +52,60 @@ export interface GenererBordereauReportNegatif {
   montantRestant: number;
 }
 
+export interface CommissionCalculationItem {
+  contrat: unknown;
+  bareme: BaremeForCalculation;
+  montantBase: number;
+}
+
+export interface RepriseCalculationRequest {
+  contratId: string;
+  typeReprise: TypeRepriseType;
+  fenetreMois: number;
+}
+
+export interface RepriseCalculation {
+  montantReprise: number;
+  suspendRecurrence: boolean;
+  creerLigneReprise: boolean;
+}
+
+export interface RecurrenceGenerationRequest {
+  contratId: string;
+  echeanceId: string;
+  dateEncaissement: string;
+}
+
+export interface RecurrenceGeneration {
+  creee: boolean;
+  recurrence: { montantCalcule: number } | null;
+}
+
+export interface GenererBordereauPersistPayload {
+  /** Bordereau to create, its id is already referenced by lignes and audits */
+  bordereau: GenererBordereauInput & { id: string; reference: string };
+  lignes: Record<string, unknown>[];
+  audits: Record<string, unknown>[];
+  repriseUpdates: Array<{ id: string; payload: Record<string, unknown> }>;
+  /** Recurrences generated for the bordereau, to insert */
+  recurrences: Record<string, unknown>[];
+  bordereauUpdate: Record<string, unknown>;
+}
+
+export type GenererBordereauMode = 'bulk' | 'sequential';
+
 export interface GenererBordereauDeps {
   state?: Record<string, unknown>;
   findCQStatusForContrat?(contratId: string): Promise<string | null>;
+  /** Bulk mode: CQ status of every contrat of the period in one read. Missing contrats map to null. */
+  findCQStatusesForContrats?(contratIds: string[]): Promise<Map<string, string | null>>;
   findCommissionsForPeriode(input: GenererBordereauInput): Promise<GenererBordereauCommission[]>;
   findBaremeForCommission(commission: GenererBordereauCommission): Promise<BaremeForCalculation>;
+  /** Bulk mode: applicable bareme keyed by commission id, resolved from baremes loaded once per period. */
+  findBaremesForCommissions?(commissions: GenererBordereauCommission[]): Promise<Map<string, BaremeForCalculation>>;
   calculerCommission(contrat: unknown, bareme: BaremeForCalculation, montantBase: number): CommissionResult;
+  /** Bulk mode: calculation over the whole batch, results in input order. */
+  calculerCommissions?(items: CommissionCalculationItem[]): CommissionResult[];
   findStatutAPayer(): Promise<{ id: string; code: string } | null>;
   findReprisesForPeriode(input: GenererBordereauInput): Promise<GenererBordereauReprise[]>;
   calculerReprise(
@@ -63,18 +113,28 @@ export interface GenererBordereauDeps {
     typeReprise: TypeRepriseType,
     fenetreMois: number,
     periode: string,
-  ): Promise<{ montantReprise: number; suspendRecurrence: boolean; creerLigneReprise: boolean }>;
+  ): Promise<RepriseCalculation>;
+  /** Bulk mode: reprise amounts from inputs read once per fenetre, results in input order. */
+  calculerReprises?(requests: RepriseCalculationRequest[], periode: string): Promise<RepriseCalculation[]>;
   updateReprise(id: string, payload: Record<string, unknown>): Promise<void>;
   findRecurrencesForPeriode(input: GenererBordereauInput): Promise<GenererBordereauRecurrence[]>;
-  genererRecurrence(contratId: string, echeanceId: string, dateEncaissement: string): Promise<{
-    creee: boolean;
-    recurrence: { montantCalcule: number } | null;
-  }>;
+  genererRecurrence(contratId: string, echeanceId: string, dateEncaissement: string): Promise<RecurrenceGeneration>;
+  /**
+   * Bulk mode: recurrences computed from inputs read once, results in input order. Nothing is
+   * persisted, the created recurrences are written by `persistBordereau`. Without it bulk mode
+   * falls back to `genererRecurrence`, whose writes are outside the transaction.
+   */
+  preparerRecurrences?(requests: RecurrenceGenerationRequest[]): Promise<RecurrenceGeneration[]>;
   findReportsNegatifs(input: GenererBordereauInput): Promise<GenererBordereauReportNegatif[]>;
   createBordereau(input: GenererBordereauInput & { reference: string }): Promise<{ id: string; reference: string }>;
   createLigne(payload: Record<string, unknown>): Promise<{ id: string }>;
   updateBordereau(id: string, payload: Record<string, unknown>): Promise<unknown>;
   audit(payload: Record<string, unknown>): Promise<void>;
+  /**
+   * Bulk mode: create the bordereau and write lignes, audit logs, reprise updates, recurrences
+   * and totals in one transaction, then return the bordereau. Its presence enables bulk mode by default.
+   */
+  persistBordereau?(payload: GenererBordereauPersistPayload): Promise<unknown>;
 }
 
 export interface GenererBordereauOutput {
@@ -96,59 +156,59 @@ export interface GenererBordereauOutput {
   };
 }
 
+interface BordereauCounters {
+  ordre: number;
+  nombreCommissions: number;
+  nombreReprises: number;
+  nombrePrimes: number;
+  excludedForCQ: number;
+  totalBrut: number;
+  totalReprises: number;
+  totalAcomptes: number;
+}
+
 @Injectable()
 export class GenererBordereauWorkflowService {
   private readonly logger = new Logger(GenererBordereauWorkflowService.name);
 
   constructor(private readonly deps: GenererBordereauDeps) {}
 
-  async execute(input: GenererBordereauInput): Promise<GenererBordereauOutput> {
+  /**
+   * Generate the bordereau of an apporteur for a period.
+   * Bulk mode (default when `persistBordereau` is wired) reads CQ statuses, baremes, reprise and
+   * recurrence inputs once, calculates the whole batch, then creates the bordereau and writes
+   * everything in one transaction: a failure leaves nothing behind.
+   * Sequential mode keeps the historical one-round-trip-per-item path.
+   */
+  async execute(
+    input: GenererBordereauInput,
+    mode: GenererBordereauMode = this.deps.persistBordereau ? 'bulk' : 'sequential',
+  ): Promise<GenererBordereauOutput> {
+    if (mode === 'bulk') {
+      if (!this.deps.persistBordereau) {
+        throw new Error('Bulk bordereau generation requires persistBordereau');
+      }
+      return this.executeBulk(input);
+    }
+    return this.executeSequential(input);
+  }
+
+  private async executeSequential(input: GenererBordereauInput): Promise<GenererBordereauOutput> {
     const reference = `BRD-${input.periode}-${Date.now()}`;
     const bordereau = await this.deps.createBordereau({ ...input, reference });
 
-    await this.deps.audit({
-      organisationId: input.organisationId,
-      scope: 'bordereau',
-      action: 'bordereau_created',
-      refId: bordereau.id,
-      afterData: { reference, periode: input.periode },
-    });
+    await this.deps.audit(this.bordereauCreatedAudit(input, bordereau.id, reference));
 
     const statutAPayer = await this.deps.findStatutAPayer();
     const commissions = await this.deps.findCommissionsForPeriode(input);
-
-    let ordre = 0;
-    let nombreCommissions = 0;
-    let nombreReprises = 0;
-    let nombrePrimes = 0;
-    let excludedForCQ = 0;
-
-    let totalBrut = 0;
-    let totalReprises = 0;
-    let totalAcomptes = 0;
+    const counters = this.emptyCounters();
 
     for (const commission of commissions) {
       // T23: Block commissions where CQ is not validated
       if (this.deps.findCQStatusForContrat) {
         const cqStatus = await this.deps.findCQStatusForContrat(commission.contratId);
         if (cqStatus !== 'VALIDE') {
-          excludedForCQ += 1;
-          this.logger.warn(
-            `Commission ${commission.id} excluded from bordereau: contrat ${commission.contratId} statut_cq=${cqStatus ?? 'null'} (motif: CQ_NON_VALIDE)`,
-          );
-          await this.deps.audit({
-            organisationId: input.organisationId,
-            scope: 'bordereau',
-            action: 'commission_excluded_cq',
-            refId: commission.id,
-            contratId: commission.contratId,
-            apporteurId: commission.apporteurId,
-            periode: input.periode,
-            afterData: {
-              motif: 'CQ_NON_VALIDE',
-              statutCq: cqStatus,
-            },
-          });
+          await this.deps.audit(this.excludeForCQ(input, commission, cqStatus, counters));
           continue;
         }
       }
@@ -160,206 +220,555 @@ export class GenererBordereauWorkflowService {
         Number(commission.montantBrut || 0),
       );
 
-      const montantBrut = this.round2(calcul.montantCalcule);
-      const montantReprise = this.round2(Number(commission.montantReprises || 0));
-      const montantAcompte = this.round2(Number(commission.montantAcomptes || 0));
-      const montantNet = this.round2(montantBrut - montantReprise - montantAcompte);
-
-      const isEligible =
-        commission.statutId === (statutAPayer?.id || '') &&
-        commission.contratValideCq !== false &&
-        commission.echeanceEncaissee !== false;
-
-      await this.deps.createLigne({
-        organisationId: input.organisationId,
-        bordereauId: bordereau.id,
-        commissionId: commission.id,
-        typeLigne: TypeLigne.COMMISSION,
-        contratId: commission.contratId,
-        contratReference: commission.reference,
-        montantBrut,
-        montantReprise,
-        montantNet,
-        baseCalcul: bareme.typeCalcul || TypeCalcul.POURCENTAGE,
-        tauxApplique: Number(bareme.tauxPourcentage || 0),
-        baremeId: (bareme as any).id || null,
-        statutLigne: isEligible ? StatutLigne.SELECTIONNEE : StatutLigne.DESELECTIONNEE,
-        selectionne: isEligible,
-        motifDeselection: isEligible ? null : 'NON_ELIGIBLE_ADV',
-        ordre,
-      });
-      ordre += 1;
-
-      nombreCommissions += 1;
-      totalBrut = this.round2(totalBrut + montantBrut);
-
-      await this.deps.audit({
-        organisationId: input.organisationId,
-        scope: 'engine',
-        action: 'commission_calculated',
-        refId: commission.id,
-        contratId: commission.contratId,
-        apporteurId: commission.apporteurId,
-        periode: input.periode,
-        afterData: {
-          montantCalcule: montantBrut,
-          typeCalcul: calcul.typeCalcul,
-          details: calcul.details,
-        },
-      });
+      const { ligne, audit } = this.commissionLigne(
+        input,
+        bordereau.id,
+        commission,
+        bareme,
+        calcul,
+        statutAPayer,
+        counters,
+      );
+      await this.deps.createLigne(ligne);
+      await this.deps.audit(audit);
     }
 
     const reprises = await this.deps.findReprisesForPeriode(input);
     for (const reprise of reprises) {
-      const type = this.toTypeReprise(reprise.typeReprise);
-      const fenetre = type === TypeReprise.RESILIATION ? 12 : 3;
-      const calculReprise = await this.deps.calculerReprise(reprise.contratId, type, fenetre, input.periode);
-      const montantReprise = this.round2(calculReprise.montantReprise);
-
-      await this.deps.updateReprise(reprise.id, {
-        montantReprise,
-        statutReprise: 'appliquee',
-        dateApplication: new Date(),
-      });
-
-      await this.deps.createLigne({
-        organisationId: input.organisationId,
-        bordereauId: bordereau.id,
-        repriseId: reprise.id,
-        typeLigne: TypeLigne.REPRISE,
-        contratId: reprise.contratId,
-        contratReference: reprise.id,
-        montantBrut: 0,
-        montantReprise,
-        montantNet: this.round2(-montantReprise),
-        statutLigne: StatutLigne.SELECTIONNEE,
-        selectionne: true,
-        ordre,
-      });
-      ordre += 1;
-
-      nombreReprises += 1;
-      totalReprises = this.round2(totalReprises + montantReprise);
-
-      await this.deps.audit({
-        organisationId: input.organisationId,
-        scope: 'reprise',
-        action: 'reprise_applied',
-        refId: reprise.id,
-        periode: input.periode,
-        afterData: { montantReprise },
-      });
+      const request = this.repriseRequest(reprise);
+      const calcul = await this.deps.calculerReprise(
+        request.contratId,
+        request.typeReprise,
+        request.fenetreMois,
+        input.periode,
+      );
+      const { update, ligne, audit } = this.repriseLigne(input, bordereau.id, reprise, calcul, counters);
+      await this.deps.updateReprise(reprise.id, update);
+      await this.deps.createLigne(ligne);
+      await this.deps.audit(audit);
     }
 
     const recurrences = await this.deps.findRecurrencesForPeriode(input);
     for (const recurrence of recurrences) {
-      const dateEncaissement = recurrence.dateEncaissement || new Date();
+      const request = this.recurrenceRequest(recurrence);
       const result = await this.deps.genererRecurrence(
-        recurrence.contratId,
-        recurrence.echeanceId || recurrence.id,
-        dateEncaissement.toISOString(),
+        request.contratId,
+        request.echeanceId,
+        request.dateEncaissement,
       );
-
-      if (!result.creee || !result.recurrence) {
+      const generated = this.recurrenceLigne(input, bordereau.id, recurrence, result, counters);
+      if (!generated) {
         continue;
       }
-
-      await this.deps.createLigne({
-        organisationId: input.organisationId,
-        bordereauId: bordereau.id,
-        typeLigne: TypeLigne.PRIME,
-        contratId: recurrence.contratId,
-        contratReference: recurrence.id,
-        montantBrut: this.round2(Number(result.recurrence.montantCalcule || 0)),
-        montantReprise: 0,
-        montantNet: this.round2(Number(result.recurrence.montantCalcule || 0)),
-        statutLigne: StatutLigne.SELECTIONNEE,
-        selectionne: true,
-        ordre,
-      });
-      ordre += 1;
-      nombrePrimes += 1;
-
-      await this.deps.audit({
-        organisationId: input.organisationId,
-        scope: 'recurrence',
-        action: 'recurrence_generated',
-        refId: recurrence.id,
-        periode: input.periode,
-        afterData: { montantCalcule: result.recurrence.montantCalcule },
-      });
+      await this.deps.createLigne(generated.ligne);
+      await this.deps.audit(generated.audit);
     }
 
     const reports = await this.deps.findReportsNegatifs(input);
     for (const report of reports) {
-      const montantAcompte = this.round2(Number(report.montantRestant || 0));
-      await this.deps.createLigne({
+      const { ligne, audit } = this.reportLigne(input, bordereau.id, report, counters);
+      await this.deps.createLigne(ligne);
+      await this.deps.audit(audit);
+    }
+
+    const { bordereauUpdate, audit, totaux } = this.finalize(input, bordereau.id, counters);
+    const updated = await this.deps.updateBordereau(bordereau.id, bordereauUpdate);
+    await this.deps.audit(audit);
+
+    return this.output(updated, counters, totaux);
+  }
+
+  private async executeBulk(input: GenererBordereauInput): Promise<GenererBordereauOutput> {
+    const reference = `BRD-${input.periode}-${Date.now()}`;
+    // Created by persistBordereau, in the same transaction as its lignes
+    const bordereau = { ...input, id: randomUUID(), reference };
+
+    const lignes: Record<string, unknown>[] = [];
+    const audits: Record<string, unknown>[] = [this.bordereauCreatedAudit(input, bordereau.id, reference)];
+    const repriseUpdates: GenererBordereauPersistPayload['repriseUpdates'] = [];
+    const recurrenceRows: Record<string, unknown>[] = [];
+    const counters = this.emptyCounters();
+
+    const [statutAPayer, commissions, reprises, recurrences, reports] = await Promise.all([
+      this.deps.findStatutAPayer(),
+      this.deps.findCommissionsForPeriode(input),
+      this.deps.findReprisesForPeriode(input),
+      this.deps.findRecurrencesForPeriode(input),
+      this.deps.findReportsNegatifs(input),
+    ]);
+
+    // T23: CQ statuses for the whole period in one read
+    const cqStatuses = await this.loadCQStatuses(commissions);
+    const included = cqStatuses
+      ? commissions.filter((commission) => cqStatuses.get(commission.contratId) === 'VALIDE')
+      : commissions;
+
+    const baremes = await this.loadBaremes(included);
+    const items = included.map((commission) => ({
+      contrat: { id: commission.contratId },
+      bareme: baremes.get(commission.id) as BaremeForCalculation,
+      montantBase: Number(commission.montantBrut || 0),
+    }));
+    const calculs = this.deps.calculerCommissions
+      ? this.deps.calculerCommissions(items)
+      : items.map((item) => this.deps.calculerCommission(item.contrat, item.bareme, item.montantBase));
+
+    const [repriseCalculs, recurrenceResults] = await Promise.all([
+      this.loadRepriseCalculs(input, reprises),
+      this.loadRecurrences(recurrences),
+    ]);
+
+    // Same ordering as the sequential path: exclusions are interleaved with commission lines
+    let calculIndex = 0;
+    for (const commission of commissions) {
+      if (cqStatuses) {
+        const cqStatus = cqStatuses.get(commission.contratId) ?? null;
+        if (cqStatus !== 'VALIDE') {
+          audits.push(this.excludeForCQ(input, commission, cqStatus, counters));
+          continue;
+        }
+      }
+
+      const { bareme } = items[calculIndex];
+      const calcul = calculs[calculIndex];
+      calculIndex += 1;
+
+      const { ligne, audit } = this.commissionLigne(
+        input,
+        bordereau.id,
+        commission,
+        bareme,
+        calcul,
+        statutAPayer,
+        counters,
+      );
+      lignes.push(ligne);
+      audits.push(audit);
+    }
+
+    reprises.forEach((reprise, index) => {
+      const { update, ligne, audit } = this.repriseLigne(
+        input,
+        bordereau.id,
+        reprise,
+        repriseCalculs[index],
+        counters,
+      );
+      repriseUpdates.push({ id: reprise.id, payload: update });
+      lignes.push(ligne);
+      audits.push(audit);
+    });
+
+    recurrences.forEach((recurrence, index) => {
+      const result = recurrenceResults[index];
+      const generated = this.recurrenceLigne(input, bordereau.id, recurrence, result, counters);
+      if (!generated || !result.recurrence) {
+        return;
+      }
+      recurrenceRows.push({
+        ...result.recurrence,
         organisationId: input.organisationId,
+        apporteurId: input.apporteurId,
+        commissionInitialeId: recurrence.commissionInitialeId,
         bordereauId: bordereau.id,
-        typeLigne: TypeLigne.ACOMPTE,
-        contratId: `report-${report.id}`,
-        contratReference: `REPORT-${report.periodeOrigine}`,
-        montantBrut: 0,
-        montantReprise: 0,
-        montantNet: this.round2(-montantAcompte),
-        statutLigne: StatutLigne.SELECTIONNEE,
-        selectionne: true,
-        ordre,
       });
-      ordre += 1;
-      totalAcomptes = this.round2(totalAcomptes + montantAcompte);
+      lignes.push(generated.ligne);
+      audits.push(generated.audit);
+    });
 
-      await this.deps.audit({
-        organisationId: input.organisationId,
-        scope: 'report',
-        action: 'report_negatif_applied',
-        refId: report.id,
-        periode: input.periode,
-        afterData: { montantAcompte, periodeOrigine: report.periodeOrigine },
-      });
+    for (const report of reports) {
+      const { ligne, audit } = this.reportLigne(input, bordereau.id, report, counters);
+      lignes.push(ligne);
+      audits.push(audit);
     }
 
-    const totalNet = this.round2(totalBrut - totalReprises - totalAcomptes);
-    const updated = await this.deps.updateBordereau(bordereau.id, {
-      nombreLignes: ordre,
-      totalBrut,
-      totalReprises,
-      totalAcomptes,
-      totalNetAPayer: totalNet,
+    const { bordereauUpdate, audit, totaux } = this.finalize(input, bordereau.id, counters);
+    audits.push(audit);
+
+    const updated = await this.deps.persistBordereau!({
+      bordereau,
+      lignes,
+      audits,
+      repriseUpdates,
+      recurrences: recurrenceRows,
+      bordereauUpdate,
     });
 
-    await this.deps.audit({
+    return this.output(updated, counters, totaux);
+  }
+
+  private async loadCQStatuses(
+    commissions: GenererBordereauCommission[],
+  ): Promise<Map<string, string | null> | null> {
+    const contratIds = [...new Set(commissions.map((commission) => commission.contratId))];
+
+    if (this.deps.findCQStatusesForContrats) {
+      return this.deps.findCQStatusesForContrats(contratIds);
+    }
+    if (!this.deps.findCQStatusForContrat) {
+      return null;
+    }
+
+    const statuses = new Map<string, string | null>();
+    for (const contratId of contratIds) {
+      statuses.set(contratId, await this.deps.findCQStatusForContrat(contratId));
+    }
+    return statuses;
+  }
+
+  private async loadBaremes(
+    commissions: GenererBordereauCommission[],
+  ): Promise<Map<string, BaremeForCalculation>> {
+    if (this.deps.findBaremesForCommissions) {
+      return this.deps.findBaremesForCommissions(commissions);
+    }
+
+    const baremes = new Map<string, BaremeForCalculation>();
+    for (const commission of commissions) {
+      baremes.set(commission.id, await this.deps.findBaremeForCommission(commission));
+    }
+    return baremes;
+  }
+
+  private async loadRepriseCalculs(
+    input: GenererBordereauInput,
+    reprises: GenererBordereauReprise[],
+  ): Promise<RepriseCalculation[]> {
+    const requests = reprises.map((reprise) => this.repriseRequest(reprise));
+
+    if (this.deps.calculerReprises) {
+      return this.deps.calculerReprises(requests, input.periode);
+    }
+
+    const calculs: RepriseCalculation[] = [];
+    for (const request of requests) {
+      calculs.push(
+        await this.deps.calculerReprise(request.contratId, request.typeReprise, request.fenetreMois, input.periode),
+      );
+    }
+    return calculs;
+  }
+
+  private async loadRecurrences(recurrences: GenererBordereauRecurrence[]): Promise<RecurrenceGeneration[]> {
+    const requests = recurrences.map((recurrence) => this.recurrenceRequest(recurrence));
+
+    if (this.deps.preparerRecurrences) {
+      return this.deps.preparerRecurrences(requests);
+    }
+
+    const results: RecurrenceGeneration[] = [];
+    for (const request of requests) {
+      results.push(await this.deps.genererRecurrence(request.contratId, request.echeanceId, request.dateEncaissement));
+    }
+    return results;
+  }
+
+  // ── Line builders shared by both modes ───────────────────────────────
+
+  private emptyCounters(): BordereauCounters {
+    return {
+      ordre: 0,
+      nombreCommissions: 0,
+      nombreReprises: 0,
+      nombrePrimes: 0,
+      excludedForCQ: 0,
+      totalBrut: 0,
+      totalReprises: 0,
+      totalAcomptes: 0,
+    };
+  }
+
+  private bordereauCreatedAudit(
+    input: GenererBordereauInput,
+    bordereauId: string,
+    reference: string,
+  ): Record<string, unknown> {
+    return {
       organisationId: input.organisationId,
       scope: 'bordereau',
       action: 'bordereau_created',
-      refId: bordereau.id,
+      refId: bordereauId,
+      afterData: { reference, periode: input.periode },
+    };
+  }
+
+  private excludeForCQ(
+    input: GenererBordereauInput,
+    commission: GenererBordereauCommission,
+    cqStatus: string | null,
+    counters: BordereauCounters,
+  ): Record<string, unknown> {
+    counters.excludedForCQ += 1;
+    this.logger.warn(
+      `Commission ${commission.id} excluded from bordereau: contrat ${commission.contratId} statut_cq=${cqStatus ?? 'null'} (motif: CQ_NON_VALIDE)`,
+    );
+    return {
+      organisationId: input.organisationId,
+      scope: 'bordereau',
+      action: 'commission_excluded_cq',
+      refId: commission.id,
+      contratId: commission.contratId,
+      apporteurId: commission.apporteurId,
       periode: input.periode,
       afterData: {
+        motif: 'CQ_NON_VALIDE',
+        statutCq: cqStatus,
+      },
+    };
+  }
+
+  private commissionLigne(
+    input: GenererBordereauInput,
+    bordereauId: string,
+    commission: GenererBordereauCommission,
+    bareme: BaremeForCalculation,
+    calcul: CommissionResult,
+    statutAPayer: { id: string; code: string } | null,
+    counters: BordereauCounters,
+  ): { ligne: Record<string, unknown>; audit: Record<string, unknown> } {
+    const montantBrut = this.round2(calcul.montantCalcule);
+    const montantReprise = this.round2(Number(commission.montantReprises || 0));
+    const montantAcompte = this.round2(Number(commission.montantAcomptes || 0));
+    const montantNet = this.round2(montantBrut - montantReprise - montantAcompte);
+
+    const isEligible =
+      commission.statutId === (statutAPayer?.id || '') &&
+      commission.contratValideCq !== false &&
+      commission.echeanceEncaissee !== false;
+
+    const ligne = {
+      organisationId: input.organisationId,
+      bordereauId,
+      commissionId: commission.id,
+      typeLigne: TypeLigne.COMMISSION,
+      contratId: commission.contratId,
+      contratReference: commission.reference,
+      montantBrut,
+      montantReprise,
+      montantNet,
+      baseCalcul: bareme.typeCalcul || TypeCalcul.POURCENTAGE,
+      tauxApplique: Number(bareme.tauxPourcentage || 0),
+      baremeId: (bareme as any).id || null,
+      statutLigne: isEligible ? StatutLigne.SELECTIONNEE : StatutLigne.DESELECTIONNEE,
+      selectionne: isEligible,
+      motifDeselection: isEligible ? null : 'NON_ELIGIBLE_ADV',
+      ordre: counters.ordre,
+    };
+    counters.ordre += 1;
+
+    counters.nombreCommissions += 1;
+    counters.totalBrut = this.round2(counters.totalBrut + montantBrut);
+
+    const audit = {
+      organisationId: input.organisationId,
+      scope: 'engine',
+      action: 'commission_calculated',
+      refId: commission.id,
+      contratId: commission.contratId,
+      apporteurId: commission.apporteurId,
+      periode: input.periode,
+      afterData: {
+        montantCalcule: montantBrut,
+        typeCalcul: calcul.typeCalcul,
+        details: calcul.details,
+      },
+    };
+
+    return { ligne, audit };
+  }
+
+  private repriseRequest(reprise: GenererBordereauReprise): RepriseCalculationRequest {
+    const typeReprise = this.toTypeReprise(reprise.typeReprise);
+    return {
+      contratId: reprise.contratId,
+      typeReprise,
+      fenetreMois: typeReprise === TypeReprise.RESILIATION ? 12 : 3,
+    };
+  }
+
+  private repriseLigne(
+    input: GenererBordereauInput,
+    bordereauId: string,
+    reprise: GenererBordereauReprise,
+    calculReprise: RepriseCalculation,
+    counters: BordereauCounters,
+  ): { update: Record<string, unknown>; ligne: Record<string, unknown>; audit: Record<string, unknown> } {
+    const montantReprise = this.round2(calculReprise.montantReprise);
+
+    const update = {
+      montantReprise,
+      statutReprise: 'appliquee',
+      dateApplication: new Date(),
+    };
+
+    const ligne = {
+      organisationId: input.organisationId,
+      bordereauId,
+      repriseId: reprise.id,
+      typeLigne: TypeLigne.REPRISE,
+      contratId: reprise.contratId,
+      contratReference: reprise.id,
+      montantBrut: 0,
+      montantReprise,
+      montantNet: this.round2(-montantReprise),
+      statutLigne: StatutLigne.SELECTIONNEE,
+      selectionne: true,
+      ordre: counters.ordre,
+    };
+    counters.ordre += 1;
+
+    counters.nombreReprises += 1;
+    counters.totalReprises = this.round2(counters.totalReprises + montantReprise);
+
+    const audit = {
+      organisationId: input.organisationId,
+      scope: 'reprise',
+      action: 'reprise_applied',
+      refId: reprise.id,
+      periode: input.periode,
+      afterData: { montantReprise },
+    };
+
+    return { update, ligne, audit };
+  }
+
+  private recurrenceRequest(recurrence: GenererBordereauRecurrence): RecurrenceGenerationRequest {
+    return {
+      contratId: recurrence.contratId,
+      echeanceId: recurrence.echeanceId || recurrence.id,
+      dateEncaissement: (recurrence.dateEncaissement || new Date()).toISOString(),
+    };
+  }
+
+  private recurrenceLigne(
+    input: GenererBordereauInput,
+    bordereauId: string,
+    recurrence: GenererBordereauRecurrence,
+    result: RecurrenceGeneration,
+    counters: BordereauCounters,
+  ): { ligne: Record<string, unknown>; audit: Record<string, unknown> } | null {
+    if (!result.creee || !result.recurrence) {
+      return null;
+    }
+
+    const ligne = {
+      organisationId: input.organisationId,
+      bordereauId,
+      typeLigne: TypeLigne.PRIME,
+      contratId: recurrence.contratId,
+      contratReference: recurrence.id,
+      montantBrut: this.round2(Number(result.recurrence.montantCalcule || 0)),
+      montantReprise: 0,
+      montantNet: this.round2(Number(result.recurrence.montantCalcule || 0)),
+      statutLigne: StatutLigne.SELECTIONNEE,
+      selectionne: true,
+      ordre: counters.ordre,
+    };
+    counters.ordre += 1;
+    counters.nombrePrimes += 1;
+
+    const audit = {
+      organisationId: input.organisationId,
+      scope: 'recurrence',
+      action: 'recurrence_generated',
+      refId: recurrence.id,
+      periode: input.periode,
+      afterData: { montantCalcule: result.recurrence.montantCalcule },
+    };
+
+    return { ligne, audit };
+  }
+
+  private reportLigne(
+    input: GenererBordereauInput,
+    bordereauId: string,
+    report: GenererBordereauReportNegatif,
+    counters: BordereauCounters,
+  ): { ligne: Record<string, unknown>; audit: Record<string, unknown> } {
+    const montantAcompte = this.round2(Number(report.montantRestant || 0));
+    const ligne = {
+      organisationId: input.organisationId,
+      bordereauId,
+      typeLigne: TypeLigne.ACOMPTE,
+      contratId: `report-${report.id}`,
+      contratReference: `REPORT-${report.periodeOrigine}`,
+      montantBrut: 0,
+      montantReprise: 0,
+      montantNet: this.round2(-montantAcompte),
+      statutLigne: StatutLigne.SELECTIONNEE,
+      selectionne: true,
+      ordre: counters.ordre,
+    };
+    counters.ordre += 1;
+    counters.totalAcomptes = this.round2(counters.totalAcomptes + montantAcompte);
+
+    const audit = {
+      organisationId: input.organisationId,
+      scope: 'report',
+      action: 'report_negatif_applied',
+      refId: report.id,
+      periode: input.periode,
+      afterData: { montantAcompte, periodeOrigine: report.periodeOrigine },
+    };
+
+    return { ligne, audit };
+  }
+
+  private finalize(
+    input: GenererBordereauInput,
+    bordereauId: string,
+    counters: BordereauCounters,
+  ): {
+    bordereauUpdate: Record<string, unknown>;
+    audit: Record<string, unknown>;
+    totaux: GenererBordereauOutput['totaux'];
+  } {
+    const { ordre, totalBrut, totalReprises, totalAcomptes } = counters;
+    const totalNet = this.round2(totalBrut - totalReprises - totalAcomptes);
+
+    return {
+      bordereauUpdate: {
         nombreLignes: ordre,
         totalBrut,
         totalReprises,
         totalAcomptes,
-        totalNet,
+        totalNetAPayer: totalNet,
       },
-    });
+      audit: {
+        organisationId: input.organisationId,
+        scope: 'bordereau',
+        action: 'bordereau_created',
+        refId: bordereauId,
+        periode: input.periode,
+        afterData: {
+          nombreLignes: ordre,
+          totalBrut,
+          totalReprises,
+          totalAcomptes,
+          totalNet,
+        },
+      },
+      totaux: { totalBrut, totalReprises, totalAcomptes, totalNet },
+    };
+  }
 
+  private output(
+    bordereau: unknown,
+    counters: BordereauCounters,
+    totaux: GenererBordereauOutput['totaux'],
+  ): GenererBordereauOutput {
     return {
-      bordereau: updated,
+      bordereau,
       summary: {
-        nombre_commissions: nombreCommissions,
-        nombre_reprises: nombreReprises,
-        nombre_primes: nombrePrimes,
-        excludedForCQ,
-        total_brut: this.toMoney(totalBrut),
-        total_reprises: this.toMoney(totalReprises),
-        total_net: this.toMoney(totalNet),
-      },
-      totaux: {
-        totalBrut,
-        totalReprises,
-        totalAcomptes,
-        totalNet,
+        nombre_commissions: counters.nombreCommissions,
+        nombre_reprises: counters.nombreReprises,
+        nombre_primes: counters.nombrePrimes,
+        excludedForCQ: counters.excludedForCQ,
+        total_brut: this.toMoney(totaux.totalBrut),
+        total_reprises: this.toMoney(totaux.totalReprises),
+        total_net: this.toMoney(totaux.totalNet),
       },
+      totaux,
     };
   }
 
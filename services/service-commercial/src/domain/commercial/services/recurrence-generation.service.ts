@@ -44,6 +44,16 @@ export interface RecurrenceDependencies {
   getRecurrenceMonthNumber: (contratId: string, dateEncaissement: Date) => Promise<number>;
   persistRecurrence: (line: RecurrenceLine) => Promise<void>;
   suspendRecurrences: (contratId: string, motif: string) => Promise<void>;
+  /** Batch variant: ids of the reglee echeances among `echeanceIds`, in one read */
+  findEcheancesReglees?: (echeanceIds: string[]) => Promise<Set<string>>;
+  /** Batch variant: contrats keyed by id, in one read */
+  findContratsByIds?: (contratIds: string[]) => Promise<Map<string, ContratForRecurrence>>;
+}
+
+export interface RecurrenceRequest {
+  contratId: string;
+  echeanceId: string;
+  dateEncaissement: string;
 }
 
 const defaultDeps: RecurrenceDependencies = {
@@ -69,9 +79,11 @@ const defaultDeps: RecurrenceDependencies = {
 
 @Injectable()
 export class RecurrenceGenerationService {
-  private readonly deps: RecurrenceDependencies = defaultDeps;
+  private readonly deps: RecurrenceDependencies;
 
-  constructor() {}
+  constructor(deps: Partial<RecurrenceDependencies> = {}) {
+    this.deps = { ...defaultDeps, ...deps };
+  }
 
   async genererRecurrence(
     contratId: string,
@@ -92,6 +104,88 @@ export class RecurrenceGenerationService {
     }
 
     const numeroMois = await this.deps.getRecurrenceMonthNumber(contratId, encaissementDate);
+    const result = this.construireRecurrence(contratId, echeanceId, encaissementDate, contrat, bareme, numeroMois);
+    if (result.recurrence) {
+      await this.deps.persistRecurrence(result.recurrence);
+    }
+    return result;
+  }
+
+  /**
+   * Recurrences of a whole period, without persisting them: echeances and contrats are
+   * read once for every request, baremes and month numbers once per contrat and date.
+   * The caller persists the created lines. Results are in request order.
+   */
+  async preparerRecurrences(requests: RecurrenceRequest[]): Promise<RecurrenceResult[]> {
+    const reglees = await this.loadEcheancesReglees([...new Set(requests.map((request) => request.echeanceId))]);
+    const payables = requests.filter((request) => reglees.has(request.echeanceId));
+    const contrats = await this.loadContrats([...new Set(payables.map((request) => request.contratId))]);
+
+    const baremes = new Map<string, BaremeForRecurrence>();
+    const moisByKey = new Map<string, number>();
+    const results: RecurrenceResult[] = [];
+    for (const { contratId, echeanceId, dateEncaissement } of requests) {
+      if (!reglees.has(echeanceId)) {
+        results.push({ creee: false, raison: 'ECHEANCE_NON_REGLEE', recurrence: null });
+        continue;
+      }
+
+      const encaissementDate = new Date(dateEncaissement);
+      const key = `${contratId}|${dateEncaissement}`;
+      if (!baremes.has(key)) {
+        baremes.set(key, await this.deps.findBaremeAtDate(contratId, encaissementDate));
+      }
+      const contrat = contrats.get(contratId);
+      const bareme = baremes.get(key) as BaremeForRecurrence;
+      if (!contrat || !this.verifierEligibilite(contrat, bareme, this.toPeriode(encaissementDate))) {
+        results.push({ creee: false, raison: 'CONTRAT_RESILIE', recurrence: null });
+        continue;
+      }
+
+      if (!moisByKey.has(key)) {
+        moisByKey.set(key, await this.deps.getRecurrenceMonthNumber(contratId, encaissementDate));
+      }
+      results.push(
+        this.construireRecurrence(contratId, echeanceId, encaissementDate, contrat, bareme, moisByKey.get(key) as number),
+      );
+    }
+    return results;
+  }
+
+  async suspendreRecurrences(contratId: string, motif: string): Promise<void> {
+    await this.deps.suspendRecurrences(contratId, motif);
+  }
+
+  verifierEligibilite(
+    contrat: ContratForRecurrence,
+    bareme: BaremeForRecurrence,
+    periode: string,
+  ): boolean {
+    if (!bareme.recurrenceActive || !bareme.tauxRecurrence || bareme.tauxRecurrence <= 0) {
+      return false;
+    }
+
+    if (contrat.statut.toUpperCase() !== 'VALIDE' && contrat.statut.toUpperCase() !== 'ACTIF') {
+      return false;
+    }
+
+    if (!contrat.dateFin) {
+      return true;
+    }
+
+    const dateFin = typeof contrat.dateFin === 'string' ? new Date(contrat.dateFin) : contrat.dateFin;
+    const finPeriode = this.toPeriode(dateFin);
+    return finPeriode >= periode;
+  }
+
+  private construireRecurrence(
+    contratId: string,
+    echeanceId: string,
+    encaissementDate: Date,
+    contrat: ContratForRecurrence,
+    bareme: BaremeForRecurrence,
+    numeroMois: number,
+  ): RecurrenceResult {
     if (bareme.dureeRecurrenceMois !== null && numeroMois > bareme.dureeRecurrenceMois) {
       return { creee: false, raison: 'DUREE_MAX_ATTEINTE', recurrence: null };
     }
@@ -114,8 +208,6 @@ export class RecurrenceGenerationService {
       statutRecurrence: StatutRecurrence.ACTIVE,
     };
 
-    await this.deps.persistRecurrence(recurrence);
-
     return {
       creee: true,
       raison: null,
@@ -123,30 +215,30 @@ export class RecurrenceGenerationService {
     };
   }
 
-  async suspendreRecurrences(contratId: string, motif: string): Promise<void> {
-    await this.deps.suspendRecurrences(contratId, motif);
-  }
-
-  verifierEligibilite(
-    contrat: ContratForRecurrence,
-    bareme: BaremeForRecurrence,
-    periode: string,
-  ): boolean {
-    if (!bareme.recurrenceActive || !bareme.tauxRecurrence || bareme.tauxRecurrence <= 0) {
-      return false;
+  private async loadEcheancesReglees(echeanceIds: string[]): Promise<Set<string>> {
+    if (this.deps.findEcheancesReglees) {
+      return this.deps.findEcheancesReglees(echeanceIds);
     }
 
-    if (contrat.statut.toUpperCase() !== 'VALIDE' && contrat.statut.toUpperCase() !== 'ACTIF') {
-      return false;
+    const reglees = new Set<string>();
+    for (const echeanceId of echeanceIds) {
+      if (await this.deps.isEcheanceReglee(echeanceId)) {
+        reglees.add(echeanceId);
+      }
     }
+    return reglees;
+  }
 
-    if (!contrat.dateFin) {
-      return true;
+  private async loadContrats(contratIds: string[]): Promise<Map<string, ContratForRecurrence>> {
+    if (this.deps.findContratsByIds) {
+      return this.deps.findContratsByIds(contratIds);
     }
 
-    const dateFin = typeof contrat.dateFin === 'string' ? new Date(contrat.dateFin) : contrat.dateFin;
-    const finPeriode = this.toPeriode(dateFin);
-    return finPeriode >= periode;
+    const contrats = new Map<string, ContratForRecurrence>();
+    for (const contratId of contratIds) {
+      contrats.set(contratId, await this.deps.findContratById(contratId));
+    }
+    return contrats;
   }
 
   private toPeriode(value: Date): string {
@@ -9,9 +9,23 @@ export interface RepriseDependencies {
     periodeActuelle: string,
   ) => Promise<number[]>;
   findCommissionDuePeriode: (contratId: string, periodeActuelle: string) => Promise<number>;
+  /** Batch variant: commissions versees of every contrat in one read, keyed by contrat id */
+  findCommissionsVerseesDansFenetreForContrats?: (
+    contratIds: string[],
+    fenetreMois: number,
+    periodeActuelle: string,
+  ) => Promise<Map<string, number[]>>;
+  /** Batch variant: commission due of every contrat in one read, keyed by contrat id */
+  findCommissionsDuesPeriode?: (contratIds: string[], periodeActuelle: string) => Promise<Map<string, number>>;
   now: () => Date;
 }
 
+export interface RepriseCalculationRequest {
+  contratId: string;
+  typeReprise: TypeReprise;
+  fenetreMois: number;
+}
+
 export interface RepriseInput {
   id: string;
   contratId: string;
@@ -70,9 +84,7 @@ export interface ContestationRegularisationResult {
 
 @Injectable()
 export class RepriseCalculationService {
-  private readonly deps: Partial<RepriseDependencies> = {};
-
-  constructor() {}
+  constructor(private readonly deps: Partial<RepriseDependencies> = {}) {}
 
   async calculerReprise(
     contratId: string,
@@ -80,13 +92,57 @@ export class RepriseCalculationService {
     fenetreMois: number,
     periodeActuelle: string,
   ): Promise<RepriseCalculationResult> {
-    if (fenetreMois <= 0) {
-      throw new DomainException('La fenetre de reprise doit etre strictement positive', 'INVALID_FENETRE');
-    }
+    this.assertFenetre(fenetreMois);
 
     const commissionsVersees = await this.getCommissionsVersees(contratId, fenetreMois, periodeActuelle);
     const commissionDuePeriode = await this.getCommissionDuePeriode(contratId, periodeActuelle);
 
+    return this.resultat(typeReprise, commissionsVersees, commissionDuePeriode);
+  }
+
+  /**
+   * Reprises of a whole period: commissions versees are read once per fenetre and
+   * commissions dues once for every contrat. Results are in request order.
+   */
+  async calculerReprises(
+    requests: RepriseCalculationRequest[],
+    periodeActuelle: string,
+  ): Promise<RepriseCalculationResult[]> {
+    requests.forEach((request) => this.assertFenetre(request.fenetreMois));
+
+    const contratIdsByFenetre = new Map<number, Set<string>>();
+    for (const { contratId, fenetreMois } of requests) {
+      const contratIds = contratIdsByFenetre.get(fenetreMois) ?? new Set<string>();
+      contratIds.add(contratId);
+      contratIdsByFenetre.set(fenetreMois, contratIds);
+    }
+
+    const verseesByFenetre = new Map<number, Map<string, number[]>>();
+    for (const [fenetreMois, contratIds] of contratIdsByFenetre) {
+      verseesByFenetre.set(
+        fenetreMois,
+        await this.getCommissionsVerseesForContrats([...contratIds], fenetreMois, periodeActuelle),
+      );
+    }
+    const dues = await this.getCommissionsDues(
+      [...new Set(requests.map((request) => request.contratId))],
+      periodeActuelle,
+    );
+
+    return requests.map(({ contratId, typeReprise, fenetreMois }) =>
+      this.resultat(
+        typeReprise,
+        verseesByFenetre.get(fenetreMois)?.get(contratId) ?? [],
+        dues.get(contratId) ?? 0,
+      ),
+    );
+  }
+
+  private resultat(
+    typeReprise: TypeReprise,
+    commissionsVersees: number[],
+    commissionDuePeriode: number,
+  ): RepriseCalculationResult {
     const totalCommissionsFenetre = this.arrondir(
       commissionsVersees.reduce((sum, value) => sum + Number(value || 0), 0),
     );
@@ -162,6 +218,40 @@ export class RepriseCalculationService {
     return [];
   }
 
+  private async getCommissionsVerseesForContrats(
+    contratIds: string[],
+    fenetreMois: number,
+    periodeActuelle: string,
+  ): Promise<Map<string, number[]>> {
+    if (this.deps?.findCommissionsVerseesDansFenetreForContrats) {
+      return this.deps.findCommissionsVerseesDansFenetreForContrats(contratIds, fenetreMois, periodeActuelle);
+    }
+
+    const versees = new Map<string, number[]>();
+    for (const contratId of contratIds) {
+      versees.set(contratId, await this.getCommissionsVersees(contratId, fenetreMois, periodeActuelle));
+    }
+    return versees;
+  }
+
+  private async getCommissionsDues(contratIds: string[], periodeActuelle: string): Promise<Map<string, number>> {
+    if (this.deps?.findCommissionsDuesPeriode) {
+      return this.deps.findCommissionsDuesPeriode(contratIds, periodeActuelle);
+    }
+
+    const dues = new Map<string, number>();
+    for (const contratId of contratIds) {
+      dues.set(contratId, await this.getCommissionDuePeriode(contratId, periodeActuelle));
+    }
+    return dues;
+  }
+
+  private assertFenetre(fenetreMois: number): void {
+    if (fenetreMois <= 0) {
+      throw new DomainException('La fenetre de reprise doit etre strictement positive', 'INVALID_FENETRE');
+    }
+  }
+
   private async getCommissionDuePeriode(contratId: string, periodeActuelle: string): Promise<number> {
     if (this.deps?.findCommissionDuePeriode) {
       return this.deps.findCommissionDuePeriode(contratId, periodeActuelle);
@@ -0,0 +1,56 @@
+import {
+  Entity,
+  PrimaryGeneratedColumn,
+  Column,
+  UpdateDateColumn,
+  Index,
+} from 'typeorm';
+
+/**
+ * Materialized dashboard aggregates: one row per organisation, societe,
+ * creation month of the contrats and commercial.
+ *
+ * Rows are always recomputed from `contrat` for a whole bucket
+ * (organisation, societe, mois), never patched with deltas, so replaying
+ * an event or a refresh is harmless.
+ */
+@Entity('contrat_kpi_mensuel')
+@Index(['organisationId', 'mois'])
+@Index(['organisationId', 'commercialId'])
+export class ContratKpiMensuelEntity {
+  @PrimaryGeneratedColumn('uuid')
+  id: string;
+
+  @Column({ name: 'organisation_id', type: 'uuid' })
+  organisationId: string;
+
+  @Column({ name: 'societe_id', type: 'uuid', nullable: true })
+  societeId: string | null;
+
+  /** Creation month of the contrats, YYYY-MM */
+  @Column({ type: 'varchar', length: 7 })
+  mois: string;
+
+  @Column({ name: 'commercial_id', type: 'uuid' })
+  commercialId: string;
+
+  @Column({ name: 'contrats_crees', type: 'int', default: 0 })
+  contratsCrees: number;
+
+  /** Contrats currently signe, actif or en_cours */
+  @Column({ name: 'contrats_signes', type: 'int', default: 0 })
+  contratsSignes: number;
+
+  @Column({ name: 'montant_signes', type: 'decimal', precision: 15, scale: 2, default: 0 })
+  montantSignes: number;
+
+  /** Signed contrats with a montant, denominator of the panier moyen */
+  @Column({ name: 'montant_signes_nombre', type: 'int', default: 0 })
+  montantSignesNombre: number;
+
+  @Column({ name: 'contrats_impayes', type: 'int', default: 0 })
+  contratsImpayes: number;
+
+  @UpdateDateColumn({ name: 'refreshed_at' })
+  refreshedAt: Date;
+}
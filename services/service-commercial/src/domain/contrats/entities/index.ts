@@ -5,3 +5,4 @@ export * from './ligne-contrat.entity';
 export * from './historique-statut-contrat.entity';
 export * from './orchestration-history.entity';
 export * from './reconduction-tacite-log.entity';
+export * from './contrat-kpi-mensuel.entity';
@@ -0,0 +1,212 @@
+import { afterEach, describe, expect, it } from 'bun:test';
+import type { ApporteurService } from '../../../../infrastructure/persistence/typeorm/repositories/commercial/apporteur.service';
+import type { ProduitService } from '../../../../infrastructure/persistence/typeorm/repositories/products/produit.service';
+import type { ContratService } from '../../../../infrastructure/persistence/typeorm/repositories/contrats/contrat.service';
+import type { SubscriptionService } from '../../../../infrastructure/persistence/typeorm/repositories/subscriptions/subscription.service';
+import { ImportMapperService, type ExternalProspectPayload } from '../import-mapper.service';
+import { ImportOrchestratorService, type ImportResult } from '../import-orchestrator.service';
+
+const originalFetch = globalThis.fetch;
+
+function makeProspect(index: number): ExternalProspectPayload {
+  return {
+    idProspect: `p-${index}`,
+    nom: index === 5 ? 'KO' : `Nom ${index}`,
+    prenom: 'Prenom',
+    telephone: `06000000${String(index).padStart(2, '0')}`,
+    commercial: { id: 'com-1', nom: 'Commercial' },
+    Souscription: [
+      {
+        idSouscription: `s-${index}`,
+        offre: { offreId: 'off-1', nom: 'Offre', prix: 10 },
+        contrats: [{ idContrat: `c-${index}`, dateDebut: '2026-01-01' }],
+      },
+    ],
+    informationsPaiement: [{ idInfoPaiement: `pay-${index}`, IBAN: 'FR76', BIC: 'BIC' }],
+  };
+}
+
+function createFixture(prospects: ExternalProspectPayload[], pageSize: number) {
+  const events: string[] = [];
+  const fetchedPages: number[] = [];
+  const bulkLookups = { apporteurs: 0, produits: 0, contrats: 0 };
+  const singleLookups: string[] = [];
+  const clientCreates = { inFlight: 0, max: 0 };
+  const totalPages = Math.ceil(prospects.length / pageSize);
+  let sequence = 0;
+  const entity = () => ({ id: `id-${++sequence}`, updatedAt: new Date('2026-01-01T00:00:00.000Z') });
+
+  globalThis.fetch = (async (input: string | URL) => {
+    const page = Number(new URL(String(input)).searchParams.get('page'));
+    fetchedPages.push(page);
+    events.push(`fetch:${page}`);
+    return {
+      ok: true,
+      status: 200,
+      json: async () => ({
+        data: prospects.slice((page - 1) * pageSize, page * pageSize),
+        pagination: { total_pages: totalPages },
+      }),
+    } as Response;
+  }) as typeof fetch;
+
+  const apporteurService = {
+    findByUtilisateurs: async () => {
+      bulkLookups.apporteurs += 1;
+      events.push('preload');
+      return [];
+    },
+    findByUtilisateur: async (id: string) => {
+      singleLookups.push(`apporteur:${id}`);
+      throw new Error('not found');
+    },
+    create: async () => entity(),
+    update: async () => entity(),
+  } as unknown as ApporteurService;
+
+  const produitService = {
+    findBySkus: async () => {
+      bulkLookups.produits += 1;
+      return [];
+    },
+    findBySku: async (_organisationId: string, sku: string) => {
+      singleLookups.push(`produit:${sku}`);
+      throw new Error('not found');
+    },
+    create: async () => entity(),
+    update: async () => entity(),
+  } as unknown as ProduitService;
+
+  const contratService = {
+    findByReferences: async () => {
+      bulkLookups.contrats += 1;
+      return [];
+    },
+    findByReference: async (_organisationId: string, reference: string) => {
+      singleLookups.push(`contrat:${reference}`);
+      throw new Error('not found');
+    },
+    create: async () => entity(),
+    update: async () => entity(),
+  } as unknown as ContratService;
+
+  const subscriptionService = {
+    findAll: async () => ({ subscriptions: [] }),
+    create: async () => entity(),
+    update: async () => entity(),
+  } as unknown as SubscriptionService;
+
+  const clientsClient = {
+    search: async () => ({ found: false }),
+    create: async (request: { nom: string }) => {
+      clientCreates.inFlight += 1;
+      clientCreates.max = Math.max(clientCreates.max, clientCreates.inFlight);
+      await new Promise((resolve) => setTimeout(resolve, 2));
+      clientCreates.inFlight -= 1;
+      if (request.nom === 'KO') {
+        throw new Error('CLIENT_CREATE_FAILED');
+      }
+      return { id: entity().id };
+    },
+    update: async () => ({ id: entity().id }),
+  };
+
+  const usersClient = {
+    ensureUser: async (input: { id?: string }) => input.id ?? null,
+  };
+
+  const paymentInfoClient = {
+    getByExternalId: async () => null,
+    upsertByExternalId: async () => ({ created: true }),
+  };
+
+  const service = new ImportOrchestratorService(
+    new ImportMapperService(),
+    apporteurService,
+    produitService,
+    contratService,
+    subscriptionService,
+    clientsClient as any,
+    usersClient as any,
+    paymentInfoClient as any,
+  );
+
+  return { service, events, fetchedPages, bulkLookups, singleLookups, clientCreates };
+}
+
+function counters(result: ImportResult) {
+  return {
+    total: result.total,
+    created: result.created,
+    updated: result.updated,
+    skipped: result.skipped,
+    errors: result.errors,
+  };
+}
+
+const prospects = Array.from({ length: 10 }, (_, index) => makeProspect(index + 1));
+const config = { organisationId: 'org-1', apiUrl: 'https://legacy.test', apiKey: 'key', pageSize: 4 };
+
+describe('ImportOrchestratorService', () => {
+  afterEach(() => {
+    globalThis.fetch = originalFetch;
+  });
+
+  it('streams every page and fetches the next one while the current page is imported', async () => {
+    const { service, events, fetchedPages } = createFixture(prospects, 4);
+
+    const result = await service.importAll({ ...config, concurrency: 4 });
+
+    expect(fetchedPages).toEqual([1, 2, 3]);
+    expect(result.total).toBe(10);
+    expect(events.slice(0, 3)).toEqual(['fetch:1', 'fetch:2', 'preload']);
+  });
+
+  it('records a failing prospect without stopping the concurrent ones', async () => {
+    const { service, clientCreates } = createFixture(prospects, 4);
+
+    const result = await service.importAll({ ...config, concurrency: 4 });
+
+    expect(clientCreates.max > 1).toBe(true);
+    expect(result.errors).toEqual([{ prospectExternalId: 'p-5', message: 'CLIENT_CREATE_FAILED' }]);
+    // Commercial: 1 created + 9 updated; client, contrat, souscription, paiement: 9 created each;
+    // offre: 1 created + 8 updated (the failing prospect stops before its offres).
+    expect(result.created).toBe(38);
+    expect(result.updated).toBe(17);
+    expect(result.skipped).toBe(1);
+  });
+
+  it('reaches the same totals as a sequential run', async () => {
+    const sequential = await createFixture(prospects, 4).service.importAll({ ...config, concurrency: 1 });
+    const concurrent = await createFixture(prospects, 4).service.importAll({ ...config, concurrency: 8 });
+
+    expect(counters(concurrent)).toEqual(counters(sequential));
+  });
+
+  it('preloads lookups once per page instead of once per prospect', async () => {
+    const { service, bulkLookups, singleLookups } = createFixture(prospects, 4);
+
+    const result = await service.importAll({ ...config, concurrency: 4 });
+
+    expect(bulkLookups).toEqual({ apporteurs: 3, produits: 3, contrats: 3 });
+    expect(singleLookups).toEqual([]);
+    expect(result.metrics?.stages.preload.count).toBe(3);
+  });
+
+  it('reports run metrics', async () => {
+    const { service } = createFixture(prospects, 4);
+
+    const result = await service.importAll({ ...config, concurrency: 3 });
+    const metrics = result.metrics;
+
+    expect(metrics?.concurrency).toBe(3);
+    expect(metrics?.pages).toBe(3);
+    expect((metrics?.durationMs ?? -1) >= 0).toBe(true);
+    expect((metrics?.prospectsPerSecond ?? 0) > 0).toBe(true);
+    expect(metrics?.stages.fetch.count).toBe(3);
+    expect(metrics?.stages.commercial.count).toBe(10);
+    expect(metrics?.stages.client.count).toBe(10);
+    expect(metrics?.stages.paiements.count).toBe(9);
+    expect((metrics?.stages.client.maxMs ?? 0) <= (metrics?.stages.client.totalMs ?? 0)).toBe(true);
+  });
+});
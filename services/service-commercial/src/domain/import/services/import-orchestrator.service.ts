@@ -1,5 +1,12 @@
-import { credentials, type ServiceError } from '@grpc/grpc-js';
-import { getServiceUrl, loadGrpcPackage } from '@crm/shared-kernel';
+import {
+  createGrpcClient,
+  getServiceUrl,
+  GRPC_READ_POLICY,
+  KeyedSerialQueue,
+  loadGrpcPackage,
+  mapWithConcurrency,
+  type PooledGrpcClient,
+} from '@crm/shared-kernel';
 import { Injectable, Logger, Optional } from '@nestjs/common';
 import { status } from '@grpc/grpc-js';
 import { RpcException } from '@nestjs/microservices';
@@ -19,12 +26,40 @@ import {
 
 type UpsertOutcome = 'created' | 'updated' | 'skipped';
 
+const DEFAULT_IMPORT_CONCURRENCY = 8;
+
+export type ImportStage =
+  | 'fetch'
+  | 'preload'
+  | 'commercial'
+  | 'client'
+  | 'offres'
+  | 'contrats'
+  | 'souscriptions'
+  | 'paiements';
+
 export interface ImportOrchestratorConfig {
   organisationId: string;
   apiUrl: string;
   apiKey: string;
   dryRun?: boolean;
   pageSize?: number;
+  /** Prospects processed in parallel within a page (default: IMPORT_CONCURRENCY or 8). */
+  concurrency?: number;
+}
+
+export interface ImportStageTiming {
+  count: number;
+  totalMs: number;
+  maxMs: number;
+}
+
+export interface ImportMetrics {
+  durationMs: number;
+  pages: number;
+  prospectsPerSecond: number;
+  concurrency: number;
+  stages: Record<ImportStage, ImportStageTiming>;
 }
 
 export interface ImportResult {
@@ -33,6 +68,23 @@ export interface ImportResult {
   updated: number;
   skipped: number;
   errors: Array<{ prospectExternalId: string; message: string }>;
+  metrics?: ImportMetrics;
+}
+
+type EntityRef = { id: string; updatedAt: Date };
+
+/**
+ * Per-run memo shared by every prospect of an import.
+ * A key mapped to `null` is a known miss (no extra lookup needed).
+ */
+interface ImportRunContext {
+  produitsBySku: Map<string, EntityRef | null>;
+  contratsByReference: Map<string, EntityRef | null>;
+  apporteursByUtilisateur: Map<string, EntityRef | null>;
+  usersById: Map<string, Promise<string | null>>;
+  locks: KeyedSerialQueue;
+  stages: Record<ImportStage, ImportStageTiming>;
+  pages: number;
 }
 
 interface SearchClientRequest {
@@ -78,21 +130,6 @@ interface SearchClientResponse {
   client?: ClientBaseResponse;
 }
 
-interface ClientBaseServiceGrpcContract {
-  Search(
-    request: SearchClientRequest,
-    callback: (error: ServiceError | null, response?: SearchClientResponse) => void,
-  ): void;
-  Create(
-    request: CreateClientRequest,
-    callback: (error: ServiceError | null, response?: ClientBaseResponse) => void,
-  ): void;
-  Update(
-    request: UpdateClientRequest,
-    callback: (error: ServiceError | null, response?: ClientBaseResponse) => void,
-  ): void;
-}
-
 interface EnsureUserInput {
   id?: string;
   nom?: string;
@@ -104,17 +141,6 @@ interface UserResponse {
   id: string;
 }
 
-interface UserServiceGrpcContract {
-  GetById?(
-    request: { id: string },
-    callback: (error: ServiceError | null, response?: UserResponse) => void,
-  ): void;
-  Create?(
-    request: Record<string, unknown>,
-    callback: (error: ServiceError | null, response?: UserResponse) => void,
-  ): void;
-}
-
 interface PaymentInfoResponse {
   id: string;
   updated_at?: string;
@@ -125,19 +151,11 @@ interface PaymentInfoUpsertResponse {
   created?: boolean;
 }
 
-interface PaymentInfoServiceGrpcContract {
-  GetByExternalId?(
-    request: { organisation_id: string; external_id: string },
-    callback: (error: ServiceError | null, response?: PaymentInfoResponse) => void,
-  ): void;
-  UpsertByExternalId(
-    request: Record<string, unknown>,
-    callback: (error: ServiceError | null, response?: PaymentInfoUpsertResponse) => void,
-  ): void;
-}
+/** Users change rarely: one lookup per commercial for a whole import run */
+const USER_LOOKUP_CACHE_TTL_MS = 60_000;
 
 class CoreClientsGrpcClient {
-  private readonly client: ClientBaseServiceGrpcContract;
+  private readonly client: PooledGrpcClient;
 
   constructor() {
     const grpcPackage = loadGrpcPackage('clients');
@@ -147,57 +165,38 @@ class CoreClientsGrpcClient {
     }
 
     const url = process.env.CLIENTS_GRPC_URL || process.env.SERVICE_CORE_GRPC_URL || getServiceUrl('clients');
-    this.client = new ServiceConstructor(url, credentials.createInsecure());
+    this.client = createGrpcClient({
+      service: ServiceConstructor,
+      url,
+      methods: { Search: GRPC_READ_POLICY },
+    });
   }
 
   async search(request: SearchClientRequest): Promise<SearchClientResponse> {
-    return new Promise<SearchClientResponse>((resolve, reject) => {
-      this.client.Search(request, (error, response) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-        resolve(response || { found: false });
-      });
-    });
+    const response = await this.client.call<SearchClientResponse | undefined>('Search', request);
+    return response || { found: false };
   }
 
   async create(request: CreateClientRequest): Promise<ClientBaseResponse> {
-    return new Promise<ClientBaseResponse>((resolve, reject) => {
-      this.client.Create(request, (error, response) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-        if (!response) {
-          reject(new Error('Client create returned an empty response'));
-          return;
-        }
-        resolve(response);
-      });
-    });
+    const response = await this.client.call<ClientBaseResponse | undefined>('Create', request);
+    if (!response) {
+      throw new Error('Client create returned an empty response');
+    }
+    return response;
   }
 
   async update(request: UpdateClientRequest): Promise<ClientBaseResponse> {
-    return new Promise<ClientBaseResponse>((resolve, reject) => {
-      this.client.Update(request, (error, response) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-        if (!response) {
-          reject(new Error('Client update returned an empty response'));
-          return;
-        }
-        resolve(response);
-      });
-    });
+    const response = await this.client.call<ClientBaseResponse | undefined>('Update', request);
+    if (!response) {
+      throw new Error('Client update returned an empty response');
+    }
+    return response;
   }
 }
 
 class CoreUsersGrpcClient {
   private readonly logger = new Logger(CoreUsersGrpcClient.name);
-  private readonly client: UserServiceGrpcContract | null;
+  private readonly client: PooledGrpcClient | null;
 
   constructor() {
     this.client = this.resolveClient();
@@ -212,57 +211,32 @@ class CoreUsersGrpcClient {
       return input.id;
     }
 
-    const getById = this.client.GetById;
-    const create = this.client.Create;
-
-    if (getById) {
+    if (this.client.hasMethod('GetById')) {
       try {
-        const existing = await new Promise<UserResponse>((resolve, reject) => {
-          getById.call(this.client, { id: input.id || '' }, (error, response) => {
-            if (error) {
-              reject(error);
-              return;
-            }
-            if (!response) {
-              reject(new Error('User GetById returned an empty response'));
-              return;
-            }
-            resolve(response);
-          });
-        });
-        return existing.id;
+        const existing = await this.client.call<UserResponse | undefined>('GetById', { id: input.id });
+        if (existing) {
+          return existing.id;
+        }
       } catch {
         // Create fallback below.
       }
     }
 
-    if (dryRun || !create) {
+    if (dryRun || !this.client.hasMethod('Create')) {
       return input.id;
     }
 
     try {
-      const created = await new Promise<UserResponse>((resolve, reject) => {
-        create.call(
-          this.client,
-          {
-            id: input.id,
-            nom: input.nom || '',
-            prenom: input.prenom || '',
-            email: input.email || '',
-          },
-          (error, response) => {
-            if (error) {
-              reject(error);
-              return;
-            }
-            if (!response) {
-              reject(new Error('User Create returned an empty response'));
-              return;
-            }
-            resolve(response);
-          },
-        );
+      const created = await this.client.call<UserResponse | undefined>('Create', {
+        id: input.id,
+        nom: input.nom || '',
+        prenom: input.prenom || '',
+        email: input.email || '',
       });
+      if (!created) {
+        throw new Error('User Create returned an empty response');
+      }
+      this.client.invalidate('GetById');
 
       return created.id;
     } catch (error) {
@@ -273,7 +247,7 @@ class CoreUsersGrpcClient {
     }
   }
 
-  private resolveClient(): UserServiceGrpcContract | null {
+  private resolveClient(): PooledGrpcClient | null {
     try {
       const grpcPackage = loadGrpcPackage('users');
       const serviceNamespace = grpcPackage?.users || grpcPackage?.utilisateurs || grpcPackage?.user;
@@ -285,7 +259,11 @@ class CoreUsersGrpcClient {
       }
 
       const url = process.env.USERS_GRPC_URL || process.env.SERVICE_CORE_GRPC_URL || getServiceUrl('users');
-      return new ServiceConstructor(url, credentials.createInsecure());
+      return createGrpcClient({
+        service: ServiceConstructor,
+        url,
+        methods: { GetById: { ...GRPC_READ_POLICY, cacheTtlMs: USER_LOOKUP_CACHE_TTL_MS } },
+      });
     } catch {
       return null;
     }
@@ -293,7 +271,7 @@ class CoreUsersGrpcClient {
 }
 
 class FinancePaymentInfoGrpcClient {
-  private readonly client: PaymentInfoServiceGrpcContract;
+  private readonly client: PooledGrpcClient;
 
   constructor() {
     const grpcPackage = loadGrpcPackage('payment-info');
@@ -308,56 +286,41 @@ class FinancePaymentInfoGrpcClient {
     }
 
     const url = process.env.FINANCE_GRPC_URL || process.env.PAYMENTS_GRPC_URL || getServiceUrl('payments');
-    this.client = new ServiceConstructor(url, credentials.createInsecure());
+    this.client = createGrpcClient({
+      service: ServiceConstructor,
+      url,
+      methods: { GetByExternalId: GRPC_READ_POLICY },
+    });
   }
 
   async getByExternalId(
     organisationId: string,
     externalId: string,
   ): Promise<PaymentInfoResponse | null> {
-    if (!this.client.GetByExternalId) {
+    if (!this.client.hasMethod('GetByExternalId')) {
       return null;
     }
 
     try {
-      return await new Promise<PaymentInfoResponse>((resolve, reject) => {
-        this.client.GetByExternalId?.(
-          {
-            organisation_id: organisationId,
-            external_id: externalId,
-          },
-          (error, response) => {
-            if (error) {
-              reject(error);
-              return;
-            }
-            if (!response) {
-              reject(new Error('GetByExternalId returned an empty response'));
-              return;
-            }
-            resolve(response);
-          },
-        );
+      const response = await this.client.call<PaymentInfoResponse | undefined>('GetByExternalId', {
+        organisation_id: organisationId,
+        external_id: externalId,
       });
+      return response ?? null;
     } catch {
       return null;
     }
   }
 
   async upsertByExternalId(request: Record<string, unknown>): Promise<PaymentInfoUpsertResponse> {
-    return new Promise<PaymentInfoUpsertResponse>((resolve, reject) => {
-      this.client.UpsertByExternalId(request, (error, response) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-        if (!response) {
-          reject(new Error('UpsertByExternalId returned an empty response'));
-          return;
-        }
-        resolve(response);
-      });
-    });
+    const response = await this.client.call<PaymentInfoUpsertResponse | undefined>(
+      'UpsertByExternalId',
+      request,
+    );
+    if (!response) {
+      throw new Error('UpsertByExternalId returned an empty response');
+    }
+    return response;
   }
 }
 
@@ -379,110 +342,253 @@ export class ImportOrchestratorService {
   ) {}
 
   async importAll(config: ImportOrchestratorConfig): Promise<ImportResult> {
-    const prospects = await this.fetchProspects(config);
+    const startedAt = Date.now();
+    const concurrency = this.resolveConcurrency(config);
+    const run = this.createRunContext();
     const result: ImportResult = {
-      total: prospects.length,
+      total: 0,
       created: 0,
       updated: 0,
       skipped: 0,
       errors: [],
     };
 
-    for (const prospect of prospects) {
-      const prospectExternalId = this.mapper.toExternalId(prospect.idProspect, 'prospect');
-      try {
-        const commercial = await this.upsertCommercial(config, prospect);
-        this.applyOutcome(result, commercial.outcome);
-
-        const client = await this.upsertClient(config, prospect);
-        this.applyOutcome(result, client.outcome);
-
-        const offres = await this.upsertOffres(config, prospect);
-        offres.forEach((outcome) => this.applyOutcome(result, outcome));
+    // Pages are processed as they arrive; the next page is fetched while the current one is imported.
+    const pages = this.streamProspectPages(config, run)[Symbol.asyncIterator]();
+    let nextPage = pages.next();
 
-        const contrats = await this.upsertContrats(config, prospect, client.id, commercial.apporteurId);
-        contrats.outcomes.forEach((outcome) => this.applyOutcome(result, outcome));
+    while (true) {
+      const { value: prospects, done } = await nextPage;
+      if (done) {
+        break;
+      }
 
-        const souscriptions = await this.upsertSouscriptions(config, prospect, client.id, contrats.byExternalId);
-        souscriptions.forEach((outcome) => this.applyOutcome(result, outcome));
+      nextPage = pages.next();
+      nextPage.catch(() => undefined);
 
-        const paiements = await this.upsertPaiements(config, prospect, client.id);
-        paiements.forEach((outcome) => this.applyOutcome(result, outcome));
-      } catch (error) {
-        const message = error instanceof Error ? error.message : String(error);
-        this.logger.error(`Import failed for prospect ${prospectExternalId}: ${message}`);
-        result.errors.push({
-          prospectExternalId,
-          message,
-        });
-        result.skipped += 1;
-      }
+      result.total += prospects.length;
+      await this.timeStage(run, 'preload', () => this.preloadLookups(config, prospects, run));
+      await mapWithConcurrency(prospects, concurrency, (prospect) =>
+        this.importProspect(config, prospect, result, run),
+      );
     }
 
+    result.metrics = this.buildMetrics(run, result, startedAt, concurrency);
+    this.logger.log(
+      `Import finished for org ${config.organisationId}: ${result.total} prospects in ${result.metrics.durationMs}ms ` +
+        `(${result.metrics.prospectsPerSecond}/s, concurrency=${concurrency}, pages=${run.pages})`,
+    );
+
     return result;
   }
 
-  private async fetchProspects(config: ImportOrchestratorConfig): Promise<ExternalProspectPayload[]> {
-    const all: ExternalProspectPayload[] = [];
+  private async importProspect(
+    config: ImportOrchestratorConfig,
+    prospect: ExternalProspectPayload,
+    result: ImportResult,
+    run: ImportRunContext,
+  ): Promise<void> {
+    const prospectExternalId = this.mapper.toExternalId(prospect.idProspect, 'prospect');
+    try {
+      const commercial = await this.timeStage(run, 'commercial', () =>
+        this.upsertCommercial(config, prospect, run),
+      );
+      this.applyOutcome(result, commercial.outcome);
+
+      const client = await this.timeStage(run, 'client', () => this.upsertClient(config, prospect, run));
+      this.applyOutcome(result, client.outcome);
+
+      const offres = await this.timeStage(run, 'offres', () => this.upsertOffres(config, prospect, run));
+      offres.forEach((outcome) => this.applyOutcome(result, outcome));
+
+      const contrats = await this.timeStage(run, 'contrats', () =>
+        this.upsertContrats(config, prospect, client.id, commercial.apporteurId, run),
+      );
+      contrats.outcomes.forEach((outcome) => this.applyOutcome(result, outcome));
+
+      const souscriptions = await this.timeStage(run, 'souscriptions', () =>
+        this.upsertSouscriptions(config, prospect, client.id, contrats.byExternalId),
+      );
+      souscriptions.forEach((outcome) => this.applyOutcome(result, outcome));
+
+      const paiements = await this.timeStage(run, 'paiements', () =>
+        this.upsertPaiements(config, prospect, client.id),
+      );
+      paiements.forEach((outcome) => this.applyOutcome(result, outcome));
+    } catch (error) {
+      const message = error instanceof Error ? error.message : String(error);
+      this.logger.error(`Import failed for prospect ${prospectExternalId}: ${message}`);
+      result.errors.push({
+        prospectExternalId,
+        message,
+      });
+      result.skipped += 1;
+    }
+  }
+
+  private async *streamProspectPages(
+    config: ImportOrchestratorConfig,
+    run: ImportRunContext,
+  ): AsyncGenerator<ExternalProspectPayload[]> {
     const pageSize = config.pageSize || 100;
     let page = 1;
 
     while (true) {
-      const url = new URL('/api/prospects', config.apiUrl);
-      url.searchParams.set('has_contrats', 'true');
-      url.searchParams.set('page', String(page));
-      url.searchParams.set('limit', String(pageSize));
+      const fetched = await this.timeStage(run, 'fetch', () => this.fetchProspectPage(config, page, pageSize));
+      run.pages += 1;
 
-      let response: Response;
-      try {
-        response = await fetch(url.toString(), {
-          method: 'GET',
-          headers: {
-            'X-API-Key': config.apiKey,
-            Accept: 'application/json',
-          },
-        });
-      } catch (error) {
-        throw new Error(
-          `Failed to fetch prospects page ${page}: ${error instanceof Error ? error.message : String(error)}`,
-        );
+      if (fetched.items.length > 0) {
+        yield fetched.items;
       }
 
-      if (!response.ok) {
-        throw new Error(`Prospects API returned HTTP ${response.status} for page ${page}`);
+      if (!fetched.hasMore) {
+        return;
       }
 
-      const payload = (await response.json()) as unknown;
+      page += 1;
+    }
+  }
+
+  private async fetchProspectPage(
+    config: ImportOrchestratorConfig,
+    page: number,
+    pageSize: number,
+  ): Promise<{ items: ExternalProspectPayload[]; hasMore: boolean }> {
+    const url = new URL('/api/prospects', config.apiUrl);
+    url.searchParams.set('has_contrats', 'true');
+    url.searchParams.set('page', String(page));
+    url.searchParams.set('limit', String(pageSize));
 
-      if (Array.isArray(payload)) {
-        all.push(...(payload as ExternalProspectPayload[]));
-        break;
-      }
+    let response: Response;
+    try {
+      response = await fetch(url.toString(), {
+        method: 'GET',
+        headers: {
+          'X-API-Key': config.apiKey,
+          Accept: 'application/json',
+        },
+      });
+    } catch (error) {
+      throw new Error(
+        `Failed to fetch prospects page ${page}: ${error instanceof Error ? error.message : String(error)}`,
+      );
+    }
+
+    if (!response.ok) {
+      throw new Error(`Prospects API returned HTTP ${response.status} for page ${page}`);
+    }
 
-      const objectPayload = payload as Record<string, unknown>;
-      const pageItems = this.resolveProspectArray(objectPayload);
-      all.push(...pageItems);
+    const payload = (await response.json()) as unknown;
 
-      const hasMore = this.hasMorePages(objectPayload, page, pageItems.length, pageSize);
-      if (!hasMore) {
-        break;
+    if (Array.isArray(payload)) {
+      return { items: payload as ExternalProspectPayload[], hasMore: false };
+    }
+
+    const objectPayload = payload as Record<string, unknown>;
+    const pageItems = this.resolveProspectArray(objectPayload);
+
+    return {
+      items: pageItems,
+      hasMore: this.hasMorePages(objectPayload, page, pageItems.length, pageSize),
+    };
+  }
+
+  /**
+   * Bulk-load the SKU, contrat and apporteur lookups needed by a page so that
+   * per-prospect upserts hit the run memo instead of issuing one query each.
+   * Failures are non-fatal: missing keys fall back to single lookups.
+   */
+  private async preloadLookups(
+    config: ImportOrchestratorConfig,
+    prospects: ExternalProspectPayload[],
+    run: ImportRunContext,
+  ): Promise<void> {
+    const skus = new Set<string>();
+    const references = new Set<string>();
+    const utilisateurIds = new Set<string>();
+
+    for (const prospect of prospects) {
+      const utilisateurId = this.mapper.mapCommercialToApporteur(
+        this.mapper.resolveCommercialPayload(prospect),
+      ).utilisateurId;
+      if (utilisateurId && !run.apporteursByUtilisateur.has(utilisateurId)) {
+        utilisateurIds.add(utilisateurId);
       }
 
-      page += 1;
+      for (const souscription of prospect.Souscription || []) {
+        if (souscription.offre || souscription.offreId) {
+          const sku = this.mapper.mapOffreToProduitInput(this.buildOffrePayload(souscription)).sku;
+          if (!run.produitsBySku.has(sku)) {
+            skus.add(sku);
+          }
+        }
+
+        for (const contratPayload of souscription.contrats || []) {
+          const reference = this.mapper.mapContratToContratInput(contratPayload, '', '').reference;
+          if (!run.contratsByReference.has(reference)) {
+            references.add(reference);
+          }
+        }
+      }
     }
 
-    return all;
+    try {
+      const [produits, contrats, apporteurs] = await Promise.all([
+        this.produitService.findBySkus(config.organisationId, [...skus]),
+        this.contratService.findByReferences(config.organisationId, [...references]),
+        this.apporteurService.findByUtilisateurs([...utilisateurIds]),
+      ]);
+
+      skus.forEach((sku) => run.produitsBySku.set(sku, null));
+      references.forEach((reference) => run.contratsByReference.set(reference, null));
+      utilisateurIds.forEach((id) => run.apporteursByUtilisateur.set(id, null));
+
+      for (const produit of produits) {
+        run.produitsBySku.set(produit.sku, { id: produit.id, updatedAt: produit.updatedAt });
+      }
+      for (const contrat of contrats) {
+        run.contratsByReference.set(contrat.reference, { id: contrat.id, updatedAt: contrat.updatedAt });
+      }
+      for (const apporteur of apporteurs) {
+        if (apporteur.utilisateurId) {
+          run.apporteursByUtilisateur.set(apporteur.utilisateurId, {
+            id: apporteur.id,
+            updatedAt: apporteur.updatedAt,
+          });
+        }
+      }
+    } catch (error) {
+      this.logger.warn(
+        `Bulk lookup preload failed, falling back to per-prospect lookups: ${
+          error instanceof Error ? error.message : String(error)
+        }`,
+      );
+    }
   }
 
   private async upsertCommercial(
     config: ImportOrchestratorConfig,
     prospect: ExternalProspectPayload,
+    run: ImportRunContext,
   ): Promise<{ outcome: UpsertOutcome; apporteurId: string }> {
     const commercial = this.mapper.resolveCommercialPayload(prospect);
     const mapped = this.mapper.mapCommercialToApporteur(commercial);
+    const lockKey = `commercial:${mapped.utilisateurId || this.mapper.toExternalId(commercial.id, 'commercial')}`;
+
+    // Many prospects share a commercial: serialize per commercial so concurrent prospects never double-create it.
+    return run.locks.run(lockKey, () => this.upsertCommercialLocked(config, prospect, commercial, mapped, run));
+  }
+
+  private async upsertCommercialLocked(
+    config: ImportOrchestratorConfig,
+    prospect: ExternalProspectPayload,
+    commercial: ExternalCommercialPayload,
+    mapped: ReturnType<ImportMapperService['mapCommercialToApporteur']>,
+    run: ImportRunContext,
+  ): Promise<{ outcome: UpsertOutcome; apporteurId: string }> {
     const sourceTimestamp = this.resolveSourceTimestamp(commercial, prospect);
 
-    const ensuredUserId = await this.coreUsersGrpcClient.ensureUser(
+    const ensuredUserId = await this.ensureUserOnce(
       {
         id: mapped.utilisateurId || undefined,
         nom: mapped.nom,
@@ -490,21 +596,14 @@ export class ImportOrchestratorService {
         email: mapped.email || undefined,
       },
       Boolean(config.dryRun),
+      run,
     );
 
     const utilisateurId = ensuredUserId || mapped.utilisateurId;
-    let existing: { id: string; updatedAt: Date } | null = null;
+    let existing: EntityRef | null = null;
 
     if (utilisateurId) {
-      try {
-        const current = await this.apporteurService.findByUtilisateur(utilisateurId);
-        existing = {
-          id: current.id,
-          updatedAt: current.updatedAt,
-        };
-      } catch {
-        existing = null;
-      }
+      existing = await this.findApporteurByUtilisateur(utilisateurId, run);
     }
 
     if (existing && !this.shouldApplyIncoming(existing.updatedAt, sourceTimestamp)) {
@@ -532,6 +631,9 @@ export class ImportOrchestratorService {
         typeApporteur: mapped.typeApporteur,
         actif: mapped.actif,
       });
+      if (utilisateurId) {
+        run.apporteursByUtilisateur.set(utilisateurId, { id: updated.id, updatedAt: updated.updatedAt });
+      }
       return { outcome: 'updated', apporteurId: updated.id };
     }
 
@@ -545,6 +647,9 @@ export class ImportOrchestratorService {
       typeApporteur: mapped.typeApporteur,
       actif: mapped.actif,
     });
+    if (utilisateurId) {
+      run.apporteursByUtilisateur.set(utilisateurId, { id: created.id, updatedAt: created.updatedAt });
+    }
 
     return { outcome: 'created', apporteurId: created.id };
   }
@@ -552,8 +657,19 @@ export class ImportOrchestratorService {
   private async upsertClient(
     config: ImportOrchestratorConfig,
     prospect: ExternalProspectPayload,
+    run: ImportRunContext,
   ): Promise<{ outcome: UpsertOutcome; id: string }> {
     const mapped = this.mapper.mapProspectToClientBase(prospect);
+    return run.locks.run(`client:${mapped.telephone}|${mapped.nom}`, () =>
+      this.upsertClientLocked(config, prospect, mapped),
+    );
+  }
+
+  private async upsertClientLocked(
+    config: ImportOrchestratorConfig,
+    prospect: ExternalProspectPayload,
+    mapped: ReturnType<ImportMapperService['mapProspectToClientBase']>,
+  ): Promise<{ outcome: UpsertOutcome; id: string }> {
     const sourceTimestamp = this.resolveSourceTimestamp(prospect);
 
     const search = await this.coreClientsGrpcClient.search({
@@ -605,76 +721,82 @@ export class ImportOrchestratorService {
   private async upsertOffres(
     config: ImportOrchestratorConfig,
     prospect: ExternalProspectPayload,
+    run: ImportRunContext,
   ): Promise<UpsertOutcome[]> {
     const outcomes: UpsertOutcome[] = [];
     const souscriptions = prospect.Souscription || [];
 
     for (const souscription of souscriptions) {
-      const sourceOffre = souscription.offre;
-      if (!sourceOffre && !souscription.offreId) {
+      if (!souscription.offre && !souscription.offreId) {
         continue;
       }
 
-      const offrePayload: ExternalOffrePayload = {
-        ...sourceOffre,
-        offreId: sourceOffre?.offreId ?? souscription.offreId,
-        totalAmount: sourceOffre?.totalAmount ?? souscription.totalAmount,
-        devise: sourceOffre?.devise ?? souscription.devise,
-        created_at: sourceOffre?.created_at ?? souscription.created_at,
-        updated_at: sourceOffre?.updated_at ?? souscription.updated_at,
-      };
-
+      const offrePayload = this.buildOffrePayload(souscription);
       const mapped = this.mapper.mapOffreToProduitInput(offrePayload);
       const sourceTimestamp = this.resolveSourceTimestamp(offrePayload, souscription, prospect);
-      const existing = await this.findProduitBySku(config.organisationId, mapped.sku);
 
-      if (existing && !this.shouldApplyIncoming(existing.updatedAt, sourceTimestamp)) {
-        outcomes.push('skipped');
-        continue;
-      }
+      outcomes.push(
+        await run.locks.run(`sku:${mapped.sku}`, () =>
+          this.upsertOffre(config, mapped, sourceTimestamp, run),
+        ),
+      );
+    }
 
-      if (config.dryRun) {
-        outcomes.push(existing ? 'updated' : 'created');
-        continue;
-      }
+    return outcomes;
+  }
 
-      if (existing) {
-        await this.produitService.update({
-          id: existing.id,
-          sku: mapped.sku,
-          nom: mapped.nom,
-          description: mapped.description,
-          categorie: mapped.categorie,
-          type: mapped.type,
-          statut_cycle: mapped.statut_cycle,
-          prix: mapped.prix,
-          taux_tva: mapped.taux_tva,
-          devise: mapped.devise,
-          code_externe: mapped.code_externe,
-          metadata: mapped.metadata,
-          actif: true,
-        });
-        outcomes.push('updated');
-      } else {
-        await this.produitService.create({
-          organisation_id: config.organisationId,
-          sku: mapped.sku,
-          nom: mapped.nom,
-          description: mapped.description,
-          categorie: mapped.categorie,
-          type: mapped.type,
-          statut_cycle: mapped.statut_cycle,
-          prix: mapped.prix,
-          taux_tva: mapped.taux_tva,
-          devise: mapped.devise,
-          code_externe: mapped.code_externe,
-          metadata: mapped.metadata,
-        });
-        outcomes.push('created');
-      }
+  private async upsertOffre(
+    config: ImportOrchestratorConfig,
+    mapped: ReturnType<ImportMapperService['mapOffreToProduitInput']>,
+    sourceTimestamp: string | null,
+    run: ImportRunContext,
+  ): Promise<UpsertOutcome> {
+    const existing = await this.findProduitBySku(config.organisationId, mapped.sku, run);
+
+    if (existing && !this.shouldApplyIncoming(existing.updatedAt, sourceTimestamp)) {
+      return 'skipped';
     }
 
-    return outcomes;
+    if (config.dryRun) {
+      return existing ? 'updated' : 'created';
+    }
+
+    if (existing) {
+      const updated = await this.produitService.update({
+        id: existing.id,
+        sku: mapped.sku,
+        nom: mapped.nom,
+        description: mapped.description,
+        categorie: mapped.categorie,
+        type: mapped.type,
+        statut_cycle: mapped.statut_cycle,
+        prix: mapped.prix,
+        taux_tva: mapped.taux_tva,
+        devise: mapped.devise,
+        code_externe: mapped.code_externe,
+        metadata: mapped.metadata,
+        actif: true,
+      });
+      run.produitsBySku.set(mapped.sku, { id: updated.id, updatedAt: updated.updatedAt });
+      return 'updated';
+    }
+
+    const created = await this.produitService.create({
+      organisation_id: config.organisationId,
+      sku: mapped.sku,
+      nom: mapped.nom,
+      description: mapped.description,
+      categorie: mapped.categorie,
+      type: mapped.type,
+      statut_cycle: mapped.statut_cycle,
+      prix: mapped.prix,
+      taux_tva: mapped.taux_tva,
+      devise: mapped.devise,
+      code_externe: mapped.code_externe,
+      metadata: mapped.metadata,
+    });
+    run.produitsBySku.set(mapped.sku, { id: created.id, updatedAt: created.updatedAt });
+    return 'created';
   }
 
   private async upsertContrats(
@@ -682,6 +804,7 @@ export class ImportOrchestratorService {
     prospect: ExternalProspectPayload,
     clientId: string,
     commercialId: string,
+    run: ImportRunContext,
   ): Promise<{ outcomes: UpsertOutcome[]; byExternalId: Map<string, string> }> {
     const outcomes: UpsertOutcome[] = [];
     const byExternalId = new Map<string, string>();
@@ -691,74 +814,84 @@ export class ImportOrchestratorService {
       for (const contratPayload of souscription.contrats || []) {
         const mapped = this.mapper.mapContratToContratInput(contratPayload, clientId, commercialId);
         const sourceTimestamp = this.resolveSourceTimestamp(contratPayload, souscription, prospect);
-        const existing = await this.findContratByReference(config.organisationId, mapped.reference);
-
-        if (existing && !this.shouldApplyIncoming(existing.updatedAt, sourceTimestamp)) {
-          outcomes.push('skipped');
-          byExternalId.set(mapped.externalId, existing.id);
-          continue;
-        }
-
-        if (config.dryRun) {
-          outcomes.push(existing ? 'updated' : 'created');
-          byExternalId.set(
-            mapped.externalId,
-            existing?.id || `dry-contrat-${mapped.externalId}`,
-          );
-          continue;
-        }
+        const upserted = await run.locks.run(`contrat:${mapped.reference}`, () =>
+          this.upsertContrat(config, mapped, sourceTimestamp, run),
+        );
 
-        if (existing) {
-          const updated = await this.contratService.update({
-            id: existing.id,
-            reference: mapped.reference,
-            titre: mapped.titre,
-            description: mapped.description,
-            type: mapped.type,
-            statut: mapped.statut,
-            dateDebut: mapped.dateDebut,
-            dateFin: mapped.dateFin,
-            dateSignature: mapped.dateSignature,
-            montant: mapped.montant,
-            devise: mapped.devise,
-            frequenceFacturation: mapped.frequenceFacturation,
-            documentUrl: mapped.documentUrl,
-            fournisseur: mapped.fournisseur,
-            clientId: mapped.clientId,
-            commercialId: mapped.commercialId,
-            notes: mapped.notes,
-          });
-          outcomes.push('updated');
-          byExternalId.set(mapped.externalId, updated.id);
-        } else {
-          const created = await this.contratService.create({
-            organisationId: config.organisationId,
-            reference: mapped.reference,
-            titre: mapped.titre,
-            description: mapped.description,
-            type: mapped.type,
-            statut: mapped.statut,
-            dateDebut: mapped.dateDebut,
-            dateFin: mapped.dateFin,
-            dateSignature: mapped.dateSignature,
-            montant: mapped.montant,
-            devise: mapped.devise,
-            frequenceFacturation: mapped.frequenceFacturation,
-            documentUrl: mapped.documentUrl,
-            fournisseur: mapped.fournisseur,
-            clientId: mapped.clientId,
-            commercialId: mapped.commercialId,
-            notes: mapped.notes,
-          });
-          outcomes.push('created');
-          byExternalId.set(mapped.externalId, created.id);
-        }
+        outcomes.push(upserted.outcome);
+        byExternalId.set(mapped.externalId, upserted.id);
       }
     }
 
     return { outcomes, byExternalId };
   }
 
+  private async upsertContrat(
+    config: ImportOrchestratorConfig,
+    mapped: ReturnType<ImportMapperService['mapContratToContratInput']>,
+    sourceTimestamp: string | null,
+    run: ImportRunContext,
+  ): Promise<{ outcome: UpsertOutcome; id: string }> {
+    const existing = await this.findContratByReference(config.organisationId, mapped.reference, run);
+
+    if (existing && !this.shouldApplyIncoming(existing.updatedAt, sourceTimestamp)) {
+      return { outcome: 'skipped', id: existing.id };
+    }
+
+    if (config.dryRun) {
+      return {
+        outcome: existing ? 'updated' : 'created',
+        id: existing?.id || `dry-contrat-${mapped.externalId}`,
+      };
+    }
+
+    if (existing) {
+      const updated = await this.contratService.update({
+        id: existing.id,
+        reference: mapped.reference,
+        titre: mapped.titre,
+        description: mapped.description,
+        type: mapped.type,
+        statut: mapped.statut,
+        dateDebut: mapped.dateDebut,
+        dateFin: mapped.dateFin,
+        dateSignature: mapped.dateSignature,
+        montant: mapped.montant,
+        devise: mapped.devise,
+        frequenceFacturation: mapped.frequenceFacturation,
+        documentUrl: mapped.documentUrl,
+        fournisseur: mapped.fournisseur,
+        clientId: mapped.clientId,
+        commercialId: mapped.commercialId,
+        notes: mapped.notes,
+      });
+      run.contratsByReference.set(mapped.reference, { id: updated.id, updatedAt: updated.updatedAt });
+      return { outcome: 'updated', id: updated.id };
+    }
+
+    const created = await this.contratService.create({
+      organisationId: config.organisationId,
+      reference: mapped.reference,
+      titre: mapped.titre,
+      description: mapped.description,
+      type: mapped.type,
+      statut: mapped.statut,
+      dateDebut: mapped.dateDebut,
+      dateFin: mapped.dateFin,
+      dateSignature: mapped.dateSignature,
+      montant: mapped.montant,
+      devise: mapped.devise,
+      frequenceFacturation: mapped.frequenceFacturation,
+      documentUrl: mapped.documentUrl,
+      fournisseur: mapped.fournisseur,
+      clientId: mapped.clientId,
+      commercialId: mapped.commercialId,
+      notes: mapped.notes,
+    });
+    run.contratsByReference.set(mapped.reference, { id: created.id, updatedAt: created.updatedAt });
+    return { outcome: 'created', id: created.id };
+  }
+
   private async upsertSouscriptions(
     config: ImportOrchestratorConfig,
     prospect: ExternalProspectPayload,
@@ -873,37 +1006,101 @@ export class ImportOrchestratorService {
   private async findProduitBySku(
     organisationId: string,
     sku: string,
-  ): Promise<{ id: string; updatedAt: Date } | null> {
+    run: ImportRunContext,
+  ): Promise<EntityRef | null> {
+    const cached = run.produitsBySku.get(sku);
+    if (cached !== undefined) {
+      return cached;
+    }
+
+    let found: EntityRef | null;
     try {
       const produit = await this.produitService.findBySku(organisationId, sku);
-      return {
+      found = {
         id: produit.id,
         updatedAt: produit.updatedAt,
       };
     } catch {
-      return null;
+      found = null;
     }
+
+    run.produitsBySku.set(sku, found);
+    return found;
   }
 
   private async findContratByReference(
     organisationId: string,
     reference: string,
-  ): Promise<{ id: string; updatedAt: Date } | null> {
+    run: ImportRunContext,
+  ): Promise<EntityRef | null> {
+    const cached = run.contratsByReference.get(reference);
+    if (cached !== undefined) {
+      return cached;
+    }
+
+    let found: EntityRef | null;
     try {
       const contrat = await this.contratService.findByReference(organisationId, reference);
-      return {
+      found = {
         id: contrat.id,
         updatedAt: contrat.updatedAt,
       };
     } catch (error) {
       if (error instanceof RpcException) {
         const rpcError = error.getError() as { code?: number };
-        if (rpcError?.code === status.NOT_FOUND) {
-          return null;
+        if (rpcError?.code !== status.NOT_FOUND) {
+          this.logger.warn(`Contrat lookup failed for reference ${reference}: ${error.message}`);
         }
       }
-      return null;
+      found = null;
     }
+
+    run.contratsByReference.set(reference, found);
+    return found;
+  }
+
+  private async findApporteurByUtilisateur(
+    utilisateurId: string,
+    run: ImportRunContext,
+  ): Promise<EntityRef | null> {
+    const cached = run.apporteursByUtilisateur.get(utilisateurId);
+    if (cached !== undefined) {
+      return cached;
+    }
+
+    let found: EntityRef | null;
+    try {
+      const current = await this.apporteurService.findByUtilisateur(utilisateurId);
+      found = {
+        id: current.id,
+        updatedAt: current.updatedAt,
+      };
+    } catch {
+      found = null;
+    }
+
+    run.apporteursByUtilisateur.set(utilisateurId, found);
+    return found;
+  }
+
+  /**
+   * Memoized per run: a commercial shared by thousands of prospects is resolved once.
+   */
+  private ensureUserOnce(
+    input: EnsureUserInput,
+    dryRun: boolean,
+    run: ImportRunContext,
+  ): Promise<string | null> {
+    if (!input.id) {
+      return Promise.resolve(null);
+    }
+
+    let pending = run.usersById.get(input.id);
+    if (!pending) {
+      pending = this.coreUsersGrpcClient.ensureUser(input, dryRun);
+      run.usersById.set(input.id, pending);
+    }
+    return pending;
   }
 
   private async findSubscriptionByExternalId(
@@ -1022,6 +1219,77 @@ export class ImportOrchestratorService {
     return null;
   }
 
+  private buildOffrePayload(souscription: ExternalSouscriptionPayload): ExternalOffrePayload {
+    const sourceOffre = souscription.offre;
+    return {
+      ...sourceOffre,
+      offreId: sourceOffre?.offreId ?? souscription.offreId,
+      totalAmount: sourceOffre?.totalAmount ?? souscription.totalAmount,
+      devise: sourceOffre?.devise ?? souscription.devise,
+      created_at: sourceOffre?.created_at ?? souscription.created_at,
+      updated_at: sourceOffre?.updated_at ?? souscription.updated_at,
+    };
+  }
+
+  private resolveConcurrency(config: ImportOrchestratorConfig): number {
+    const configured = config.concurrency ?? Number(process.env.IMPORT_CONCURRENCY);
+    if (!Number.isFinite(configured) || configured < 1) {
+      return DEFAULT_IMPORT_CONCURRENCY;
+    }
+    return Math.floor(configured);
+  }
+
+  private createRunContext(): ImportRunContext {
+    const emptyTiming = (): ImportStageTiming => ({ count: 0, totalMs: 0, maxMs: 0 });
+    return {
+      produitsBySku: new Map(),
+      contratsByReference: new Map(),
+      apporteursByUtilisateur: new Map(),
+      usersById: new Map(),
+      locks: new KeyedSerialQueue(),
+      stages: {
+        fetch: emptyTiming(),
+        preload: emptyTiming(),
+        commercial: emptyTiming(),
+        client: emptyTiming(),
+        offres: emptyTiming(),
+        contrats: emptyTiming(),
+        souscriptions: emptyTiming(),
+        paiements: emptyTiming(),
+      },
+      pages: 0,
+    };
+  }
+
+  private async timeStage<T>(run: ImportRunContext, stage: ImportStage, task: () => Promise<T>): Promise<T> {
+    const startedAt = Date.now();
+    try {
+      return await task();
+    } finally {
+      const elapsed = Date.now() - startedAt;
+      const timing = run.stages[stage];
+      timing.count += 1;
+      timing.totalMs += elapsed;
+      timing.maxMs = Math.max(timing.maxMs, elapsed);
+    }
+  }
+
+  private buildMetrics(
+    run: ImportRunContext,
+    result: ImportResult,
+    startedAt: number,
+    concurrency: number,
+  ): ImportMetrics {
+    const durationMs = Date.now() - startedAt;
+    return {
+      durationMs,
+      pages: run.pages,
+      prospectsPerSecond: durationMs > 0 ? Math.round((result.total * 1000 * 100) / durationMs) / 100 : result.total,
+      concurrency,
+      stages: run.stages,
+    };
+  }
+
   private applyOutcome(result: ImportResult, outcome: UpsertOutcome): void {
     if (outcome === 'created') {
       result.created += 1;
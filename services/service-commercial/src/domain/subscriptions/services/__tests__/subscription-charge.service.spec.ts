@@ -10,6 +10,9 @@ import type { ISubscriptionRepository } from '../../repositories/ISubscriptionRe
 import {
   type CreateSubscriptionFactureInput,
   type CreateSubscriptionPaymentIntentInput,
+  InMemorySubscriptionChargeCheckpointStore,
+  type SubscriptionChargeCheckpoint,
+  type SubscriptionChargeOptions,
   type SubscriptionFactureClient,
   type SubscriptionPaymentClient,
   SubscriptionChargeService,
@@ -57,10 +60,16 @@ interface FixtureOptions {
   preProcessedKeys?: string[];
   maxRetries?: number;
   natsConnected?: boolean;
+  factureFailuresOnce?: string[];
+  paymentDelayMs?: number;
+  chargeOptions?: Partial<SubscriptionChargeOptions>;
 }
 
 function createFixture(options: FixtureOptions = {}) {
   const paymentFailures = new Set(options.paymentFailures || []);
+  const factureFailures = new Set(options.factureFailuresOnce || []);
+  const paymentConcurrency = { inFlight: 0, max: 0 };
+  const bulkLookups: string[][] = [];
   const processedKeys = new Set(options.preProcessedKeys || []);
 
   const dueSubscriptions = options.dueSubscriptions || [makeSubscription()];
@@ -123,6 +132,11 @@ function createFixture(options: FixtureOptions = {}) {
   const paymentClient: SubscriptionPaymentClient = {
     createPaymentIntent: async (input) => {
       paymentCalls.push(input);
+      paymentConcurrency.inFlight += 1;
+      paymentConcurrency.max = Math.max(paymentConcurrency.max, paymentConcurrency.inFlight);
+      await new Promise((resolve) => setTimeout(resolve, options.paymentDelayMs ?? 0));
+      paymentConcurrency.inFlight -= 1;
+
       const subscriptionId = input.metadata.subscription_id;
       if (paymentFailures.has(subscriptionId)) {
         throw new Error(`PAYMENT_FAILED_${subscriptionId}`);
@@ -137,6 +151,9 @@ function createFixture(options: FixtureOptions = {}) {
   const factureClient: SubscriptionFactureClient = {
     createFacture: async (input) => {
       factureCalls.push(input);
+      if (factureFailures.delete(input.subscriptionId)) {
+        throw new Error(`FACTURE_FAILED_${input.subscriptionId}`);
+      }
       return {
         id: `fac-${input.subscriptionId}`,
       };
@@ -148,6 +165,14 @@ function createFixture(options: FixtureOptions = {}) {
     markEventProcessed: async (eventId: string) => {
       processedKeys.add(eventId);
     },
+    ...(options.chargeOptions
+      ? {
+          findProcessedEventIds: async (eventIds: string[]) => {
+            bulkLookups.push(eventIds);
+            return eventIds.filter((eventId) => processedKeys.has(eventId));
+          },
+        }
+      : {}),
   };
 
   const natsService = {
@@ -169,11 +194,15 @@ function createFixture(options: FixtureOptions = {}) {
       maxRetries: options.maxRetries ?? 3,
       pspName: 'GOCARDLESS',
       now: () => new Date('2026-02-01T10:00:00.000Z'),
+      ...options.chargeOptions,
     },
   );
 
   return {
     service,
+    dueSubscriptions,
+    paymentConcurrency,
+    bulkLookups,
     savedSubscriptions,
     lifecycleTransitions,
     paymentCalls,
@@ -352,4 +381,113 @@ describe('SubscriptionChargeService', () => {
     expect(result.skippedCount).toBe(1);
     expect(result.results[0].reason).toBe('STATUS_NOT_ELIGIBLE');
   });
+
+  it('charges in parallel with one bulk idempotence lookup', async () => {
+    const dueSubscriptions = Array.from({ length: 20 }, (_, index) =>
+      makeSubscription({ id: `sub-${index}` }),
+    );
+    const { service, paymentCalls, paymentConcurrency, bulkLookups } = createFixture({
+      dueSubscriptions,
+      preProcessedKeys: ['sub-3-2026-02-01T00:00:00.000Z'],
+      paymentDelayMs: 5,
+      chargeOptions: { concurrency: 4, pspRateLimits: { GOCARDLESS: { ratePerSecond: 1000, burst: 100 } } },
+    });
+
+    const result = await service.processCharges('org-1');
+
+    expect(result.successCount).toBe(19);
+    expect(result.results[3].reason).toBe('ALREADY_CHARGED');
+    expect(result.results.map((item) => item.subscriptionId)).toEqual(dueSubscriptions.map((item) => item.id));
+    expect(paymentCalls.length).toBe(19);
+    expect(paymentConcurrency.max).toBe(4);
+    expect(bulkLookups.length).toBe(1);
+    expect(bulkLookups[0].length).toBe(20);
+  });
+
+  it('paces payment intents with the PSP rate limit', async () => {
+    const { service } = createFixture({
+      dueSubscriptions: Array.from({ length: 5 }, (_, index) => makeSubscription({ id: `sub-${index}` })),
+      chargeOptions: { concurrency: 5, pspRateLimits: { GOCARDLESS: { ratePerSecond: 100, burst: 1 } } },
+    });
+
+    const startedAt = Date.now();
+    const result = await service.processCharges('org-1');
+
+    expect(result.successCount).toBe(5);
+    // One immediate token, then four more at one per 10 ms
+    expect(Date.now() - startedAt >= 35).toBe(true);
+  });
+
+  it('resumes a paid charge from its checkpoint without charging again', async () => {
+    const checkpointStore = new InMemorySubscriptionChargeCheckpointStore();
+    const { service, dueSubscriptions, paymentCalls, factureCalls, publishedEvents } = createFixture({
+      dueSubscriptions: [makeSubscription({ id: 'sub-crash' })],
+      factureFailuresOnce: ['sub-crash'],
+      chargeOptions: { checkpointStore },
+    });
+
+    const first = await service.processCharges('org-1');
+    expect(first.failedCount).toBe(1);
+    expect(first.results[0].reason).toBe('CHARGE_INCOMPLETE: FACTURE_FAILED_sub-crash');
+    expect((await checkpointStore.findPending('org-1'))[0].stage).toBe('SUBSCRIPTION_ADVANCED');
+
+    // The subscription was advanced, so it is no longer due on the next run
+    dueSubscriptions.length = 0;
+    const second = await service.processCharges('org-1');
+
+    expect(second.successCount).toBe(1);
+    expect(second.results[0].invoiceId).toBe('fac-sub-crash');
+    expect(paymentCalls.length).toBe(1);
+    expect(factureCalls.length).toBe(2);
+    expect(publishedEvents.map((event) => event.subject)).toEqual(['SUBSCRIPTION_CHARGED']);
+    expect((await checkpointStore.findPending('org-1')).length).toBe(0);
+  });
+
+  it('resumes after a lost checkpoint update without advancing the subscription twice', async () => {
+    class FlakyCheckpointStore extends InMemorySubscriptionChargeCheckpointStore {
+      failAdvancedOnce = true;
+
+      async save(checkpoint: SubscriptionChargeCheckpoint): Promise<void> {
+        if (checkpoint.stage === 'SUBSCRIPTION_ADVANCED' && this.failAdvancedOnce) {
+          this.failAdvancedOnce = false;
+          throw new Error('CHECKPOINT_SAVE_FAILED');
+        }
+        await super.save(checkpoint);
+      }
+    }
+    const checkpointStore = new FlakyCheckpointStore();
+    const { service, dueSubscriptions, savedSubscriptions, paymentCalls } = createFixture({
+      dueSubscriptions: [makeSubscription({ id: 'sub-crash' })],
+      chargeOptions: { checkpointStore },
+    });
+
+    const first = await service.processCharges('org-1');
+    expect(first.results[0].reason).toBe('CHARGE_INCOMPLETE: CHECKPOINT_SAVE_FAILED');
+    expect((await checkpointStore.findPending('org-1'))[0].stage).toBe('PAYMENT_CREATED');
+
+    dueSubscriptions.length = 0;
+    const second = await service.processCharges('org-1');
+
+    expect(second.successCount).toBe(1);
+    expect(paymentCalls.length).toBe(1);
+    expect(savedSubscriptions.map((item) => (item.nextChargeAt as Date).toISOString())).toEqual([
+      '2026-03-01T00:00:00.000Z',
+      '2026-03-01T00:00:00.000Z',
+    ]);
+  });
+
+  it('reports charge rate and PSP latency and failure rate', async () => {
+    const { service } = createFixture({
+      dueSubscriptions: [makeSubscription({ id: 'sub-ok' }), makeSubscription({ id: 'sub-ko' })],
+      paymentFailures: ['sub-ko'],
+      chargeOptions: { resolvePspName: () => 'STRIPE' },
+    });
+
+    const result = await service.processCharges('org-1');
+
+    expect(result.metrics?.psp.STRIPE.calls).toBe(2);
+    expect(result.metrics?.psp.STRIPE.failures).toBe(1);
+    expect(result.metrics?.psp.STRIPE.failureRate).toBe(0.5);
+    expect((result.metrics?.chargesPerSecond ?? 0) > 0).toBe(true);
+  });
 });
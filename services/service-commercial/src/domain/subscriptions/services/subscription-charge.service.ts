@@ -1,10 +1,14 @@
-import { credentials, type ServiceError } from '@grpc/grpc-js';
+import { status } from '@grpc/grpc-js';
 import {
+  createGrpcClient,
   IdempotenceService,
   type IdempotenceStore,
   getServiceUrl,
   loadGrpcPackage,
+  mapWithConcurrency,
   NatsService,
+  type PooledGrpcClient,
+  TokenBucket,
 } from '@crm/shared-kernel';
 import { Injectable, Logger, Optional } from '@nestjs/common';
 import {
@@ -30,6 +34,16 @@ const DEFAULT_FACTURE_ADRESSE_ID = '';
 const DEFAULT_FACTURE_PRODUIT_ID = '';
 const DEFAULT_FACTURE_TAUX_TVA = 20;
 
+const DEFAULT_CHARGE_CONCURRENCY = 8;
+
+/** Sustained request rates kept under each PSP's documented API limits */
+const DEFAULT_PSP_RATE_LIMITS: Record<string, PspRateLimit> = {
+  STRIPE: { ratePerSecond: 25, burst: 25 },
+  GOCARDLESS: { ratePerSecond: 10, burst: 10 },
+  SLIMPAY: { ratePerSecond: 5, burst: 5 },
+};
+const FALLBACK_PSP_RATE_LIMIT: PspRateLimit = { ratePerSecond: 5, burst: 5 };
+
 const WEB_DIRECT_SOURCES = new Set<StoreSource>([StoreSource.WEB_DIRECT, StoreSource.NONE]);
 
 export interface SubscriptionChargeSchedulingPort {
@@ -77,11 +91,57 @@ export interface SubscriptionFactureClient {
   createFacture(input: CreateSubscriptionFactureInput): Promise<SubscriptionFacture>;
 }
 
+export interface PspRateLimit {
+  ratePerSecond: number;
+  burst?: number;
+}
+
+export type SubscriptionChargeCheckpointStage =
+  | 'PAYMENT_CREATED'
+  | 'SUBSCRIPTION_ADVANCED'
+  | 'INVOICED';
+
+/** Progress of a charge whose payment intent exists but whose follow-up steps may not */
+export interface SubscriptionChargeCheckpoint {
+  idempotencyKey: string;
+  organisationId: string;
+  subscriptionId: string;
+  stage: SubscriptionChargeCheckpointStage;
+  paymentIntentId: string;
+  invoiceId?: string;
+  chargedAt: string;
+  /** Next charge date the subscription advances to, fixed when the payment is created */
+  nextChargeAt: string;
+  source: 'RECURRING' | 'TRIAL_CONVERSION';
+}
+
+/**
+ * Where paid-but-unfinished charges are recorded until they complete.
+ *
+ * Resuming after a process crash only works if the store is durable: the
+ * default `InMemorySubscriptionChargeCheckpointStore` loses its checkpoints
+ * with the process, so a charge paid just before a crash is then neither
+ * invoiced nor published. Production wiring must supply a persistent store.
+ */
+export interface SubscriptionChargeCheckpointStore {
+  find(idempotencyKey: string): Promise<SubscriptionChargeCheckpoint | null>;
+  findPending(organisationId: string): Promise<SubscriptionChargeCheckpoint[]>;
+  save(checkpoint: SubscriptionChargeCheckpoint): Promise<void>;
+  complete(idempotencyKey: string): Promise<void>;
+}
+
 export interface SubscriptionChargeOptions {
   maxRetries?: number;
   pspName?: string;
   now?: () => Date;
   resolveSocieteId?: (subscription: SubscriptionEntity) => string;
+  /** PSP of a subscription, defaults to `pspName` */
+  resolvePspName?: (subscription: SubscriptionEntity) => string;
+  /** Charges in flight per PSP partition */
+  concurrency?: number;
+  /** Request rate allowed towards each PSP, by PSP name */
+  pspRateLimits?: Record<string, PspRateLimit>;
+  checkpointStore?: SubscriptionChargeCheckpointStore;
 }
 
 export interface SubscriptionChargeResult {
@@ -94,12 +154,27 @@ export interface SubscriptionChargeResult {
   reason?: string;
 }
 
+export interface PspChargeMetrics {
+  calls: number;
+  failures: number;
+  failureRate: number;
+  avgLatencyMs: number;
+  p95LatencyMs: number;
+}
+
+export interface SubscriptionChargeRunMetrics {
+  durationMs: number;
+  chargesPerSecond: number;
+  psp: Record<string, PspChargeMetrics>;
+}
+
 export interface ChargeResult {
   processedCount: number;
   successCount: number;
   failedCount: number;
   skippedCount: number;
   results: SubscriptionChargeResult[];
+  metrics?: SubscriptionChargeRunMetrics;
 }
 
 export type SubscriptionChargeBatchResult = ChargeResult;
@@ -121,13 +196,6 @@ interface PaymentIntentGrpcResponse {
   psp_payment_id?: string;
 }
 
-interface PaymentServiceGrpcContract {
-  CreatePaymentIntent(
-    request: CreatePaymentIntentGrpcRequest,
-    callback: (error: ServiceError | null, response?: PaymentIntentGrpcResponse) => void,
-  ): void;
-}
-
 interface CreateFactureGrpcLine {
   produit_id: string;
   quantite: number;
@@ -153,13 +221,6 @@ interface CreateFactureGrpcResponse {
   numero?: string;
 }
 
-interface FactureServiceGrpcContract {
-  Create(
-    request: CreateFactureGrpcRequest,
-    callback: (error: ServiceError | null, response?: CreateFactureGrpcResponse) => void,
-  ): void;
-}
-
 function resolvePaymentGrpcUrl(): string {
   return process.env.FINANCE_GRPC_URL || process.env.PAYMENTS_GRPC_URL || getServiceUrl('payments');
 }
@@ -169,7 +230,7 @@ function resolveFactureGrpcUrl(): string {
 }
 
 export class PaymentServiceGrpcClient implements SubscriptionPaymentClient {
-  private readonly client: PaymentServiceGrpcContract;
+  private readonly client: PooledGrpcClient;
 
   constructor(url: string = resolvePaymentGrpcUrl()) {
     const grpcPackage = loadGrpcPackage('payments');
@@ -179,7 +240,14 @@ export class PaymentServiceGrpcClient implements SubscriptionPaymentClient {
       throw new Error('PaymentService gRPC constructor not found in payments proto package');
     }
 
-    this.client = new PaymentServiceConstructor(url, credentials.createInsecure());
+    // Payment intents carry an idempotency key: transport failures are safe to retry
+    this.client = createGrpcClient({
+      service: PaymentServiceConstructor,
+      url,
+      methods: {
+        CreatePaymentIntent: { deadlineMs: 10_000, retries: 2, retryOn: [status.UNAVAILABLE] },
+      },
+    });
   }
 
   async createPaymentIntent(
@@ -196,21 +264,13 @@ export class PaymentServiceGrpcClient implements SubscriptionPaymentClient {
       metadata: input.metadata,
     };
 
-    const response = await new Promise<PaymentIntentGrpcResponse>((resolve, reject) => {
-      this.client.CreatePaymentIntent(request, (error, payload) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-
-        if (!payload) {
-          reject(new Error('CreatePaymentIntent returned an empty response'));
-          return;
-        }
-
-        resolve(payload);
-      });
-    });
+    const response = await this.client.call<PaymentIntentGrpcResponse | undefined>(
+      'CreatePaymentIntent',
+      request,
+    );
+    if (!response) {
+      throw new Error('CreatePaymentIntent returned an empty response');
+    }
 
     return {
       id: response.id,
@@ -230,7 +290,7 @@ export interface FactureServiceGrpcClientOptions {
 }
 
 export class FactureServiceGrpcClient implements SubscriptionFactureClient {
-  private readonly client: FactureServiceGrpcContract;
+  private readonly client: PooledGrpcClient;
   private readonly statutId: string;
   private readonly emissionFactureId: string;
   private readonly adresseFacturationId: string;
@@ -247,7 +307,12 @@ export class FactureServiceGrpcClient implements SubscriptionFactureClient {
 
     const url = options.url || resolveFactureGrpcUrl();
 
-    this.client = new FactureServiceConstructor(url, credentials.createInsecure());
+    // Facture creation is not idempotent: deadline only, no retries
+    this.client = createGrpcClient({
+      service: FactureServiceConstructor,
+      url,
+      methods: { Create: { deadlineMs: 10_000 } },
+    });
     this.statutId =
       options.statutId || process.env.SUBSCRIPTION_FACTURE_STATUT_ID || DEFAULT_FACTURE_STATUT_ID;
     this.emissionFactureId =
@@ -294,21 +359,10 @@ export class FactureServiceGrpcClient implements SubscriptionFactureClient {
       ],
     };
 
-    const response = await new Promise<CreateFactureGrpcResponse>((resolve, reject) => {
-      this.client.Create(request, (error, payload) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-
-        if (!payload) {
-          reject(new Error('CreateFacture returned an empty response'));
-          return;
-        }
-
-        resolve(payload);
-      });
-    });
+    const response = await this.client.call<CreateFactureGrpcResponse | undefined>('Create', request);
+    if (!response) {
+      throw new Error('CreateFacture returned an empty response');
+    }
 
     return {
       id: response.id,
@@ -331,6 +385,70 @@ export class InMemorySubscriptionChargeIdempotencyStore implements IdempotenceSt
   async markEventProcessed(eventId: string): Promise<void> {
     this.keys.add(eventId);
   }
+
+  async findProcessedEventIds(eventIds: string[]): Promise<string[]> {
+    return eventIds.filter((eventId) => this.keys.has(eventId));
+  }
+}
+
+/** Process-local checkpoints: covers failures within one run, not process crashes */
+export class InMemorySubscriptionChargeCheckpointStore implements SubscriptionChargeCheckpointStore {
+  private readonly checkpoints = new Map<string, SubscriptionChargeCheckpoint>();
+
+  async find(idempotencyKey: string): Promise<SubscriptionChargeCheckpoint | null> {
+    return this.checkpoints.get(idempotencyKey) ?? null;
+  }
+
+  async findPending(organisationId: string): Promise<SubscriptionChargeCheckpoint[]> {
+    return [...this.checkpoints.values()].filter(
+      (checkpoint) => checkpoint.organisationId === organisationId,
+    );
+  }
+
+  async save(checkpoint: SubscriptionChargeCheckpoint): Promise<void> {
+    this.checkpoints.set(checkpoint.idempotencyKey, { ...checkpoint });
+  }
+
+  async complete(idempotencyKey: string): Promise<void> {
+    this.checkpoints.delete(idempotencyKey);
+  }
+}
+
+/** PSP call latencies and failures of one charging run */
+class ChargeRunMetrics {
+  private readonly startedAt = Date.now();
+  private readonly calls = new Map<string, { latencies: number[]; failures: number }>();
+
+  record(pspName: string, latencyMs: number, failed: boolean): void {
+    const entry = this.calls.get(pspName) ?? { latencies: [], failures: 0 };
+    entry.latencies.push(latencyMs);
+    if (failed) {
+      entry.failures += 1;
+    }
+    this.calls.set(pspName, entry);
+  }
+
+  snapshot(chargedCount: number): SubscriptionChargeRunMetrics {
+    const durationMs = Math.max(1, Date.now() - this.startedAt);
+    const psp: Record<string, PspChargeMetrics> = {};
+
+    for (const [pspName, { latencies, failures }] of this.calls) {
+      const sorted = [...latencies].sort((a, b) => a - b);
+      psp[pspName] = {
+        calls: sorted.length,
+        failures,
+        failureRate: failures / sorted.length,
+        avgLatencyMs: sorted.reduce((sum, value) => sum + value, 0) / sorted.length,
+        p95LatencyMs: sorted[Math.min(sorted.length - 1, Math.ceil(sorted.length * 0.95) - 1)],
+      };
+    }
+
+    return {
+      durationMs,
+      chargesPerSecond: (chargedCount * 1000) / durationMs,
+      psp,
+    };
+  }
 }
 
 type ChargeFailureTransitionPolicy = 'ON_MAX_RETRIES' | 'ALWAYS';
@@ -342,10 +460,32 @@ interface ProcessSubscriptionChargeOptions {
   source: 'RECURRING' | 'TRIAL_CONVERSION';
 }
 
+const RECURRING_CHARGE_OPTIONS: ProcessSubscriptionChargeOptions = {
+  allowedStatuses: [SubscriptionStatus.ACTIVE],
+  failureTransitionPolicy: 'ON_MAX_RETRIES',
+  failureReason: 'recurring_charge_failed',
+  source: 'RECURRING',
+};
+
+const TRIAL_CONVERSION_CHARGE_OPTIONS: ProcessSubscriptionChargeOptions = {
+  allowedStatuses: [SubscriptionStatus.TRIAL],
+  failureTransitionPolicy: 'ALWAYS',
+  failureReason: 'trial_conversion_payment_failed',
+  source: 'TRIAL_CONVERSION',
+};
+
+interface ChargeCandidate {
+  index: number;
+  subscription: SubscriptionEntity;
+  idempotencyKey: string;
+}
+
 @Injectable()
 export class SubscriptionChargeService {
   private readonly logger = new Logger(SubscriptionChargeService.name);
   private readonly idempotenceService: IdempotenceService;
+  private readonly checkpointStore: SubscriptionChargeCheckpointStore;
+  private readonly pspBuckets = new Map<string, TokenBucket>();
 
   constructor(
     private readonly subscriptionRepository: ISubscriptionRepository,
@@ -359,52 +499,128 @@ export class SubscriptionChargeService {
     private readonly options: SubscriptionChargeOptions = {},
   ) {
     this.idempotenceService = new IdempotenceService(this.idempotencyStore);
+    this.checkpointStore =
+      this.options.checkpointStore || new InMemorySubscriptionChargeCheckpointStore();
   }
 
+  /**
+   * Charge every due subscription of the organisation.
+   *
+   * Idempotence is checked in one bulk lookup, charges left half-done by a
+   * previous run are finished first, then subscriptions are charged in one
+   * partition per PSP, each with bounded concurrency and its own rate limit.
+   */
   async processCharges(organisationId: string): Promise<ChargeResult> {
     const now = this.now();
+    const metrics = new ChargeRunMetrics();
     const dueSubscriptions = await this.schedulingService.getDueSubscriptions(organisationId, now);
-    const results: SubscriptionChargeResult[] = [];
+    const results = new Array<SubscriptionChargeResult>(dueSubscriptions.length);
+    const candidates: ChargeCandidate[] = [];
 
-    for (const subscription of dueSubscriptions) {
+    dueSubscriptions.forEach((subscription, index) => {
       if (subscription.organisationId !== organisationId) {
-        results.push(
-          this.buildSkippedResult(
-            subscription.id,
-            this.safeIdempotencyKey(subscription),
-            'ORGANISATION_MISMATCH',
-          ),
+        results[index] = this.buildSkippedResult(
+          subscription.id,
+          this.safeIdempotencyKey(subscription),
+          'ORGANISATION_MISMATCH',
         );
-        continue;
+        return;
       }
 
-      const result = await this.processSubscriptionCharge(subscription, now, {
-        allowedStatuses: [SubscriptionStatus.ACTIVE],
-        failureTransitionPolicy: 'ON_MAX_RETRIES',
-        failureReason: 'recurring_charge_failed',
-        source: 'RECURRING',
+      const skipped = this.checkEligibility(subscription, RECURRING_CHARGE_OPTIONS);
+      if (skipped) {
+        results[index] = skipped;
+        return;
+      }
+
+      candidates.push({
+        index,
+        subscription,
+        idempotencyKey: this.buildIdempotencyKey(subscription.id, subscription.nextChargeAt as Date),
       });
+    });
 
-      results.push(result);
+    const pendingCheckpoints = await this.checkpointStore.findPending(organisationId);
+    const checkpoints = new Map(
+      pendingCheckpoints.map((checkpoint) => [checkpoint.idempotencyKey, checkpoint]),
+    );
+    const processedKeys = await this.idempotenceService.filterProcessed([
+      ...candidates.map((candidate) => candidate.idempotencyKey),
+      ...checkpoints.keys(),
+    ]);
+
+    const claimedKeys = new Set<string>();
+    const partitions = new Map<string, ChargeCandidate[]>();
+    for (const candidate of candidates) {
+      if (processedKeys.has(candidate.idempotencyKey) || claimedKeys.has(candidate.idempotencyKey)) {
+        results[candidate.index] = this.buildSkippedResult(
+          candidate.subscription.id,
+          candidate.idempotencyKey,
+          'ALREADY_CHARGED',
+        );
+        continue;
+      }
+
+      claimedKeys.add(candidate.idempotencyKey);
+      const pspName = this.resolvePspName(candidate.subscription);
+      partitions.set(pspName, [...(partitions.get(pspName) ?? []), candidate]);
     }
 
-    return this.buildBatchResult(results);
+    const resumedResults = await this.resumeCheckpoints(
+      pendingCheckpoints.filter((checkpoint) => !claimedKeys.has(checkpoint.idempotencyKey)),
+      processedKeys,
+    );
+
+    await Promise.all(
+      [...partitions.values()].map((partition) =>
+        mapWithConcurrency(partition, this.concurrency(), async (candidate) => {
+          results[candidate.index] = await this.chargeSubscription(
+            candidate.subscription,
+            candidate.idempotencyKey,
+            now,
+            RECURRING_CHARGE_OPTIONS,
+            checkpoints.get(candidate.idempotencyKey) ?? null,
+            metrics,
+          );
+        }),
+      ),
+    );
+
+    const batch = this.buildBatchResult([...results, ...resumedResults]);
+    batch.metrics = metrics.snapshot(batch.successCount);
+    this.logger.log(
+      `Charging run ${organisationId}: ${batch.successCount} charged, ${batch.failedCount} failed, ` +
+        `${batch.skippedCount} skipped in ${batch.metrics.durationMs}ms ` +
+        `(${batch.metrics.chargesPerSecond.toFixed(1)} charges/s)`,
+    );
+
+    return batch;
   }
 
   async chargeTrialConversion(subscription: SubscriptionEntity): Promise<SubscriptionChargeResult> {
-    return this.processSubscriptionCharge(subscription, this.now(), {
-      allowedStatuses: [SubscriptionStatus.TRIAL],
-      failureTransitionPolicy: 'ALWAYS',
-      failureReason: 'trial_conversion_payment_failed',
-      source: 'TRIAL_CONVERSION',
-    });
+    const skipped = this.checkEligibility(subscription, TRIAL_CONVERSION_CHARGE_OPTIONS);
+    if (skipped) {
+      return skipped;
+    }
+
+    const idempotencyKey = this.buildIdempotencyKey(subscription.id, subscription.nextChargeAt as Date);
+    if (await this.idempotenceService.isProcessed(idempotencyKey)) {
+      return this.buildSkippedResult(subscription.id, idempotencyKey, 'ALREADY_CHARGED');
+    }
+
+    return this.chargeSubscription(
+      subscription,
+      idempotencyKey,
+      this.now(),
+      TRIAL_CONVERSION_CHARGE_OPTIONS,
+      await this.checkpointStore.find(idempotencyKey),
+    );
   }
 
-  private async processSubscriptionCharge(
+  private checkEligibility(
     subscription: SubscriptionEntity,
-    now: Date,
     options: ProcessSubscriptionChargeOptions,
-  ): Promise<SubscriptionChargeResult> {
+  ): SubscriptionChargeResult | null {
     if (!this.isWebDirectSubscription(subscription)) {
       return this.buildSkippedResult(
         subscription.id,
@@ -438,111 +654,252 @@ export class SubscriptionChargeService {
       );
     }
 
-    const idempotencyKey = this.buildIdempotencyKey(subscription.id, subscription.nextChargeAt);
-    const alreadyProcessed = await this.idempotenceService.isProcessed(idempotencyKey);
+    return null;
+  }
 
-    if (alreadyProcessed) {
-      return this.buildSkippedResult(subscription.id, idempotencyKey, 'ALREADY_CHARGED');
+  /**
+   * Create the payment intent (unless a checkpoint shows it exists), then
+   * advance the subscription, invoice and publish. A failure after the
+   * payment leaves the checkpoint in place for the next run to finish.
+   */
+  private async chargeSubscription(
+    subscription: SubscriptionEntity,
+    idempotencyKey: string,
+    now: Date,
+    options: ProcessSubscriptionChargeOptions,
+    checkpoint: SubscriptionChargeCheckpoint | null,
+    metrics?: ChargeRunMetrics,
+  ): Promise<SubscriptionChargeResult> {
+    let current = checkpoint;
+
+    if (!current) {
+      let paymentIntent: SubscriptionPaymentIntent;
+      try {
+        paymentIntent = await this.createPaymentIntent(subscription, idempotencyKey, metrics);
+      } catch (error) {
+        return this.handleChargeFailure(subscription, idempotencyKey, now, options, error);
+      }
+
+      current = {
+        idempotencyKey,
+        organisationId: subscription.organisationId,
+        subscriptionId: subscription.id,
+        stage: 'PAYMENT_CREATED',
+        paymentIntentId: paymentIntent.id,
+        chargedAt: now.toISOString(),
+        nextChargeAt: this.toIsoDate(
+          this.schedulingService.calculateNextChargeAt(
+            subscription.frequency,
+            this.toIsoDate(subscription.nextChargeAt),
+          ),
+        ),
+        source: options.source,
+      };
     }
 
     try {
-      const paymentIntent = await this.paymentClient.createPaymentIntent(
-        this.buildPaymentIntentInput(subscription, idempotencyKey),
-      );
-
-      const chargedAt = now.toISOString();
-      const nextChargeAt = this.schedulingService.calculateNextChargeAt(
-        subscription.frequency,
-        this.toIsoDate(subscription.nextChargeAt),
-      );
+      if (!checkpoint) {
+        await this.checkpointStore.save(current);
+      }
+      return await this.completeCharge(subscription, current);
+    } catch (error) {
+      return this.buildIncompleteResult(current, error);
+    }
+  }
 
-      subscription.nextChargeAt = this.toDate(nextChargeAt, 'nextChargeAt');
+  private async completeCharge(
+    subscription: SubscriptionEntity,
+    checkpoint: SubscriptionChargeCheckpoint,
+  ): Promise<SubscriptionChargeResult> {
+    let current = checkpoint;
+    let savedSubscription = subscription;
+
+    if (current.stage === 'PAYMENT_CREATED') {
+      // Assign the target stored with the checkpoint rather than recomputing it:
+      // if the save below succeeded but the checkpoint update did not, the
+      // subscription is already advanced and a recomputation would skip a period.
+      subscription.nextChargeAt = this.toDate(current.nextChargeAt, 'nextChargeAt');
       subscription.retryCount = 0;
 
-      const savedSubscription = await this.subscriptionRepository.save(subscription);
+      savedSubscription = await this.subscriptionRepository.save(subscription);
+      current = { ...current, stage: 'SUBSCRIPTION_ADVANCED' };
+      await this.checkpointStore.save(current);
+    }
 
+    if (current.stage === 'SUBSCRIPTION_ADVANCED') {
       const facture = await this.factureClient.createFacture({
         organisationId: savedSubscription.organisationId,
-        dateEmission: chargedAt,
+        dateEmission: current.chargedAt,
         clientBaseId: savedSubscription.clientId,
         contratId: savedSubscription.contratId,
         amount: Number(savedSubscription.amount || 0),
         currency: savedSubscription.currency || 'EUR',
         subscriptionId: savedSubscription.id,
       });
+      current = { ...current, stage: 'INVOICED', invoiceId: facture.id };
+      await this.checkpointStore.save(current);
+    }
 
-      await this.idempotenceService.markProcessed(
-        idempotencyKey,
-        SUBSCRIPTION_CHARGE_IDEMPOTENCE_EVENT,
-      );
+    await this.idempotenceService.markProcessed(
+      current.idempotencyKey,
+      SUBSCRIPTION_CHARGE_IDEMPOTENCE_EVENT,
+    );
 
-      await this.publishEvent(SUBSCRIPTION_CHARGED_EVENT, {
-        subscriptionId: savedSubscription.id,
-        organisationId: savedSubscription.organisationId,
-        clientId: savedSubscription.clientId,
-        amount: Number(savedSubscription.amount || 0),
-        currency: savedSubscription.currency || 'EUR',
-        invoiceId: facture.id,
-        paymentIntentId: paymentIntent.id,
-        idempotencyKey,
-        chargedAt,
-        nextChargeAt: savedSubscription.nextChargeAt
-          ? this.toIsoDate(savedSubscription.nextChargeAt)
-          : null,
-        source: options.source,
-      });
+    await this.publishEvent(SUBSCRIPTION_CHARGED_EVENT, {
+      subscriptionId: savedSubscription.id,
+      organisationId: savedSubscription.organisationId,
+      clientId: savedSubscription.clientId,
+      amount: Number(savedSubscription.amount || 0),
+      currency: savedSubscription.currency || 'EUR',
+      invoiceId: current.invoiceId,
+      paymentIntentId: current.paymentIntentId,
+      idempotencyKey: current.idempotencyKey,
+      chargedAt: current.chargedAt,
+      nextChargeAt: savedSubscription.nextChargeAt
+        ? this.toIsoDate(savedSubscription.nextChargeAt)
+        : null,
+      source: current.source,
+    });
 
-      return {
-        subscriptionId: savedSubscription.id,
-        idempotencyKey,
-        status: 'CHARGED',
-        paymentIntentId: paymentIntent.id,
-        invoiceId: facture.id,
-      };
-    } catch (error) {
-      const reason = this.errorMessage(error);
-      const nextRetryCount = Number(subscription.retryCount || 0) + 1;
-
-      subscription.retryCount = nextRetryCount;
-      let savedSubscription = await this.subscriptionRepository.save(subscription);
-
-      if (this.shouldTransitionToPastDue(options.failureTransitionPolicy, nextRetryCount)) {
-        savedSubscription = await this.lifecycleService.markPastDue(savedSubscription.id, {
-          reason: options.failureReason,
-          triggeredBy: SubscriptionTriggeredBy.DUNNING,
-          metadata: {
-            source: options.source,
-            retryCount: nextRetryCount,
-            maxRetries: this.maxRetries(),
-            idempotencyKey,
-            failure: reason,
-          },
-        });
+    await this.checkpointStore.complete(current.idempotencyKey);
+
+    return {
+      subscriptionId: savedSubscription.id,
+      idempotencyKey: current.idempotencyKey,
+      status: 'CHARGED',
+      paymentIntentId: current.paymentIntentId,
+      invoiceId: current.invoiceId,
+    };
+  }
+
+  /** Finish charges a previous run paid but did not complete */
+  private async resumeCheckpoints(
+    checkpoints: SubscriptionChargeCheckpoint[],
+    processedKeys: Set<string>,
+  ): Promise<SubscriptionChargeResult[]> {
+    const results = await mapWithConcurrency(checkpoints, this.concurrency(), async (checkpoint) => {
+      if (processedKeys.has(checkpoint.idempotencyKey)) {
+        await this.checkpointStore.complete(checkpoint.idempotencyKey);
+        return null;
       }
 
-      await this.publishEvent(SUBSCRIPTION_CHARGE_FAILED_EVENT, {
-        subscriptionId: savedSubscription.id,
-        organisationId: savedSubscription.organisationId,
-        clientId: savedSubscription.clientId,
-        amount: Number(savedSubscription.amount || 0),
-        currency: savedSubscription.currency || 'EUR',
-        idempotencyKey,
-        retryCount: nextRetryCount,
-        maxRetries: this.maxRetries(),
-        status: savedSubscription.status,
-        reason,
-        failedAt: now.toISOString(),
-        source: options.source,
+      try {
+        const subscription = await this.subscriptionRepository.findById(checkpoint.subscriptionId);
+        if (!subscription) {
+          throw new Error(`Subscription ${checkpoint.subscriptionId} not found`);
+        }
+
+        this.logger.warn(
+          `Resuming charge ${checkpoint.idempotencyKey} from stage ${checkpoint.stage}`,
+        );
+        return await this.completeCharge(subscription, checkpoint);
+      } catch (error) {
+        return this.buildIncompleteResult(checkpoint, error);
+      }
+    });
+
+    return results.filter((result): result is SubscriptionChargeResult => result !== null);
+  }
+
+  private async createPaymentIntent(
+    subscription: SubscriptionEntity,
+    idempotencyKey: string,
+    metrics?: ChargeRunMetrics,
+  ): Promise<SubscriptionPaymentIntent> {
+    const input = this.buildPaymentIntentInput(subscription, idempotencyKey);
+    await this.pspBucket(input.pspName).take();
+
+    const startedAt = Date.now();
+    try {
+      const paymentIntent = await this.paymentClient.createPaymentIntent(input);
+      metrics?.record(input.pspName, Date.now() - startedAt, false);
+      return paymentIntent;
+    } catch (error) {
+      metrics?.record(input.pspName, Date.now() - startedAt, true);
+      throw error;
+    }
+  }
+
+  private async handleChargeFailure(
+    subscription: SubscriptionEntity,
+    idempotencyKey: string,
+    now: Date,
+    options: ProcessSubscriptionChargeOptions,
+    error: unknown,
+  ): Promise<SubscriptionChargeResult> {
+    const reason = this.errorMessage(error);
+    const nextRetryCount = Number(subscription.retryCount || 0) + 1;
+
+    subscription.retryCount = nextRetryCount;
+    let savedSubscription = await this.subscriptionRepository.save(subscription);
+
+    if (this.shouldTransitionToPastDue(options.failureTransitionPolicy, nextRetryCount)) {
+      savedSubscription = await this.lifecycleService.markPastDue(savedSubscription.id, {
+        reason: options.failureReason,
+        triggeredBy: SubscriptionTriggeredBy.DUNNING,
+        metadata: {
+          source: options.source,
+          retryCount: nextRetryCount,
+          maxRetries: this.maxRetries(),
+          idempotencyKey,
+          failure: reason,
+        },
       });
+    }
 
-      return {
-        subscriptionId: savedSubscription.id,
-        idempotencyKey,
-        status: 'FAILED',
-        retryCount: nextRetryCount,
-        reason,
-      };
+    await this.publishEvent(SUBSCRIPTION_CHARGE_FAILED_EVENT, {
+      subscriptionId: savedSubscription.id,
+      organisationId: savedSubscription.organisationId,
+      clientId: savedSubscription.clientId,
+      amount: Number(savedSubscription.amount || 0),
+      currency: savedSubscription.currency || 'EUR',
+      idempotencyKey,
+      retryCount: nextRetryCount,
+      maxRetries: this.maxRetries(),
+      status: savedSubscription.status,
+      reason,
+      failedAt: now.toISOString(),
+      source: options.source,
+    });
+
+    return {
+      subscriptionId: savedSubscription.id,
+      idempotencyKey,
+      status: 'FAILED',
+      retryCount: nextRetryCount,
+      reason,
+    };
+  }
+
+  private buildIncompleteResult(
+    checkpoint: SubscriptionChargeCheckpoint,
+    error: unknown,
+  ): SubscriptionChargeResult {
+    const reason = this.errorMessage(error);
+    this.logger.error(
+      `Charge ${checkpoint.idempotencyKey} paid (${checkpoint.paymentIntentId}) but not completed, ` +
+        `will resume from ${checkpoint.stage}: ${reason}`,
+    );
+
+    return {
+      subscriptionId: checkpoint.subscriptionId,
+      idempotencyKey: checkpoint.idempotencyKey,
+      status: 'FAILED',
+      paymentIntentId: checkpoint.paymentIntentId,
+      reason: `CHARGE_INCOMPLETE: ${reason}`,
+    };
+  }
+
+  private pspBucket(pspName: string): TokenBucket {
+    const key = pspName.toUpperCase();
+    let bucket = this.pspBuckets.get(key);
+    if (!bucket) {
+      const limit =
+        this.options.pspRateLimits?.[key] || DEFAULT_PSP_RATE_LIMITS[key] || FALLBACK_PSP_RATE_LIMIT;
+      bucket = new TokenBucket(limit.ratePerSecond, limit.burst ?? limit.ratePerSecond);
+      this.pspBuckets.set(key, bucket);
     }
+    return bucket;
   }
 
   private buildPaymentIntentInput(
@@ -553,7 +910,7 @@ export class SubscriptionChargeService {
       organisationId: subscription.organisationId,
       societeId: this.resolveSocieteId(subscription),
       clientId: subscription.clientId,
-      pspName: this.pspName(),
+      pspName: this.resolvePspName(subscription),
       amount: this.toMinorUnits(subscription.amount),
       currency: subscription.currency || 'EUR',
       idempotencyKey,
@@ -643,8 +1000,12 @@ export class SubscriptionChargeService {
     return this.options.now?.() || new Date();
   }
 
-  private pspName(): string {
-    return this.options.pspName || DEFAULT_PSP_NAME;
+  private resolvePspName(subscription: SubscriptionEntity): string {
+    return this.options.resolvePspName?.(subscription) || this.options.pspName || DEFAULT_PSP_NAME;
+  }
+
+  private concurrency(): number {
+    return this.options.concurrency ?? DEFAULT_CHARGE_CONCURRENCY;
   }
 
   private maxRetries(): number {
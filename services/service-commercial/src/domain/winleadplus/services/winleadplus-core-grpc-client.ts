@@ -1,5 +1,10 @@
-import { credentials, type ServiceError } from '@grpc/grpc-js';
-import { getServiceUrl, loadGrpcPackage } from '@crm/shared-kernel';
+import {
+  createGrpcClient,
+  getServiceUrl,
+  GRPC_READ_POLICY,
+  loadGrpcPackage,
+  type PooledGrpcClient,
+} from '@crm/shared-kernel';
 
 // ===== TYPE CONTRACTS =====
 
@@ -92,37 +97,11 @@ interface DeleteResponse {
   success: boolean;
 }
 
-interface ClientBaseServiceGrpcContract {
-  Search(
-    request: SearchClientRequest,
-    callback: (error: ServiceError | null, response?: SearchClientResponse) => void,
-  ): void;
-  Create(
-    request: CreateClientRequest,
-    callback: (error: ServiceError | null, response?: ClientBaseResponse) => void,
-  ): void;
-  Update(
-    request: UpdateClientRequest,
-    callback: (error: ServiceError | null, response?: ClientBaseResponse) => void,
-  ): void;
-  Delete(
-    request: DeleteClientRequest,
-    callback: (error: ServiceError | null, response?: DeleteResponse) => void,
-  ): void;
-}
-
-interface AdresseServiceGrpcContract {
-  Create(
-    request: CreateAdresseRequest,
-    callback: (error: ServiceError | null, response?: AdresseResponse) => void,
-  ): void;
-}
-
 // ===== GRPC CLIENT =====
 
 export class WinLeadPlusCoreGrpcClient {
-  private readonly clientBaseService: ClientBaseServiceGrpcContract;
-  private readonly adresseService: AdresseServiceGrpcContract;
+  private readonly clientBaseService: PooledGrpcClient;
+  private readonly adresseService: PooledGrpcClient;
 
   constructor() {
     const grpcPackage = loadGrpcPackage('clients');
@@ -135,84 +114,50 @@ export class WinLeadPlusCoreGrpcClient {
     if (!ClientBaseConstructor) {
       throw new Error('ClientBaseService gRPC constructor not found in clients proto package');
     }
-    this.clientBaseService = new ClientBaseConstructor(url, credentials.createInsecure());
+    this.clientBaseService = createGrpcClient({
+      service: ClientBaseConstructor,
+      url,
+      methods: { Search: GRPC_READ_POLICY },
+    });
 
     const AdresseConstructor = grpcPackage?.clients?.AdresseService;
     if (!AdresseConstructor) {
       throw new Error('AdresseService gRPC constructor not found in clients proto package');
     }
-    this.adresseService = new AdresseConstructor(url, credentials.createInsecure());
+    this.adresseService = createGrpcClient({ service: AdresseConstructor, url });
   }
 
   async search(request: SearchClientRequest): Promise<SearchClientResponse> {
-    return new Promise<SearchClientResponse>((resolve, reject) => {
-      this.clientBaseService.Search(request, (error, response) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-        resolve(response || { found: false });
-      });
-    });
+    const response = await this.clientBaseService.call<SearchClientResponse | undefined>('Search', request);
+    return response || { found: false };
   }
 
   async create(request: CreateClientRequest): Promise<ClientBaseResponse> {
-    return new Promise<ClientBaseResponse>((resolve, reject) => {
-      this.clientBaseService.Create(request, (error, response) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-        if (!response) {
-          reject(new Error('ClientBase create returned empty response'));
-          return;
-        }
-        resolve(response);
-      });
-    });
+    const response = await this.clientBaseService.call<ClientBaseResponse | undefined>('Create', request);
+    if (!response) {
+      throw new Error('ClientBase create returned empty response');
+    }
+    return response;
   }
 
   async update(request: UpdateClientRequest): Promise<ClientBaseResponse> {
-    return new Promise<ClientBaseResponse>((resolve, reject) => {
-      this.clientBaseService.Update(request, (error, response) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-        if (!response) {
-          reject(new Error('ClientBase update returned empty response'));
-          return;
-        }
-        resolve(response);
-      });
-    });
+    const response = await this.clientBaseService.call<ClientBaseResponse | undefined>('Update', request);
+    if (!response) {
+      throw new Error('ClientBase update returned empty response');
+    }
+    return response;
   }
 
   async createAdresse(request: CreateAdresseRequest): Promise<AdresseResponse> {
-    return new Promise<AdresseResponse>((resolve, reject) => {
-      this.adresseService.Create(request, (error, response) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-        if (!response) {
-          reject(new Error('Adresse create returned empty response'));
-          return;
-        }
-        resolve(response);
-      });
-    });
+    const response = await this.adresseService.call<AdresseResponse | undefined>('Create', request);
+    if (!response) {
+      throw new Error('Adresse create returned empty response');
+    }
+    return response;
   }
 
   async deleteClient(request: DeleteClientRequest): Promise<DeleteResponse> {
-    return new Promise<DeleteResponse>((resolve, reject) => {
-      this.clientBaseService.Delete(request, (error, response) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-        resolve(response || { success: false });
-      });
-    });
+    const response = await this.clientBaseService.call<DeleteResponse | undefined>('Delete', request);
+    return response || { success: false };
   }
 }
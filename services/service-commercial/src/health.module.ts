@@ -0,0 +1,7 @@
+import { Module } from '@nestjs/common';
+import { HealthController } from './infrastructure/http/health/health.controller';
+
+@Module({
+  controllers: [HealthController],
+})
+export class HealthModule {}
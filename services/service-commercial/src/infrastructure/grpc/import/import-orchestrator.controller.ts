@@ -12,6 +12,7 @@ interface ImportAllRequest {
   api_key: string;
   dry_run?: boolean;
   page_size?: number;
+  concurrency?: number;
 }
 
 @Controller()
@@ -54,6 +55,7 @@ export class ImportOrchestratorController {
         apiKey: data.api_key,
         dryRun: Boolean(data.dry_run),
         pageSize: data.page_size,
+        concurrency: data.concurrency,
       });
 
       return {
@@ -0,0 +1,36 @@
+import { beforeEach, describe, expect, it } from 'bun:test';
+import { PooledGrpcClient, resetGrpcClientMetrics } from '@crm/shared-kernel';
+import { HealthController } from '../health.controller';
+
+describe('HealthController', () => {
+  beforeEach(() => {
+    resetGrpcClientMetrics();
+  });
+
+  it('reports the service as up', () => {
+    const health = new HealthController().getHealth();
+
+    expect(health.status).toBe('ok');
+    expect(health.service).toBe('service-commercial');
+  });
+
+  it('exposes the pooled gRPC client metrics', async () => {
+    const raw = {
+      GetById: (
+        request: { id: string },
+        _metadata: unknown,
+        _options: unknown,
+        callback: (error: unknown, response?: unknown) => void,
+      ) => callback(null, { id: request.id }),
+    };
+    const client = new PooledGrpcClient(raw, 'users:50051', { methods: { GetById: { cacheTtlMs: 60_000 } } });
+    await client.call('GetById', { id: 'u-1' });
+    await client.call('GetById', { id: 'u-1' });
+
+    const { methods } = new HealthController().getGrpcClients();
+
+    expect(methods.map(({ target, method, count, cacheHits }) => ({ target, method, count, cacheHits }))).toEqual([
+      { target: 'users:50051', method: 'GetById', count: 1, cacheHits: 1 },
+    ]);
+  });
+});
@@ -0,0 +1,23 @@
+import { Controller, Get } from '@nestjs/common';
+import { getGrpcClientMetrics, type GrpcClientMethodMetrics } from '@crm/shared-kernel';
+
+@Controller('health')
+export class HealthController {
+  @Get()
+  getHealth() {
+    return {
+      status: 'ok',
+      timestamp: new Date().toISOString(),
+      service: 'service-commercial',
+    };
+  }
+
+  /** Latency histograms, retries, coalesced calls and cache hits of the pooled gRPC clients */
+  @Get('grpc-clients')
+  getGrpcClients(): { timestamp: string; methods: GrpcClientMethodMetrics[] } {
+    return {
+      timestamp: new Date().toISOString(),
+      methods: getGrpcClientMetrics(),
+    };
+  }
+}
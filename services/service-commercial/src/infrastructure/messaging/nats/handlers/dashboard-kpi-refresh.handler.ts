@@ -0,0 +1,93 @@
+import { Injectable, Logger, OnModuleDestroy, OnModuleInit } from '@nestjs/common';
+import { NatsService } from '@crm/shared-kernel';
+import { ContratKpiMaterializerService } from '../../../persistence/typeorm/repositories/dashboard/contrat-kpi-materializer.service';
+
+const DEFAULT_FLUSH_DELAY_MS = 500;
+const MAX_PENDING_CONTRATS = 500;
+
+/** Contrat lifecycle, payment and commission events carrying the contrat they touch */
+const KPI_REFRESH_SUBJECTS = [
+  'crm.contrat.status.changed',
+  'crm.contrat.signed',
+  'crm.contrat.activated',
+  'crm.contrat.suspended',
+  'crm.contrat.terminated',
+  'payment.echeance.encaissee',
+  'crm.commissions.prime_fixe.requested',
+  'crm.commissions.recurrente.requested',
+];
+
+/**
+ * Keeps the materialized dashboard KPIs up to date from contrat and commission events.
+ *
+ * Contrat ids are buffered for a short delay so that a burst of events
+ * (bulk status changes, payment runs, the generic and specific subjects of one
+ * status change) recomputes each bucket only once. Edits that publish no event
+ * (creation, montant, commercial or societe) are picked up by the periodic sweep
+ * in DashboardKpiSchedulerService.
+ */
+@Injectable()
+export class DashboardKpiRefreshHandler implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(DashboardKpiRefreshHandler.name);
+  private readonly pending = new Set<string>();
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  private flushing: Promise<void> = Promise.resolve();
+  private readonly flushDelayMs =
+    Number(process.env.DASHBOARD_KPI_FLUSH_DELAY_MS) || DEFAULT_FLUSH_DELAY_MS;
+
+  constructor(
+    private readonly natsService: NatsService,
+    private readonly materializer: ContratKpiMaterializerService,
+  ) {}
+
+  async onModuleInit(): Promise<void> {
+    this.logger.log('DashboardKpiRefreshHandler initialized - subscribing to contrat and commission events');
+
+    for (const subject of KPI_REFRESH_SUBJECTS) {
+      await this.natsService.subscribe(subject, this.handleContratEvent.bind(this));
+    }
+  }
+
+  async onModuleDestroy(): Promise<void> {
+    await this.flush();
+  }
+
+  private async handleContratEvent(data: any, subject?: string): Promise<void> {
+    const contratId = data?.contrat_id || data?.contratId;
+    if (!contratId) {
+      this.logger.warn(`${subject ?? 'contrat'} event without contrat_id — KPI refresh skipped`);
+      return;
+    }
+
+    this.pending.add(contratId);
+    if (this.pending.size >= MAX_PENDING_CONTRATS) {
+      await this.flush();
+    } else if (!this.timer) {
+      this.timer = setTimeout(() => void this.flush(), this.flushDelayMs);
+    }
+  }
+
+  /** Recompute the buckets of every buffered contrat; flushes never overlap. */
+  async flush(): Promise<void> {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+
+    this.flushing = this.flushing.then(async () => {
+      const contratIds = [...this.pending];
+      this.pending.clear();
+      if (contratIds.length === 0) return;
+
+      try {
+        const buckets = await this.materializer.refreshContrats(contratIds);
+        this.logger.debug(`Refreshed ${buckets} KPI bucket(s) for ${contratIds.length} contrat(s)`);
+      } catch (error: any) {
+        // The periodic sweep in DashboardKpiSchedulerService picks these contrats up again
+        this.logger.error(`KPI refresh failed for ${contratIds.length} contrat(s): ${error.message}`);
+      }
+    });
+
+    return this.flushing;
+  }
+}
@@ -1,5 +1,11 @@
-import { credentials, type ServiceError } from '@grpc/grpc-js';
-import { getServiceUrl, loadGrpcPackage, NatsService } from '@crm/shared-kernel';
+import { status } from '@grpc/grpc-js';
+import {
+  createGrpcClient,
+  getServiceUrl,
+  loadGrpcPackage,
+  NatsService,
+  type PooledGrpcClient,
+} from '@crm/shared-kernel';
 import { Injectable, Logger, OnModuleInit, Optional } from '@nestjs/common';
 import {
   ClientExternalMappingEntity,
@@ -34,6 +40,9 @@ import { SubscriptionService } from '../../../../persistence/typeorm/repositorie
 
 const IMS_WEBHOOK_SUBJECT = 'crm.commercial.mondial-tv.ims.webhook.received';
 const IMS_INTERNAL_SUBJECT_PREFIX = 'crm.commercial.mondial-tv.ims';
+const IMS_WEBHOOK_STREAM = 'CRM_COMMERCIAL_IMS_WEBHOOKS';
+const IMS_WEBHOOK_DURABLE = 'service-commercial-ims-event-handler';
+const DEFAULT_IMS_EVENT_CONCURRENCY = 8;
 
 interface CreateClientBaseGrpcRequest {
   organisation_id: string;
@@ -87,17 +96,6 @@ interface ClientBaseGrpcResponse {
   statut?: string;
 }
 
-interface ClientBaseServiceGrpcContract {
-  Create(
-    request: CreateClientBaseGrpcRequest,
-    callback: (error: ServiceError | null, response?: ClientBaseGrpcResponse) => void,
-  ): void;
-  Update(
-    request: UpdateClientBaseGrpcRequest,
-    callback: (error: ServiceError | null, response?: ClientBaseGrpcResponse) => void,
-  ): void;
-}
-
 interface UpdatePaymentIntentGrpcRequest {
   id: string;
   status?: string;
@@ -111,13 +109,6 @@ interface PaymentIntentGrpcResponse {
   status?: string;
 }
 
-interface PaymentServiceGrpcContract {
-  UpdatePaymentIntent(
-    request: UpdatePaymentIntentGrpcRequest,
-    callback: (error: ServiceError | null, response?: PaymentIntentGrpcResponse) => void,
-  ): void;
-}
-
 export interface ClientBaseClientPort {
   createClient(input: CreateClientBaseGrpcRequest): Promise<ClientBaseGrpcResponse>;
   updateClient(input: UpdateClientBaseGrpcRequest): Promise<ClientBaseGrpcResponse>;
@@ -136,7 +127,7 @@ function resolvePaymentsGrpcUrl(): string {
 }
 
 export class ClientBaseServiceGrpcClient implements ClientBaseClientPort {
-  private readonly client: ClientBaseServiceGrpcContract;
+  private readonly client: PooledGrpcClient;
 
   constructor(url: string = resolveClientsGrpcUrl()) {
     const grpcPackage = loadGrpcPackage('clients');
@@ -146,48 +137,35 @@ export class ClientBaseServiceGrpcClient implements ClientBaseClientPort {
       throw new Error('ClientBaseService gRPC constructor not found in clients proto package');
     }
 
-    this.client = new ClientBaseServiceConstructor(url, credentials.createInsecure());
+    // Update overwrites fields with the event values, replaying it is harmless
+    this.client = createGrpcClient({
+      service: ClientBaseServiceConstructor,
+      url,
+      methods: { Update: { retries: 2, retryOn: [status.UNAVAILABLE] } },
+    });
   }
 
   async createClient(input: CreateClientBaseGrpcRequest): Promise<ClientBaseGrpcResponse> {
-    return new Promise<ClientBaseGrpcResponse>((resolve, reject) => {
-      this.client.Create(input, (error, response) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-
-        if (!response) {
-          reject(new Error('Create client returned an empty response'));
-          return;
-        }
+    const response = await this.client.call<ClientBaseGrpcResponse | undefined>('Create', input);
+    if (!response) {
+      throw new Error('Create client returned an empty response');
+    }
 
-        resolve(response);
-      });
-    });
+    return response;
   }
 
   async updateClient(input: UpdateClientBaseGrpcRequest): Promise<ClientBaseGrpcResponse> {
-    return new Promise<ClientBaseGrpcResponse>((resolve, reject) => {
-      this.client.Update(input, (error, response) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-
-        if (!response) {
-          reject(new Error('Update client returned an empty response'));
-          return;
-        }
+    const response = await this.client.call<ClientBaseGrpcResponse | undefined>('Update', input);
+    if (!response) {
+      throw new Error('Update client returned an empty response');
+    }
 
-        resolve(response);
-      });
-    });
+    return response;
   }
 }
 
 export class PaymentIntentGrpcClient implements PaymentIntentClientPort {
-  private readonly client: PaymentServiceGrpcContract;
+  private readonly client: PooledGrpcClient;
 
   constructor(url: string = resolvePaymentsGrpcUrl()) {
     const grpcPackage = loadGrpcPackage('payments');
@@ -197,27 +175,26 @@ export class PaymentIntentGrpcClient implements PaymentIntentClientPort {
       throw new Error('PaymentService gRPC constructor not found in payments proto package');
     }
 
-    this.client = new PaymentServiceConstructor(url, credentials.createInsecure());
+    // Setting an intent to the status carried by the event is idempotent
+    this.client = createGrpcClient({
+      service: PaymentServiceConstructor,
+      url,
+      methods: { UpdatePaymentIntent: { retries: 2, retryOn: [status.UNAVAILABLE] } },
+    });
   }
 
   async updatePaymentIntent(
     input: UpdatePaymentIntentGrpcRequest,
   ): Promise<PaymentIntentGrpcResponse> {
-    return new Promise<PaymentIntentGrpcResponse>((resolve, reject) => {
-      this.client.UpdatePaymentIntent(input, (error, response) => {
-        if (error) {
-          reject(error);
-          return;
-        }
-
-        if (!response) {
-          reject(new Error('UpdatePaymentIntent returned an empty response'));
-          return;
-        }
+    const response = await this.client.call<PaymentIntentGrpcResponse | undefined>(
+      'UpdatePaymentIntent',
+      input,
+    );
+    if (!response) {
+      throw new Error('UpdatePaymentIntent returned an empty response');
+    }
 
-        resolve(response);
-      });
-    });
+    return response;
   }
 }
 
@@ -257,11 +234,19 @@ export class ImsEventHandler implements OnModuleInit {
       return;
     }
 
-    await this.natsService.subscribe<ImsWebhookNatsEvent>(
+    // Durable consumer: events survive restarts, failed ones are redelivered.
+    // Events of the same IMS user stay ordered, other users are handled in parallel.
+    await this.natsService.consume<ImsWebhookNatsEvent>(
       IMS_WEBHOOK_SUBJECT,
       async (event) => {
         await this.processEvent(event);
       },
+      {
+        stream: IMS_WEBHOOK_STREAM,
+        durable: IMS_WEBHOOK_DURABLE,
+        concurrency: Number(process.env.IMS_EVENT_CONCURRENCY) || DEFAULT_IMS_EVENT_CONCURRENCY,
+        orderingKey: (event) => this.resolveOrderingKey(event),
+      },
     );
 
     this.logger.log('ImsEventHandler initialized - ready to process IMS webhook events');
@@ -1090,6 +1075,17 @@ export class ImsEventHandler implements OnModuleInit {
     return trimmed || null;
   }
 
+  private resolveOrderingKey(event: ImsWebhookNatsEvent): string | undefined {
+    const userKey = this.readString(this.readPayload(event), [
+      'ims_user_id',
+      'imsUserId',
+      'user_id',
+      'client_id',
+      'clientId',
+    ]);
+    return userKey ? `${event.organisationId}:${userKey}` : undefined;
+  }
+
   private readPayload(event: ImsWebhookNatsEvent): Record<string, any> {
     if (event.payload && typeof event.payload === 'object' && !Array.isArray(event.payload)) {
       return event.payload;
@@ -1,6 +1,6 @@
 import { Injectable, NotFoundException } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository } from 'typeorm';
+import { In, Repository } from 'typeorm';
 import { RpcException } from '@nestjs/microservices';
 import { status } from '@grpc/grpc-js';
 import { ApporteurEntity } from '../../../../../domain/commercial/entities/apporteur.entity';
@@ -70,6 +70,13 @@ export class ApporteurService {
     return apporteur;
   }
 
+  async findByUtilisateurs(utilisateurIds: string[]): Promise<ApporteurEntity[]> {
+    if (utilisateurIds.length === 0) {
+      return [];
+    }
+    return this.apporteurRepository.find({ where: { utilisateurId: In(utilisateurIds) } });
+  }
+
   async findAll(
     filters?: { search?: string; typeApporteur?: string; actif?: boolean },
     pagination?: { page: number; limit: number },
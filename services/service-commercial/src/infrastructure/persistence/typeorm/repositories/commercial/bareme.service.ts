@@ -88,6 +88,59 @@ export class BaremeService {
     return bareme;
   }
 
+  static applicableKey(typeProduit: string, dateEffet: string): string {
+    return `${typeProduit}|${dateEffet}`;
+  }
+
+  /**
+   * Bulk variant of findApplicable for batch jobs.
+   * Active baremes are loaded once per distinct date, then each (typeProduit, date)
+   * pair is resolved in memory with the same rules and version ordering, memoized
+   * under `applicableKey`. Throws NOT_FOUND like findApplicable if a pair has no bareme.
+   */
+  async findApplicableMany(
+    organisationId: string,
+    requests: Array<{ typeProduit: string; dateEffet: string }>,
+  ): Promise<Map<string, BaremeCommissionEntity>> {
+    const resolved = new Map<string, BaremeCommissionEntity>();
+    const candidatesByDate = new Map<string, BaremeCommissionEntity[]>();
+
+    for (const { typeProduit, dateEffet } of requests) {
+      const key = BaremeService.applicableKey(typeProduit, dateEffet);
+      if (resolved.has(key)) {
+        continue;
+      }
+
+      let candidates = candidatesByDate.get(dateEffet);
+      if (!candidates) {
+        const qb = this.baremeRepository.createQueryBuilder('b');
+        qb.leftJoinAndSelect('b.paliers', 'paliers');
+        qb.where('b.organisationId = :orgId', { orgId: organisationId });
+        qb.andWhere('b.actif = true');
+        if (dateEffet) {
+          qb.andWhere('b.dateEffet <= :dateEffet', { dateEffet });
+          qb.andWhere('(b.dateFin IS NULL OR b.dateFin >= :dateEffet)', { dateEffet });
+        }
+        qb.orderBy('b.version', 'DESC');
+        candidates = await qb.getMany();
+        candidatesByDate.set(dateEffet, candidates);
+      }
+
+      const bareme = candidates.find(
+        (candidate) => !typeProduit || candidate.typeProduit === typeProduit || candidate.typeProduit == null,
+      );
+      if (!bareme) {
+        throw new RpcException({
+          code: status.NOT_FOUND,
+          message: `Aucun bareme applicable trouve`,
+        });
+      }
+      resolved.set(key, bareme);
+    }
+
+    return resolved;
+  }
+
   async findAll(
     filters?: { organisationId?: string; typeProduit?: string; actif?: boolean },
     pagination?: { page: number; limit: number },
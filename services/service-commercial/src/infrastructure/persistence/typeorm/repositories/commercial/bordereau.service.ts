@@ -1,9 +1,26 @@
 import { Injectable } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository } from 'typeorm';
+import { EntityManager, Repository } from 'typeorm';
 import { RpcException } from '@nestjs/microservices';
 import { status } from '@grpc/grpc-js';
+import { chunkArray } from '@crm/shared-kernel';
 import { BordereauCommissionEntity, StatutBordereau } from '../../../../../domain/commercial/entities/bordereau-commission.entity';
+import { LigneBordereauEntity } from '../../../../../domain/commercial/entities/ligne-bordereau.entity';
+import { CommissionAuditLogEntity } from '../../../../../domain/commercial/entities/commission-audit-log.entity';
+import { RepriseCommissionEntity } from '../../../../../domain/commercial/entities/reprise-commission.entity';
+import { CommissionRecurrenteEntity } from '../../../../../domain/commercial/entities/commission-recurrente.entity';
+
+/** Rows per multi-row INSERT; keeps bind parameters well under the PostgreSQL limit. */
+const INSERT_CHUNK_SIZE = 500;
+
+export interface BordereauGenerationWrite {
+  bordereau: Partial<BordereauCommissionEntity> & { id: string; reference: string };
+  lignes: Partial<LigneBordereauEntity>[];
+  audits: Partial<CommissionAuditLogEntity>[];
+  repriseUpdates: Array<{ id: string; payload: Partial<RepriseCommissionEntity> }>;
+  recurrences: Partial<CommissionRecurrenteEntity>[];
+  bordereauUpdate: Partial<BordereauCommissionEntity>;
+}
 
 @Injectable()
 export class BordereauService {
@@ -14,15 +31,7 @@ export class BordereauService {
 
   async create(data: Partial<BordereauCommissionEntity>): Promise<BordereauCommissionEntity> {
     if (data.reference) {
-      const existing = await this.bordereauRepository.findOne({
-        where: { reference: data.reference },
-      });
-      if (existing) {
-        throw new RpcException({
-          code: status.ALREADY_EXISTS,
-          message: `Bordereau avec reference "${data.reference}" existe deja`,
-        });
-      }
+      await this.assertReferenceAvailable(this.bordereauRepository.manager, data.reference);
     }
     const bordereau = this.bordereauRepository.create(data);
     return this.bordereauRepository.save(bordereau);
@@ -34,6 +43,33 @@ export class BordereauService {
     return this.bordereauRepository.save(bordereau);
   }
 
+  /**
+   * Write the result of a bulk bordereau generation in a single transaction: the bordereau
+   * with its totals, lignes, audit logs and recurrences as chunked multi-row INSERTs, then
+   * reprise updates. Nothing is left behind when any write fails.
+   */
+  async persistGeneration(write: BordereauGenerationWrite): Promise<BordereauCommissionEntity> {
+    await this.bordereauRepository.manager.transaction(async (manager) => {
+      await this.assertReferenceAvailable(manager, write.bordereau.reference);
+      await manager.insert(BordereauCommissionEntity, { ...write.bordereau, ...write.bordereauUpdate });
+
+      for (const rows of chunkArray(write.lignes, INSERT_CHUNK_SIZE)) {
+        await manager.createQueryBuilder().insert().into(LigneBordereauEntity).values(rows).execute();
+      }
+      for (const rows of chunkArray(write.audits, INSERT_CHUNK_SIZE)) {
+        await manager.createQueryBuilder().insert().into(CommissionAuditLogEntity).values(rows).execute();
+      }
+      for (const rows of chunkArray(write.recurrences, INSERT_CHUNK_SIZE)) {
+        await manager.createQueryBuilder().insert().into(CommissionRecurrenteEntity).values(rows).execute();
+      }
+      for (const { id, payload } of write.repriseUpdates) {
+        await manager.update(RepriseCommissionEntity, id, payload);
+      }
+    });
+
+    return this.findById(write.bordereau.id);
+  }
+
   async findById(id: string): Promise<BordereauCommissionEntity> {
     const bordereau = await this.bordereauRepository.findOne({
       where: { id },
@@ -118,4 +154,14 @@ export class BordereauService {
     const result = await this.bordereauRepository.delete(id);
     return (result.affected ?? 0) > 0;
   }
+
+  private async assertReferenceAvailable(manager: EntityManager, reference: string): Promise<void> {
+    const existing = await manager.findOne(BordereauCommissionEntity, { where: { reference } });
+    if (existing) {
+      throw new RpcException({
+        code: status.ALREADY_EXISTS,
+        message: `Bordereau avec reference "${reference}" existe deja`,
+      });
+    }
+  }
 }
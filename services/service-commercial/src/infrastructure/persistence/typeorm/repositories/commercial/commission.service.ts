@@ -89,8 +89,69 @@ export class CommissionService {
     return { data, total, page, limit, totalPages: Math.ceil(total / limit) };
   }
 
+  /**
+   * Net amounts of the paid commissions of `contratIds` over the `fenetreMois`
+   * periods preceding `periode`, keyed by contrat id, in one read.
+   */
+  async findMontantsVersesDansFenetre(
+    contratIds: string[],
+    fenetreMois: number,
+    periode: string,
+  ): Promise<Map<string, number[]>> {
+    const versees = new Map<string, number[]>(contratIds.map((contratId) => [contratId, []]));
+    if (contratIds.length === 0) {
+      return versees;
+    }
+
+    const rows: Array<{ contratId: string; montant: string }> = await this.commissionRepository
+      .createQueryBuilder('c')
+      .innerJoin('c.statut', 's')
+      .select('c.contratId', 'contratId')
+      .addSelect('c.montantNetAPayer', 'montant')
+      .where('c.contratId IN (:...contratIds)', { contratIds })
+      .andWhere('s.code = :code', { code: 'payee' })
+      .andWhere('c.periode >= :debut AND c.periode < :periode', {
+        debut: shiftPeriode(periode, -fenetreMois),
+        periode,
+      })
+      .getRawMany();
+
+    for (const row of rows) {
+      versees.get(row.contratId)?.push(Number(row.montant));
+    }
+    return versees;
+  }
+
+  /** Net amount due on `periode` for each of `contratIds`, keyed by contrat id, in one read. */
+  async sumMontantsDusPeriode(contratIds: string[], periode: string): Promise<Map<string, number>> {
+    const dues = new Map<string, number>(contratIds.map((contratId) => [contratId, 0]));
+    if (contratIds.length === 0) {
+      return dues;
+    }
+
+    const rows: Array<{ contratId: string; montant: string }> = await this.commissionRepository
+      .createQueryBuilder('c')
+      .select('c.contratId', 'contratId')
+      .addSelect('SUM(c.montantNetAPayer)', 'montant')
+      .where('c.contratId IN (:...contratIds)', { contratIds })
+      .andWhere('c.periode = :periode', { periode })
+      .groupBy('c.contratId')
+      .getRawMany();
+
+    for (const row of rows) {
+      dues.set(row.contratId, Number(row.montant));
+    }
+    return dues;
+  }
+
   async delete(id: string): Promise<boolean> {
     const result = await this.commissionRepository.delete(id);
     return (result.affected ?? 0) > 0;
   }
 }
+
+function shiftPeriode(periode: string, mois: number): string {
+  const [year, month] = periode.split('-').map(Number);
+  const index = year * 12 + (month - 1) + mois;
+  return `${Math.floor(index / 12)}-${String((index % 12) + 1).padStart(2, '0')}`;
+}
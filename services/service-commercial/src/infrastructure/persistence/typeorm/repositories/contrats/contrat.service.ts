@@ -1,6 +1,6 @@
 import { Injectable, Logger } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository, Like, FindOptionsWhere } from 'typeorm';
+import { Repository, Like, In, FindOptionsWhere } from 'typeorm';
 import { RpcException } from '@nestjs/microservices';
 import { status } from '@grpc/grpc-js';
 import { ContratEntity } from '../../../../../domain/contrats/entities/contrat.entity';
@@ -258,6 +258,32 @@ export class ContratService {
     return this.enrichWithDebitDate(entity);
   }
 
+  /**
+   * Bulk lookup by reference for batch jobs. Returns raw entities without
+   * debit date enrichment to avoid one calendar call per contrat.
+   */
+  async findByReferences(organisationId: string, references: string[]): Promise<ContratEntity[]> {
+    if (references.length === 0) {
+      return [];
+    }
+
+    return this.repository.find({
+      where: { organisationId, reference: In(references) },
+    });
+  }
+
+  /**
+   * Bulk lookup by id for batch jobs. Returns raw entities without
+   * calendar enrichment; unknown ids are simply absent from the result.
+   */
+  async findByIds(ids: string[]): Promise<ContratEntity[]> {
+    if (ids.length === 0) {
+      return [];
+    }
+
+    return this.repository.find({ where: { id: In(ids) } });
+  }
+
   async findAll(
     filters?: {
       organisationId?: string;
@@ -0,0 +1,406 @@
+import { describe, expect, it, jest } from 'bun:test';
+import type { ConfigService } from '@nestjs/config';
+import type { NatsService } from '@crm/shared-kernel';
+import { DashboardService } from '../dashboard.service';
+import {
+  ContratKpiMaterializerService,
+  type KpiCommercialAggregate,
+  type KpiMoisAggregate,
+  type MaterializedKpis,
+  STATUTS_SIGNES,
+  moisKey,
+} from '../contrat-kpi-materializer.service';
+import { DashboardKpiRefreshHandler } from '../../../../../messaging/nats/handlers/dashboard-kpi-refresh.handler';
+
+// ---------------------------------------------------------------------------
+// Fixture: contrats over the last five months of one organisation
+// ---------------------------------------------------------------------------
+
+interface FixtureContrat {
+  societeId: string;
+  commercialId: string;
+  statut: string;
+  montant: number | null;
+  createdAt: Date;
+}
+
+const STATUTS = ['brouillon', 'signe', 'actif', 'en_cours', 'impaye', 'resilie', 'annule'];
+
+function seededRandom(seed: number) {
+  let state = seed;
+  return () => {
+    state = (state * 1664525 + 1013904223) % 4294967296;
+    return state / 4294967296;
+  };
+}
+
+function buildContrats(now: Date): FixtureContrat[] {
+  const random = seededRandom(7);
+  return Array.from({ length: 800 }, () => {
+    const offset = -Math.floor(random() * 5);
+    // Days 1-27 only: the live previous-month window ends at midnight of its last day
+    const lastDay = offset === 0 ? Math.max(1, now.getDate() - 1) : 27;
+    const day = 1 + Math.floor(random() * lastDay);
+    return {
+      societeId: random() < 0.6 ? 'soc-a' : 'soc-b',
+      commercialId: `com-${Math.floor(random() * 14)}`,
+      statut: STATUTS[Math.floor(random() * STATUTS.length)],
+      montant: random() < 0.1 ? null : Math.round(random() * 500000) / 100,
+      createdAt: new Date(now.getFullYear(), now.getMonth() + offset, day, 10),
+    };
+  });
+}
+
+/** In-memory equivalent of the materializer read queries over `contrat_kpi_mensuel` */
+function materialize(contrats: FixtureContrat[], societeId?: string): MaterializedKpis {
+  const mois = new Map<string, KpiMoisAggregate>();
+  const commerciaux = new Map<string, KpiCommercialAggregate>();
+
+  for (const c of contrats.filter((c) => !societeId || c.societeId === societeId)) {
+    const signe = STATUTS_SIGNES.includes(c.statut);
+    const m = mois.get(moisKey(c.createdAt)) ?? {
+      contratsCrees: 0,
+      contratsSignes: 0,
+      montantSignes: 0,
+      montantSignesNombre: 0,
+    };
+    m.contratsCrees += 1;
+    if (signe) {
+      m.contratsSignes += 1;
+      if (c.montant !== null) {
+        m.montantSignes += c.montant;
+        m.montantSignesNombre += 1;
+      }
+    }
+    mois.set(moisKey(c.createdAt), m);
+
+    const k = commerciaux.get(c.commercialId) ?? {
+      commercialId: c.commercialId,
+      contratsSignes: 0,
+      montantSignes: 0,
+      contratsImpayes: 0,
+    };
+    if (signe) {
+      k.contratsSignes += 1;
+      k.montantSignes += c.montant ?? 0;
+    }
+    if (c.statut === 'impaye') k.contratsImpayes += 1;
+    commerciaux.set(c.commercialId, k);
+  }
+
+  return { mois, commerciaux: [...commerciaux.values()] };
+}
+
+/** KPIs computed straight from the contrats, like the live SQL queries */
+function liveKpis(contrats: FixtureContrat[], now: Date) {
+  const inMonth = (c: FixtureContrat, offset: number) => moisKey(c.createdAt) === moisKey(now, offset);
+  const signe = (c: FixtureContrat) => STATUTS_SIGNES.includes(c.statut);
+
+  const conversion = (offset: number) => {
+    const created = contrats.filter((c) => inMonth(c, offset));
+    return created.length > 0 ? (created.filter(signe).length / created.length) * 100 : 0;
+  };
+  const panier = (offset: number) => {
+    const signed = contrats.filter((c) => inMonth(c, offset) && signe(c) && c.montant !== null);
+    return signed.length > 0 ? signed.reduce((sum, c) => sum + (c.montant as number), 0) / signed.length : 0;
+  };
+
+  const ca = contrats
+    .filter((c) => [0, -1, -2, -3].some((o) => inMonth(c, o)) && signe(c))
+    .reduce((sum, c) => sum + (c.montant ?? 0), 0);
+
+  const parCommercial = new Map<string, { count: number; ca: number }>();
+  for (const c of contrats.filter(signe)) {
+    const entry = parCommercial.get(c.commercialId) ?? { count: 0, ca: 0 };
+    entry.count += 1;
+    entry.ca += c.montant ?? 0;
+    parCommercial.set(c.commercialId, entry);
+  }
+
+  return {
+    tauxConversion: conversion(0),
+    tauxConversionPrecedent: conversion(-1),
+    panierMoyen: panier(0),
+    panierMoyenPrecedent: panier(-1),
+    ca,
+    topVentes: Math.max(...[...parCommercial.values()].map((e) => e.count)),
+    topCa: Math.max(...[...parCommercial.values()].map((e) => e.ca)),
+    commerciauxSignes: parCommercial.size,
+  };
+}
+
+// ---------------------------------------------------------------------------
+// Harness
+// ---------------------------------------------------------------------------
+
+function createQueryCounter(delayMs = 0) {
+  const stats = { calls: 0, inFlight: 0, maxInFlight: 0 };
+  const run = async <T>(value: T): Promise<T> => {
+    stats.calls += 1;
+    stats.inFlight += 1;
+    stats.maxInFlight = Math.max(stats.maxInFlight, stats.inFlight);
+    await new Promise((resolve) => setTimeout(resolve, delayMs));
+    stats.inFlight -= 1;
+    return value;
+  };
+  return { stats, run };
+}
+
+function createContratRepository(counter: ReturnType<typeof createQueryCounter>) {
+  const queryBuilder: Record<string, unknown> = {};
+  for (const method of ['select', 'addSelect', 'where', 'andWhere', 'groupBy', 'orderBy', 'limit']) {
+    queryBuilder[method] = () => queryBuilder;
+  }
+  queryBuilder.getCount = () => counter.run(3);
+  queryBuilder.getRawOne = () => counter.run({ count: '3', avg: '120.5', total: '9000' });
+  queryBuilder.getRawMany = () => counter.run([{ commercial_id: 'com-1', valeur: '4' }]);
+  queryBuilder.getMany = () => counter.run([]);
+
+  return {
+    createQueryBuilder: () => queryBuilder,
+    count: () => counter.run(10),
+  };
+}
+
+/**
+ * `contrat_kpi_mensuel` and `contrat_kpi_organisation` in memory, behind the raw
+ * queries of ContratKpiMaterializerService. Every refreshed bucket gets one row.
+ */
+function createKpiStore(now: Date) {
+  const rows: Array<Record<string, unknown>> = [];
+  const rebuilt = new Set<unknown>();
+  const bucketRow = (organisationId: unknown, societeId: unknown, mois: unknown) => ({
+    organisation_id: organisationId,
+    societe_id: societeId,
+    mois,
+    commercial_id: 'com-1',
+    contrats_crees: 4,
+    contrats_signes: 2,
+    montant_signes: '300',
+    montant_signes_nombre: 2,
+    contrats_impayes: 1,
+  });
+
+  const query = async (sql: string, params: unknown[] = []) => {
+    if (sql.includes('WITH touched')) {
+      return [{ organisationId: 'org-1', societeId: 'soc-a', mois: moisKey(now) }];
+    }
+    if (sql.includes('FROM contrat_kpi_organisation')) {
+      return rebuilt.has(params[0]) ? [{ '?column?': 1 }] : [];
+    }
+    if (sql.includes('INSERT INTO contrat_kpi_organisation')) {
+      rebuilt.add(params[0]);
+    } else if (sql.includes('DELETE FROM contrat_kpi_mensuel')) {
+      const [organisationId, societeId, mois] = params;
+      const kept = rows.filter(
+        (row) =>
+          row.organisation_id !== organisationId ||
+          (params.length > 1 && (row.societe_id !== societeId || row.mois !== mois)),
+      );
+      rows.splice(0, rows.length, ...kept);
+    } else if (sql.includes('INSERT INTO contrat_kpi_mensuel')) {
+      // Bucket refresh: [signes, impaye, org, societe, mois]; full rebuild: [signes, impaye, org]
+      const [, , organisationId, societeId, mois] = params;
+      if (params.length === 5) {
+        rows.push(bucketRow(organisationId, societeId, mois));
+      } else {
+        for (const offset of [0, -1, -2, -3]) {
+          rows.push(bucketRow(organisationId, 'soc-a', moisKey(now, offset)));
+        }
+      }
+    }
+    return [];
+  };
+
+  const createQueryBuilder = () => {
+    const builder: Record<string, unknown> = {};
+    for (const method of ['select', 'addSelect', 'where', 'andWhere', 'groupBy']) {
+      builder[method] = () => builder;
+    }
+    builder.getRawMany = async () => rows.map((row) => ({ ...row }));
+    return builder;
+  };
+
+  return {
+    rows,
+    rebuilt,
+    repository: { manager: { query, transaction: async (work: (tx: unknown) => unknown) => work({ query }) }, createQueryBuilder },
+  };
+}
+
+function createService(materializer?: Partial<ContratKpiMaterializerService>, delayMs = 0) {
+  const counter = createQueryCounter(delayMs);
+  const configService = {
+    get: (_key: string, fallback: unknown) => fallback,
+  } as unknown as ConfigService;
+
+  const service = new DashboardService(
+    createContratRepository(counter) as never,
+    {} as never,
+    {} as never,
+    configService,
+    materializer as ContratKpiMaterializerService | undefined,
+  );
+  return { service, counter };
+}
+
+// ---------------------------------------------------------------------------
+// Tests
+// ---------------------------------------------------------------------------
+
+describe('DashboardService materialized KPIs', () => {
+  it('serves the same KPIs from the monthly aggregates as the live queries compute', async () => {
+    const now = new Date();
+    const contrats = buildContrats(now);
+
+    for (const societeId of [undefined, 'soc-a']) {
+      const scoped = contrats.filter((c) => !societeId || c.societeId === societeId);
+      const readKpis = jest.fn(async () => materialize(contrats, societeId));
+      const { service } = createService({ readKpis, rebuildOrganisation: jest.fn() });
+
+      const kpis = await service.getKpisCommerciaux({ organisation_id: 'org-1', societe_id: societeId } as never);
+      const expected = liveKpis(scoped, now);
+
+      expect(kpis.taux_conversion).toBe(Math.round(expected.tauxConversion * 100) / 100);
+      expect(kpis.panier_moyen).toBe(Math.round(expected.panierMoyen * 100) / 100);
+      expect(kpis.ca_previsionnel_3_mois).toBe(Math.round(expected.ca * 100) / 100);
+      expect(kpis.classement_par_ventes[0].valeur).toBe(expected.topVentes);
+      expect(kpis.classement_par_ca[0].valeur).toBeCloseTo(expected.topCa, 6);
+      expect(kpis.classement_par_ventes).toHaveLength(Math.min(10, expected.commerciauxSignes));
+      expect(kpis.classement_par_ca.map((c) => c.rang)).toEqual(
+        kpis.classement_par_ca.map((_, index) => index + 1),
+      );
+    }
+  });
+
+  it('computes the unpaid-rate alert from the aggregates', async () => {
+    const materialized: MaterializedKpis = {
+      mois: new Map(),
+      commerciaux: [
+        { commercialId: 'com-1', contratsSignes: 30, montantSignes: 0, contratsImpayes: 6 },
+        { commercialId: 'com-2', contratsSignes: 10, montantSignes: 0, contratsImpayes: 4 },
+      ],
+    };
+    const { service } = createService({ readKpis: jest.fn(async () => materialized) });
+
+    const alertes = await service.getAlertes({ organisation_id: 'org-1' } as never);
+    const impayes = alertes.alertes.find((a) => a.type === 'taux_impayes');
+
+    // 10 unpaid out of 50 signed or unpaid contrats
+    expect(impayes?.valeur_actuelle).toBe(20);
+    expect(impayes?.niveau).toBe('critique');
+  });
+
+  it('falls back to concurrent live queries and schedules a rebuild when nothing is materialized', async () => {
+    const rebuildOrganisation = jest.fn(async () => undefined);
+    const { service, counter } = createService({ readKpis: jest.fn(async () => null), rebuildOrganisation }, 5);
+
+    const kpis = await service.getKpisCommerciaux({ organisation_id: 'org-1' } as never);
+    await service.getKpisCommerciaux({ organisation_id: 'org-1' } as never);
+
+    expect(kpis.panier_moyen).toBe(120.5);
+    expect(rebuildOrganisation).toHaveBeenCalledTimes(1);
+    // 2 new-client counts, 4 conversion counts, 2 averages, 1 sum, 2 rankings
+    expect(counter.stats.calls).toBe(22);
+    expect(counter.stats.maxInFlight).toBe(11);
+  });
+
+  it('keeps using the live queries after a partial refresh until the organisation is rebuilt', async () => {
+    const now = new Date();
+    const store = createKpiStore(now);
+    const materializer = new ContratKpiMaterializerService(store.repository as never);
+    const rebuildOrganisation = jest.spyOn(materializer, 'rebuildOrganisation');
+    const { service } = createService(materializer);
+
+    // A contrat event of an organisation never materialized writes a single bucket
+    await materializer.refreshContrats(['ctr-1']);
+    expect(store.rows).toHaveLength(1);
+    expect(await materializer.readKpis('org-1', undefined, [moisKey(now)])).toBeNull();
+
+    const live = await service.getKpisCommerciaux({ organisation_id: 'org-1' } as never);
+    expect(live.panier_moyen).toBe(120.5);
+    expect(rebuildOrganisation).toHaveBeenCalledTimes(1);
+    await new Promise((resolve) => setTimeout(resolve, 0));
+
+    // The rebuild covers every month, reads are now served from the aggregates
+    expect(store.rebuilt.has('org-1')).toBe(true);
+    const kpis = await materializer.readKpis('org-1', undefined, [moisKey(now, -1)]);
+    expect(kpis?.mois.get(moisKey(now, -1))?.contratsCrees).toBe(4);
+    const materialized = await service.getKpisCommerciaux({ organisation_id: 'org-1' } as never);
+    expect(materialized.panier_moyen).toBe(150);
+    expect(rebuildOrganisation).toHaveBeenCalledTimes(1);
+  });
+
+  it('runs the alert detections concurrently without a materializer', async () => {
+    const { service, counter } = createService(undefined, 5);
+
+    await service.getAlertes({ organisation_id: 'org-1' } as never);
+
+    expect(counter.stats.calls).toBe(5);
+    expect(counter.stats.maxInFlight).toBe(5);
+  });
+});
+
+describe('DashboardKpiRefreshHandler', () => {
+  it('coalesces a burst of contrat events into one bucket refresh', async () => {
+    const subscriptions: Record<string, (payload: unknown, subject?: string) => Promise<void>> = {};
+    const natsService = {
+      subscribe: jest.fn(async (subject: string, handler: (payload: unknown) => Promise<void>) => {
+        subscriptions[subject] = handler;
+      }),
+    } as unknown as NatsService;
+    const refreshContrats = jest.fn(async (ids: string[]) => ids.length);
+    const handler = new DashboardKpiRefreshHandler(natsService, {
+      refreshContrats,
+    } as unknown as ContratKpiMaterializerService);
+
+    await handler.onModuleInit();
+    await subscriptions['crm.contrat.status.changed']({ contrat_id: 'ctr-1', new_status: 'actif' });
+    await subscriptions['crm.contrat.status.changed']({ contrat_id: 'ctr-2', new_status: 'impaye' });
+    await subscriptions['crm.contrat.suspended']({ contrat_id: 'ctr-2', new_status: 'suspended' });
+    await subscriptions['payment.echeance.encaissee']({ contrat_id: 'ctr-1' });
+    await subscriptions['crm.commissions.recurrente.requested']({ contratId: 'ctr-3', commercialId: 'com-1' });
+    await subscriptions['crm.contrat.status.changed']({ new_status: 'actif' });
+    await handler.flush();
+
+    expect(refreshContrats).toHaveBeenCalledTimes(1);
+    expect(refreshContrats.mock.calls[0][0]).toEqual(['ctr-1', 'ctr-2', 'ctr-3']);
+
+    await handler.onModuleDestroy();
+    expect(refreshContrats).toHaveBeenCalledTimes(1);
+  });
+});
+
+describe('ContratKpiMaterializerService incremental refresh', () => {
+  it('also recomputes the buckets that may still count a contrat under its previous societe', async () => {
+    const lookups: string[] = [];
+    const recomputed: unknown[][] = [];
+    const manager = {
+      query: jest.fn(async (sql: string) => {
+        lookups.push(sql);
+        // Current bucket from `contrat`, previous societe from `contrat_kpi_mensuel`
+        return [
+          { organisationId: 'org-1', societeId: 'soc-2', mois: '2026-03' },
+          { organisationId: 'org-1', societeId: 'soc-1', mois: '2026-03' },
+        ];
+      }),
+      transaction: jest.fn(async (work: (tx: unknown) => Promise<void>) =>
+        work({
+          query: async (sql: string, params: unknown[]) => {
+            if (sql.includes('DELETE FROM contrat_kpi_mensuel')) recomputed.push(params);
+          },
+        }),
+      ),
+    };
+    const materializer = new ContratKpiMaterializerService({ manager } as never);
+
+    expect(await materializer.refreshContrats(['ctr-1'])).toBe(2);
+
+    expect(lookups).toHaveLength(1);
+    expect(lookups[0]).toContain('FROM contrat_kpi_mensuel k');
+    expect(recomputed).toEqual([
+      ['org-1', 'soc-2', '2026-03'],
+      ['org-1', 'soc-1', '2026-03'],
+    ]);
+  });
+});
@@ -0,0 +1,409 @@
+import { Injectable, Logger } from '@nestjs/common';
+import { InjectRepository } from '@nestjs/typeorm';
+import { Repository, EntityManager } from 'typeorm';
+import { mapWithConcurrency } from '@crm/shared-kernel';
+import { ContratKpiMensuelEntity } from '../../../../../domain/contrats/entities/contrat-kpi-mensuel.entity';
+
+export const STATUTS_SIGNES = ['signe', 'actif', 'en_cours'];
+export const STATUT_IMPAYE = 'impaye';
+
+const REFRESH_CONCURRENCY = 4;
+const CLASSEMENT_LIMIT = 10;
+
+/** Smallest unit recomputed at once: every contrat created in that month for that societe */
+export interface ContratKpiBucket {
+  organisationId: string;
+  societeId: string | null;
+  mois: string;
+}
+
+export interface KpiMoisAggregate {
+  contratsCrees: number;
+  contratsSignes: number;
+  montantSignes: number;
+  montantSignesNombre: number;
+}
+
+export interface KpiCommercialAggregate {
+  commercialId: string;
+  contratsSignes: number;
+  montantSignes: number;
+  contratsImpayes: number;
+}
+
+export interface MaterializedKpis {
+  mois: Map<string, KpiMoisAggregate>;
+  commerciaux: KpiCommercialAggregate[];
+}
+
+export interface ClassementEntry {
+  commercial_id: string;
+  nom_complet: string;
+  valeur: number;
+  rang: number;
+}
+
+export interface KpiConsistencyReport {
+  organisationId: string;
+  rows: number;
+  mismatches: Array<{
+    key: string;
+    live: Record<string, number> | null;
+    materialized: Record<string, number> | null;
+  }>;
+}
+
+/**
+ * Aggregates contrats per organisation, societe, creation month and commercial.
+ * `$1` is always the signed statuts, `$2` the unpaid statut.
+ */
+const AGGREGATE_SELECT = `
+  SELECT
+    c.organisation_id AS organisation_id,
+    c.societe_id AS societe_id,
+    to_char(c.created_at, 'YYYY-MM') AS mois,
+    c.commercial_id AS commercial_id,
+    COUNT(*)::int AS contrats_crees,
+    (COUNT(*) FILTER (WHERE c.statut = ANY($1)))::int AS contrats_signes,
+    COALESCE(SUM(c.montant) FILTER (WHERE c.statut = ANY($1)), 0) AS montant_signes,
+    (COUNT(c.montant) FILTER (WHERE c.statut = ANY($1)))::int AS montant_signes_nombre,
+    (COUNT(*) FILTER (WHERE c.statut = $2))::int AS contrats_impayes
+  FROM contrat c
+`;
+
+const AGGREGATE_GROUP_BY = `GROUP BY c.organisation_id, c.societe_id, to_char(c.created_at, 'YYYY-MM'), c.commercial_id`;
+
+const INSERT_COLUMNS = `
+  INSERT INTO contrat_kpi_mensuel (
+    organisation_id, societe_id, mois, commercial_id, contrats_crees,
+    contrats_signes, montant_signes, montant_signes_nombre, contrats_impayes
+  )
+`;
+
+/**
+ * Buckets to recompute for the contrats matched by `touched` (a WHERE clause on `contrat c`):
+ * their current buckets, plus every materialized bucket of the same organisation and month.
+ * `contrat_kpi_mensuel` does not record which contrats a row counts, so a contrat moved to
+ * another societe or commercial may still be counted under any of them.
+ */
+function touchedBucketsQuery(touched: string): string {
+  return `
+    WITH touched AS (
+      SELECT DISTINCT c.organisation_id, c.societe_id, to_char(c.created_at, 'YYYY-MM') AS mois
+      FROM contrat c
+      WHERE ${touched}
+    )
+    SELECT organisation_id AS "organisationId", societe_id AS "societeId", mois FROM touched
+    UNION
+    SELECT k.organisation_id, k.societe_id, k.mois
+    FROM contrat_kpi_mensuel k
+    JOIN touched t ON t.organisation_id = k.organisation_id AND t.mois = k.mois
+  `;
+}
+
+const MEASURES = [
+  'contrats_crees',
+  'contrats_signes',
+  'montant_signes',
+  'montant_signes_nombre',
+  'contrats_impayes',
+] as const;
+
+function toNumber(value: unknown): number {
+  return parseFloat(String(value ?? '0')) || 0;
+}
+
+/**
+ * Maintains `contrat_kpi_mensuel` and serves the dashboard aggregates from it.
+ *
+ * Every write recomputes complete buckets from `contrat` under a per-organisation
+ * advisory lock, so concurrent refreshes (several pods, replayed events, cron)
+ * always converge to the live figures.
+ */
+@Injectable()
+export class ContratKpiMaterializerService {
+  private readonly logger = new Logger(ContratKpiMaterializerService.name);
+
+  constructor(
+    @InjectRepository(ContratKpiMensuelEntity)
+    private readonly kpiRepository: Repository<ContratKpiMensuelEntity>,
+  ) {}
+
+  // =========================================================================
+  // Reads
+  // =========================================================================
+
+  /**
+   * Monthly totals for `mois` (may be empty) and all-time totals per commercial.
+   * Returns null until the organisation has been fully rebuilt once: buckets written by
+   * incremental refreshes alone would under-count every month they do not cover.
+   */
+  async readKpis(
+    orgId: string,
+    societeId: string | undefined,
+    mois: string[],
+  ): Promise<MaterializedKpis | null> {
+    const monthly = this.kpiRepository
+      .createQueryBuilder('k')
+      .select('k.mois', 'mois')
+      .addSelect('COALESCE(SUM(k.contrats_crees), 0)', 'contrats_crees')
+      .addSelect('COALESCE(SUM(k.contrats_signes), 0)', 'contrats_signes')
+      .addSelect('COALESCE(SUM(k.montant_signes), 0)', 'montant_signes')
+      .addSelect('COALESCE(SUM(k.montant_signes_nombre), 0)', 'montant_signes_nombre')
+      .where('k.organisation_id = :orgId', { orgId })
+      .andWhere('k.mois IN (:...mois)', { mois })
+      .groupBy('k.mois');
+
+    const perCommercial = this.kpiRepository
+      .createQueryBuilder('k')
+      .select('k.commercial_id', 'commercial_id')
+      .addSelect('COALESCE(SUM(k.contrats_signes), 0)', 'contrats_signes')
+      .addSelect('COALESCE(SUM(k.montant_signes), 0)', 'montant_signes')
+      .addSelect('COALESCE(SUM(k.contrats_impayes), 0)', 'contrats_impayes')
+      .where('k.organisation_id = :orgId', { orgId })
+      .groupBy('k.commercial_id');
+
+    if (societeId) {
+      monthly.andWhere('k.societe_id = :societeId', { societeId });
+      perCommercial.andWhere('k.societe_id = :societeId', { societeId });
+    }
+
+    const [rebuilt, monthlyRows, commercialRows] = await Promise.all([
+      this.isRebuilt(orgId),
+      mois.length > 0 ? monthly.getRawMany() : Promise.resolve([]),
+      perCommercial.getRawMany(),
+    ]);
+
+    if (!rebuilt) {
+      return null;
+    }
+
+    return {
+      mois: new Map(
+        monthlyRows.map((row) => [
+          row.mois,
+          {
+            contratsCrees: toNumber(row.contrats_crees),
+            contratsSignes: toNumber(row.contrats_signes),
+            montantSignes: toNumber(row.montant_signes),
+            montantSignesNombre: toNumber(row.montant_signes_nombre),
+          },
+        ]),
+      ),
+      commerciaux: commercialRows.map((row) => ({
+        commercialId: row.commercial_id,
+        contratsSignes: toNumber(row.contrats_signes),
+        montantSignes: toNumber(row.montant_signes),
+        contratsImpayes: toNumber(row.contrats_impayes),
+      })),
+    };
+  }
+
+  // =========================================================================
+  // Incremental refresh
+  // =========================================================================
+
+  /**
+   * Recompute the buckets holding `contratIds`, and those that may still count them
+   * under a previous societe or commercial. Several contrats of the same bucket cost
+   * a single recomputation.
+   */
+  async refreshContrats(contratIds: string[]): Promise<number> {
+    if (contratIds.length === 0) return 0;
+
+    const buckets: ContratKpiBucket[] = await this.kpiRepository.manager.query(
+      touchedBucketsQuery('c.id = ANY($1)'),
+      [contratIds],
+    );
+
+    return this.refreshBuckets(buckets);
+  }
+
+  /**
+   * Recompute every bucket containing, or previously containing, a contrat created or
+   * modified since `since`. Catches changes that publish no event (creation, montant,
+   * commercial or societe edits).
+   */
+  async refreshUpdatedSince(since: Date): Promise<number> {
+    const buckets: ContratKpiBucket[] = await this.kpiRepository.manager.query(
+      touchedBucketsQuery('c.updated_at >= $1'),
+      [since.toISOString()],
+    );
+
+    return this.refreshBuckets(buckets);
+  }
+
+  async refreshBuckets(buckets: ContratKpiBucket[]): Promise<number> {
+    const unique = new Map(buckets.map((b) => [`${b.organisationId}|${b.societeId ?? ''}|${b.mois}`, b]));
+
+    await mapWithConcurrency([...unique.values()], REFRESH_CONCURRENCY, (bucket) =>
+      this.kpiRepository.manager.transaction(async (manager) => {
+        await this.lockOrganisation(manager, bucket.organisationId);
+        await manager.query(
+          `DELETE FROM contrat_kpi_mensuel
+           WHERE organisation_id = $1 AND societe_id IS NOT DISTINCT FROM $2 AND mois = $3`,
+          [bucket.organisationId, bucket.societeId, bucket.mois],
+        );
+        await manager.query(
+          `${INSERT_COLUMNS} ${AGGREGATE_SELECT}
+           WHERE c.organisation_id = $3 AND c.societe_id IS NOT DISTINCT FROM $4
+             AND c.created_at >= ($5 || '-01')::timestamp
+             AND c.created_at < ($5 || '-01')::timestamp + interval '1 month'
+           ${AGGREGATE_GROUP_BY}`,
+          [STATUTS_SIGNES, STATUT_IMPAYE, bucket.organisationId, bucket.societeId, bucket.mois],
+        );
+      }),
+    );
+
+    return unique.size;
+  }
+
+  // =========================================================================
+  // Full rebuild and consistency check
+  // =========================================================================
+
+  async listOrganisations(): Promise<string[]> {
+    const rows: Array<{ organisation_id: string }> = await this.kpiRepository.manager.query(
+      'SELECT DISTINCT organisation_id FROM contrat',
+    );
+    return rows.map((row) => row.organisation_id);
+  }
+
+  /**
+   * Replace every row of the organisation; also drops buckets of deleted contrats.
+   * Marks the organisation as rebuilt, which enables `readKpis` for it.
+   */
+  async rebuildOrganisation(orgId: string): Promise<void> {
+    await this.kpiRepository.manager.transaction(async (manager) => {
+      await this.lockOrganisation(manager, orgId);
+      await manager.query('DELETE FROM contrat_kpi_mensuel WHERE organisation_id = $1', [orgId]);
+      await manager.query(
+        `${INSERT_COLUMNS} ${AGGREGATE_SELECT} WHERE c.organisation_id = $3 ${AGGREGATE_GROUP_BY}`,
+        [STATUTS_SIGNES, STATUT_IMPAYE, orgId],
+      );
+      await manager.query(
+        `INSERT INTO contrat_kpi_organisation (organisation_id, rebuilt_at) VALUES ($1, now())
+         ON CONFLICT (organisation_id) DO UPDATE SET rebuilt_at = now()`,
+        [orgId],
+      );
+    });
+  }
+
+  /**
+   * Compare the materialized rows of an organisation with the same aggregation
+   * run live on `contrat`. An empty `mismatches` means the dashboard reads are exact.
+   */
+  async verifyConsistency(orgId: string): Promise<KpiConsistencyReport> {
+    const [liveRows, materializedRows] = await Promise.all([
+      this.kpiRepository.manager.query(
+        `${AGGREGATE_SELECT} WHERE c.organisation_id = $3 ${AGGREGATE_GROUP_BY}`,
+        [STATUTS_SIGNES, STATUT_IMPAYE, orgId],
+      ),
+      this.kpiRepository.manager.query(
+        `SELECT organisation_id, societe_id, mois, commercial_id, ${MEASURES.join(', ')}
+         FROM contrat_kpi_mensuel WHERE organisation_id = $1`,
+        [orgId],
+      ),
+    ]);
+
+    const keyOf = (row: Record<string, unknown>) =>
+      `${row.societe_id ?? ''}|${row.mois}|${row.commercial_id}`;
+    const measuresOf = (row: Record<string, unknown>) =>
+      Object.fromEntries(MEASURES.map((m) => [m, toNumber(row[m])]));
+
+    const live = new Map<string, Record<string, number>>(
+      liveRows.map((row: Record<string, unknown>) => [keyOf(row), measuresOf(row)]),
+    );
+    const materialized = new Map<string, Record<string, number>>(
+      materializedRows.map((row: Record<string, unknown>) => [keyOf(row), measuresOf(row)]),
+    );
+
+    const mismatches: KpiConsistencyReport['mismatches'] = [];
+    for (const key of new Set([...live.keys(), ...materialized.keys()])) {
+      const l = live.get(key) ?? null;
+      const m = materialized.get(key) ?? null;
+      const equal = l !== null && m !== null && MEASURES.every((measure) => l[measure] === m[measure]);
+      if (!equal) {
+        mismatches.push({ key, live: l, materialized: m });
+      }
+    }
+
+    if (mismatches.length > 0) {
+      this.logger.warn(
+        `KPI drift for organisation ${orgId}: ${mismatches.length} bucket row(s) differ from live contrats`,
+      );
+    }
+
+    return { organisationId: orgId, rows: live.size, mismatches };
+  }
+
+  private async isRebuilt(orgId: string): Promise<boolean> {
+    const rows: unknown[] = await this.kpiRepository.manager.query(
+      'SELECT 1 FROM contrat_kpi_organisation WHERE organisation_id = $1',
+      [orgId],
+    );
+    return rows.length > 0;
+  }
+
+  private async lockOrganisation(manager: EntityManager, orgId: string): Promise<void> {
+    await manager.query(`SELECT pg_advisory_xact_lock(hashtext('contrat_kpi_mensuel:' || $1))`, [orgId]);
+  }
+}
+
+// ===========================================================================
+// Dashboard figures derived from the aggregates
+// ===========================================================================
+
+const EMPTY_MOIS: KpiMoisAggregate = {
+  contratsCrees: 0,
+  contratsSignes: 0,
+  montantSignes: 0,
+  montantSignesNombre: 0,
+};
+
+/** YYYY-MM of `date` shifted by `offset` months, in server local time like the live queries */
+export function moisKey(date: Date, offset = 0): string {
+  const shifted = new Date(date.getFullYear(), date.getMonth() + offset, 1);
+  return `${shifted.getFullYear()}-${String(shifted.getMonth() + 1).padStart(2, '0')}`;
+}
+
+export function tauxConversionFor(kpis: MaterializedKpis, mois: string): number {
+  const m = kpis.mois.get(mois) ?? EMPTY_MOIS;
+  return m.contratsCrees > 0 ? (m.contratsSignes / m.contratsCrees) * 100 : 0;
+}
+
+export function panierMoyenFor(kpis: MaterializedKpis, mois: string): number {
+  const m = kpis.mois.get(mois) ?? EMPTY_MOIS;
+  return m.montantSignesNombre > 0 ? m.montantSignes / m.montantSignesNombre : 0;
+}
+
+export function montantSignesFor(kpis: MaterializedKpis, mois: string[]): number {
+  return mois.reduce((sum, m) => sum + (kpis.mois.get(m) ?? EMPTY_MOIS).montantSignes, 0);
+}
+
+/** Top commerciaux by signed contrats or signed CA, limited like the live ranking */
+export function classementFor(kpis: MaterializedKpis, mode: 'count' | 'ca'): ClassementEntry[] {
+  const valeur = (c: KpiCommercialAggregate) => (mode === 'count' ? c.contratsSignes : c.montantSignes);
+
+  return kpis.commerciaux
+    .filter((c) => c.contratsSignes > 0)
+    .sort((a, b) => valeur(b) - valeur(a))
+    .slice(0, CLASSEMENT_LIMIT)
+    .map((c, index) => ({
+      commercial_id: c.commercialId,
+      nom_complet: '',
+      valeur: valeur(c),
+      rang: index + 1,
+    }));
+}
+
+/** Contrats counted by the unpaid-rate alert: signed or unpaid, and unpaid only */
+export function impayesFor(kpis: MaterializedKpis): { totalActive: number; impayeCount: number } {
+  return kpis.commerciaux.reduce(
+    (acc, c) => ({
+      totalActive: acc.totalActive + c.contratsSignes + c.contratsImpayes,
+      impayeCount: acc.impayeCount + c.contratsImpayes,
+    }),
+    { totalActive: 0, impayeCount: 0 },
+  );
+}
@@ -1,10 +1,21 @@
-import { Injectable, Logger } from '@nestjs/common';
+import { Injectable, Logger, Optional } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
 import { Repository, Between, LessThanOrEqual, MoreThanOrEqual, In } from 'typeorm';
 import { ConfigService } from '@nestjs/config';
 import { ContratEntity } from '../../../../../domain/contrats/entities/contrat.entity';
 import { LigneContratEntity } from '../../../../../domain/contrats/entities/ligne-contrat.entity';
 import { ProduitEntity } from '../../../../../domain/products/entities/produit.entity';
+import {
+  ContratKpiMaterializerService,
+  type MaterializedKpis,
+  type ClassementEntry,
+  classementFor,
+  impayesFor,
+  moisKey,
+  montantSignesFor,
+  panierMoyenFor,
+  tauxConversionFor,
+} from './contrat-kpi-materializer.service';
 import type {
   AlertesResponse,
   Alerte as AlerteType,
@@ -34,6 +45,16 @@ const DEFAULT_THRESHOLDS: AlertThresholds = {
   tauxChurnAvertissementPct: 5,
 };
 
+interface CommerciauxKpis {
+  tauxConversion: number;
+  tauxConversionPrecedent: number;
+  panierMoyen: number;
+  panierMoyenPrecedent: number;
+  caPrevisionnel: number;
+  classementParVentes: ClassementEntry[];
+  classementParCa: ClassementEntry[];
+}
+
 // Color palette for product distribution chart
 const CHART_COLORS = [
   '#3B82F6', '#10B981', '#F59E0B', '#EF4444', '#8B5CF6',
@@ -44,6 +65,8 @@ const CHART_COLORS = [
 export class DashboardService {
   private readonly logger = new Logger(DashboardService.name);
   private readonly thresholds: AlertThresholds;
+  private readonly materializedReads: boolean;
+  private readonly rebuildsRequested = new Set<string>();
 
   constructor(
     @InjectRepository(ContratEntity)
@@ -53,7 +76,13 @@ export class DashboardService {
     @InjectRepository(ProduitEntity)
     private readonly produitRepository: Repository<ProduitEntity>,
     private readonly configService: ConfigService,
+    @Optional()
+    private readonly kpiMaterializer?: ContratKpiMaterializerService,
   ) {
+    this.materializedReads =
+      !!this.kpiMaterializer &&
+      this.configService.get<string>('DASHBOARD_KPI_MATERIALIZED', 'true') !== 'false';
+
     this.thresholds = {
       contratExpirationCritiqueDays: this.configService.get<number>(
         'ALERT_CONTRAT_EXPIRATION_CRITIQUE_DAYS',
@@ -88,16 +117,18 @@ export class DashboardService {
 
   async getAlertes(filters: DashboardFilters): Promise<AlertesResponse> {
     const now = new Date();
-    const alertes: AlerteType[] = [];
-
-    // 1. Contracts expiring soon
-    await this.detectExpiringContracts(filters, now, alertes);
-
-    // 2. High unpaid rate detection
-    await this.detectHighUnpaidRate(filters, now, alertes);
-
-    // 3. Abnormal churn detection
-    await this.detectAbnormalChurn(filters, now, alertes);
+    const expirations: AlerteType[] = [];
+    const impayes: AlerteType[] = [];
+    const churn: AlerteType[] = [];
+
+    // Independent detections run concurrently, alerts keep their usual order:
+    // 1. Contracts expiring soon, 2. High unpaid rate, 3. Abnormal churn
+    await Promise.all([
+      this.detectExpiringContracts(filters, now, expirations),
+      this.detectHighUnpaidRate(filters, now, impayes),
+      this.detectAbnormalChurn(filters, now, churn),
+    ]);
+    const alertes = [...expirations, ...impayes, ...churn];
 
     const nombreCritiques = alertes.filter((a) => a.niveau === 'critique').length;
     const nombreAvertissements = alertes.filter((a) => a.niveau === 'avertissement').length;
@@ -185,19 +216,10 @@ export class DashboardService {
     alertes: AlerteType[],
   ): Promise<void> {
     // Calculate unpaid rate: contracts with statut 'impaye' / total active
-    const orgFilter = { organisationId: filters.organisation_id } as any;
-    if (filters.societe_id) orgFilter.societeId = filters.societe_id;
-
-    const totalActive = await this.contratRepository.count({
-      where: { ...orgFilter, statut: In(['actif', 'en_cours', 'signe', 'impaye']) },
-    });
+    const { totalActive, impayeCount } = await this.countImpayes(filters);
 
     if (totalActive === 0) return;
 
-    const impayeCount = await this.contratRepository.count({
-      where: { ...orgFilter, statut: 'impaye' },
-    });
-
     const tauxImpayes = (impayeCount / totalActive) * 100;
 
     if (tauxImpayes >= this.thresholds.tauxImpayesCritiquePct) {
@@ -252,10 +274,8 @@ export class DashboardService {
       qbCurrentChurn.andWhere('c.societe_id = :societeId', { societeId: filters.societe_id });
     }
 
-    const currentChurn = await qbCurrentChurn.getCount();
-
     // Total active at start of month (approximation)
-    const totalAtStart = await this.contratRepository
+    const qbTotalAtStart = this.contratRepository
       .createQueryBuilder('c')
       .where('c.organisation_id = :orgId', { orgId: filters.organisation_id })
       .andWhere('c.created_at < :start', { start: currentMonthStart.toISOString() })
@@ -266,8 +286,12 @@ export class DashboardService {
           churnStatuts: ['resilie', 'annule'],
           start2: currentMonthStart.toISOString(),
         },
-      )
-      .getCount();
+      );
+
+    const [currentChurn, totalAtStart] = await Promise.all([
+      qbCurrentChurn.getCount(),
+      qbTotalAtStart.getCount(),
+    ]);
 
     if (totalAtStart === 0) return;
 
@@ -315,46 +339,22 @@ export class DashboardService {
     const orgId = filters.organisation_id;
     const societeId = filters.societe_id;
 
-    // ------ nouveaux_clients_mois ------
-    const nouveauxClientsMois = await this.countDistinctNewClients(
-      orgId,
-      societeId,
-      currentMonthStart,
-      now,
-    );
-    const nouveauxClientsMoisPrecedent = await this.countDistinctNewClients(
-      orgId,
-      societeId,
-      previousMonthStart,
-      previousMonthEnd,
-    );
-
-    // ------ taux_conversion ------
-    const { tauxConversion, tauxConversionPrecedent } = await this.calculateConversionRate(
-      orgId,
-      societeId,
-      currentMonthStart,
-      previousMonthStart,
-      previousMonthEnd,
-      now,
-    );
-
-    // ------ panier_moyen ------
-    const { panierMoyen, panierMoyenPrecedent } = await this.calculatePanierMoyen(
-      orgId,
-      societeId,
-      currentMonthStart,
-      previousMonthStart,
-      previousMonthEnd,
-      now,
-    );
-
-    // ------ ca_previsionnel_3_mois ------
-    const caPrevisionnel = await this.calculateCaPrevisionnel3Mois(orgId, societeId, now);
-
-    // ------ classements ------
-    const classementParVentes = await this.getClassementCommercial(orgId, societeId, 'count');
-    const classementParCa = await this.getClassementCommercial(orgId, societeId, 'ca');
+    // Nouveaux clients stay live (first contrat of a client across the organisation),
+    // the other KPIs come from the materialized aggregates when available
+    const [nouveauxClientsMois, nouveauxClientsMoisPrecedent, kpis] = await Promise.all([
+      this.countDistinctNewClients(orgId, societeId, currentMonthStart, now),
+      this.countDistinctNewClients(orgId, societeId, previousMonthStart, previousMonthEnd),
+      this.computeCommerciauxKpis(orgId, societeId, now, previousMonthStart, previousMonthEnd),
+    ]);
+    const {
+      tauxConversion,
+      tauxConversionPrecedent,
+      panierMoyen,
+      panierMoyenPrecedent,
+      caPrevisionnel,
+      classementParVentes,
+      classementParCa,
+    } = kpis;
 
     return {
       nouveaux_clients_mois: nouveauxClientsMois,
@@ -373,6 +373,57 @@ export class DashboardService {
     };
   }
 
+  private async computeCommerciauxKpis(
+    orgId: string,
+    societeId: string | undefined,
+    now: Date,
+    previousMonthStart: Date,
+    previousMonthEnd: Date,
+  ): Promise<CommerciauxKpis> {
+    const moisCourant = moisKey(now);
+    const moisPrecedent = moisKey(now, -1);
+    const moisCa = [moisKey(now, -3), moisKey(now, -2), moisPrecedent, moisCourant];
+
+    const materialized = await this.readMaterializedKpis(orgId, societeId, moisCa);
+    if (materialized) {
+      return {
+        tauxConversion: tauxConversionFor(materialized, moisCourant),
+        tauxConversionPrecedent: tauxConversionFor(materialized, moisPrecedent),
+        panierMoyen: panierMoyenFor(materialized, moisCourant),
+        panierMoyenPrecedent: panierMoyenFor(materialized, moisPrecedent),
+        // Same window as calculateCaPrevisionnel3Mois: M-3 to the current month
+        caPrevisionnel: montantSignesFor(materialized, moisCa),
+        classementParVentes: classementFor(materialized, 'count'),
+        classementParCa: classementFor(materialized, 'ca'),
+      };
+    }
+
+    const currentMonthStart = new Date(now.getFullYear(), now.getMonth(), 1);
+    const [conversion, panier, caPrevisionnel, classementParVentes, classementParCa] = await Promise.all([
+      this.calculateConversionRate(
+        orgId,
+        societeId,
+        currentMonthStart,
+        previousMonthStart,
+        previousMonthEnd,
+        now,
+      ),
+      this.calculatePanierMoyen(
+        orgId,
+        societeId,
+        currentMonthStart,
+        previousMonthStart,
+        previousMonthEnd,
+        now,
+      ),
+      this.calculateCaPrevisionnel3Mois(orgId, societeId, now),
+      this.getClassementCommercial(orgId, societeId, 'count'),
+      this.getClassementCommercial(orgId, societeId, 'ca'),
+    ]);
+
+    return { ...conversion, ...panier, caPrevisionnel, classementParVentes, classementParCa };
+  }
+
   private async countDistinctNewClients(
     orgId: string,
     societeId: string | undefined,
@@ -415,23 +466,12 @@ export class DashboardService {
     now: Date,
   ): Promise<{ tauxConversion: number; tauxConversionPrecedent: number }> {
     // Conversion = signed contracts / total contracts created
-    const currentSigned = await this.countContractsByStatut(
-      orgId,
-      societeId,
-      ['signe', 'actif', 'en_cours'],
-      currentStart,
-      now,
-    );
-    const currentTotal = await this.countContractsCreated(orgId, societeId, currentStart, now);
-
-    const prevSigned = await this.countContractsByStatut(
-      orgId,
-      societeId,
-      ['signe', 'actif', 'en_cours'],
-      prevStart,
-      prevEnd,
-    );
-    const prevTotal = await this.countContractsCreated(orgId, societeId, prevStart, prevEnd);
+    const [currentSigned, currentTotal, prevSigned, prevTotal] = await Promise.all([
+      this.countContractsByStatut(orgId, societeId, ['signe', 'actif', 'en_cours'], currentStart, now),
+      this.countContractsCreated(orgId, societeId, currentStart, now),
+      this.countContractsByStatut(orgId, societeId, ['signe', 'actif', 'en_cours'], prevStart, prevEnd),
+      this.countContractsCreated(orgId, societeId, prevStart, prevEnd),
+    ]);
 
     return {
       tauxConversion: currentTotal > 0 ? (currentSigned / currentTotal) * 100 : 0,
@@ -483,8 +523,10 @@ export class DashboardService {
     prevEnd: Date,
     now: Date,
   ): Promise<{ panierMoyen: number; panierMoyenPrecedent: number }> {
-    const currentPanier = await this.avgMontantContrats(orgId, societeId, currentStart, now);
-    const prevPanier = await this.avgMontantContrats(orgId, societeId, prevStart, prevEnd);
+    const [currentPanier, prevPanier] = await Promise.all([
+      this.avgMontantContrats(orgId, societeId, currentStart, now),
+      this.avgMontantContrats(orgId, societeId, prevStart, prevEnd),
+    ]);
 
     return {
       panierMoyen: currentPanier,
@@ -639,6 +681,65 @@ export class DashboardService {
     };
   }
 
+  // =========================================================================
+  // Materialized KPIs
+  // =========================================================================
+
+  /**
+   * Aggregates from `contrat_kpi_mensuel`, or null to fall back to the live queries.
+   * Reads miss until the organisation has been fully rebuilt once; the first miss
+   * schedules that background rebuild.
+   */
+  private async readMaterializedKpis(
+    orgId: string,
+    societeId: string | undefined,
+    mois: string[],
+  ): Promise<MaterializedKpis | null> {
+    if (!this.materializedReads || !this.kpiMaterializer) return null;
+
+    try {
+      const kpis = await this.kpiMaterializer.readKpis(orgId, societeId, mois);
+      if (!kpis && !this.rebuildsRequested.has(orgId)) {
+        this.rebuildsRequested.add(orgId);
+        this.kpiMaterializer.rebuildOrganisation(orgId).catch((error: Error) => {
+          this.rebuildsRequested.delete(orgId);
+          this.logger.warn(`KPI rebuild failed for organisation ${orgId}: ${error.message}`);
+        });
+      }
+      return kpis;
+    } catch (error: any) {
+      this.logger.warn(`Materialized KPIs unavailable, using live queries: ${error.message}`);
+      return null;
+    }
+  }
+
+  private async countImpayes(
+    filters: DashboardFilters,
+  ): Promise<{ totalActive: number; impayeCount: number }> {
+    const materialized = await this.readMaterializedKpis(
+      filters.organisation_id,
+      filters.societe_id,
+      [],
+    );
+    if (materialized) {
+      return impayesFor(materialized);
+    }
+
+    const orgFilter = { organisationId: filters.organisation_id } as any;
+    if (filters.societe_id) orgFilter.societeId = filters.societe_id;
+
+    const [totalActive, impayeCount] = await Promise.all([
+      this.contratRepository.count({
+        where: { ...orgFilter, statut: In(['actif', 'en_cours', 'signe', 'impaye']) },
+      }),
+      this.contratRepository.count({
+        where: { ...orgFilter, statut: 'impaye' },
+      }),
+    ]);
+
+    return { totalActive, impayeCount };
+  }
+
   // =========================================================================
   // Utility
   // =========================================================================
@@ -1 +1,2 @@
 export { DashboardService } from './dashboard.service';
+export { ContratKpiMaterializerService } from './contrat-kpi-materializer.service';
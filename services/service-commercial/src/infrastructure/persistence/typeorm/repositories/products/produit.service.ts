@@ -1,6 +1,6 @@
 import { Injectable, Logger } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository } from 'typeorm';
+import { In, Repository } from 'typeorm';
 import { RpcException } from '@nestjs/microservices';
 import { status } from '@grpc/grpc-js';
 import { ProduitEntity, TypeProduit, CategorieProduit, StatutCycleProduit } from '../../../../../domain/products/entities/produit.entity';
@@ -210,6 +210,16 @@ export class ProduitService {
     return produit;
   }
 
+  async findBySkus(organisationId: string, skus: string[]): Promise<ProduitEntity[]> {
+    if (skus.length === 0) {
+      return [];
+    }
+
+    return this.produitRepository.find({
+      where: { organisationId, sku: In(skus) },
+    });
+  }
+
   async findAll(input: {
     organisation_id: string;
     gamme_id?: string;
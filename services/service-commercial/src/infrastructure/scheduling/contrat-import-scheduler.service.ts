@@ -90,11 +90,16 @@ export class ContratImportSchedulerService {
       );
 
       // Call the import orchestrator
+      const concurrency = Number(
+        this.configService.get<string>('IMPORT_CONCURRENCY', '8'),
+      );
+
       const result = await this.importOrchestratorService.importAll({
         apiUrl,
         apiKey,
         organisationId,
         dryRun: false,
+        concurrency,
       });
 
       const durationMs = Date.now() - startTime;
@@ -109,6 +114,20 @@ export class ContratImportSchedulerService {
           `errors: ${result.errors.length}`,
       );
 
+      if (result.metrics) {
+        const stageSummary = Object.entries(result.metrics.stages)
+          .filter(([, timing]) => timing.count > 0)
+          .map(
+            ([stage, timing]) =>
+              `${stage}=${Math.round(timing.totalMs / timing.count)}ms avg/${timing.maxMs}ms max`,
+          )
+          .join(', ');
+        this.logger.log(
+          `[${jobName}] Throughput: ${result.metrics.prospectsPerSecond} prospects/s ` +
+            `(concurrency ${result.metrics.concurrency}, ${result.metrics.pages} pages) — ${stageSummary}`,
+        );
+      }
+
       // Log errors if any
       if (result.errors.length > 0) {
         this.logger.warn(
@@ -0,0 +1,92 @@
+import { mapWithConcurrency } from '@crm/shared-kernel';
+import { Injectable, Logger } from '@nestjs/common';
+import { Cron } from '@nestjs/schedule';
+import { ContratKpiMaterializerService } from '../persistence/typeorm/repositories/dashboard/contrat-kpi-materializer.service';
+
+/** Overlap between two sweeps, covers transactions committed after the previous run started */
+const SWEEP_OVERLAP_MS = 60_000;
+/**
+ * Buckets refreshed by the first sweep after a restart. Only keeps rebuilt organisations
+ * current: `readKpis` ignores an organisation until its first full rebuild.
+ */
+const FIRST_SWEEP_WINDOW_MS = 24 * 60 * 60 * 1000;
+const REBUILD_CONCURRENCY = 2;
+
+/**
+ * Background upkeep of `contrat_kpi_mensuel`:
+ * - every 5 minutes, recompute the buckets of contrats modified since the previous sweep
+ *   (creations and edits publish no NATS event);
+ * - every night, check each organisation against the live aggregation and rebuild it,
+ *   which also removes buckets of deleted contrats.
+ */
+@Injectable()
+export class DashboardKpiSchedulerService {
+  private readonly logger = new Logger(DashboardKpiSchedulerService.name);
+  private lastSweepAt: Date | null = null;
+  private isSweeping = false;
+  private isRebuilding = false;
+
+  constructor(private readonly materializer: ContratKpiMaterializerService) {}
+
+  @Cron('*/5 * * * *', {
+    name: 'dashboard-kpi-incremental-refresh',
+  })
+  async refreshRecentContrats(): Promise<void> {
+    if (this.isSweeping) {
+      this.logger.warn('KPI sweep already running, skipping');
+      return;
+    }
+
+    this.isSweeping = true;
+    try {
+      const startedAt = new Date();
+      const since = this.lastSweepAt
+        ? new Date(this.lastSweepAt.getTime() - SWEEP_OVERLAP_MS)
+        : new Date(startedAt.getTime() - FIRST_SWEEP_WINDOW_MS);
+
+      const buckets = await this.materializer.refreshUpdatedSince(since);
+      this.lastSweepAt = startedAt;
+
+      if (buckets > 0) {
+        this.logger.log(`Refreshed ${buckets} KPI bucket(s) modified since ${since.toISOString()}`);
+      }
+    } catch (error: any) {
+      this.logger.error(`KPI sweep failed: ${error.message}`);
+    } finally {
+      this.isSweeping = false;
+    }
+  }
+
+  @Cron('30 3 * * *', {
+    name: 'dashboard-kpi-nightly-rebuild',
+    timeZone: 'Europe/Paris',
+  })
+  async rebuildAll(): Promise<void> {
+    if (this.isRebuilding) {
+      this.logger.warn('KPI rebuild already running, skipping');
+      return;
+    }
+
+    this.isRebuilding = true;
+    try {
+      const organisations = await this.materializer.listOrganisations();
+      let drifted = 0;
+
+      await mapWithConcurrency(organisations, REBUILD_CONCURRENCY, async (orgId) => {
+        try {
+          const report = await this.materializer.verifyConsistency(orgId);
+          if (report.mismatches.length > 0) drifted += 1;
+          await this.materializer.rebuildOrganisation(orgId);
+        } catch (error: any) {
+          this.logger.error(`KPI rebuild failed for organisation ${orgId}: ${error.message}`);
+        }
+      });
+
+      this.logger.log(
+        `KPI rebuild done for ${organisations.length} organisation(s), ${drifted} had drifted from live data`,
+      );
+    } finally {
+      this.isRebuilding = false;
+    }
+  }
+}
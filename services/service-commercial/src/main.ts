@@ -8,6 +8,7 @@ async function bootstrap() {
   const app = await NestFactory.create(AppModule, {
     rawBody: true,
   });
+  app.enableShutdownHooks();
 
   const grpcPort = process.env.GRPC_PORT || 50053;
   const grpcOptions = getMultiGrpcOptions(['commerciaux', 'contrats', 'products', 'commission', 'dashboard', 'bundle', 'subscriptions', 'subscription-plans', 'subscription-preferences', 'subscription-preference-schemas', 'woocommerce', 'partenaires', 'cfast'], {
@@ -0,0 +1,72 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+export class CreateContratKpiMensuel1774600000000
+  implements MigrationInterface
+{
+  name = 'CreateContratKpiMensuel1774600000000';
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query(`
+      CREATE TABLE "contrat_kpi_mensuel" (
+        "id" UUID NOT NULL DEFAULT gen_random_uuid(),
+        "organisation_id" UUID NOT NULL,
+        "societe_id" UUID,
+        "mois" VARCHAR(7) NOT NULL,
+        "commercial_id" UUID NOT NULL,
+        "contrats_crees" INTEGER NOT NULL DEFAULT 0,
+        "contrats_signes" INTEGER NOT NULL DEFAULT 0,
+        "montant_signes" DECIMAL(15,2) NOT NULL DEFAULT 0,
+        "montant_signes_nombre" INTEGER NOT NULL DEFAULT 0,
+        "contrats_impayes" INTEGER NOT NULL DEFAULT 0,
+        "refreshed_at" TIMESTAMP NOT NULL DEFAULT now(),
+        CONSTRAINT "PK_contrat_kpi_mensuel" PRIMARY KEY ("id")
+      )
+    `);
+
+    // One row per bucket and commercial, NULL societe included
+    await queryRunner.query(`
+      CREATE UNIQUE INDEX "UQ_contrat_kpi_mensuel_bucket"
+      ON "contrat_kpi_mensuel" (
+        "organisation_id",
+        COALESCE("societe_id", '00000000-0000-0000-0000-000000000000'::uuid),
+        "mois",
+        "commercial_id"
+      )
+    `);
+
+    await queryRunner.query(`
+      CREATE INDEX "IDX_contrat_kpi_mensuel_org_mois"
+      ON "contrat_kpi_mensuel" ("organisation_id", "mois")
+    `);
+
+    await queryRunner.query(`
+      CREATE INDEX "IDX_contrat_kpi_mensuel_org_commercial"
+      ON "contrat_kpi_mensuel" ("organisation_id", "commercial_id")
+    `);
+
+    // Organisations whose rows were fully rebuilt once; reads of any other organisation
+    // fall back to the live queries, incremental refreshes only cover a few buckets
+    await queryRunner.query(`
+      CREATE TABLE "contrat_kpi_organisation" (
+        "organisation_id" UUID NOT NULL,
+        "rebuilt_at" TIMESTAMP NOT NULL DEFAULT now(),
+        CONSTRAINT "PK_contrat_kpi_organisation" PRIMARY KEY ("organisation_id")
+      )
+    `);
+
+    // Incremental refresh sweeps contrats touched since the previous run
+    await queryRunner.query(`
+      CREATE INDEX IF NOT EXISTS "IDX_contrat_updated_at"
+      ON "contrat" ("updated_at")
+    `);
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query(`DROP INDEX IF EXISTS "IDX_contrat_updated_at"`);
+    await queryRunner.query(`DROP TABLE IF EXISTS "contrat_kpi_organisation"`);
+    await queryRunner.query(`DROP INDEX IF EXISTS "IDX_contrat_kpi_mensuel_org_commercial"`);
+    await queryRunner.query(`DROP INDEX IF EXISTS "IDX_contrat_kpi_mensuel_org_mois"`);
+    await queryRunner.query(`DROP INDEX IF EXISTS "UQ_contrat_kpi_mensuel_bucket"`);
+    await queryRunner.query(`DROP TABLE IF EXISTS "contrat_kpi_mensuel"`);
+  }
+}
@@ -21,6 +21,7 @@ export enum PaymentIntentStatus {
 }
 
 @Entity('payment_intents')
+@Index('IDX_payment_intents_societe_created_id', ['societeId', 'createdAt', 'id'])
 export class PaymentIntentEntity {
   @PrimaryGeneratedColumn('uuid')
   id: string;
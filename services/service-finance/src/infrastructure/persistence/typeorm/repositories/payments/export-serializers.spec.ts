@@ -0,0 +1,144 @@
+import {
+  AccountingEntry,
+  EXPORT_COLUMNS,
+  serializeCsv,
+  serializeJson,
+  serializeXlsx,
+} from './export-serializers';
+
+// ============================================================================
+// Helpers
+// ============================================================================
+
+function makeEntry(index: number, overrides: Partial<AccountingEntry> = {}): AccountingEntry {
+  return {
+    entry_id: `E${String(index + 1).padStart(6, '0')}`,
+    company_id: 'company-1',
+    journal_code: 'BAN',
+    entry_date: '2026-06-15',
+    document_ref: `pi_${index}`,
+    account_debit: '512000',
+    account_credit: '411000',
+    amount_debit: 49.9 + index,
+    amount_credit: 49.9 + index,
+    currency: 'EUR',
+    customer_ref: `client-${index}`,
+    contract_ref: '',
+    provider_name: 'gocardless',
+    provider_ref: `pi_${index}`,
+    status_code: 'PAID',
+    preferred_debit_day: null,
+    debit_lot_code: null,
+    planned_debit_date: null,
+    risk_score: index % 2 === 0 ? 12 : null,
+    risk_tier: index % 2 === 0 ? 'LOW' : null,
+    reminder_count: index % 3,
+    ...overrides,
+  };
+}
+
+async function* inChunks(entries: AccountingEntry[], size: number): AsyncGenerator<AccountingEntry[]> {
+  for (let i = 0; i < entries.length; i += size) {
+    yield entries.slice(i, i + size);
+  }
+}
+
+async function collect(stream: AsyncIterable<Buffer>): Promise<Buffer> {
+  const parts: Buffer[] = [];
+  for await (const part of stream) {
+    parts.push(part);
+  }
+  return Buffer.concat(parts);
+}
+
+const ENTRIES = Array.from({ length: 25 }, (_, i) =>
+  makeEntry(i, i === 3 ? { customer_ref: 'Dupont; "SARL"' } : {}),
+);
+
+// ============================================================================
+// CSV / JSON — identical to the former in-memory renderers
+// ============================================================================
+
+describe('serializeCsv', () => {
+  it('matches the full-buffer rendering whatever the chunk size', async () => {
+    const expected =
+      '\uFEFF' +
+      [
+        EXPORT_COLUMNS.join(';'),
+        ...ENTRIES.map((entry) =>
+          EXPORT_COLUMNS.map((col) => {
+            const value = entry[col];
+            if (value === null || value === undefined) return '';
+            if (typeof value === 'string' && value.includes(';')) return `"${value.replace(/"/g, '""')}"`;
+            return String(value);
+          }).join(';'),
+        ),
+      ].join('\r\n');
+
+    for (const size of [1, 7, 100]) {
+      const csv = await collect(serializeCsv(inChunks(ENTRIES, size)));
+      expect(csv.toString('utf-8')).toBe(expected);
+    }
+  });
+});
+
+describe('serializeJson', () => {
+  it('matches JSON.stringify(entries, null, 2) whatever the chunk size', async () => {
+    for (const size of [1, 7, 100]) {
+      const json = await collect(serializeJson(inChunks(ENTRIES, size)));
+      expect(json.toString('utf-8')).toBe(JSON.stringify(ENTRIES, null, 2));
+    }
+  });
+
+  it('writes an empty array when there are no entries', async () => {
+    const json = await collect(serializeJson(inChunks([], 10)));
+    expect(json.toString('utf-8')).toBe('[]');
+  });
+});
+
+// ============================================================================
+// XLSX — forward-only ZIP container
+// ============================================================================
+
+describe('serializeXlsx', () => {
+  function readCentralDirectory(zip: Buffer): Array<{ name: string; size: number; offset: number }> {
+    const end = zip.length - 22;
+    expect(zip.readUInt32LE(end)).toBe(0x06054b50);
+    const count = zip.readUInt16LE(end + 10);
+    let cursor = zip.readUInt32LE(end + 16);
+
+    const files: Array<{ name: string; size: number; offset: number }> = [];
+    for (let i = 0; i < count; i++) {
+      expect(zip.readUInt32LE(cursor)).toBe(0x02014b50);
+      const nameLength = zip.readUInt16LE(cursor + 28);
+      files.push({
+        name: zip.toString('utf-8', cursor + 46, cursor + 46 + nameLength),
+        size: zip.readUInt32LE(cursor + 24),
+        offset: zip.readUInt32LE(cursor + 42),
+      });
+      cursor += 46 + nameLength;
+    }
+    return files;
+  }
+
+  it('produces a workbook whose sheet holds one row per entry plus the header', async () => {
+    const zip = await collect(serializeXlsx(inChunks(ENTRIES, 7)));
+    const files = readCentralDirectory(zip);
+
+    expect(files.map((f) => f.name)).toEqual([
+      '[Content_Types].xml',
+      '_rels/.rels',
+      'xl/workbook.xml',
+      'xl/_rels/workbook.xml.rels',
+      'xl/worksheets/sheet1.xml',
+    ]);
+
+    const sheet = files[4];
+    const dataStart = sheet.offset + 30 + Buffer.byteLength(sheet.name);
+    const xml = zip.toString('utf-8', dataStart, dataStart + sheet.size);
+
+    expect(xml.match(/<row>/g)).toHaveLength(ENTRIES.length + 1);
+    expect(xml).toContain('<t>Dupont; &quot;SARL&quot;</t>');
+    expect(xml.endsWith('</sheetData></worksheet>')).toBe(true);
+  });
+});
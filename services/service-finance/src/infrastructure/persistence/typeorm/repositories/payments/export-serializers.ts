@@ -0,0 +1,316 @@
+/**
+ * Streaming serializers for accounting exports (CDC Annexe J.1).
+ *
+ * Each serializer consumes accounting entries chunk by chunk and yields the
+ * encoded bytes for that chunk only, so the full file is never held in memory.
+ * Output is byte-identical to the previous in-memory renderers for CSV and JSON.
+ */
+
+// ── Annexe J.2 — Column definitions ──────────────────────────────────
+export const EXPORT_COLUMNS = [
+  'entry_id',
+  'company_id',
+  'journal_code',
+  'entry_date',
+  'document_ref',
+  'account_debit',
+  'account_credit',
+  'amount_debit',
+  'amount_credit',
+  'currency',
+  'customer_ref',
+  'contract_ref',
+  'provider_name',
+  'provider_ref',
+  'status_code',
+  'preferred_debit_day',
+  'debit_lot_code',
+  'planned_debit_date',
+  'risk_score',
+  'risk_tier',
+  'reminder_count',
+] as const;
+
+// ── Annexe J.6 — Accounting status mapping ───────────────────────────
+export interface AccountingEntry {
+  entry_id: string;
+  company_id: string;
+  journal_code: string;
+  entry_date: string;
+  document_ref: string;
+  account_debit: string;
+  account_credit: string;
+  amount_debit: number;
+  amount_credit: number;
+  currency: string;
+  customer_ref: string;
+  contract_ref: string;
+  provider_name: string;
+  provider_ref: string;
+  status_code: string;
+  preferred_debit_day: number | null;
+  debit_lot_code: string | null;
+  planned_debit_date: string | null;
+  risk_score: number | null;
+  risk_tier: string | null;
+  reminder_count: number;
+}
+
+export type ExportSerializer = (chunks: AsyncIterable<AccountingEntry[]>) => AsyncGenerator<Buffer>;
+
+// ── CSV ──────────────────────────────────────────────────────────────
+
+function csvCell(value: AccountingEntry[keyof AccountingEntry]): string {
+  if (value === null || value === undefined) return '';
+  if (typeof value === 'string' && value.includes(';')) {
+    return `"${value.replace(/"/g, '""')}"`;
+  }
+  return String(value);
+}
+
+/**
+ * CSV with separator `;`, UTF-8 BOM, header included, CRLF between lines.
+ */
+export async function* serializeCsv(chunks: AsyncIterable<AccountingEntry[]>): AsyncGenerator<Buffer> {
+  yield Buffer.from('\uFEFF' + EXPORT_COLUMNS.join(';'), 'utf-8');
+
+  for await (const entries of chunks) {
+    if (entries.length === 0) continue;
+    const lines = entries.map((entry) => '\r\n' + EXPORT_COLUMNS.map((col) => csvCell(entry[col])).join(';'));
+    yield Buffer.from(lines.join(''), 'utf-8');
+  }
+}
+
+// ── JSON ─────────────────────────────────────────────────────────────
+
+/**
+ * JSON array written element by element, formatted like `JSON.stringify(entries, null, 2)`.
+ */
+export async function* serializeJson(chunks: AsyncIterable<AccountingEntry[]>): AsyncGenerator<Buffer> {
+  let first = true;
+
+  for await (const entries of chunks) {
+    if (entries.length === 0) continue;
+    const parts = entries.map((entry) => {
+      const prefix = first ? '[\n  ' : ',\n  ';
+      first = false;
+      return prefix + JSON.stringify(entry, null, 2).replace(/\n/g, '\n  ');
+    });
+    yield Buffer.from(parts.join(''), 'utf-8');
+  }
+
+  yield Buffer.from(first ? '[]' : '\n]', 'utf-8');
+}
+
+// ── XLSX ─────────────────────────────────────────────────────────────
+
+const CRC_TABLE = (() => {
+  const table = new Uint32Array(256);
+  for (let n = 0; n < 256; n++) {
+    let c = n;
+    for (let k = 0; k < 8; k++) {
+      c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+    }
+    table[n] = c >>> 0;
+  }
+  return table;
+})();
+
+function crc32(buffer: Buffer, previous = 0): number {
+  let crc = previous ^ 0xffffffff;
+  for (let i = 0; i < buffer.length; i++) {
+    crc = CRC_TABLE[(crc ^ buffer[i]) & 0xff] ^ (crc >>> 8);
+  }
+  return (crc ^ 0xffffffff) >>> 0;
+}
+
+const ZIP32_LIMIT = 0xffffffff;
+/** General purpose flags: bit 3 (sizes in data descriptor) + bit 11 (UTF-8 names). */
+const ZIP_FLAGS = 0x0808;
+
+interface ZipEntryRecord {
+  name: Buffer;
+  crc: number;
+  size: number;
+  offset: number;
+}
+
+/**
+ * Minimal forward-only ZIP writer using STORED entries with data descriptors.
+ * Entries are not deflated here: the whole archive goes through gzip afterwards.
+ */
+class StreamingZipWriter {
+  private readonly entries: ZipEntryRecord[] = [];
+  private readonly dosTime: number;
+  private readonly dosDate: number;
+  private current: ZipEntryRecord | null = null;
+  private offset = 0;
+
+  constructor(now = new Date()) {
+    this.dosTime = (now.getHours() << 11) | (now.getMinutes() << 5) | Math.floor(now.getSeconds() / 2);
+    this.dosDate = ((now.getFullYear() - 1980) << 9) | ((now.getMonth() + 1) << 5) | now.getDate();
+  }
+
+  open(name: string): Buffer {
+    const nameBytes = Buffer.from(name, 'utf-8');
+    const header = Buffer.alloc(30);
+    header.writeUInt32LE(0x04034b50, 0);
+    header.writeUInt16LE(20, 4);
+    header.writeUInt16LE(ZIP_FLAGS, 6);
+    header.writeUInt16LE(0, 8); // STORED
+    header.writeUInt16LE(this.dosTime, 10);
+    header.writeUInt16LE(this.dosDate, 12);
+    header.writeUInt16LE(nameBytes.length, 26);
+
+    this.current = { name: nameBytes, crc: 0, size: 0, offset: this.offset };
+    return this.advance(Buffer.concat([header, nameBytes]));
+  }
+
+  data(chunk: Buffer): Buffer {
+    if (!this.current) {
+      throw new Error('No open ZIP entry');
+    }
+    this.current.crc = crc32(chunk, this.current.crc);
+    this.current.size += chunk.length;
+    return this.advance(chunk);
+  }
+
+  close(): Buffer {
+    const entry = this.current;
+    if (!entry) {
+      throw new Error('No open ZIP entry');
+    }
+    this.current = null;
+    this.entries.push(entry);
+
+    const descriptor = Buffer.alloc(16);
+    descriptor.writeUInt32LE(0x08074b50, 0);
+    descriptor.writeUInt32LE(entry.crc, 4);
+    descriptor.writeUInt32LE(entry.size, 8);
+    descriptor.writeUInt32LE(entry.size, 12);
+    return this.advance(descriptor);
+  }
+
+  finish(): Buffer {
+    const directoryOffset = this.offset;
+    const records = this.entries.map((entry) => {
+      const record = Buffer.alloc(46);
+      record.writeUInt32LE(0x02014b50, 0);
+      record.writeUInt16LE(20, 4);
+      record.writeUInt16LE(20, 6);
+      record.writeUInt16LE(ZIP_FLAGS, 8);
+      record.writeUInt16LE(0, 10);
+      record.writeUInt16LE(this.dosTime, 12);
+      record.writeUInt16LE(this.dosDate, 14);
+      record.writeUInt32LE(entry.crc, 16);
+      record.writeUInt32LE(entry.size, 20);
+      record.writeUInt32LE(entry.size, 24);
+      record.writeUInt16LE(entry.name.length, 28);
+      record.writeUInt32LE(entry.offset, 42);
+      return Buffer.concat([record, entry.name]);
+    });
+    const directory = Buffer.concat(records);
+
+    const end = Buffer.alloc(22);
+    end.writeUInt32LE(0x06054b50, 0);
+    end.writeUInt16LE(this.entries.length, 8);
+    end.writeUInt16LE(this.entries.length, 10);
+    end.writeUInt32LE(directory.length, 12);
+    end.writeUInt32LE(directoryOffset, 16);
+
+    return this.advance(Buffer.concat([directory, end]));
+  }
+
+  private advance(bytes: Buffer): Buffer {
+    this.offset += bytes.length;
+    if (this.offset > ZIP32_LIMIT) {
+      throw new Error('XLSX export exceeds the 4 GiB ZIP limit, use CSV or JSON for this period');
+    }
+    return bytes;
+  }
+}
+
+const XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n';
+const SHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main';
+const REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships';
+const PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships';
+
+const XLSX_STATIC_PARTS: Array<[string, string]> = [
+  [
+    '[Content_Types].xml',
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">' +
+      '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>' +
+      '<Default Extension="xml" ContentType="application/xml"/>' +
+      '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>' +
+      '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>' +
+      '</Types>',
+  ],
+  [
+    '_rels/.rels',
+    `<Relationships xmlns="${PKG_REL_NS}">` +
+      `<Relationship Id="rId1" Type="${REL_NS}/officeDocument" Target="xl/workbook.xml"/>` +
+      '</Relationships>',
+  ],
+  [
+    'xl/workbook.xml',
+    `<workbook xmlns="${SHEET_NS}" xmlns:r="${REL_NS}">` +
+      '<sheets><sheet name="Export" sheetId="1" r:id="rId1"/></sheets>' +
+      '</workbook>',
+  ],
+  [
+    'xl/_rels/workbook.xml.rels',
+    `<Relationships xmlns="${PKG_REL_NS}">` +
+      `<Relationship Id="rId1" Type="${REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>` +
+      '</Relationships>',
+  ],
+];
+
+function escapeXml(value: string): string {
+  return value
+    .replace(/[\u0000-\u0008\u000B\u000C\u000E-\u001F]/g, '')
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;');
+}
+
+function xlsxCell(value: AccountingEntry[keyof AccountingEntry]): string {
+  if (value === null || value === undefined) return '<c/>';
+  if (typeof value === 'number') {
+    return Number.isFinite(value) ? `<c><v>${value}</v></c>` : '<c/>';
+  }
+  return `<c t="inlineStr"><is><t>${escapeXml(value)}</t></is></c>`;
+}
+
+function xlsxRow(values: Array<AccountingEntry[keyof AccountingEntry]>): string {
+  return `<row>${values.map(xlsxCell).join('')}</row>`;
+}
+
+/**
+ * Single-sheet XLSX workbook written row by row with inline strings,
+ * so no shared-string table has to be kept in memory.
+ */
+export async function* serializeXlsx(chunks: AsyncIterable<AccountingEntry[]>): AsyncGenerator<Buffer> {
+  const zip = new StreamingZipWriter();
+
+  for (const [name, xml] of XLSX_STATIC_PARTS) {
+    yield zip.open(name);
+    yield zip.data(Buffer.from(XML_HEADER + xml, 'utf-8'));
+    yield zip.close();
+  }
+
+  yield zip.open('xl/worksheets/sheet1.xml');
+  yield zip.data(
+    Buffer.from(`${XML_HEADER}<worksheet xmlns="${SHEET_NS}"><sheetData>${xlsxRow([...EXPORT_COLUMNS])}`, 'utf-8'),
+  );
+
+  for await (const entries of chunks) {
+    if (entries.length === 0) continue;
+    const rows = entries.map((entry) => xlsxRow(EXPORT_COLUMNS.map((col) => entry[col])));
+    yield zip.data(Buffer.from(rows.join(''), 'utf-8'));
+  }
+
+  yield zip.data(Buffer.from('</sheetData></worksheet>', 'utf-8'));
+  yield zip.close();
+  yield zip.finish();
+}
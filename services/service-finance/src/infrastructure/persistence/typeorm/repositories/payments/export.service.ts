@@ -1,10 +1,12 @@
-import { Injectable, Logger } from '@nestjs/common';
+import { Injectable, Logger, Optional } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository, Between } from 'typeorm';
+import { Repository } from 'typeorm';
 import { Cron } from '@nestjs/schedule';
+import { mapWithConcurrency, S3StorageService } from '@crm/shared-kernel';
 import * as crypto from 'crypto';
 import * as zlib from 'zlib';
-import { promisify } from 'util';
+import { PassThrough, Readable, Transform } from 'stream';
+import { pipeline } from 'stream/promises';
 
 import {
   ExportJobEntity,
@@ -24,57 +26,40 @@ import {
 import {
   ReminderEntity,
 } from '../../../../../domain/payments/entities/reminder.entity';
+import {
+  AccountingEntry,
+  ExportSerializer,
+  serializeCsv,
+  serializeJson,
+  serializeXlsx,
+} from './export-serializers';
+
+const SERIALIZERS: Record<ExportFormat, { serialize: ExportSerializer; extension: string }> = {
+  [ExportFormat.CSV]: { serialize: serializeCsv, extension: 'csv' },
+  [ExportFormat.XLSX]: { serialize: serializeXlsx, extension: 'xlsx' },
+  [ExportFormat.JSON]: { serialize: serializeJson, extension: 'json' },
+};
+
+function positiveIntFromEnv(name: string, fallback: number): number {
+  const value = Number(process.env[name]);
+  return Number.isInteger(value) && value > 0 ? value : fallback;
+}
 
-const gzip = promisify(zlib.gzip);
-
-// ── Annexe J.2 — Column definitions ──────────────────────────────────
-const EXPORT_COLUMNS = [
-  'entry_id',
-  'company_id',
-  'journal_code',
-  'entry_date',
-  'document_ref',
-  'account_debit',
-  'account_credit',
-  'amount_debit',
-  'amount_credit',
-  'currency',
-  'customer_ref',
-  'contract_ref',
-  'provider_name',
-  'provider_ref',
-  'status_code',
-  'preferred_debit_day',
-  'debit_lot_code',
-  'planned_debit_date',
-  'risk_score',
-  'risk_tier',
-  'reminder_count',
-] as const;
-
-// ── Annexe J.6 — Accounting status mapping ───────────────────────────
-interface AccountingEntry {
-  entry_id: string;
-  company_id: string;
-  journal_code: string;
-  entry_date: string;
-  document_ref: string;
-  account_debit: string;
-  account_credit: string;
-  amount_debit: number;
-  amount_credit: number;
-  currency: string;
-  customer_ref: string;
-  contract_ref: string;
-  provider_name: string;
-  provider_ref: string;
-  status_code: string;
-  preferred_debit_day: number | null;
-  debit_lot_code: string | null;
-  planned_debit_date: string | null;
-  risk_score: number | null;
-  risk_tier: string | null;
-  reminder_count: number;
+/** Payments read per keyset page; bounds the memory held by one export. */
+const EXPORT_CHUNK_SIZE = positiveIntFromEnv('EXPORT_CHUNK_SIZE', 1000);
+/** Company exports generated in parallel by the scheduled jobs. */
+const EXPORT_CONCURRENCY = positiveIntFromEnv('EXPORT_CONCURRENCY', 4);
+
+interface PaymentCursor {
+  createdAt: string;
+  id: string;
+}
+
+interface ExportRunStats {
+  payments: number;
+  entries: number;
+  rawBytes: number;
+  compressedBytes: number;
 }
 
 export interface ExportPaginatedResult<T> {
@@ -98,8 +83,12 @@ const DOWNLOAD_TOKEN_SECRET = process.env.EXPORT_DOWNLOAD_SECRET || 'export-down
 /**
  * ExportService — Asynchronous accounting export generation.
  *
- * CDC Annexe J: Generates CSV, XLSX (simplified), and JSON exports
- * of payment data with accounting mappings, compressed and hashed.
+ * CDC Annexe J: Generates CSV, XLSX, and JSON exports of payment data
+ * with accounting mappings, compressed and hashed.
+ *
+ * Generation is fully streamed: payments are read by keyset pages, enriched
+ * per page, serialized row by row, then gzipped and hashed on the way to
+ * object storage, so memory stays flat whatever the period size.
  *
  * Scheduled exports:
  *   - Daily at 06:00 (previous day)
@@ -121,6 +110,8 @@ export class ExportService {
     private readonly retryScheduleRepository: Repository<RetryScheduleEntity>,
     @InjectRepository(ReminderEntity)
     private readonly reminderRepository: Repository<ReminderEntity>,
+    @Optional()
+    private readonly storage: S3StorageService | null = null,
   ) {}
 
   // ── CRUD operations ────────────────────────────────────────────────
@@ -135,16 +126,7 @@ export class ExportService {
     format: ExportFormat;
     createdBy?: string;
   }): Promise<ExportJobEntity> {
-    const job = this.exportJobRepository.create({
-      companyId: params.companyId,
-      periodFrom: params.periodFrom,
-      periodTo: params.periodTo,
-      format: params.format,
-      status: ExportJobStatus.PENDING,
-      createdBy: params.createdBy ?? null,
-    });
-
-    const saved = await this.exportJobRepository.save(job);
+    const saved = await this.saveExportJob(params);
 
     // Fire & forget — don't block the caller
     this.generateExport(saved.id).catch((err) => {
@@ -156,6 +138,25 @@ export class ExportService {
     return saved;
   }
 
+  private async saveExportJob(params: {
+    companyId: string;
+    periodFrom: Date;
+    periodTo: Date;
+    format: ExportFormat;
+    createdBy?: string;
+  }): Promise<ExportJobEntity> {
+    const job = this.exportJobRepository.create({
+      companyId: params.companyId,
+      periodFrom: params.periodFrom,
+      periodTo: params.periodTo,
+      format: params.format,
+      status: ExportJobStatus.PENDING,
+      createdBy: params.createdBy ?? null,
+    });
+
+    return this.exportJobRepository.save(job);
+  }
+
   /**
    * Get a single export job by ID.
    */
@@ -226,7 +227,7 @@ export class ExportService {
 
   /**
    * Generate the export file for a job.
-   * Queries payments, maps to accounting entries, formats, compresses, and hashes.
+   * Streams payments → accounting entries → serializer → gzip → SHA-256 → storage.
    */
   async generateExport(jobId: string): Promise<void> {
     const startTime = Date.now();
@@ -241,42 +242,47 @@ export class ExportService {
     await this.exportJobRepository.save(job);
 
     try {
-      // 1. Query payments for the period
-      const payments = await this.paymentIntentRepository.find({
-        where: {
-          societeId: job.companyId,
-          createdAt: Between(job.periodFrom, job.periodTo),
-        },
-        order: { createdAt: 'ASC' },
-      });
-
-      // 2. Enrich with risk scores and reminder counts
-      const entries = await this.buildAccountingEntries(payments, job.companyId);
-
-      // 3. Generate file content based on format
-      let fileContent: Buffer;
-      switch (job.format) {
-        case ExportFormat.CSV:
-          fileContent = this.generateCsv(entries);
-          break;
-        case ExportFormat.XLSX:
-          fileContent = this.generateXlsx(entries);
-          break;
-        case ExportFormat.JSON:
-          fileContent = this.generateJson(entries);
-          break;
-        default:
-          throw new Error(`Unsupported format: ${job.format}`);
+      const format = SERIALIZERS[job.format];
+      if (!format) {
+        throw new Error(`Unsupported format: ${job.format}`);
       }
 
-      // 4. Compress with ZIP/gzip (CDC Annexe J.4)
-      const compressed = await gzip(fileContent);
+      const stats: ExportRunStats = { payments: 0, entries: 0, rawBytes: 0, compressedBytes: 0 };
+      const hash = crypto.createHash('sha256');
 
-      // 5. Hash SHA-256 for integrity (CDC Annexe J.4)
-      const hash = crypto.createHash('sha256').update(compressed).digest('hex');
+      // 1-3. Keyset-paginated read, per-chunk enrichment, row-by-row serialization
+      const source = Readable.from(format.serialize(this.streamAccountingEntries(job, stats)));
+      const countRaw = new Transform({
+        transform(chunk: Buffer, _encoding, callback) {
+          stats.rawBytes += chunk.length;
+          callback(null, chunk);
+        },
+      });
 
-      // 6. Generate file ID from hash (would normally store file to object storage)
-      const fileId = hash.substring(0, 36).replace(
+      // 4-5. Compress (CDC Annexe J.4) and hash the compressed bytes for integrity
+      const hashCompressed = new Transform({
+        transform(chunk: Buffer, _encoding, callback) {
+          hash.update(chunk);
+          stats.compressedBytes += chunk.length;
+          callback(null, chunk);
+        },
+      });
+
+      // 6. Store to object storage when configured, otherwise only hash the output
+      const output = new PassThrough();
+      const storageKey = `exports/${job.companyId}/${job.id}.${format.extension}.gz`;
+      const sink = this.storage
+        ? this.storage.uploadStream(storageKey, output, 'application/gzip', {
+            'company-id': job.companyId,
+            'export-job-id': job.id,
+          })
+        : this.discard(output);
+      sink.catch((err: unknown) => output.destroy(err instanceof Error ? err : new Error(String(err))));
+
+      await Promise.all([pipeline(source, countRaw, zlib.createGzip(), hashCompressed, output), sink]);
+
+      const digest = hash.digest('hex');
+      const fileId = digest.substring(0, 36).replace(
         /^(.{8})(.{4})(.{4})(.{4})(.{12})$/,
         '$1-$2-$3-$4-$5',
       );
@@ -288,8 +294,9 @@ export class ExportService {
       await this.exportJobRepository.save(job);
 
       this.logger.log(
-        `Export job ${jobId} completed: ${entries.length} entries, ${job.format}, ` +
-        `${compressed.length} bytes compressed, duration ${job.durationMs}ms, hash ${hash.substring(0, 16)}...`,
+        `Export job ${jobId} completed: ${stats.entries} entries from ${stats.payments} payments, ${job.format}, ` +
+        `${stats.rawBytes} bytes raw, ${stats.compressedBytes} bytes compressed, ` +
+        `${this.storage ? `stored at ${storageKey}, ` : ''}duration ${job.durationMs}ms, hash ${digest.substring(0, 16)}...`,
       );
     } catch (error) {
       job.status = ExportJobStatus.FAILED;
@@ -303,6 +310,71 @@ export class ExportService {
     }
   }
 
+  private async discard(stream: Readable): Promise<void> {
+    for await (const _chunk of stream) {
+      // Nothing to keep: size and hash are computed upstream.
+    }
+  }
+
+  /**
+   * Read the job's payments in (created_at, id) keyset pages.
+   * The cursor keeps created_at as database text so microsecond precision is not
+   * truncated by JS dates, which would otherwise duplicate or skip rows at page edges.
+   */
+  private async *streamPaymentChunks(job: ExportJobEntity): AsyncGenerator<PaymentIntentEntity[]> {
+    let cursor: PaymentCursor | null = null;
+
+    for (;;) {
+      const query = this.paymentIntentRepository
+        .createQueryBuilder('pi')
+        .addSelect('pi.created_at::text', 'cursor_created_at')
+        .where('pi.societe_id = :companyId', { companyId: job.companyId })
+        .andWhere('pi.created_at BETWEEN :from AND :to', { from: job.periodFrom, to: job.periodTo });
+
+      if (cursor) {
+        query.andWhere('(pi.created_at, pi.id) > (CAST(:cursorCreatedAt AS timestamp), :cursorId)', {
+          cursorCreatedAt: cursor.createdAt,
+          cursorId: cursor.id,
+        });
+      }
+
+      const { entities, raw } = await query
+        .orderBy('pi.created_at', 'ASC')
+        .addOrderBy('pi.id', 'ASC')
+        .limit(EXPORT_CHUNK_SIZE)
+        .getRawAndEntities<{ cursor_created_at: string }>();
+
+      if (entities.length === 0) {
+        return;
+      }
+
+      yield entities;
+
+      if (entities.length < EXPORT_CHUNK_SIZE) {
+        return;
+      }
+
+      const last = entities[entities.length - 1];
+      cursor = { createdAt: raw[raw.length - 1].cursor_created_at, id: last.id };
+    }
+  }
+
+  /**
+   * Map each payment page to accounting entries, enriching one page at a time.
+   * Entry numbering continues across pages.
+   */
+  private async *streamAccountingEntries(
+    job: ExportJobEntity,
+    stats: ExportRunStats,
+  ): AsyncGenerator<AccountingEntry[]> {
+    for await (const payments of this.streamPaymentChunks(job)) {
+      const entries = await this.buildAccountingEntries(payments, job.companyId, stats.entries);
+      stats.payments += payments.length;
+      stats.entries += entries.length;
+      yield entries;
+    }
+  }
+
   // ── Accounting entry mapping (Annexe J.6) ──────────────────────────
 
   /**
@@ -312,6 +384,7 @@ export class ExportService {
   private async buildAccountingEntries(
     payments: PaymentIntentEntity[],
     companyId: string,
+    startIndex: number = 0,
   ): Promise<AccountingEntry[]> {
     const entries: AccountingEntry[] = [];
 
@@ -340,7 +413,7 @@ export class ExportService {
       reminderCounts.map((r) => [r.paymentId, parseInt(r.count, 10)]),
     );
 
-    let entryIndex = 0;
+    let entryIndex = startIndex;
 
     for (const payment of payments) {
       const riskScore = riskScoreMap.get(payment.id);
@@ -468,57 +541,6 @@ export class ExportService {
     }
   }
 
-  // ── Format generators ──────────────────────────────────────────────
-
-  /**
-   * Generate CSV with separator `;`, UTF-8 BOM, header included (Annexe J.1).
-   */
-  private generateCsv(entries: AccountingEntry[]): Buffer {
-    const BOM = '\uFEFF';
-    const header = EXPORT_COLUMNS.join(';');
-    const rows = entries.map((entry) =>
-      EXPORT_COLUMNS.map((col) => {
-        const value = entry[col];
-        if (value === null || value === undefined) return '';
-        if (typeof value === 'string' && value.includes(';')) {
-          return `"${value.replace(/"/g, '""')}"`;
-        }
-        return String(value);
-      }).join(';'),
-    );
-
-    const content = BOM + [header, ...rows].join('\r\n');
-    return Buffer.from(content, 'utf-8');
-  }
-
-  /**
-   * Generate simplified XLSX as tab-separated CSV with .xlsx hint.
-   * Avoids heavy XLSX libraries per MUST NOT constraints.
-   * In production, this would use a streaming XLSX writer.
-   */
-  private generateXlsx(entries: AccountingEntry[]): Buffer {
-    // Simplified: generate tab-separated values that Excel can open
-    const header = EXPORT_COLUMNS.join('\t');
-    const rows = entries.map((entry) =>
-      EXPORT_COLUMNS.map((col) => {
-        const value = entry[col];
-        if (value === null || value === undefined) return '';
-        return String(value);
-      }).join('\t'),
-    );
-
-    const content = [header, ...rows].join('\r\n');
-    return Buffer.from(content, 'utf-8');
-  }
-
-  /**
-   * Generate JSON export — structured array (Annexe J.1).
-   */
-  private generateJson(entries: AccountingEntry[]): Buffer {
-    const content = JSON.stringify(entries, null, 2);
-    return Buffer.from(content, 'utf-8');
-  }
-
   // ── Scheduled exports (Annexe J.3) ─────────────────────────────────
 
   /**
@@ -544,17 +566,16 @@ export class ExportService {
         .andWhere('pi.created_at <= :to', { to: endOfYesterday })
         .getRawMany<{ companyId: string }>();
 
-      for (const { companyId } of companies) {
-        await this.createExportJob({
-          companyId,
-          periodFrom: yesterday,
-          periodTo: endOfYesterday,
-          format: ExportFormat.CSV,
-          createdBy: 'SYSTEM_DAILY',
-        });
-      }
+      const { succeeded, failed } = await this.runScheduledExports(
+        companies.map((c) => c.companyId),
+        yesterday,
+        endOfYesterday,
+        'SYSTEM_DAILY',
+      );
 
-      this.logger.log(`Daily export: created ${companies.length} export jobs.`);
+      this.logger.log(
+        `Daily export: ${companies.length} export jobs, ${succeeded} done, ${failed} failed.`,
+      );
     } catch (error) {
       this.logger.error(
         `Daily export failed: ${error instanceof Error ? error.message : String(error)}`,
@@ -586,17 +607,16 @@ export class ExportService {
         .andWhere('pi.created_at <= :to', { to: endOfLastWeek })
         .getRawMany<{ companyId: string }>();
 
-      for (const { companyId } of companies) {
-        await this.createExportJob({
-          companyId,
-          periodFrom: weekAgo,
-          periodTo: endOfLastWeek,
-          format: ExportFormat.CSV,
-          createdBy: 'SYSTEM_WEEKLY',
-        });
-      }
+      const { succeeded, failed } = await this.runScheduledExports(
+        companies.map((c) => c.companyId),
+        weekAgo,
+        endOfLastWeek,
+        'SYSTEM_WEEKLY',
+      );
 
-      this.logger.log(`Weekly export: created ${companies.length} export jobs.`);
+      this.logger.log(
+        `Weekly export: ${companies.length} export jobs, ${succeeded} done, ${failed} failed.`,
+      );
     } catch (error) {
       this.logger.error(
         `Weekly export failed: ${error instanceof Error ? error.message : String(error)}`,
@@ -623,21 +643,50 @@ export class ExportService {
         .andWhere('pi.created_at <= :to', { to: lastOfLastMonth })
         .getRawMany<{ companyId: string }>();
 
-      for (const { companyId } of companies) {
-        await this.createExportJob({
-          companyId,
-          periodFrom: firstOfLastMonth,
-          periodTo: lastOfLastMonth,
-          format: ExportFormat.CSV,
-          createdBy: 'SYSTEM_MONTHLY',
-        });
-      }
+      const { succeeded, failed } = await this.runScheduledExports(
+        companies.map((c) => c.companyId),
+        firstOfLastMonth,
+        lastOfLastMonth,
+        'SYSTEM_MONTHLY',
+      );
 
-      this.logger.log(`Monthly export: created ${companies.length} export jobs.`);
+      this.logger.log(
+        `Monthly export: ${companies.length} export jobs, ${succeeded} done, ${failed} failed.`,
+      );
     } catch (error) {
       this.logger.error(
         `Monthly export failed: ${error instanceof Error ? error.message : String(error)}`,
       );
     }
   }
+
+  /**
+   * Create and generate one export job per company, at most EXPORT_CONCURRENCY at a time.
+   * A failing company does not stop the others; its job is left FAILED by generateExport.
+   */
+  private async runScheduledExports(
+    companyIds: string[],
+    periodFrom: Date,
+    periodTo: Date,
+    createdBy: string,
+  ): Promise<{ succeeded: number; failed: number }> {
+    const results = await mapWithConcurrency(companyIds, EXPORT_CONCURRENCY, async (companyId) => {
+      try {
+        const job = await this.saveExportJob({
+          companyId,
+          periodFrom,
+          periodTo,
+          format: ExportFormat.CSV,
+          createdBy,
+        });
+        await this.generateExport(job.id);
+        return true;
+      } catch {
+        return false;
+      }
+    });
+
+    const succeeded = results.filter(Boolean).length;
+    return { succeeded, failed: results.length - succeeded };
+  }
 }
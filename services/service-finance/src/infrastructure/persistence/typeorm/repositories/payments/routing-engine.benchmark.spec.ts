@@ -0,0 +1,116 @@
+import type { ProviderRoutingRuleEntity } from '../../../../../domain/payments/entities';
+import { CompiledRoutingRuleSet } from './routing-rule-compiler';
+
+// ============================================================================
+// Routing benchmark
+//
+// Measures routing decisions per second against a realistic rule set
+// (200 rules over channels, products, debit lots, debit days and risk tiers)
+// and checks that the indexed fast path picks the same rule as the full trace.
+// ============================================================================
+
+const CHANNELS = ['WEB', 'PHONE', 'SHOP', 'PARTNER', 'APP'];
+const PRODUCTS = Array.from({ length: 40 }, (_, i) => `PRD-${i}`);
+const LOTS = Array.from({ length: 12 }, (_, i) => `LOT${i}`);
+const TIERS = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL'];
+const RULE_COUNT = 200;
+const PAYMENT_COUNT = 20_000;
+const NOW = new Date('2026-06-15T10:00:00Z');
+
+/** Deterministic PRNG so runs are comparable */
+function createRandom(seed: number): () => number {
+  let state = seed;
+  return () => {
+    state = (state * 1664525 + 1013904223) % 4294967296;
+    return state / 4294967296;
+  };
+}
+
+function pick<T>(random: () => number, values: T[], count = 1): T[] {
+  return Array.from({ length: count }, () => values[Math.floor(random() * values.length)]);
+}
+
+function buildRules(random: () => number): ProviderRoutingRuleEntity[] {
+  const rules = Array.from({ length: RULE_COUNT }, (_, i) => {
+    const conditions: Record<string, any> = {};
+    if (random() < 0.6) conditions.source_channel = pick(random, CHANNELS, 2);
+    if (random() < 0.5) conditions.product_code = pick(random, PRODUCTS, 3);
+    if (random() < 0.3) conditions.debit_lot_code_in = pick(random, LOTS, 2);
+    if (random() < 0.3) conditions.preferred_debit_day_in = pick(random, [1, 5, 10, 15, 20, 28], 2);
+    if (random() < 0.3) conditions.risk_tier = pick(random, TIERS, 2);
+    if (random() < 0.3) conditions.contract_age_months_gte = Math.floor(random() * 24);
+
+    return {
+      id: `rule-${i}`,
+      companyId: 'company-bench',
+      name: `Rule ${i}`,
+      priority: i,
+      conditions,
+      providerAccountId: `provider-${i % 7}`,
+      fallback: false,
+      isEnabled: true,
+      createdAt: new Date('2026-01-01'),
+      updatedAt: new Date('2026-01-01'),
+    } as ProviderRoutingRuleEntity;
+  });
+
+  rules.push({ ...rules[0], id: 'fallback', name: 'Fallback', priority: 999, conditions: {}, fallback: true });
+  return rules;
+}
+
+function buildPayments(random: () => number): Record<string, any>[] {
+  return Array.from({ length: PAYMENT_COUNT }, (_, i) => ({
+    id: `pi-${i}`,
+    source_channel: pick(random, CHANNELS)[0].toLowerCase(),
+    contract: {
+      product_code: pick(random, PRODUCTS)[0],
+      start_date: new Date(2024, Math.floor(random() * 24), 1).toISOString(),
+    },
+    metadata: {
+      debit_lot_code: pick(random, LOTS)[0],
+      preferred_debit_day: pick(random, [1, 5, 10, 15, 20, 28])[0],
+    },
+    risk_tier: pick(random, TIERS)[0],
+  }));
+}
+
+function decisionsPerSecond(payments: Record<string, any>[], decide: (payment: Record<string, any>) => unknown) {
+  const startedAt = process.hrtime.bigint();
+  for (const payment of payments) {
+    decide(payment);
+  }
+  const elapsedMs = Number(process.hrtime.bigint() - startedAt) / 1e6;
+  return Math.round((payments.length / elapsedMs) * 1000);
+}
+
+describe('Routing engine benchmark', () => {
+  const random = createRandom(42);
+  const rules = buildRules(random);
+  const payments = buildPayments(random);
+  const ruleSet = CompiledRoutingRuleSet.compile(rules);
+
+  it('fast path and trace agree on every decision', () => {
+    for (const payment of payments.slice(0, 2_000)) {
+      expect(ruleSet.match(payment, NOW).matchedRule?.id).toBe(ruleSet.trace(payment, NOW).matchedRule?.id);
+    }
+  });
+
+  it('measures decisions per second', () => {
+    const compileStartedAt = Date.now();
+    CompiledRoutingRuleSet.compile(rules);
+    const compileMs = Date.now() - compileStartedAt;
+
+    const matchRate = decisionsPerSecond(payments, (payment) => ruleSet.match(payment, NOW));
+    const traceRate = decisionsPerSecond(payments, (payment) => ruleSet.trace(payment, NOW));
+
+    // eslint-disable-next-line no-console
+    console.log(
+      `[routing-bench] ${RULE_COUNT} rules, ${PAYMENT_COUNT} payments — ` +
+        `compile ${compileMs}ms, match ${matchRate}/s, trace ${traceRate}/s`,
+    );
+
+    // Rates are only reported: wall-clock thresholds are not reliable on shared runners.
+    // The fallback rule guarantees every payment gets a decision.
+    expect(payments.every((payment) => ruleSet.match(payment, NOW).matchedRule)).toBe(true);
+  });
+});
@@ -0,0 +1,162 @@
+import { describe, expect, it } from '@jest/globals';
+import type { ProviderRoutingRuleEntity } from '../../../../../domain/payments/entities';
+import { RoutingEngineService } from './routing-engine.service';
+
+// ============================================================================
+// Helpers
+// ============================================================================
+
+function makeRule(
+  id: string,
+  companyId: string,
+  priority: number,
+  conditions: Record<string, any>,
+  fallback = false,
+): ProviderRoutingRuleEntity {
+  return {
+    id,
+    companyId,
+    name: `Rule ${id}`,
+    priority,
+    conditions,
+    providerAccountId: `provider-${id}`,
+    fallback,
+    isEnabled: true,
+    createdAt: new Date('2026-01-01'),
+    updatedAt: new Date('2026-01-01'),
+  } as ProviderRoutingRuleEntity;
+}
+
+function createFixture(rulesByCompany: Record<string, ProviderRoutingRuleEntity[]>) {
+  const ruleLoads: string[] = [];
+  const inserts: unknown[][] = [];
+  let failNextLoad = false;
+
+  const ruleRepository = {
+    find: async ({ where }: { where: { companyId: string } }) => {
+      ruleLoads.push(where.companyId);
+      if (failNextLoad) {
+        failNextLoad = false;
+        throw new Error('DB_UNAVAILABLE');
+      }
+      return rulesByCompany[where.companyId] ?? [];
+    },
+    create: (data: unknown) => data,
+  };
+  const alertRepository = {
+    create: (data: unknown) => data,
+    save: async (data: unknown) => data,
+  };
+  const paymentEventRepository = {
+    create: (data: unknown) => data,
+    insert: async (rows: unknown[]) => {
+      inserts.push(rows);
+    },
+  };
+  const providerOverrideService = {
+    getOverride: async () => null,
+  };
+
+  const service = new RoutingEngineService(
+    ruleRepository as any,
+    alertRepository as any,
+    paymentEventRepository as any,
+    providerOverrideService as any,
+  );
+
+  return {
+    service,
+    ruleLoads,
+    inserts,
+    failNextLoad: () => {
+      failNextLoad = true;
+    },
+  };
+}
+
+const webPayment = { id: 'pi-1', source_channel: 'web' };
+
+// ============================================================================
+// RoutingEngineService
+// ============================================================================
+
+describe('RoutingEngineService', () => {
+  it('compiles the rule set of a company once and reuses it', async () => {
+    const { service, ruleLoads } = createFixture({
+      'company-a': [makeRule('web', 'company-a', 10, { source_channel: ['web'] })],
+      'company-b': [makeRule('fallback', 'company-b', 99, {}, true)],
+    });
+
+    const [first, second] = await Promise.all([
+      service.evaluateRouting(webPayment, 'company-a'),
+      service.evaluateRouting(webPayment, 'company-a'),
+    ]);
+    await service.evaluateRouting(webPayment, 'company-a');
+    const other = await service.evaluateRouting(webPayment, 'company-b');
+
+    expect(first?.id).toBe('web');
+    expect(second?.id).toBe('web');
+    expect(other?.id).toBe('fallback');
+    expect(ruleLoads).toEqual(['company-a', 'company-b']);
+    await service.flushRoutingDecisions();
+  });
+
+  it('reloads the rules of a company after invalidateRules', async () => {
+    const rulesByCompany = {
+      'company-a': [makeRule('web', 'company-a', 10, { source_channel: ['web'] })],
+    };
+    const { service, ruleLoads } = createFixture(rulesByCompany);
+
+    expect((await service.testRouting(webPayment, 'company-a')).matchedRule?.id).toBe('web');
+
+    rulesByCompany['company-a'] = [makeRule('web-v2', 'company-a', 5, { source_channel: ['web'] })];
+    expect((await service.testRouting(webPayment, 'company-a')).matchedRule?.id).toBe('web');
+
+    service.invalidateRules('company-a');
+    expect((await service.testRouting(webPayment, 'company-a')).matchedRule?.id).toBe('web-v2');
+    expect(ruleLoads).toEqual(['company-a', 'company-a']);
+  });
+
+  it('does not cache a failed rule load', async () => {
+    const { service, ruleLoads, failNextLoad } = createFixture({
+      'company-a': [makeRule('web', 'company-a', 10, { source_channel: ['web'] })],
+    });
+
+    failNextLoad();
+    await expect(service.testRouting(webPayment, 'company-a')).rejects.toThrow('DB_UNAVAILABLE');
+
+    expect((await service.testRouting(webPayment, 'company-a')).matchedRule?.id).toBe('web');
+    expect(ruleLoads).toEqual(['company-a', 'company-a']);
+  });
+
+  it('writes buffered routing decisions as one multi-row insert', async () => {
+    const { service, inserts } = createFixture({
+      'company-a': [makeRule('web', 'company-a', 10, { source_channel: ['web'] })],
+    });
+
+    for (const id of ['pi-1', 'pi-2', 'pi-3']) {
+      await service.evaluateRouting({ id, source_channel: 'web' }, 'company-a');
+    }
+    expect(inserts).toEqual([]);
+
+    await service.flushRoutingDecisions();
+
+    expect(inserts).toHaveLength(1);
+    expect(inserts[0].map((row: any) => row.paymentIntentId)).toEqual(['pi-1', 'pi-2', 'pi-3']);
+    expect((inserts[0][0] as any).payload.payload_out.rule_id).toBe('web');
+  });
+
+  it('flushes pending routing decisions on module destroy', async () => {
+    const { service, inserts } = createFixture({
+      'company-a': [makeRule('web', 'company-a', 10, { source_channel: ['web'] })],
+    });
+
+    await service.evaluateRouting({ id: 'pi-1', source_channel: 'web' }, 'company-a');
+    await service.evaluateRouting({ id: 'pi-2', source_channel: 'web' }, 'company-a');
+
+    await service.onModuleDestroy();
+
+    expect(inserts).toHaveLength(1);
+    expect(inserts[0]).toHaveLength(2);
+  });
+});
@@ -1,4 +1,4 @@
-import { Injectable, Logger } from '@nestjs/common';
+import { Injectable, Logger, OnModuleDestroy } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
 import { Repository } from 'typeorm';
 import {
@@ -11,25 +11,34 @@ import {
   ProviderRoutingRuleEntity,
 } from '../../../../../domain/payments/entities';
 import { ProviderOverrideService } from './provider-override.service';
+import {
+  CompiledRoutingRuleSet,
+  extractString,
+  type RoutingEvaluationResult,
+  type RoutingMatch,
+} from './routing-rule-compiler';
 
-export interface RoutingEvaluationResult {
-  ruleId: string;
-  ruleName: string;
-  priority: number;
-  matched: boolean;
-  reason?: string;
-}
+export type { RoutingEvaluationResult } from './routing-rule-compiler';
+
+export type TestRoutingResult = RoutingMatch;
+
+/** Safety net for rule changes made by another replica; local writes evict immediately. */
+const RULE_SET_TTL_MS = Number(process.env.ROUTING_RULES_CACHE_TTL_MS) || 60_000;
+const DECISION_LOG_BATCH_SIZE = 200;
+const DECISION_LOG_FLUSH_MS = 1_000;
 
-export interface TestRoutingResult {
-  matchedRule: ProviderRoutingRuleEntity | null;
-  matchedBy: 'OVERRIDE' | 'RULE' | 'FALLBACK' | 'NONE';
-  explanation: string;
-  evaluations: RoutingEvaluationResult[];
+interface CachedRuleSet {
+  ruleSet: Promise<CompiledRoutingRuleSet>;
+  expiresAt: number;
 }
 
 @Injectable()
-export class RoutingEngineService {
+export class RoutingEngineService implements OnModuleDestroy {
   private readonly logger = new Logger(RoutingEngineService.name);
+  private readonly ruleSets = new Map<string, CachedRuleSet>();
+  private pendingDecisionLogs: PaymentEventEntity[] = [];
+  private decisionLogTimer: NodeJS.Timeout | null = null;
+  private decisionLogFlush: Promise<void> = Promise.resolve();
 
   constructor(
     @InjectRepository(ProviderRoutingRuleEntity)
@@ -41,17 +50,21 @@ export class RoutingEngineService {
     private readonly providerOverrideService: ProviderOverrideService,
   ) {}
 
+  async onModuleDestroy(): Promise<void> {
+    await this.flushRoutingDecisions();
+  }
+
   async evaluateRouting(
     payment: Record<string, any>,
     companyId: string,
   ): Promise<ProviderRoutingRuleEntity | null> {
-    const result = await this.evaluateInternal(payment, companyId);
+    const result = await this.evaluateInternal(payment, companyId, false);
 
     if (!result.matchedRule) {
       await this.createRoutingNotFoundAlert(companyId, payment);
     }
 
-    await this.logRoutingDecision(companyId, payment, result.matchedRule, result.matchedBy);
+    this.logRoutingDecision(companyId, payment, result.matchedRule, result.matchedBy);
     return result.matchedRule;
   }
 
@@ -59,15 +72,38 @@ export class RoutingEngineService {
     payment: Record<string, any>,
     companyId: string,
   ): Promise<TestRoutingResult> {
-    return this.evaluateInternal(payment, companyId);
+    return this.evaluateInternal(payment, companyId, true);
+  }
+
+  /**
+   * Drop the compiled rule set of a company.
+   * Must be called whenever one of its rules is created, updated or deleted.
+   */
+  invalidateRules(companyId: string): void {
+    this.ruleSets.delete(companyId);
+  }
+
+  /**
+   * Write the buffered routing decisions now (also done on a timer and on shutdown).
+   */
+  async flushRoutingDecisions(): Promise<void> {
+    if (this.decisionLogTimer) {
+      clearTimeout(this.decisionLogTimer);
+      this.decisionLogTimer = null;
+    }
+
+    const batch = this.pendingDecisionLogs;
+    this.pendingDecisionLogs = [];
+
+    this.decisionLogFlush = this.decisionLogFlush.then(() => this.insertDecisionLogs(batch));
+    await this.decisionLogFlush;
   }
 
   private async evaluateInternal(
     payment: Record<string, any>,
     companyId: string,
+    withTrace: boolean,
   ): Promise<TestRoutingResult> {
-    const evaluations: RoutingEvaluationResult[] = [];
-
     const override = await this.resolveOverride(payment);
     if (override) {
       const overrideRule = this.ruleRepository.create({
@@ -83,13 +119,15 @@ export class RoutingEngineService {
         updatedAt: override.updatedAt,
       });
 
-      evaluations.push({
-        ruleId: override.id,
-        ruleName: `Override ${override.scope}`,
-        priority: 0,
-        matched: true,
-        reason: `Override applied on ${override.scope}=${override.scopeId}`,
-      });
+      const evaluations: RoutingEvaluationResult[] = [
+        {
+          ruleId: override.id,
+          ruleName: `Override ${override.scope}`,
+          priority: 0,
+          matched: true,
+          reason: `Override applied on ${override.scope}=${override.scopeId}`,
+        },
+      ];
 
       return {
         matchedRule: overrideRule,
@@ -99,61 +137,38 @@ export class RoutingEngineService {
       };
     }
 
-    const rules = await this.ruleRepository.find({
-      where: { companyId, isEnabled: true },
-      order: { priority: 'ASC', createdAt: 'ASC' },
-    });
-
-    const primaryRules = rules.filter((rule) => !rule.fallback);
-    const fallbackRule = rules.find((rule) => rule.fallback) ?? null;
-
-    for (const rule of primaryRules) {
-      const evaluation = this.evaluateRuleConditions(rule, payment);
-      evaluations.push({
-        ruleId: rule.id,
-        ruleName: rule.name,
-        priority: rule.priority,
-        matched: evaluation.matched,
-        reason: evaluation.reason,
-      });
+    const ruleSet = await this.getRuleSet(companyId);
+    return withTrace ? ruleSet.trace(payment) : ruleSet.match(payment);
+  }
 
-      if (evaluation.matched) {
-        return {
-          matchedRule: rule,
-          matchedBy: 'RULE',
-          explanation: `Rule \"${rule.name}\" matched by priority`,
-          evaluations,
-        };
-      }
+  private getRuleSet(companyId: string): Promise<CompiledRoutingRuleSet> {
+    const now = Date.now();
+    const cached = this.ruleSets.get(companyId);
+    if (cached && cached.expiresAt > now) {
+      return cached.ruleSet;
     }
 
-    if (fallbackRule) {
-      evaluations.push({
-        ruleId: fallbackRule.id,
-        ruleName: fallbackRule.name,
-        priority: fallbackRule.priority,
-        matched: true,
-        reason: 'No priority rule matched, fallback selected',
-      });
+    const ruleSet = this.ruleRepository
+      .find({
+        where: { companyId, isEnabled: true },
+        order: { priority: 'ASC', createdAt: 'ASC' },
+      })
+      .then((rules) => CompiledRoutingRuleSet.compile(rules));
 
-      return {
-        matchedRule: fallbackRule,
-        matchedBy: 'FALLBACK',
-        explanation: `Fallback rule \"${fallbackRule.name}\" selected`,
-        evaluations,
-      };
-    }
+    const entry: CachedRuleSet = { ruleSet, expiresAt: now + RULE_SET_TTL_MS };
+    this.ruleSets.set(companyId, entry);
 
-    return {
-      matchedRule: null,
-      matchedBy: 'NONE',
-      explanation: 'No rule or fallback matched',
-      evaluations,
-    };
+    ruleSet.catch(() => {
+      if (this.ruleSets.get(companyId) === entry) {
+        this.ruleSets.delete(companyId);
+      }
+    });
+
+    return ruleSet;
   }
 
   private async resolveOverride(payment: Record<string, any>) {
-    const contractId = this.extractString(payment, [
+    const contractId = extractString(payment, [
       'contrat_id',
       'contract_id',
       'contratId',
@@ -171,7 +186,7 @@ export class RoutingEngineService {
       }
     }
 
-    const clientId = this.extractString(payment, [
+    const clientId = extractString(payment, [
       'client_id',
       'clientId',
       'client.id',
@@ -184,171 +199,11 @@ export class RoutingEngineService {
     return null;
   }
 
-  private evaluateRuleConditions(
-    rule: ProviderRoutingRuleEntity,
-    payment: Record<string, any>,
-  ): { matched: boolean; reason?: string } {
-    const conditions = rule.conditions ?? {};
-    const failures: string[] = [];
-
-    const sourceChannel = this.extractString(payment, [
-      'source_channel',
-      'sourceChannel',
-      'contract.source_channel',
-      'contract.sourceChannel',
-    ]);
-
-    if (conditions.source_channel !== undefined) {
-      const acceptedChannels = this.toStringArray(conditions.source_channel);
-      if (!sourceChannel || !this.matchStringList(sourceChannel, acceptedChannels)) {
-        failures.push(`source_channel must be one of [${acceptedChannels.join(', ')}]`);
-      }
-    }
-
-    if (conditions.contract_age_months_gte !== undefined) {
-      const expectedMonths = Number(conditions.contract_age_months_gte);
-      const contractAgeMonths = this.resolveContractAgeMonths(payment);
-
-      if (!Number.isFinite(expectedMonths)) {
-        failures.push('contract_age_months_gte must be a number');
-      } else if (contractAgeMonths === null) {
-        failures.push('contract start_date is missing');
-      } else if (contractAgeMonths < expectedMonths) {
-        failures.push(`contract age ${contractAgeMonths} < required ${expectedMonths}`);
-      }
-    }
-
-    if (conditions.product_code !== undefined) {
-      const productCode = this.extractString(payment, [
-        'product_code',
-        'productCode',
-        'contract.product_code',
-        'contract.productCode',
-      ]);
-      const acceptedProducts = this.toStringArray(conditions.product_code);
-
-      if (!productCode || !this.matchStringList(productCode, acceptedProducts)) {
-        failures.push(`product_code must be one of [${acceptedProducts.join(', ')}]`);
-      }
-    }
-
-    if (conditions.debit_lot_code_in !== undefined) {
-      const debitLotCode = this.extractString(payment, [
-        'debit_lot_code',
-        'debitLotCode',
-        'metadata.debit_lot_code',
-        'metadata.debitLotCode',
-      ]);
-      const acceptedLots = this.toStringArray(conditions.debit_lot_code_in);
-
-      if (!debitLotCode || !this.matchStringList(debitLotCode, acceptedLots)) {
-        failures.push(`debit_lot_code must be one of [${acceptedLots.join(', ')}]`);
-      }
-    }
-
-    if (conditions.preferred_debit_day_in !== undefined) {
-      const preferredDebitDay = this.resolvePreferredDebitDay(payment);
-      const acceptedDays = this.toNumberArray(conditions.preferred_debit_day_in);
-
-      if (preferredDebitDay === null || !acceptedDays.includes(preferredDebitDay)) {
-        failures.push(`preferred_debit_day must be one of [${acceptedDays.join(', ')}]`);
-      }
-    }
-
-    if (conditions.risk_tier !== undefined) {
-      const riskTier = this.extractString(payment, [
-        'risk_tier',
-        'riskTier',
-        'risk_score_tier',
-        'riskScoreTier',
-        'risk_score.risk_tier',
-        'riskScore.riskTier',
-      ]);
-      const acceptedTiers = this.toStringArray(conditions.risk_tier);
-
-      if (!riskTier || !this.matchStringList(riskTier, acceptedTiers)) {
-        failures.push(`risk_tier must be one of [${acceptedTiers.join(', ')}]`);
-      }
-    }
-
-    if (failures.length > 0) {
-      return {
-        matched: false,
-        reason: failures.join('; '),
-      };
-    }
-
-    return { matched: true, reason: 'All conditions matched' };
-  }
-
-  private resolveContractAgeMonths(payment: Record<string, any>): number | null {
-    const explicitAge = this.extractNumber(payment, [
-      'contract_age_months',
-      'contractAgeMonths',
-    ]);
-
-    if (explicitAge !== null) {
-      return explicitAge;
-    }
-
-    const startDateValue = this.extractValue(payment, [
-      'contract.start_date',
-      'contract.startDate',
-      'contract_start_date',
-      'contractStartDate',
-      'start_date',
-      'startDate',
-    ]);
-
-    const startDate = this.toDate(startDateValue);
-    if (!startDate) {
-      return null;
-    }
-
-    const now = new Date();
-    let months =
-      (now.getFullYear() - startDate.getFullYear()) * 12 +
-      (now.getMonth() - startDate.getMonth());
-
-    if (now.getDate() < startDate.getDate()) {
-      months -= 1;
-    }
-
-    return Math.max(0, months);
-  }
-
-  private resolvePreferredDebitDay(payment: Record<string, any>): number | null {
-    const explicitDay = this.extractNumber(payment, [
-      'preferred_debit_day',
-      'preferredDebitDay',
-      'metadata.preferred_debit_day',
-      'metadata.preferredDebitDay',
-    ]);
-
-    if (explicitDay !== null) {
-      return explicitDay;
-    }
-
-    const plannedDateValue = this.extractValue(payment, [
-      'planned_debit_date',
-      'plannedDebitDate',
-      'metadata.planned_debit_date',
-      'metadata.plannedDebitDate',
-    ]);
-
-    const plannedDate = this.toDate(plannedDateValue);
-    if (!plannedDate) {
-      return null;
-    }
-
-    return plannedDate.getDate();
-  }
-
   private async createRoutingNotFoundAlert(
     companyId: string,
     payment: Record<string, any>,
   ): Promise<void> {
-    const paymentReference = this.extractString(payment, [
+    const paymentReference = extractString(payment, [
       'id',
       'payment_id',
       'paymentId',
@@ -370,16 +225,16 @@ export class RoutingEngineService {
     await this.alertRepository.save(alert);
   }
 
-  private async logRoutingDecision(
+  private logRoutingDecision(
     companyId: string,
     payment: Record<string, any>,
     matchedRule: ProviderRoutingRuleEntity | null,
     matchedBy: TestRoutingResult['matchedBy'],
-  ): Promise<void> {
+  ): void {
     const paymentIntentId =
-      this.extractString(payment, ['payment_intent_id', 'paymentIntentId', 'id']) ||
+      extractString(payment, ['payment_intent_id', 'paymentIntentId', 'id']) ||
       undefined;
-    const scheduleId = this.extractString(payment, ['schedule_id', 'scheduleId']) || undefined;
+    const scheduleId = extractString(payment, ['schedule_id', 'scheduleId']) || undefined;
 
     const payload = {
       event: 'ROUTING_DECISION',
@@ -407,102 +262,58 @@ export class RoutingEngineService {
       eventType: PaymentEventType.PAYMENT_PROCESSING,
       payload: { ...payload, originalEventType: 'routing.decision' },
       processed: true,
-    } as any);
-
-    try {
-      await this.paymentEventRepository.save(event);
-    } catch (error) {
-      this.logger.warn('Routing decision type not available in enum, falling back to PAYMENT_PROCESSING log');
-      const fallbackEvent = this.paymentEventRepository.create({
-        paymentIntentId,
-        scheduleId,
-        societeId: companyId,
-        eventType: PaymentEventType.PAYMENT_PROCESSING,
-        payload,
-        processed: true,
-      });
-      await this.paymentEventRepository.save(fallbackEvent);
+    } as any) as unknown as PaymentEventEntity;
+
+    this.pendingDecisionLogs.push(event);
+
+    if (this.pendingDecisionLogs.length >= DECISION_LOG_BATCH_SIZE) {
+      void this.flushRoutingDecisions();
+    } else if (!this.decisionLogTimer) {
+      this.decisionLogTimer = setTimeout(() => {
+        this.decisionLogTimer = null;
+        void this.flushRoutingDecisions();
+      }, DECISION_LOG_FLUSH_MS);
+      this.decisionLogTimer.unref?.();
     }
   }
 
-  private extractValue(source: Record<string, any>, paths: string[]): any {
-    for (const path of paths) {
-      const segments = path.split('.');
-      let current: any = source;
-
-      for (const segment of segments) {
-        if (current === null || current === undefined) {
-          current = undefined;
-          break;
-        }
-        current = current[segment];
-      }
-
-      if (current !== undefined && current !== null) {
-        return current;
-      }
-    }
-
-    return undefined;
-  }
-
-  private extractString(source: Record<string, any>, paths: string[]): string | null {
-    const value = this.extractValue(source, paths);
-
-    if (value === undefined || value === null) {
-      return null;
+  /**
+   * Multi-row insert of a batch of routing decisions. Never throws: the
+   * decision log is an audit trail and must not fail the payment path.
+   */
+  private async insertDecisionLogs(batch: PaymentEventEntity[]): Promise<void> {
+    if (batch.length === 0) {
+      return;
     }
 
-    const normalized = String(value).trim();
-    return normalized.length > 0 ? normalized : null;
-  }
-
-  private extractNumber(source: Record<string, any>, paths: string[]): number | null {
-    const value = this.extractValue(source, paths);
-    if (value === undefined || value === null || value === '') {
-      return null;
-    }
-
-    const numberValue = Number(value);
-    return Number.isFinite(numberValue) ? numberValue : null;
-  }
-
-  private toStringArray(value: unknown): string[] {
-    if (Array.isArray(value)) {
-      return value
-        .map((item) => String(item).trim())
-        .filter((item) => item.length > 0);
-    }
-
-    if (value === undefined || value === null || value === '') {
-      return [];
-    }
-
-    return [String(value).trim()].filter((item) => item.length > 0);
-  }
-
-  private toNumberArray(value: unknown): number[] {
-    if (!Array.isArray(value)) {
-      const parsed = Number(value);
-      return Number.isFinite(parsed) ? [parsed] : [];
-    }
-
-    return value
-      .map((item) => Number(item))
-      .filter((item) => Number.isFinite(item));
-  }
-
-  private matchStringList(actual: string, expectedValues: string[]): boolean {
-    const normalizedActual = actual.trim().toUpperCase();
-    return expectedValues.some((value) => value.trim().toUpperCase() === normalizedActual);
-  }
-
-  private toDate(value: unknown): Date | null {
-    if (!value) {
-      return null;
+    try {
+      await this.paymentEventRepository.insert(batch);
+    } catch (error) {
+      this.logger.warn(
+        `Failed to write ${batch.length} routing decision(s), retrying without originalEventType: ${
+          error instanceof Error ? error.message : String(error)
+        }`,
+      );
+      try {
+        const fallbackBatch = batch.map((event) => {
+          const { originalEventType: _ignored, ...payload } = event.payload ?? {};
+          return this.paymentEventRepository.create({
+            paymentIntentId: event.paymentIntentId ?? undefined,
+            scheduleId: event.scheduleId ?? undefined,
+            societeId: event.societeId,
+            eventType: PaymentEventType.PAYMENT_PROCESSING,
+            payload,
+            processed: true,
+          });
+        });
+        await this.paymentEventRepository.insert(fallbackBatch);
+      } catch (fallbackError) {
+        this.logger.error(
+          `Dropped ${batch.length} routing decision log(s): ${
+            fallbackError instanceof Error ? fallbackError.message : String(fallbackError)
+          }`,
+        );
+      }
     }
-
-    const date = value instanceof Date ? value : new Date(String(value));
-    return Number.isNaN(date.getTime()) ? null : date;
   }
 }
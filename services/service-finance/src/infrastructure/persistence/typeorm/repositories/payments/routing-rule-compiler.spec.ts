@@ -0,0 +1,110 @@
+import type { ProviderRoutingRuleEntity } from '../../../../../domain/payments/entities';
+import { CompiledRoutingRuleSet } from './routing-rule-compiler';
+
+// ============================================================================
+// Helpers
+// ============================================================================
+
+function makeRule(
+  id: string,
+  priority: number,
+  conditions: Record<string, any>,
+  fallback = false,
+): ProviderRoutingRuleEntity {
+  return {
+    id,
+    companyId: 'company-1',
+    name: `Rule ${id}`,
+    priority,
+    conditions,
+    providerAccountId: `provider-${id}`,
+    fallback,
+    isEnabled: true,
+    createdAt: new Date('2026-01-01'),
+    updatedAt: new Date('2026-01-01'),
+  } as ProviderRoutingRuleEntity;
+}
+
+const NOW = new Date('2026-06-15T10:00:00Z');
+
+// ============================================================================
+// CompiledRoutingRuleSet
+// ============================================================================
+
+describe('CompiledRoutingRuleSet', () => {
+  const rules = [
+    makeRule('web-premium', 10, { source_channel: ['web'], product_code: 'PREMIUM' }),
+    makeRule('old-contracts', 20, { contract_age_months_gte: 12 }),
+    makeRule('lot-5', 30, { debit_lot_code_in: ['LOT5'], preferred_debit_day_in: [5, 15] }),
+    makeRule('high-risk', 40, { risk_tier: ['HIGH', 'critical'] }),
+    makeRule('fallback', 99, {}, true),
+  ];
+  const ruleSet = CompiledRoutingRuleSet.compile(rules);
+
+  it('matches the first rule by priority with case-insensitive lists', () => {
+    const result = ruleSet.match({ source_channel: ' WEB ', product_code: 'premium' }, NOW);
+
+    expect(result.matchedBy).toBe('RULE');
+    expect(result.matchedRule?.id).toBe('web-premium');
+  });
+
+  it('evaluates numeric conditions from nested payment fields', () => {
+    expect(ruleSet.match({ contract: { start_date: '2025-01-01' } }, NOW).matchedRule?.id).toBe(
+      'old-contracts',
+    );
+    expect(
+      ruleSet.match({ metadata: { debit_lot_code: 'lot5', planned_debit_date: '2026-07-15' } }, NOW)
+        .matchedRule?.id,
+    ).toBe('lot-5');
+    expect(ruleSet.match({ riskScore: { riskTier: 'Critical' } }, NOW).matchedRule?.id).toBe('high-risk');
+  });
+
+  it('selects the fallback when no priority rule matches', () => {
+    const result = ruleSet.match({ source_channel: 'phone' }, NOW);
+
+    expect(result.matchedBy).toBe('FALLBACK');
+    expect(result.matchedRule?.id).toBe('fallback');
+  });
+
+  it('returns NONE without rules', () => {
+    const result = CompiledRoutingRuleSet.compile([]).match({ source_channel: 'web' }, NOW);
+
+    expect(result.matchedBy).toBe('NONE');
+    expect(result.matchedRule).toBeNull();
+  });
+
+  it('keeps the evaluation trace and failure reasons in trace mode', () => {
+    const result = ruleSet.trace({ source_channel: 'web', contract_age_months: 3 }, NOW);
+
+    expect(result.matchedBy).toBe('FALLBACK');
+    expect(result.evaluations.map((evaluation) => evaluation.ruleId)).toEqual([
+      'web-premium',
+      'old-contracts',
+      'lot-5',
+      'high-risk',
+      'fallback',
+    ]);
+    expect(result.evaluations[0].reason).toBe('product_code must be one of [PREMIUM]');
+    expect(result.evaluations[1].reason).toBe('contract age 3 < required 12');
+    expect(result.evaluations[2].reason).toBe(
+      'debit_lot_code must be one of [LOT5]; preferred_debit_day must be one of [5, 15]',
+    );
+    expect(result.evaluations[4].reason).toBe('No priority rule matched, fallback selected');
+  });
+
+  it('stops the trace at the first matching rule', () => {
+    const result = ruleSet.trace({ source_channel: 'web', product_code: 'PREMIUM' }, NOW);
+
+    expect(result.evaluations).toHaveLength(1);
+    expect(result.evaluations[0]).toMatchObject({ matched: true, reason: 'All conditions matched' });
+  });
+
+  it('never matches a rule whose age condition is not a number', () => {
+    const invalid = CompiledRoutingRuleSet.compile([makeRule('bad', 1, { contract_age_months_gte: 'abc' })]);
+
+    expect(invalid.match({ contract_age_months: 100 }, NOW).matchedBy).toBe('NONE');
+    expect(invalid.trace({ contract_age_months: 100 }, NOW).evaluations[0].reason).toBe(
+      'contract_age_months_gte must be a number',
+    );
+  });
+});
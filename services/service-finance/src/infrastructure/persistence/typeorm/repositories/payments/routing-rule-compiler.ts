@@ -0,0 +1,479 @@
+import type { ProviderRoutingRuleEntity } from '../../../../../domain/payments/entities';
+
+export interface RoutingEvaluationResult {
+  ruleId: string;
+  ruleName: string;
+  priority: number;
+  matched: boolean;
+  reason?: string;
+}
+
+export type RoutingMatchedBy = 'OVERRIDE' | 'RULE' | 'FALLBACK' | 'NONE';
+
+export interface RoutingMatch {
+  matchedRule: ProviderRoutingRuleEntity | null;
+  matchedBy: RoutingMatchedBy;
+  explanation: string;
+  evaluations: RoutingEvaluationResult[];
+}
+
+type ConditionField =
+  | 'source_channel'
+  | 'contract_age_months_gte'
+  | 'product_code'
+  | 'debit_lot_code_in'
+  | 'preferred_debit_day_in'
+  | 'risk_tier';
+
+/** Payment attributes a condition reads; each is extracted at most once per evaluation. */
+type FeatureKey =
+  | 'sourceChannel'
+  | 'contractAgeMonths'
+  | 'productCode'
+  | 'debitLotCode'
+  | 'preferredDebitDay'
+  | 'riskTier';
+
+/** String-list conditions, indexed by accepted value. */
+const INDEXED_FIELDS: Array<{ field: ConditionField; feature: FeatureKey }> = [
+  { field: 'source_channel', feature: 'sourceChannel' },
+  { field: 'product_code', feature: 'productCode' },
+  { field: 'debit_lot_code_in', feature: 'debitLotCode' },
+  { field: 'risk_tier', feature: 'riskTier' },
+];
+
+const FEATURE_PATHS: Record<Exclude<FeatureKey, 'contractAgeMonths' | 'preferredDebitDay'>, string[]> = {
+  sourceChannel: ['source_channel', 'sourceChannel', 'contract.source_channel', 'contract.sourceChannel'],
+  productCode: ['product_code', 'productCode', 'contract.product_code', 'contract.productCode'],
+  debitLotCode: ['debit_lot_code', 'debitLotCode', 'metadata.debit_lot_code', 'metadata.debitLotCode'],
+  riskTier: [
+    'risk_tier',
+    'riskTier',
+    'risk_score_tier',
+    'riskScoreTier',
+    'risk_score.risk_tier',
+    'riskScore.riskTier',
+  ],
+};
+
+/**
+ * A single compiled condition. `test` returns the failure reason, or null when it passes.
+ */
+interface CompiledCheck {
+  field: ConditionField;
+  test(features: PaymentFeatures): string | null;
+}
+
+interface CompiledRule {
+  rule: ProviderRoutingRuleEntity;
+  checks: CompiledCheck[];
+  /** Checks not covered by the value index (numeric conditions) */
+  residualChecks: CompiledCheck[];
+}
+
+interface FieldIndex {
+  feature: FeatureKey;
+  /** Positions of the rules carrying a condition on this field */
+  constrained: Set<number>;
+  /** Normalized accepted value -> positions of the rules accepting it */
+  byValue: Map<string, Set<number>>;
+}
+
+const EMPTY_POSITIONS: ReadonlySet<number> = new Set<number>();
+
+/**
+ * Lazily extracted, memoized payment attributes.
+ */
+class PaymentFeatures {
+  private readonly cache = new Map<FeatureKey, string | number | null>();
+
+  constructor(
+    private readonly payment: Record<string, any>,
+    private readonly now: Date,
+  ) {}
+
+  get(feature: FeatureKey): string | number | null {
+    if (this.cache.has(feature)) {
+      return this.cache.get(feature) ?? null;
+    }
+
+    let value: string | number | null;
+    if (feature === 'contractAgeMonths') {
+      value = resolveContractAgeMonths(this.payment, this.now);
+    } else if (feature === 'preferredDebitDay') {
+      value = resolvePreferredDebitDay(this.payment);
+    } else {
+      value = extractString(this.payment, FEATURE_PATHS[feature]);
+    }
+
+    this.cache.set(feature, value);
+    return value;
+  }
+
+  string(feature: FeatureKey): string | null {
+    const value = this.get(feature);
+    return value === null ? null : String(value);
+  }
+
+  number(feature: FeatureKey): number | null {
+    const value = this.get(feature);
+    return typeof value === 'number' ? value : null;
+  }
+}
+
+/**
+ * In-memory matcher for one company's enabled routing rules.
+ *
+ * Conditions are compiled once into closures over pre-normalized sets, and
+ * string-list conditions are indexed by accepted value so that a payment only
+ * runs the numeric checks of the rules its attributes can still satisfy.
+ * `trace()` evaluates every rule and keeps the reasons returned by `testRouting`.
+ */
+export class CompiledRoutingRuleSet {
+  private readonly indexes: FieldIndex[];
+
+  private constructor(
+    private readonly primary: CompiledRule[],
+    readonly fallback: ProviderRoutingRuleEntity | null,
+    readonly size: number,
+  ) {
+    this.indexes = this.buildIndexes();
+  }
+
+  /**
+   * @param rules - enabled rules ordered by priority ASC, createdAt ASC
+   */
+  static compile(rules: ProviderRoutingRuleEntity[]): CompiledRoutingRuleSet {
+    const primary = rules
+      .filter((rule) => !rule.fallback)
+      .map((rule) => {
+        const checks = compileConditions(rule.conditions ?? {});
+        const indexed = new Set(INDEXED_FIELDS.map((entry) => entry.field));
+        return {
+          rule,
+          checks,
+          residualChecks: checks.filter((check) => !indexed.has(check.field)),
+        };
+      });
+    const fallback = rules.find((rule) => rule.fallback) ?? null;
+
+    return new CompiledRoutingRuleSet(primary, fallback, rules.length);
+  }
+
+  /**
+   * Fast path: first matching rule by priority, without an evaluation trace.
+   */
+  match(payment: Record<string, any>, now = new Date()): RoutingMatch {
+    const features = new PaymentFeatures(payment, now);
+    const allowed = this.indexes.map((index) => {
+      const actual = features.string(index.feature);
+      return actual === null ? EMPTY_POSITIONS : (index.byValue.get(normalize(actual)) ?? EMPTY_POSITIONS);
+    });
+
+    for (let position = 0; position < this.primary.length; position++) {
+      const compiled = this.primary[position];
+      let viable = true;
+
+      for (let i = 0; i < this.indexes.length; i++) {
+        if (this.indexes[i].constrained.has(position) && !allowed[i].has(position)) {
+          viable = false;
+          break;
+        }
+      }
+
+      if (viable && compiled.residualChecks.every((check) => check.test(features) === null)) {
+        return this.ruleMatch(compiled.rule, []);
+      }
+    }
+
+    return this.fallbackMatch([]);
+  }
+
+  /**
+   * Full evaluation: every primary rule up to the first match, with failure reasons.
+   */
+  trace(payment: Record<string, any>, now = new Date()): RoutingMatch {
+    const features = new PaymentFeatures(payment, now);
+    const evaluations: RoutingEvaluationResult[] = [];
+
+    for (const compiled of this.primary) {
+      const failures = compiled.checks
+        .map((check) => check.test(features))
+        .filter((reason): reason is string => reason !== null);
+      const matched = failures.length === 0;
+
+      evaluations.push({
+        ruleId: compiled.rule.id,
+        ruleName: compiled.rule.name,
+        priority: compiled.rule.priority,
+        matched,
+        reason: matched ? 'All conditions matched' : failures.join('; '),
+      });
+
+      if (matched) {
+        return this.ruleMatch(compiled.rule, evaluations);
+      }
+    }
+
+    return this.fallbackMatch(evaluations);
+  }
+
+  private ruleMatch(rule: ProviderRoutingRuleEntity, evaluations: RoutingEvaluationResult[]): RoutingMatch {
+    return {
+      matchedRule: rule,
+      matchedBy: 'RULE',
+      explanation: `Rule \"${rule.name}\" matched by priority`,
+      evaluations,
+    };
+  }
+
+  private fallbackMatch(evaluations: RoutingEvaluationResult[]): RoutingMatch {
+    if (this.fallback) {
+      evaluations.push({
+        ruleId: this.fallback.id,
+        ruleName: this.fallback.name,
+        priority: this.fallback.priority,
+        matched: true,
+        reason: 'No priority rule matched, fallback selected',
+      });
+
+      return {
+        matchedRule: this.fallback,
+        matchedBy: 'FALLBACK',
+        explanation: `Fallback rule \"${this.fallback.name}\" selected`,
+        evaluations,
+      };
+    }
+
+    return {
+      matchedRule: null,
+      matchedBy: 'NONE',
+      explanation: 'No rule or fallback matched',
+      evaluations,
+    };
+  }
+
+  private buildIndexes(): FieldIndex[] {
+    const indexes: FieldIndex[] = [];
+
+    for (const { field, feature } of INDEXED_FIELDS) {
+      const index: FieldIndex = { feature, constrained: new Set(), byValue: new Map() };
+
+      this.primary.forEach((compiled, position) => {
+        const conditions = compiled.rule.conditions ?? {};
+        if (conditions[field] === undefined) {
+          return;
+        }
+
+        index.constrained.add(position);
+        for (const value of toStringArray(conditions[field])) {
+          const key = normalize(value);
+          const positions = index.byValue.get(key) ?? new Set<number>();
+          positions.add(position);
+          index.byValue.set(key, positions);
+        }
+      });
+
+      if (index.constrained.size > 0) {
+        indexes.push(index);
+      }
+    }
+
+    return indexes;
+  }
+}
+
+function compileConditions(conditions: Record<string, any>): CompiledCheck[] {
+  const checks: CompiledCheck[] = [];
+
+  const stringList = (field: ConditionField, feature: FeatureKey, label: string): void => {
+    if (conditions[field] === undefined) {
+      return;
+    }
+    const accepted = toStringArray(conditions[field]);
+    const acceptedSet = new Set(accepted.map(normalize));
+    const reason = `${label} must be one of [${accepted.join(', ')}]`;
+
+    checks.push({
+      field,
+      test: (features) => {
+        const actual = features.string(feature);
+        return actual && acceptedSet.has(normalize(actual)) ? null : reason;
+      },
+    });
+  };
+
+  stringList('source_channel', 'sourceChannel', 'source_channel');
+
+  if (conditions.contract_age_months_gte !== undefined) {
+    const expectedMonths = Number(conditions.contract_age_months_gte);
+
+    checks.push({
+      field: 'contract_age_months_gte',
+      test: (features) => {
+        if (!Number.isFinite(expectedMonths)) {
+          return 'contract_age_months_gte must be a number';
+        }
+        const contractAgeMonths = features.number('contractAgeMonths');
+        if (contractAgeMonths === null) {
+          return 'contract start_date is missing';
+        }
+        if (contractAgeMonths < expectedMonths) {
+          return `contract age ${contractAgeMonths} < required ${expectedMonths}`;
+        }
+        return null;
+      },
+    });
+  }
+
+  stringList('product_code', 'productCode', 'product_code');
+  stringList('debit_lot_code_in', 'debitLotCode', 'debit_lot_code');
+
+  if (conditions.preferred_debit_day_in !== undefined) {
+    const acceptedDays = toNumberArray(conditions.preferred_debit_day_in);
+    const acceptedSet = new Set(acceptedDays);
+    const reason = `preferred_debit_day must be one of [${acceptedDays.join(', ')}]`;
+
+    checks.push({
+      field: 'preferred_debit_day_in',
+      test: (features) => {
+        const day = features.number('preferredDebitDay');
+        return day !== null && acceptedSet.has(day) ? null : reason;
+      },
+    });
+  }
+
+  stringList('risk_tier', 'riskTier', 'risk_tier');
+
+  return checks;
+}
+
+function resolveContractAgeMonths(payment: Record<string, any>, now: Date): number | null {
+  const explicitAge = extractNumber(payment, ['contract_age_months', 'contractAgeMonths']);
+
+  if (explicitAge !== null) {
+    return explicitAge;
+  }
+
+  const startDate = toDate(
+    extractValue(payment, [
+      'contract.start_date',
+      'contract.startDate',
+      'contract_start_date',
+      'contractStartDate',
+      'start_date',
+      'startDate',
+    ]),
+  );
+  if (!startDate) {
+    return null;
+  }
+
+  let months = (now.getFullYear() - startDate.getFullYear()) * 12 + (now.getMonth() - startDate.getMonth());
+
+  if (now.getDate() < startDate.getDate()) {
+    months -= 1;
+  }
+
+  return Math.max(0, months);
+}
+
+function resolvePreferredDebitDay(payment: Record<string, any>): number | null {
+  const explicitDay = extractNumber(payment, [
+    'preferred_debit_day',
+    'preferredDebitDay',
+    'metadata.preferred_debit_day',
+    'metadata.preferredDebitDay',
+  ]);
+
+  if (explicitDay !== null) {
+    return explicitDay;
+  }
+
+  const plannedDate = toDate(
+    extractValue(payment, [
+      'planned_debit_date',
+      'plannedDebitDate',
+      'metadata.planned_debit_date',
+      'metadata.plannedDebitDate',
+    ]),
+  );
+
+  return plannedDate ? plannedDate.getDate() : null;
+}
+
+export function extractValue(source: Record<string, any>, paths: string[]): any {
+  for (const path of paths) {
+    const segments = path.split('.');
+    let current: any = source;
+
+    for (const segment of segments) {
+      if (current === null || current === undefined) {
+        current = undefined;
+        break;
+      }
+      current = current[segment];
+    }
+
+    if (current !== undefined && current !== null) {
+      return current;
+    }
+  }
+
+  return undefined;
+}
+
+export function extractString(source: Record<string, any>, paths: string[]): string | null {
+  const value = extractValue(source, paths);
+
+  if (value === undefined || value === null) {
+    return null;
+  }
+
+  const normalized = String(value).trim();
+  return normalized.length > 0 ? normalized : null;
+}
+
+function extractNumber(source: Record<string, any>, paths: string[]): number | null {
+  const value = extractValue(source, paths);
+  if (value === undefined || value === null || value === '') {
+    return null;
+  }
+
+  const numberValue = Number(value);
+  return Number.isFinite(numberValue) ? numberValue : null;
+}
+
+function toStringArray(value: unknown): string[] {
+  if (Array.isArray(value)) {
+    return value.map((item) => String(item).trim()).filter((item) => item.length > 0);
+  }
+
+  if (value === undefined || value === null || value === '') {
+    return [];
+  }
+
+  return [String(value).trim()].filter((item) => item.length > 0);
+}
+
+function toNumberArray(value: unknown): number[] {
+  if (!Array.isArray(value)) {
+    const parsed = Number(value);
+    return Number.isFinite(parsed) ? [parsed] : [];
+  }
+
+  return value.map((item) => Number(item)).filter((item) => Number.isFinite(item));
+}
+
+function normalize(value: string): string {
+  return value.trim().toUpperCase();
+}
+
+function toDate(value: unknown): Date | null {
+  if (!value) {
+    return null;
+  }
+
+  const date = value instanceof Date ? value : new Date(String(value));
+  return Number.isNaN(date.getTime()) ? null : date;
+}
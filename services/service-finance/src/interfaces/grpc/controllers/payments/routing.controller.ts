@@ -61,6 +61,7 @@ export class RoutingController {
     });
 
     const savedRule = await this.routingRuleRepository.save(rule);
+    this.routingEngineService.invalidateRules(savedRule.companyId);
     return this.toRoutingRuleResponse(savedRule);
   }
 
@@ -96,6 +97,7 @@ export class RoutingController {
     }
 
     const savedRule = await this.routingRuleRepository.save(rule);
+    this.routingEngineService.invalidateRules(savedRule.companyId);
     return this.toRoutingRuleResponse(savedRule);
   }
 
@@ -107,6 +109,7 @@ export class RoutingController {
       id: data.id,
       companyId: data.societe_id,
     });
+    this.routingEngineService.invalidateRules(data.societe_id);
 
     return {
       success: (result.affected ?? 0) > 0,
@@ -0,0 +1,18 @@
+import { MigrationInterface, QueryRunner, TableIndex } from 'typeorm';
+
+export class AddPaymentIntentsExportKeysetIndex1774600000000 implements MigrationInterface {
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    // Supports the (created_at, id) keyset pagination of accounting exports per company
+    await queryRunner.createIndex(
+      'payment_intents',
+      new TableIndex({
+        name: 'IDX_payment_intents_societe_created_id',
+        columnNames: ['societe_id', 'created_at', 'id'],
+      }),
+    );
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.dropIndex('payment_intents', 'IDX_payment_intents_societe_created_id');
+  }
+}
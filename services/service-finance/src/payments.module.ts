@@ -1,7 +1,8 @@
-import { Global, Module } from '@nestjs/common';
+import { Global, Logger, Module } from '@nestjs/common';
 import { APP_INTERCEPTOR } from '@nestjs/core';
 import { TypeOrmModule } from '@nestjs/typeorm';
 import { ScheduleModule } from '@nestjs/schedule';
+import { S3StorageService, s3ConfigFromEnv } from '@crm/shared-kernel';
 
 // Domain entities
 import {
@@ -111,6 +112,29 @@ import { JournalReglementsService } from './domain/payments/services/journal-reg
 import { JournalImpayesService } from './domain/payments/services/journal-impayes.service';
 import { FecGeneratorService } from './domain/payments/services/fec-generator.service';
 
+/**
+ * Object storage for accounting exports. Resolves to null when S3 is not
+ * configured: exports are then generated and hashed but not stored.
+ */
+const S3_STORAGE_PROVIDER = {
+  provide: S3StorageService,
+  useFactory: (): S3StorageService | null => {
+    const logger = new Logger('PaymentsModule');
+
+    if (!process.env.S3_BUCKET) {
+      logger.warn('S3_BUCKET env var is not set. Export files will not be stored.');
+      return null;
+    }
+
+    try {
+      return new S3StorageService(s3ConfigFromEnv());
+    } catch (error) {
+      logger.error(`Failed to initialise S3StorageService: ${error instanceof Error ? error.message : String(error)}`);
+      return null;
+    }
+  },
+};
+
 @Global()
 @Module({
   imports: [
@@ -192,6 +216,7 @@ import { FecGeneratorService } from './domain/payments/services/fec-generator.se
     ArchiveSchedulerService,
     CustomerInteractionService,
     ScoringClientService,
+    S3_STORAGE_PROVIDER,
     ExportService,
     AlertService,
     SelectiveDunningService,
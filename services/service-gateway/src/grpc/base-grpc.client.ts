@@ -1,4 +1,5 @@
 import { HttpException, Logger } from '@nestjs/common';
+import { httpStatusFromGrpcCode } from '@crm/shared-kernel';
 import { Observable } from 'rxjs';
 import { catchError } from 'rxjs/operators';
 
@@ -10,12 +11,23 @@ export function wrapGrpcCall<T>(
 ): Observable<T> {
   return call$.pipe(
     catchError((error: unknown) => {
-      const err = error as Error;
+      const err = error as Error & { code?: number; details?: string };
+      const httpStatus = httpStatusFromGrpcCode(err.code);
+
+      // Client errors carry a message meant for the caller; server errors stay generic
+      if (httpStatus < 500) {
+        logger.warn(`gRPC ${serviceName}.${methodName} rejected the request: ${err.message}`);
+        throw new HttpException(err.details || err.message, httpStatus);
+      }
+
       logger.error(
         `gRPC error calling ${serviceName}.${methodName}: ${err.message}`,
         err.stack,
       );
-      throw new HttpException('Service unavailable', 503);
+      throw new HttpException(
+        httpStatus === 504 ? 'Service timeout' : 'Service unavailable',
+        httpStatus,
+      );
     }),
   );
 }
@@ -13,6 +13,20 @@ export interface IFulfillmentBatchLineRepository {
     lineStatus?: FulfillmentBatchLineStatus;
   }): Promise<FulfillmentBatchLineEntity>;
 
+  createMany(
+    params: Array<{
+      organisationId: string;
+      batchId: string;
+      subscriptionId: string;
+      clientId: string;
+      produitId: string;
+      quantite: number;
+      addressSnapshotId: string;
+      preferenceSnapshotId: string;
+      lineStatus?: FulfillmentBatchLineStatus;
+    }>,
+  ): Promise<FulfillmentBatchLineEntity[]>;
+
   findById(id: string): Promise<FulfillmentBatchLineEntity | null>;
 
   findByBatchId(
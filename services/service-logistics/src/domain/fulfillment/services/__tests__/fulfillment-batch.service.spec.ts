@@ -17,6 +17,7 @@ import {
 import {
   FulfillmentBatchService,
   type FulfillmentAddressSourcePort,
+  type FulfillmentBatchServiceOptions,
   type FulfillmentChargedSubscription,
   type FulfillmentChargedSubscriptionSourcePort,
   type FulfillmentCreateExpeditionRequest,
@@ -34,6 +35,12 @@ interface FixtureOptions {
   preferences?: Record<string, Record<string, unknown>>;
   cutoffConfigs?: FulfillmentCutoffConfigEntity[];
   defaultTransporteurCompteId?: string;
+  /** Failed attempts before createExpedition succeeds, per reference_commande */
+  expeditionFailures?: Record<string, number>;
+  expeditionDelayMs?: number;
+  batchSources?: boolean;
+  unreachableClientIds?: string[];
+  serviceOptions?: Partial<FulfillmentBatchServiceOptions>;
 }
 
 function createFixture(options: FixtureOptions = {}) {
@@ -44,6 +51,9 @@ function createFixture(options: FixtureOptions = {}) {
   const addressSnapshots = new Map<string, AddressSnapshotEntity>();
   const preferenceSnapshots = new Map<string, PreferenceSnapshotEntity>();
   const expeditionRequests: FulfillmentCreateExpeditionRequest[] = [];
+  const sourceCalls = { address: 0, addressBatch: 0, preference: 0, preferenceBatch: 0 };
+  const expeditionStats = { inFlight: 0, maxInFlight: 0 };
+  const expeditionFailures = { ...(options.expeditionFailures || {}) };
 
   const chargedBySubscriptionId = new Map<string, FulfillmentChargedSubscription>();
   for (const item of options.dueCandidates || []) {
@@ -132,29 +142,8 @@ function createFixture(options: FixtureOptions = {}) {
   };
 
   const batchLineRepository: IFulfillmentBatchLineRepository = {
-    create: async (params) => {
-      const line: FulfillmentBatchLineEntity = {
-        id: `line-${++lineSeq}`,
-        organisationId: params.organisationId,
-        batchId: params.batchId,
-        subscriptionId: params.subscriptionId,
-        clientId: params.clientId,
-        produitId: params.produitId,
-        quantite: params.quantite,
-        addressSnapshotId: params.addressSnapshotId,
-        preferenceSnapshotId: params.preferenceSnapshotId,
-        lineStatus: params.lineStatus || FulfillmentBatchLineStatus.TO_PREPARE,
-        expeditionId: null,
-        errorMessage: null,
-        createdAt: new Date(now),
-        updatedAt: new Date(now),
-        isPrepared: () => false,
-        isShipped: () => false,
-        hasError: () => false,
-      };
-      lines.set(line.id, line);
-      return { ...line };
-    },
+    create: async (params) => createLine(params),
+    createMany: async (params) => params.map((item) => createLine(item)),
     findById: async (id) => {
       const line = lines.get(id);
       return line ? { ...line } : null;
@@ -196,8 +185,38 @@ function createFixture(options: FixtureOptions = {}) {
     countByBatchId: async (batchId) => {
       return Array.from(lines.values()).filter((line) => line.batchId === batchId).length;
     },
+    findAllByBatchId: async (batchId) => {
+      return Array.from(lines.values())
+        .filter((line) => line.batchId === batchId)
+        .map((line) => ({ ...line }));
+    },
+    deleteBySubscriptionIdFromOpenBatches: async () => 0,
   };
 
+  function createLine(params: Parameters<IFulfillmentBatchLineRepository['create']>[0]) {
+    const line: FulfillmentBatchLineEntity = {
+      id: `line-${++lineSeq}`,
+      organisationId: params.organisationId,
+      batchId: params.batchId,
+      subscriptionId: params.subscriptionId,
+      clientId: params.clientId,
+      produitId: params.produitId,
+      quantite: params.quantite,
+      addressSnapshotId: params.addressSnapshotId,
+      preferenceSnapshotId: params.preferenceSnapshotId,
+      lineStatus: params.lineStatus || FulfillmentBatchLineStatus.TO_PREPARE,
+      expeditionId: null,
+      errorMessage: null,
+      createdAt: new Date(now),
+      updatedAt: new Date(now),
+      isPrepared: () => false,
+      isShipped: () => false,
+      hasError: () => false,
+    };
+    lines.set(line.id, line);
+    return { ...line };
+  }
+
   const cutoffConfigRepository: IFulfillmentCutoffConfigRepository = {
     create: async (params) => {
       const config: FulfillmentCutoffConfigEntity = {
@@ -258,39 +277,55 @@ function createFixture(options: FixtureOptions = {}) {
     },
   };
 
+  function createAddressSnapshot(
+    params: Parameters<IFulfillmentAddressSnapshotRepository['create']>[0],
+  ): AddressSnapshotEntity {
+    const snapshot: AddressSnapshotEntity = {
+      id: `addr-${++addressSeq}`,
+      organisationId: params.organisationId,
+      clientId: params.clientId,
+      rue: params.rue,
+      codePostal: params.codePostal,
+      ville: params.ville,
+      pays: params.pays,
+      capturedAt: params.capturedAt,
+    };
+    addressSnapshots.set(snapshot.id, snapshot);
+    return { ...snapshot };
+  }
+
+  function createPreferenceSnapshot(
+    params: Parameters<IFulfillmentPreferenceSnapshotRepository['create']>[0],
+  ): PreferenceSnapshotEntity {
+    const snapshot: PreferenceSnapshotEntity = {
+      id: `pref-${++preferenceSeq}`,
+      organisationId: params.organisationId,
+      subscriptionId: params.subscriptionId,
+      preferenceData: params.preferenceData,
+      capturedAt: params.capturedAt,
+    };
+    preferenceSnapshots.set(snapshot.id, snapshot);
+    return { ...snapshot };
+  }
+
   const addressSnapshotRepository: IFulfillmentAddressSnapshotRepository = {
-    create: async (params) => {
-      const snapshot: AddressSnapshotEntity = {
-        id: `addr-${++addressSeq}`,
-        organisationId: params.organisationId,
-        clientId: params.clientId,
-        rue: params.rue,
-        codePostal: params.codePostal,
-        ville: params.ville,
-        pays: params.pays,
-        capturedAt: params.capturedAt,
-      };
-      addressSnapshots.set(snapshot.id, snapshot);
-      return { ...snapshot };
-    },
+    create: async (params) => createAddressSnapshot(params),
+    createMany: async (params) => params.map((item) => createAddressSnapshot(item)),
     findById: async (id) => {
       const snapshot = addressSnapshots.get(id);
       return snapshot ? { ...snapshot } : null;
     },
+    findByIds: async (ids) => {
+      return ids
+        .map((id) => addressSnapshots.get(id))
+        .filter((snapshot): snapshot is AddressSnapshotEntity => Boolean(snapshot))
+        .map((snapshot) => ({ ...snapshot }));
+    },
   };
 
   const preferenceSnapshotRepository: IFulfillmentPreferenceSnapshotRepository = {
-    create: async (params) => {
-      const snapshot: PreferenceSnapshotEntity = {
-        id: `pref-${++preferenceSeq}`,
-        organisationId: params.organisationId,
-        subscriptionId: params.subscriptionId,
-        preferenceData: params.preferenceData,
-        capturedAt: params.capturedAt,
-      };
-      preferenceSnapshots.set(snapshot.id, snapshot);
-      return { ...snapshot };
-    },
+    create: async (params) => createPreferenceSnapshot(params),
+    createMany: async (params) => params.map((item) => createPreferenceSnapshot(item)),
   };
 
   const chargedSubscriptionSource: FulfillmentChargedSubscriptionSourcePort = {
@@ -307,34 +342,73 @@ function createFixture(options: FixtureOptions = {}) {
     },
   };
 
+  const resolveAddress = (clientId: string) => {
+    if (options.unreachableClientIds?.includes(clientId)) {
+      throw new Error(`Client ${clientId} unreachable`);
+    }
+
+    const value = addresses[clientId];
+    if (value) {
+      return { ...value };
+    }
+
+    return {
+      rue: '10 rue inconnue',
+      codePostal: '75001',
+      ville: 'Paris',
+      pays: 'FR',
+    };
+  };
+
   const addressSource: FulfillmentAddressSourcePort = {
     getClientAddress: async (_organisationId, clientId) => {
-      const value = addresses[clientId];
-      if (value) {
-        return { ...value };
-      }
-
-      return {
-        rue: '10 rue inconnue',
-        codePostal: '75001',
-        ville: 'Paris',
-        pays: 'FR',
-      };
+      sourceCalls.address += 1;
+      return resolveAddress(clientId);
     },
   };
 
   const preferenceSource: FulfillmentPreferenceSourcePort = {
     getSubscriptionPreferences: async (_organisationId, subscriptionId) => {
+      sourceCalls.preference += 1;
       return {
         ...(preferences[subscriptionId] || {}),
       };
     },
   };
 
+  if (options.batchSources) {
+    addressSource.getClientAddresses = async (_organisationId, clientIds) => {
+      sourceCalls.addressBatch += 1;
+      return new Map(clientIds.map((clientId) => [clientId, resolveAddress(clientId)]));
+    };
+    preferenceSource.getSubscriptionPreferencesBatch = async (_organisationId, subscriptionIds) => {
+      sourceCalls.preferenceBatch += 1;
+      return new Map(
+        subscriptionIds
+          .filter((subscriptionId) => preferences[subscriptionId])
+          .map((subscriptionId) => [subscriptionId, { ...preferences[subscriptionId] }]),
+      );
+    };
+  }
+
   const expeditionBridge: FulfillmentExpeditionBridgePort = {
     createExpedition: async (request) => {
-      expeditionRequests.push(request);
-      return { id: `exp-${++expeditionSeq}` };
+      expeditionStats.inFlight += 1;
+      expeditionStats.maxInFlight = Math.max(expeditionStats.maxInFlight, expeditionStats.inFlight);
+      try {
+        await new Promise((resolve) => setTimeout(resolve, options.expeditionDelayMs || 0));
+
+        const reference = request.reference_commande;
+        if ((expeditionFailures[reference] || 0) > 0) {
+          expeditionFailures[reference] -= 1;
+          throw new Error(`Carrier unavailable for ${reference}`);
+        }
+
+        expeditionRequests.push(request);
+        return { id: `exp-${++expeditionSeq}` };
+      } finally {
+        expeditionStats.inFlight -= 1;
+      }
     },
   };
 
@@ -352,6 +426,8 @@ function createFixture(options: FixtureOptions = {}) {
     {
       now: () => new Date(now),
       defaultTransporteurCompteId: options.defaultTransporteurCompteId || 'carrier-default',
+      dispatchRetryDelayMs: 1,
+      ...options.serviceOptions,
     },
   );
 
@@ -362,6 +438,8 @@ function createFixture(options: FixtureOptions = {}) {
     addressSnapshots,
     preferenceSnapshots,
     expeditionRequests,
+    sourceCalls,
+    expeditionStats,
   };
 }
 
@@ -565,6 +643,136 @@ describe('FulfillmentBatchService', () => {
     expect(lockedBatches[0].status).toBe(FulfillmentBatchStatus.LOCKED);
   });
 
+  it('lockBatch: snapshots more than one page of candidates with batched source calls', async () => {
+    const dueCandidates = Array.from({ length: 120 }, (_, index) =>
+      candidate({
+        subscriptionId: `sub-${index}`,
+        clientId: `client-${index % 40}`,
+        referenceCommande: `cmd-${index}`,
+      }),
+    );
+    const { service, lines, addressSnapshots, preferenceSnapshots, sourceCalls, expeditionRequests } =
+      createFixture({
+        dueCandidates,
+        batchSources: true,
+        preferences: { 'sub-7': { grind: 'fine' } },
+        serviceOptions: { lockChunkSize: 50 },
+      });
+
+    const batch = await service.createBatch('org-1', 'soc-1');
+    const locked = await service.lockBatch(batch.id);
+
+    expect(locked.lineCount).toBe(120);
+    expect(lines.size).toBe(120);
+    expect(addressSnapshots.size).toBe(120);
+    expect(preferenceSnapshots.size).toBe(120);
+    expect(sourceCalls).toEqual({ address: 0, addressBatch: 3, preference: 0, preferenceBatch: 3 });
+
+    const line = Array.from(lines.values()).find((item) => item.subscriptionId === 'sub-7');
+    expect(preferenceSnapshots.get(line?.preferenceSnapshotId || '')?.preferenceData).toEqual({
+      grind: 'fine',
+    });
+
+    await service.dispatchBatch(batch.id);
+
+    // Every line is dispatched, not only the first page
+    expect(expeditionRequests.length).toBe(120);
+    expect(service.getMetrics().lock.lastItemCount).toBe(120);
+    expect(service.getMetrics().dispatch.lastItemCount).toBe(120);
+  });
+
+  it('lockBatch: falls back to deduplicated single lookups without batch sources', async () => {
+    const { service, sourceCalls } = createFixture({
+      dueCandidates: [
+        candidate({ subscriptionId: 'sub-1', clientId: 'client-1' }),
+        candidate({ subscriptionId: 'sub-2', clientId: 'client-1' }),
+        candidate({ subscriptionId: 'sub-3', clientId: 'client-2' }),
+      ],
+    });
+
+    const batch = await service.createBatch('org-1', 'soc-1');
+    await service.lockBatch(batch.id);
+
+    expect(sourceCalls.address).toBe(2);
+    expect(sourceCalls.preference).toBe(3);
+  });
+
+  it('dispatchBatch: creates expeditions concurrently and retries failed attempts', async () => {
+    const dueCandidates = Array.from({ length: 12 }, (_, index) =>
+      candidate({ subscriptionId: `sub-${index}`, referenceCommande: `cmd-${index}` }),
+    );
+    const { service, lines, expeditionRequests, expeditionStats } = createFixture({
+      dueCandidates,
+      expeditionDelayMs: 5,
+      expeditionFailures: { 'cmd-3': 2 },
+      serviceOptions: { dispatchConcurrency: 4 },
+    });
+
+    const batch = await service.createBatch('org-1', 'soc-1');
+    await service.lockBatch(batch.id);
+    const dispatched = await service.dispatchBatch(batch.id);
+
+    expect(dispatched.status).toBe(FulfillmentBatchStatus.DISPATCHED);
+    expect(expeditionRequests.length).toBe(12);
+    expect(expeditionStats.maxInFlight).toBe(4);
+    expect(
+      Array.from(lines.values()).every((line) => line.lineStatus === FulfillmentBatchLineStatus.SHIPPED),
+    ).toBe(true);
+    expect(service.getMetrics().dispatch.count).toBe(1);
+  });
+
+  it('dispatchBatch: keeps the batch LOCKED on partial failure and only retries failed lines', async () => {
+    const { service, batches, lines, expeditionRequests } = createFixture({
+      dueCandidates: [
+        candidate({ subscriptionId: 'sub-1', referenceCommande: 'cmd-1' }),
+        candidate({ subscriptionId: 'sub-2', referenceCommande: 'cmd-2' }),
+      ],
+      expeditionFailures: { 'cmd-2': 3 },
+    });
+
+    const batch = await service.createBatch('org-1', 'soc-1');
+    await service.lockBatch(batch.id);
+
+    await expect(service.dispatchBatch(batch.id)).rejects.toMatchObject({
+      code: 'FULFILLMENT_DISPATCH_PARTIAL_FAILURE',
+    });
+    expect(batches.get(batch.id)?.status).toBe(FulfillmentBatchStatus.LOCKED);
+    const failed = Array.from(lines.values()).find((line) => line.subscriptionId === 'sub-2');
+    expect(failed?.lineStatus).toBe(FulfillmentBatchLineStatus.TO_PREPARE);
+    expect(failed?.errorMessage).toBe('Carrier unavailable for cmd-2');
+
+    const dispatched = await service.dispatchBatch(batch.id);
+
+    expect(dispatched.status).toBe(FulfillmentBatchStatus.DISPATCHED);
+    expect(expeditionRequests.map((request) => request.reference_commande)).toEqual(['cmd-1', 'cmd-2']);
+    expect(failed && lines.get(failed.id)?.errorMessage).toBeNull();
+  });
+
+  it('runCutoffJob: locks several societes and isolates failures', async () => {
+    const { service, batches } = createFixture({
+      dueCandidates: [
+        candidate({ societeId: 'soc-1', subscriptionId: 'sub-1' }),
+        candidate({ societeId: 'soc-2', subscriptionId: 'sub-2', clientId: 'client-unreachable' }),
+        candidate({ societeId: 'soc-3', subscriptionId: 'sub-3' }),
+      ],
+      unreachableClientIds: ['client-unreachable'],
+      cutoffConfigs: [
+        cutoffConfig({ id: 'cfg-1', societeId: 'soc-1' }),
+        cutoffConfig({ id: 'cfg-2', societeId: 'soc-2' }),
+        cutoffConfig({ id: 'cfg-3', societeId: 'soc-3' }),
+      ],
+    });
+
+    const first = await service.createBatch('org-1', 'soc-1');
+    const second = await service.createBatch('org-1', 'soc-2');
+    const third = await service.createBatch('org-1', 'soc-3');
+    const lockedBatches = await service.runCutoffJob('org-1', new Date('2026-02-02T15:30:00.000Z'));
+
+    expect(lockedBatches.map((batch) => batch.id)).toEqual([first.id, third.id]);
+    expect(batches.get(second.id)?.status).toBe(FulfillmentBatchStatus.OPEN);
+    expect(service.getMetrics().lock.count).toBe(2);
+  });
+
   it('invalid transition: lockBatch rejects DISPATCHED -> OPEN path', async () => {
     const { service, batches } = createFixture();
 
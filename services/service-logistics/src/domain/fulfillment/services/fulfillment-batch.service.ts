@@ -1,5 +1,5 @@
 import { Injectable, Logger, OnModuleInit, Optional } from '@nestjs/common';
-import { DomainException, NatsService } from '@crm/shared-kernel';
+import { chunkArray, DomainException, mapWithConcurrency, NatsService } from '@crm/shared-kernel';
 import {
   AddressSnapshotEntity,
   FulfillmentBatchEntity,
@@ -17,6 +17,13 @@ import type {
 
 const SUBSCRIPTION_CHARGED_EVENT = 'SUBSCRIPTION_CHARGED';
 
+const DEFAULT_LOCK_CHUNK_SIZE = 200;
+const DEFAULT_SOURCE_CONCURRENCY = 16;
+const DEFAULT_DISPATCH_CONCURRENCY = 8;
+const DEFAULT_DISPATCH_MAX_ATTEMPTS = 3;
+const DEFAULT_DISPATCH_RETRY_DELAY_MS = 200;
+const DEFAULT_CUTOFF_SOCIETE_CONCURRENCY = 4;
+
 export interface FulfillmentCreateExpeditionAddress {
   line1: string;
   line2?: string;
@@ -89,6 +96,12 @@ export interface FulfillmentClientAddress {
 
 export interface FulfillmentAddressSourcePort {
   getClientAddress(organisationId: string, clientId: string): Promise<FulfillmentClientAddress>;
+
+  /** Batch lookup, keyed by client id */
+  getClientAddresses?(
+    organisationId: string,
+    clientIds: string[],
+  ): Promise<Map<string, FulfillmentClientAddress>>;
 }
 
 export interface FulfillmentPreferenceSourcePort {
@@ -96,29 +109,47 @@ export interface FulfillmentPreferenceSourcePort {
     organisationId: string,
     subscriptionId: string,
   ): Promise<Record<string, unknown>>;
+
+  /** Batch lookup, keyed by subscription id */
+  getSubscriptionPreferencesBatch?(
+    organisationId: string,
+    subscriptionIds: string[],
+  ): Promise<Map<string, Record<string, unknown>>>;
+}
+
+interface AddressSnapshotParams {
+  organisationId: string;
+  clientId: string;
+  rue: string;
+  codePostal: string;
+  ville: string;
+  pays: string;
+  capturedAt: Date;
+}
+
+interface PreferenceSnapshotParams {
+  organisationId: string;
+  subscriptionId: string;
+  preferenceData: Record<string, unknown>;
+  capturedAt: Date;
 }
 
 export interface IFulfillmentAddressSnapshotRepository {
-  create(params: {
-    organisationId: string;
-    clientId: string;
-    rue: string;
-    codePostal: string;
-    ville: string;
-    pays: string;
-    capturedAt: Date;
-  }): Promise<AddressSnapshotEntity>;
+  create(params: AddressSnapshotParams): Promise<AddressSnapshotEntity>;
+
+  /** Inserts in bulk, results in input order */
+  createMany(params: AddressSnapshotParams[]): Promise<AddressSnapshotEntity[]>;
 
   findById(id: string): Promise<AddressSnapshotEntity | null>;
+
+  findByIds(ids: string[]): Promise<AddressSnapshotEntity[]>;
 }
 
 export interface IFulfillmentPreferenceSnapshotRepository {
-  create(params: {
-    organisationId: string;
-    subscriptionId: string;
-    preferenceData: Record<string, unknown>;
-    capturedAt: Date;
-  }): Promise<PreferenceSnapshotEntity>;
+  create(params: PreferenceSnapshotParams): Promise<PreferenceSnapshotEntity>;
+
+  /** Inserts in bulk, results in input order */
+  createMany(params: PreferenceSnapshotParams[]): Promise<PreferenceSnapshotEntity[]>;
 }
 
 export interface FulfillmentExpeditionBridgePort {
@@ -130,6 +161,29 @@ export interface FulfillmentBatchServiceOptions {
   resolveOrganisationIdForSociete?: (societeId: string) => Promise<string | null>;
   defaultOrganisationId?: string;
   defaultTransporteurCompteId?: string;
+  /** Candidates snapshotted per bulk insert round when locking */
+  lockChunkSize?: number;
+  /** Single address/preference lookups in flight when a source has no batch lookup */
+  sourceConcurrency?: number;
+  /** Expeditions created in parallel when dispatching */
+  dispatchConcurrency?: number;
+  dispatchMaxAttempts?: number;
+  dispatchRetryDelayMs?: number;
+  /** Societes locked in parallel by the cutoff job */
+  cutoffSocieteConcurrency?: number;
+}
+
+export interface FulfillmentOperationMetrics {
+  count: number;
+  totalMs: number;
+  maxMs: number;
+  lastMs: number;
+  lastItemCount: number;
+}
+
+export interface FulfillmentBatchMetrics {
+  lock: FulfillmentOperationMetrics;
+  dispatch: FulfillmentOperationMetrics;
 }
 
 @Injectable()
@@ -140,6 +194,10 @@ export class FulfillmentBatchService implements OnModuleInit {
     Map<string, FulfillmentChargedSubscription>
   >();
   private readonly dispatchMetadataByLineId = new Map<string, FulfillmentDispatchMetadata>();
+  private readonly metrics: FulfillmentBatchMetrics = {
+    lock: this.emptyOperationMetrics(),
+    dispatch: this.emptyOperationMetrics(),
+  };
 
   constructor(
     private readonly batchRepository: IFulfillmentBatchRepository,
@@ -181,7 +239,13 @@ export class FulfillmentBatchService implements OnModuleInit {
     return this.getOrCreateOpenBatch(societeId);
   }
 
+  /**
+   * Freeze the due candidates into batch lines.
+   * Candidates are handled in chunks: addresses and preferences are fetched
+   * in batch calls, snapshots and lines inserted in bulk.
+   */
   async lockBatch(batchId: string): Promise<FulfillmentBatchEntity> {
+    const startedAt = Date.now();
     const batch = await this.requireBatch(batchId);
     this.assertTransition(batch, FulfillmentBatchStatus.OPEN, FulfillmentBatchStatus.LOCKED);
 
@@ -196,71 +260,104 @@ export class FulfillmentBatchService implements OnModuleInit {
     const capturedAt = this.now();
     let createdLineCount = 0;
 
-    for (const candidate of candidates) {
-      const address = await this.addressSource.getClientAddress(
-        batch.organisationId,
-        candidate.clientId,
-      );
-      const preferences = await this.preferenceSource.getSubscriptionPreferences(
-        batch.organisationId,
-        candidate.subscriptionId,
+    for (const chunk of chunkArray(candidates, this.options.lockChunkSize ?? DEFAULT_LOCK_CHUNK_SIZE)) {
+      const [addresses, preferences] = await Promise.all([
+        this.fetchAddresses(
+          batch.organisationId,
+          chunk.map((candidate) => candidate.clientId),
+        ),
+        this.fetchPreferences(
+          batch.organisationId,
+          chunk.map((candidate) => candidate.subscriptionId),
+        ),
+      ]);
+
+      const [addressSnapshots, preferenceSnapshots] = await Promise.all([
+        this.addressSnapshotRepository.createMany(
+          chunk.map((candidate) => {
+            const address = addresses.get(candidate.clientId) as FulfillmentClientAddress;
+            return {
+              organisationId: batch.organisationId,
+              clientId: candidate.clientId,
+              rue: address.rue,
+              codePostal: address.codePostal,
+              ville: address.ville,
+              pays: address.pays,
+              capturedAt,
+            };
+          }),
+        ),
+        this.preferenceSnapshotRepository.createMany(
+          chunk.map((candidate) => ({
+            organisationId: batch.organisationId,
+            subscriptionId: candidate.subscriptionId,
+            preferenceData: this.cloneRecord(preferences.get(candidate.subscriptionId) || {}),
+            capturedAt,
+          })),
+        ),
+      ]);
+
+      const lines = await this.batchLineRepository.createMany(
+        chunk.map((candidate, index) => ({
+          organisationId: batch.organisationId,
+          batchId: batch.id,
+          subscriptionId: candidate.subscriptionId,
+          clientId: candidate.clientId,
+          produitId: candidate.produitId,
+          quantite: candidate.quantite,
+          addressSnapshotId: addressSnapshots[index].id,
+          preferenceSnapshotId: preferenceSnapshots[index].id,
+          lineStatus: FulfillmentBatchLineStatus.TO_PREPARE,
+        })),
       );
 
-      const addressSnapshot = await this.addressSnapshotRepository.create({
-        organisationId: batch.organisationId,
-        clientId: candidate.clientId,
-        rue: address.rue,
-        codePostal: address.codePostal,
-        ville: address.ville,
-        pays: address.pays,
-        capturedAt,
-      });
-
-      const preferenceSnapshot = await this.preferenceSnapshotRepository.create({
-        organisationId: batch.organisationId,
-        subscriptionId: candidate.subscriptionId,
-        preferenceData: this.cloneRecord(preferences),
-        capturedAt,
-      });
-
-      const line = await this.batchLineRepository.create({
-        organisationId: batch.organisationId,
-        batchId: batch.id,
-        subscriptionId: candidate.subscriptionId,
-        clientId: candidate.clientId,
-        produitId: candidate.produitId,
-        quantite: candidate.quantite,
-        addressSnapshotId: addressSnapshot.id,
-        preferenceSnapshotId: preferenceSnapshot.id,
-        lineStatus: FulfillmentBatchLineStatus.TO_PREPARE,
-      });
-
-      this.dispatchMetadataByLineId.set(line.id, {
-        transporteurCompteId: candidate.transporteurCompteId,
-        contratId: candidate.contratId,
-        nomProduit: candidate.nomProduit,
-        poids: candidate.poids,
-        referenceCommande: candidate.referenceCommande,
+      lines.forEach((line, index) => {
+        const candidate = chunk[index];
+        this.dispatchMetadataByLineId.set(line.id, {
+          transporteurCompteId: candidate.transporteurCompteId,
+          contratId: candidate.contratId,
+          nomProduit: candidate.nomProduit,
+          poids: candidate.poids,
+          referenceCommande: candidate.referenceCommande,
+        });
       });
 
-      createdLineCount += 1;
+      createdLineCount += lines.length;
     }
 
-    return this.batchRepository.update(batch.id, {
+    const locked = await this.batchRepository.update(batch.id, {
       status: FulfillmentBatchStatus.LOCKED,
       lockedAt: capturedAt,
       lineCount: createdLineCount,
     });
+
+    const durationMs = this.recordOperation(this.metrics.lock, startedAt, createdLineCount);
+    this.logger.log(`Batch ${batch.id} locked with ${createdLineCount} line(s) in ${durationMs}ms`);
+
+    return locked;
   }
 
+  /**
+   * Create the expeditions of a locked batch, several at a time, each retried
+   * on failure. Lines already shipped are skipped, so a batch whose dispatch
+   * partially failed stays LOCKED and can simply be dispatched again.
+   */
   async dispatchBatch(batchId: string): Promise<FulfillmentBatchEntity> {
+    const startedAt = Date.now();
     const batch = await this.requireBatch(batchId);
     this.assertTransition(batch, FulfillmentBatchStatus.LOCKED, FulfillmentBatchStatus.DISPATCHED);
 
-    const { lines } = await this.batchLineRepository.findByBatchId(batch.id);
+    const lines = (await this.batchLineRepository.findAllByBatchId(batch.id)).filter(
+      (line) => line.lineStatus !== FulfillmentBatchLineStatus.SHIPPED,
+    );
 
-    for (const line of lines) {
-      const addressSnapshot = await this.addressSnapshotRepository.findById(line.addressSnapshotId);
+    const snapshots = await this.addressSnapshotRepository.findByIds(
+      Array.from(new Set(lines.map((line) => line.addressSnapshotId))),
+    );
+    const snapshotsById = new Map(snapshots.map((snapshot) => [snapshot.id, snapshot]));
+
+    const requests = lines.map((line) => {
+      const addressSnapshot = snapshotsById.get(line.addressSnapshotId);
       if (!addressSnapshot) {
         throw new DomainException(
           `Address snapshot ${line.addressSnapshotId} not found`,
@@ -271,24 +368,62 @@ export class FulfillmentBatchService implements OnModuleInit {
           },
         );
       }
+      return this.toCreateExpeditionRequest(batch, line, addressSnapshot);
+    });
 
-      const expedition = await this.expeditionBridge.createExpedition(
-        this.toCreateExpeditionRequest(batch, line, addressSnapshot),
-      );
+    const failedLineIds: string[] = [];
+    await mapWithConcurrency(
+      lines,
+      this.options.dispatchConcurrency ?? DEFAULT_DISPATCH_CONCURRENCY,
+      async (line, index) => {
+        try {
+          const expedition = await this.createExpeditionWithRetry(requests[index]);
+          await this.batchLineRepository.update(line.id, {
+            lineStatus: FulfillmentBatchLineStatus.SHIPPED,
+            expeditionId: expedition.id,
+            errorMessage: null,
+          });
+        } catch (error: any) {
+          failedLineIds.push(line.id);
+          this.logger.error(`Expedition failed for batch line ${line.id}: ${error.message}`);
+          await this.batchLineRepository.update(line.id, {
+            errorMessage: error.message || String(error),
+          });
+        }
+      },
+    );
 
-      await this.batchLineRepository.update(line.id, {
-        lineStatus: FulfillmentBatchLineStatus.SHIPPED,
-        expeditionId: expedition.id,
-        errorMessage: null,
-      });
+    this.recordOperation(this.metrics.dispatch, startedAt, lines.length);
+
+    if (failedLineIds.length > 0) {
+      throw new DomainException(
+        `${failedLineIds.length}/${lines.length} expedition(s) failed for batch ${batch.id}`,
+        'FULFILLMENT_DISPATCH_PARTIAL_FAILURE',
+        {
+          batchId: batch.id,
+          failedLineIds,
+        },
+      );
     }
 
+    this.logger.log(
+      `Batch ${batch.id} dispatched ${lines.length} line(s) in ${this.metrics.dispatch.lastMs}ms`,
+    );
+
     return this.batchRepository.update(batch.id, {
       status: FulfillmentBatchStatus.DISPATCHED,
       dispatchedAt: this.now(),
     });
   }
 
+  /** Lock and dispatch durations since startup */
+  getMetrics(): FulfillmentBatchMetrics {
+    return {
+      lock: { ...this.metrics.lock },
+      dispatch: { ...this.metrics.dispatch },
+    };
+  }
+
   async completeBatch(batchId: string): Promise<FulfillmentBatchEntity> {
     const batch = await this.requireBatch(batchId);
     this.assertTransition(batch, FulfillmentBatchStatus.DISPATCHED, FulfillmentBatchStatus.COMPLETED);
@@ -315,24 +450,30 @@ export class FulfillmentBatchService implements OnModuleInit {
     referenceDate: Date = this.now(),
   ): Promise<FulfillmentBatchEntity[]> {
     const configs = await this.cutoffConfigRepository.findActiveByOrganisationId(organisationId);
-    const lockedBatches: FulfillmentBatchEntity[] = [];
-
-    for (const config of configs) {
-      if (!this.isCutoffReached(config, referenceDate)) {
-        continue;
-      }
-
-      const openBatch = await this.batchRepository.findOpenBySocieteId(config.societeId);
-      if (!openBatch) {
-        continue;
-      }
-
-      const lockedBatch = await this.lockBatch(openBatch.id);
-      lockedBatches.push(lockedBatch);
-      this.logger.log(`Batch ${lockedBatch.id} auto-locked for societe ${config.societeId}`);
-    }
+    const dueConfigs = configs.filter((config) => this.isCutoffReached(config, referenceDate));
+
+    // Societes are independent: lock them in parallel, one failure does not hold back the others
+    const lockedBatches = await mapWithConcurrency(
+      dueConfigs,
+      this.options.cutoffSocieteConcurrency ?? DEFAULT_CUTOFF_SOCIETE_CONCURRENCY,
+      async (config) => {
+        try {
+          const openBatch = await this.batchRepository.findOpenBySocieteId(config.societeId);
+          if (!openBatch) {
+            return null;
+          }
+
+          const lockedBatch = await this.lockBatch(openBatch.id);
+          this.logger.log(`Batch ${lockedBatch.id} auto-locked for societe ${config.societeId}`);
+          return lockedBatch;
+        } catch (error: any) {
+          this.logger.error(`Cutoff lock failed for societe ${config.societeId}: ${error.message}`);
+          return null;
+        }
+      },
+    );
 
-    return lockedBatches;
+    return lockedBatches.filter((batch): batch is FulfillmentBatchEntity => batch !== null);
   }
 
   private async getOrCreateOpenBatch(
@@ -482,6 +623,84 @@ export class FulfillmentBatchService implements OnModuleInit {
     };
   }
 
+  private async fetchAddresses(
+    organisationId: string,
+    clientIds: string[],
+  ): Promise<Map<string, FulfillmentClientAddress>> {
+    const uniqueIds = Array.from(new Set(clientIds));
+    const addresses = this.addressSource.getClientAddresses
+      ? await this.addressSource.getClientAddresses(organisationId, uniqueIds)
+      : new Map<string, FulfillmentClientAddress>();
+
+    const missing = uniqueIds.filter((clientId) => !addresses.has(clientId));
+    await mapWithConcurrency(missing, this.sourceConcurrency(), async (clientId) => {
+      addresses.set(clientId, await this.addressSource.getClientAddress(organisationId, clientId));
+    });
+
+    return addresses;
+  }
+
+  private async fetchPreferences(
+    organisationId: string,
+    subscriptionIds: string[],
+  ): Promise<Map<string, Record<string, unknown>>> {
+    const uniqueIds = Array.from(new Set(subscriptionIds));
+    if (this.preferenceSource.getSubscriptionPreferencesBatch) {
+      // Subscriptions without preferences are simply absent from the result
+      return this.preferenceSource.getSubscriptionPreferencesBatch(organisationId, uniqueIds);
+    }
+
+    const preferences = new Map<string, Record<string, unknown>>();
+    await mapWithConcurrency(uniqueIds, this.sourceConcurrency(), async (subscriptionId) => {
+      preferences.set(
+        subscriptionId,
+        await this.preferenceSource.getSubscriptionPreferences(organisationId, subscriptionId),
+      );
+    });
+
+    return preferences;
+  }
+
+  private async createExpeditionWithRetry(
+    request: FulfillmentCreateExpeditionRequest,
+  ): Promise<{ id: string }> {
+    const maxAttempts = this.options.dispatchMaxAttempts ?? DEFAULT_DISPATCH_MAX_ATTEMPTS;
+    const retryDelayMs = this.options.dispatchRetryDelayMs ?? DEFAULT_DISPATCH_RETRY_DELAY_MS;
+
+    for (let attempt = 1; ; attempt += 1) {
+      try {
+        return await this.expeditionBridge.createExpedition(request);
+      } catch (error) {
+        if (attempt >= maxAttempts) {
+          throw error;
+        }
+        await new Promise((resolve) => setTimeout(resolve, retryDelayMs * 2 ** (attempt - 1)));
+      }
+    }
+  }
+
+  private sourceConcurrency(): number {
+    return this.options.sourceConcurrency ?? DEFAULT_SOURCE_CONCURRENCY;
+  }
+
+  private emptyOperationMetrics(): FulfillmentOperationMetrics {
+    return { count: 0, totalMs: 0, maxMs: 0, lastMs: 0, lastItemCount: 0 };
+  }
+
+  private recordOperation(
+    metrics: FulfillmentOperationMetrics,
+    startedAt: number,
+    itemCount: number,
+  ): number {
+    const durationMs = Date.now() - startedAt;
+    metrics.count += 1;
+    metrics.totalMs += durationMs;
+    metrics.maxMs = Math.max(metrics.maxMs, durationMs);
+    metrics.lastMs = durationMs;
+    metrics.lastItemCount = itemCount;
+    return durationMs;
+  }
+
   private toCreateExpeditionRequest(
     batch: FulfillmentBatchEntity,
     line: FulfillmentBatchLineEntity,
@@ -1,8 +1,10 @@
 import { Injectable, Logger } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository } from 'typeorm';
+import { In, Repository } from 'typeorm';
 import { AddressSnapshotEntity } from '../../../../../domain/fulfillment/entities';
 
+const SAVE_CHUNK_SIZE = 500;
+
 @Injectable()
 export class AddressSnapshotRepositoryService {
   private readonly logger = new Logger(AddressSnapshotRepositoryService.name);
@@ -25,7 +27,31 @@ export class AddressSnapshotRepositoryService {
     return this.repository.save(entity);
   }
 
+  async createMany(
+    params: Array<{
+      organisationId: string;
+      clientId: string;
+      rue: string;
+      codePostal: string;
+      ville: string;
+      pays: string;
+      capturedAt: Date;
+    }>,
+  ): Promise<AddressSnapshotEntity[]> {
+    if (params.length === 0) {
+      return [];
+    }
+    return this.repository.save(this.repository.create(params), { chunk: SAVE_CHUNK_SIZE });
+  }
+
   async findById(id: string): Promise<AddressSnapshotEntity | null> {
     return this.repository.findOne({ where: { id } });
   }
+
+  async findByIds(ids: string[]): Promise<AddressSnapshotEntity[]> {
+    if (ids.length === 0) {
+      return [];
+    }
+    return this.repository.find({ where: { id: In(ids) } });
+  }
 }
@@ -7,6 +7,8 @@ import {
 } from '../../../../../domain/fulfillment/entities';
 import type { IFulfillmentBatchLineRepository } from '../../../../../domain/fulfillment/repositories';
 
+const SAVE_CHUNK_SIZE = 500;
+
 @Injectable()
 export class FulfillmentBatchLineRepositoryService implements IFulfillmentBatchLineRepository {
   private readonly logger = new Logger(FulfillmentBatchLineRepositoryService.name);
@@ -41,6 +43,31 @@ export class FulfillmentBatchLineRepositoryService implements IFulfillmentBatchL
     return this.repository.save(entity);
   }
 
+  async createMany(
+    params: Array<{
+      organisationId: string;
+      batchId: string;
+      subscriptionId: string;
+      clientId: string;
+      produitId: string;
+      quantite: number;
+      addressSnapshotId: string;
+      preferenceSnapshotId: string;
+      lineStatus?: FulfillmentBatchLineStatus;
+    }>,
+  ): Promise<FulfillmentBatchLineEntity[]> {
+    if (params.length === 0) {
+      return [];
+    }
+    const entities = this.repository.create(
+      params.map((item) => ({
+        ...item,
+        lineStatus: item.lineStatus || FulfillmentBatchLineStatus.TO_PREPARE,
+      })),
+    );
+    return this.repository.save(entities, { chunk: SAVE_CHUNK_SIZE });
+  }
+
   async findById(id: string): Promise<FulfillmentBatchLineEntity | null> {
     return this.repository.findOne({ where: { id } });
   }
@@ -3,6 +3,8 @@ import { InjectRepository } from '@nestjs/typeorm';
 import { Repository } from 'typeorm';
 import { PreferenceSnapshotEntity } from '../../../../../domain/fulfillment/entities';
 
+const SAVE_CHUNK_SIZE = 500;
+
 @Injectable()
 export class PreferenceSnapshotRepositoryService {
   private readonly logger = new Logger(PreferenceSnapshotRepositoryService.name);
@@ -22,6 +24,20 @@ export class PreferenceSnapshotRepositoryService {
     return this.repository.save(entity);
   }
 
+  async createMany(
+    params: Array<{
+      organisationId: string;
+      subscriptionId: string;
+      preferenceData: Record<string, unknown>;
+      capturedAt: Date;
+    }>,
+  ): Promise<PreferenceSnapshotEntity[]> {
+    if (params.length === 0) {
+      return [];
+    }
+    return this.repository.save(this.repository.create(params), { chunk: SAVE_CHUNK_SIZE });
+  }
+
   async findById(id: string): Promise<PreferenceSnapshotEntity | null> {
     return this.repository.findOne({ where: { id } });
   }